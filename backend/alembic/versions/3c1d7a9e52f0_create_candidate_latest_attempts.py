@@ -0,0 +1,249 @@
+"""create candidate_latest_attempts read model
+
+Revision ID: 3c1d7a9e52f0
+Revises: 64b08df6fab4
+Create Date: 2026-10-18 15:00:00.000000
+Created By: md-danish-ai
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1d7a9e52f0"
+down_revision: Union[str, Sequence[str], None] = "64b08df6fab4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns of interview_records the read model depends on. Autosaves only touch
+# the counters, so they do not fire the trigger.
+RECORD_COLUMNS = (
+    "user_id, paper_id, status, completion_reason, started_at, submitted_at, "
+    "overall_grade, typing_stats"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "candidate_latest_attempts",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("attempt_id", sa.Integer(), nullable=True),
+        sa.Column("paper_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=30), nullable=True),
+        sa.Column("completion_reason", sa.String(length=30), nullable=True),
+        sa.Column("started_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("submitted_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("overall_grade", sa.String(length=20), nullable=True),
+        sa.Column(
+            "typing_stats", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+        sa.Column("attempts_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "interviewers",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="[]",
+            nullable=False,
+        ),
+        sa.Column(
+            "interviewer_ids",
+            postgresql.ARRAY(sa.Integer()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column("assignment_id", sa.Integer(), nullable=True),
+        sa.Column("assignment_paper_id", sa.Integer(), nullable=True),
+        sa.Column("assignment_department_id", sa.Integer(), nullable=True),
+        sa.Column("assignment_test_level_id", sa.Integer(), nullable=True),
+        sa.Column("assignment_is_attempted", sa.Boolean(), nullable=True),
+        sa.Column("assignment_date", sa.Date(), nullable=True),
+        sa.Column(
+            "refreshed_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_candidate_latest_attempts_attempt_id",
+        "candidate_latest_attempts",
+        ["attempt_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_candidate_latest_attempts_interviewer_ids",
+        "candidate_latest_attempts",
+        ["interviewer_ids"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    # Recomputes one candidate's row from the source tables. Every trigger
+    # funnels into this, so the row is always a pure function of the sources.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_candidate_latest_attempt(p_user_id integer)
+        RETURNS void AS $$
+        DECLARE
+            rec interview_records%ROWTYPE;
+            asg paper_assignments%ROWTYPE;
+        BEGIN
+            IF p_user_id IS NULL THEN
+                RETURN;
+            END IF;
+
+            SELECT * INTO rec FROM interview_records
+            WHERE user_id = p_user_id ORDER BY id DESC LIMIT 1;
+            SELECT * INTO asg FROM paper_assignments
+            WHERE user_id = p_user_id ORDER BY id DESC LIMIT 1;
+
+            IF rec.id IS NULL AND asg.id IS NULL THEN
+                DELETE FROM candidate_latest_attempts WHERE user_id = p_user_id;
+                RETURN;
+            END IF;
+
+            INSERT INTO candidate_latest_attempts AS c (
+                user_id, attempt_id, paper_id, status, completion_reason,
+                started_at, submitted_at, overall_grade, typing_stats,
+                attempts_count, interviewers, interviewer_ids,
+                assignment_id, assignment_paper_id, assignment_department_id,
+                assignment_test_level_id, assignment_is_attempted,
+                assignment_date, refreshed_at
+            )
+            SELECT
+                p_user_id, rec.id, rec.paper_id, rec.status,
+                rec.completion_reason, rec.started_at, rec.submitted_at,
+                rec.overall_grade, rec.typing_stats,
+                (SELECT count(*) FROM interview_records
+                 WHERE user_id = p_user_id),
+                COALESCE(ev.interviewers, '[]'::jsonb),
+                COALESCE(ev.interviewer_ids, '{}'::integer[]),
+                asg.id, asg.paper_id, asg.department_id, asg.test_level_id,
+                asg.is_attempted, asg.assigned_date, CURRENT_TIMESTAMP
+            FROM (
+                SELECT
+                    jsonb_agg(
+                        jsonb_build_object('name', u.username, 'status', e.status)
+                        ORDER BY (e.status = 'completed') DESC, e.updated_at
+                    ) AS interviewers,
+                    array_agg(DISTINCT e.project_lead_id) AS interviewer_ids
+                FROM interview_evaluations AS e
+                JOIN users AS u ON u.id = e.project_lead_id
+                WHERE e.attempt_id = rec.id
+            ) AS ev
+            ON CONFLICT (user_id) DO UPDATE SET
+                attempt_id = EXCLUDED.attempt_id,
+                paper_id = EXCLUDED.paper_id,
+                status = EXCLUDED.status,
+                completion_reason = EXCLUDED.completion_reason,
+                started_at = EXCLUDED.started_at,
+                submitted_at = EXCLUDED.submitted_at,
+                overall_grade = EXCLUDED.overall_grade,
+                typing_stats = EXCLUDED.typing_stats,
+                attempts_count = EXCLUDED.attempts_count,
+                interviewers = EXCLUDED.interviewers,
+                interviewer_ids = EXCLUDED.interviewer_ids,
+                assignment_id = EXCLUDED.assignment_id,
+                assignment_paper_id = EXCLUDED.assignment_paper_id,
+                assignment_department_id = EXCLUDED.assignment_department_id,
+                assignment_test_level_id = EXCLUDED.assignment_test_level_id,
+                assignment_is_attempted = EXCLUDED.assignment_is_attempted,
+                assignment_date = EXCLUDED.assignment_date,
+                refreshed_at = EXCLUDED.refreshed_at;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION trg_refresh_candidate_latest_attempt()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM refresh_candidate_latest_attempt(OLD.user_id);
+            END IF;
+            IF TG_OP = 'INSERT'
+               OR (TG_OP = 'UPDATE' AND NEW.user_id IS DISTINCT FROM OLD.user_id) THEN
+                PERFORM refresh_candidate_latest_attempt(NEW.user_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        f"""
+        CREATE TRIGGER trg_interview_records_latest_attempt
+        AFTER INSERT OR DELETE OR UPDATE OF {RECORD_COLUMNS}
+        ON interview_records
+        FOR EACH ROW EXECUTE FUNCTION trg_refresh_candidate_latest_attempt()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_interview_evaluations_latest_attempt
+        AFTER INSERT OR DELETE OR UPDATE OF user_id, project_lead_id, attempt_id, status
+        ON interview_evaluations
+        FOR EACH ROW EXECUTE FUNCTION trg_refresh_candidate_latest_attempt()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paper_assignments_latest_attempt
+        AFTER INSERT OR DELETE
+            OR UPDATE OF user_id, paper_id, department_id, test_level_id,
+                         is_attempted, assigned_date
+        ON paper_assignments
+        FOR EACH ROW EXECUTE FUNCTION trg_refresh_candidate_latest_attempt()
+        """
+    )
+
+    # Backfill every candidate that has an attempt or an assignment
+    op.execute(
+        """
+        SELECT refresh_candidate_latest_attempt(user_id)
+        FROM (
+            SELECT user_id FROM interview_records
+            UNION
+            SELECT user_id FROM paper_assignments
+        ) AS candidates
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_paper_assignments_latest_attempt "
+        "ON paper_assignments"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_interview_evaluations_latest_attempt "
+        "ON interview_evaluations"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_interview_records_latest_attempt "
+        "ON interview_records"
+    )
+    op.execute("DROP FUNCTION IF EXISTS trg_refresh_candidate_latest_attempt()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_candidate_latest_attempt(integer)")
+    op.drop_index(
+        "ix_candidate_latest_attempts_interviewer_ids",
+        table_name="candidate_latest_attempts",
+        postgresql_using="gin",
+    )
+    op.drop_index(
+        "ix_candidate_latest_attempts_attempt_id",
+        table_name="candidate_latest_attempts",
+    )
+    op.drop_table("candidate_latest_attempts")
@@ -0,0 +1,55 @@
+"""add typing_stats to interview_records
+
+Revision ID: 64b08df6fab4
+Revises: 8ef30707a070
+Create Date: 2026-10-18 14:10:00.000000
+Created By: md-danish-ai
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "64b08df6fab4"
+down_revision: Union[str, Sequence[str], None] = "8ef30707a070"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "interview_records",
+        sa.Column(
+            "typing_stats", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+    )
+
+    # Backfill submitted attempts from the first JSON answer carrying stats
+    op.execute(
+        """
+        UPDATE interview_records AS r
+        SET typing_stats = s.stats
+        FROM (
+            SELECT DISTINCT ON (x.attempt_id)
+                x.attempt_id,
+                x.answer_text::jsonb -> 'stats' AS stats
+            FROM interview_responses AS x
+            WHERE x.answer_text IS JSON OBJECT
+              AND x.answer_text::jsonb ? 'stats'
+            ORDER BY x.attempt_id, x.id
+        ) AS s
+        WHERE s.attempt_id = r.id
+          AND r.status <> 'started'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("interview_records", "typing_stats")
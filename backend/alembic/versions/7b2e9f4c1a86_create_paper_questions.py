@@ -0,0 +1,56 @@
+"""create paper_questions reverse index
+
+Revision ID: 7b2e9f4c1a86
+Revises: d51e0c7a93b4
+Create Date: 2026-10-18 17:00:00.000000
+Created By: md-danish-ai
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e9f4c1a86"
+down_revision: Union[str, Sequence[str], None] = "d51e0c7a93b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "paper_questions",
+        sa.Column("paper_id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("paper_id", "question_id"),
+    )
+    op.create_index(
+        "ix_paper_questions_question_id",
+        "paper_questions",
+        ["question_id"],
+        unique=False,
+    )
+
+    # Backfill with the same rules as _extract_question_ids: every integer or
+    # digit-only string anywhere in the papers.question_id document.
+    op.execute(
+        r"""
+        INSERT INTO paper_questions (paper_id, question_id)
+        SELECT DISTINCT p.id, (v #>> '{}')::integer
+        FROM papers AS p,
+             jsonb_path_query(p.question_id, 'strict $.**') AS v
+        WHERE (jsonb_typeof(v) = 'number' AND v #>> '{}' ~ '^\d+$')
+           OR (jsonb_typeof(v) = 'string' AND v #>> '{}' ~ '^\s*\d+\s*$')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_paper_questions_question_id", table_name="paper_questions")
+    op.drop_table("paper_questions")
@@ -0,0 +1,139 @@
+"""create interview_responses table
+
+Revision ID: 8ef30707a070
+Revises: e4f490f8874c
+Create Date: 2026-10-18 10:05:00.000000
+Created By: md-danish-ai
+
+Moves saved answers out of the interview_records.responses JSONB array into
+one row per (attempt_id, question_id) so a save is a single-row upsert
+instead of a rewrite of the whole document. Existing arrays are backfilled in
+their original order before the column is dropped.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8ef30707a070"
+down_revision: Union[str, Sequence[str], None] = "e4f490f8874c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "interview_responses",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("attempt_id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("section_code", sa.String(length=100), nullable=False),
+        sa.Column("section_name", sa.String(length=255), nullable=False),
+        sa.Column("answer_text", sa.Text(), nullable=True),
+        sa.Column("is_attempted", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column(
+            "is_auto_saved", sa.Boolean(), server_default="false", nullable=False
+        ),
+        sa.Column("is_skipped", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("manual_marks", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column(
+            "saved_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["attempt_id"], ["interview_records.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["question_id"], ["questions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "attempt_id",
+            "question_id",
+            name="uq_interview_responses_attempt_question",
+        ),
+    )
+
+    # Backfill in array order so id order == the old JSON order. Entries whose
+    # question no longer exists were already ignored by grading and are skipped.
+    op.execute(
+        """
+        INSERT INTO interview_responses (
+            attempt_id, question_id, section_code, section_name, answer_text,
+            is_attempted, is_auto_saved, is_skipped, manual_marks, saved_at
+        )
+        SELECT
+            r.id,
+            (t.elem->>'question_id')::int,
+            COALESCE(NULLIF(t.elem->>'section_code', ''), 'GENERAL'),
+            COALESCE(NULLIF(t.elem->>'section_name', ''), 'General'),
+            t.elem->>'answer_text',
+            COALESCE((t.elem->>'is_attempted')::boolean, false),
+            COALESCE((t.elem->>'is_auto_saved')::boolean, false),
+            COALESCE((t.elem->>'is_skipped')::boolean, false),
+            NULLIF(t.elem->>'manual_marks', '')::numeric,
+            COALESCE(NULLIF(t.elem->>'saved_at', '')::timestamp, r.updated_at)
+        FROM interview_records AS r
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(r.responses) = 'array'
+                 THEN r.responses ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS t(elem, ord)
+        WHERE (t.elem->>'question_id') ~ '^[0-9]+$'
+          AND EXISTS (
+              SELECT 1 FROM questions AS q
+              WHERE q.id = (t.elem->>'question_id')::int
+          )
+        ORDER BY r.id, t.ord
+        ON CONFLICT (attempt_id, question_id) DO NOTHING
+        """
+    )
+
+    op.drop_column("interview_records", "responses")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "interview_records",
+        sa.Column(
+            "responses",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="[]",
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        """
+        UPDATE interview_records AS r
+        SET responses = agg.responses
+        FROM (
+            SELECT
+                attempt_id,
+                jsonb_agg(
+                    jsonb_build_object(
+                        'question_id', question_id,
+                        'section_code', section_code,
+                        'section_name', section_name,
+                        'answer_text', answer_text,
+                        'is_attempted', is_attempted,
+                        'is_auto_saved', is_auto_saved,
+                        'is_skipped', is_skipped,
+                        'manual_marks', manual_marks,
+                        'saved_at', to_char(saved_at, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+                    )
+                    ORDER BY id
+                ) AS responses
+            FROM interview_responses
+            GROUP BY attempt_id
+        ) AS agg
+        WHERE agg.attempt_id = r.id
+        """
+    )
+
+    op.drop_table("interview_responses")
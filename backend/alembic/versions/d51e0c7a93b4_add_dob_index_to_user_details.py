@@ -0,0 +1,35 @@
+"""add dob expression index to user_details
+
+Revision ID: d51e0c7a93b4
+Revises: 3c1d7a9e52f0
+Create Date: 2026-10-18 16:00:00.000000
+Created By: md-danish-ai
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d51e0c7a93b4"
+down_revision: Union[str, Sequence[str], None] = "3c1d7a9e52f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_user_details_dob",
+        "user_details",
+        [sa.text("(personal_details ->> 'dob')")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_details_dob", table_name="user_details")
@@ -0,0 +1,123 @@
+"""
+Password hashing on a dedicated thread pool.
+
+A bcrypt hash or check is ~250ms of CPU. Run on the blocking pool it holds
+one of its threads, and usually a DB session, for all of it, so a registration
+rush starves every other request of the worker. Each worker therefore hashes
+on its own PASSWORD_HASH_THREADS threads, started on first use and shut down
+with the app; ``stats()`` shows how deep its queue gets. bcrypt releases the
+GIL while it works, so the rest of the worker keeps running meanwhile.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.auth.utils import hash_password, verify_password
+from app.core.config import settings
+from app.core.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], *args: Any) -> tuple[float, T]:
+    # Runs on a hashing thread; the start time gives the queue wait
+    return time.monotonic(), func(*args)
+
+
+class PasswordHasher:
+    def __init__(self, threads: int, slow_wait_ms: int):
+        self.threads = threads
+        self.slow_wait_ms = slow_wait_ms
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.threads, thread_name_prefix="password-hash"
+                )
+            return self._pool
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> tuple[float, T]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), _timed_call, func, *args)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.threads <= 0:
+            return await run_blocking(func, *args)
+
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        enqueued_at = time.monotonic()
+        failed = False
+        try:
+            started_at, result = await self._submit(func, *args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._queued -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+        wait_ms = max(started_at - enqueued_at, 0.0) * 1000
+        with self._lock:
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        if wait_ms > self.slow_wait_ms:
+            logger.warning(
+                f"Password hasher saturated: hash waited {wait_ms:.1f}ms "
+                f"(threads={self.threads}, queued={self._queued})"
+            )
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threads": self.threads,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": (
+                    round(self._total_wait_ms / self._completed, 2)
+                    if self._completed
+                    else 0.0
+                ),
+                "max_wait_ms": round(self._max_wait_ms, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    threads=settings.PASSWORD_HASH_THREADS,
+    slow_wait_ms=settings.PASSWORD_HASH_SLOW_WAIT_MS,
+)
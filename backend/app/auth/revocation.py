@@ -0,0 +1,123 @@
+"""
+Deactivated accounts and revoked tokens, shared across workers through Redis.
+
+A JWT stays valid until it expires, so deactivating a user did not end their
+session. Writers record it here after their commit: ``deactivate`` and
+``reactivate`` maintain a set of inactive user ids, and ``revoke_tokens``
+stores the time before which a user's tokens are rejected. Authentication
+reads a user's state through a per-worker cache of AUTH_REVOCATION_TTL_SECONDS,
+so a change reaches every worker within that many seconds. Without Redis
+nothing is checked.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+INACTIVE_USERS_KEY = "auth:inactive_users"
+REVOKED_BEFORE_KEY = "auth:revoked_before"
+
+
+@dataclass(frozen=True)
+class AuthState:
+    inactive: bool = False
+    # Tokens issued before this unix time are rejected
+    revoked_before: int = 0
+
+
+_local: dict[int, tuple[float, AuthState]] = {}
+_local_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return settings.AUTH_REVOCATION_ENABLED and redis_client is not None
+
+
+def _remember(user_id: int, state: AuthState) -> None:
+    with _local_lock:
+        _local.pop(user_id, None)
+        _local[user_id] = (
+            time.monotonic() + settings.AUTH_REVOCATION_TTL_SECONDS,
+            state,
+        )
+        # Oldest first (insertion order)
+        while len(_local) > settings.AUTH_REVOCATION_LOCAL_MAXSIZE:
+            del _local[next(iter(_local))]
+
+
+def _forget(user_ids: Iterable[int]) -> None:
+    with _local_lock:
+        for user_id in user_ids:
+            _local.pop(user_id, None)
+
+
+def cached_state(user_id: int) -> Optional[AuthState]:
+    """The user's state if this worker looked it up recently, without any IO."""
+    entry = _local.get(user_id)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def get_state(user_id: int) -> AuthState:
+    """The user's state, from the local cache or Redis (blocking)."""
+    state = cached_state(user_id)
+    if state is not None:
+        return state
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.sismember(INACTIVE_USERS_KEY, user_id)
+        pipe.hget(REVOKED_BEFORE_KEY, user_id)
+        inactive, revoked_before = pipe.execute()
+        state = AuthState(bool(inactive), int(revoked_before or 0))
+    except Exception as e:
+        # Fail open: Redis trouble must not log everybody out
+        logger.warning(f"Auth revocation lookup failed for user {user_id}: {e}")
+        state = AuthState()
+    _remember(user_id, state)
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Writers (call after the DB change is committed)
+# ---------------------------------------------------------------------------
+
+
+def deactivate(user_ids: Iterable[int]) -> None:
+    user_ids = list(user_ids)
+    if not user_ids or redis_client is None:
+        return
+    _forget(user_ids)
+    try:
+        redis_client.sadd(INACTIVE_USERS_KEY, *user_ids)
+    except Exception as e:
+        logger.error(f"Could not mark users {user_ids} inactive: {e}")
+
+
+def reactivate(user_ids: Iterable[int]) -> None:
+    user_ids = list(user_ids)
+    if not user_ids or redis_client is None:
+        return
+    _forget(user_ids)
+    try:
+        redis_client.srem(INACTIVE_USERS_KEY, *user_ids)
+    except Exception as e:
+        logger.error(f"Could not mark users {user_ids} active: {e}")
+
+
+def revoke_tokens(user_id: int) -> None:
+    """Reject every token issued to the user before now."""
+    if redis_client is None:
+        return
+    _forget([user_id])
+    try:
+        redis_client.hset(REVOKED_BEFORE_KEY, user_id, int(time.time()))
+    except Exception as e:
+        logger.error(f"Could not revoke tokens of user {user_id}: {e}")
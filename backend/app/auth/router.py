@@ -16,8 +16,10 @@ from app.auth.schemas import (
     CreateAdminSchema,
     ChangePasswordSchema,
 )
+from app.core.executor import run_blocking
 from app.utils.status_codes import StatusCode, ResponseMessage, api_response
 from app.utils.dependencies import require_roles, authenticate_user
+from app.utils.enums import TotalCountMode
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -40,8 +42,11 @@ async def get_users(
     exclude_software: bool = Query(
         False, description="Exclude Software department users"
     ),
+    cursor: str = Query(None, description="next_cursor of the previous page"),
+    total: TotalCountMode = Query(TotalCountMode.EXACT),
 ):
-    data = get_users_by_role(
+    data = await run_blocking(
+        get_users_by_role,
         role,
         page=page,
         limit=limit,
@@ -52,6 +57,8 @@ async def get_users(
         test_level_id=test_level_id,
         status=status,
         exclude_software=exclude_software,
+        cursor=cursor,
+        total=total,
     )
     return api_response(
         StatusCode.OK,
@@ -63,7 +70,7 @@ async def get_users(
 
 @router.get("/me")
 async def get_me(user_id: int = Depends(authenticate_user)):
-    user = get_user_by_id(user_id)
+    user = await run_blocking(get_user_by_id, user_id)
     if not user:
         return api_response(StatusCode.NOT_FOUND, ResponseMessage.NOT_FOUND)
     return api_response(StatusCode.OK, ResponseMessage.FETCHED, data=user)
@@ -71,7 +78,7 @@ async def get_me(user_id: int = Depends(authenticate_user)):
 
 @router.post("/sign-up-user")
 async def signup(data: SignUpSchema):
-    result = signup_user(data)
+    result = await signup_user(data)
 
     if "error" in result:
         return api_response(
@@ -83,7 +90,7 @@ async def signup(data: SignUpSchema):
 
 @router.post("/sign-in-user")
 async def signin(data: SignInSchema):
-    result = signin_user(data)
+    result = await signin_user(data)
 
     if "error" in result:
         return api_response(
@@ -97,7 +104,7 @@ async def signin(data: SignInSchema):
 
 @router.post("/create-admin-account")
 async def create_admin_user(data: CreateAdminSchema):
-    result = create_admin(data)
+    result = await create_admin(data)
 
     if "error" in result:
         return api_response(
@@ -111,7 +118,7 @@ async def create_admin_user(data: CreateAdminSchema):
     "/create-project-lead-account", dependencies=[Depends(require_roles(["admin"]))]
 )
 async def create_project_lead_user(data: CreateAdminSchema):
-    result = create_project_lead(data)
+    result = await create_project_lead(data)
 
     if "error" in result:
         return api_response(
@@ -128,7 +135,7 @@ async def create_project_lead_user(data: CreateAdminSchema):
 async def toggle_status(user_id: int, payload: dict):
     # payload should be {"is_active": true/false}
     is_active = payload.get("is_active")
-    data = toggle_user_status(user_id, is_active)
+    data = await run_blocking(toggle_user_status, user_id, is_active)
     return api_response(StatusCode.OK, ResponseMessage.UPDATED, data=data)
 
 
@@ -140,7 +147,7 @@ async def update_basic_info(user_id: int, data: SignUpSchema):
     Update basic user info (username, mobile, email, testlevel, department_id).
     We reuse SignUpSchema fields for this.
     """
-    result = update_user_basic_info(user_id, data)
+    result = await update_user_basic_info(user_id, data)
     return api_response(StatusCode.OK, ResponseMessage.UPDATED, data=result)
 
 
@@ -153,7 +160,7 @@ async def change_pwd(
     """
     Allow Admin and Project Lead to change their own password.
     """
-    result = change_password(user_id, data)
+    result = await change_password(user_id, data)
     if "error" in result:
         return api_response(
             StatusCode.BAD_REQUEST, ResponseMessage.BAD_REQUEST, errors=result["error"]
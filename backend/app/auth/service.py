@@ -1,28 +1,42 @@
 # app/auth/service.py
 
 from app.database.db import SessionLocal
-from app.auth.utils import hash_password, verify_password, generate_jwt
+from typing import Optional
+
+from app.auth import revocation
+from app.auth.hasher import password_hasher
+from app.auth.utils import password_needs_rehash, generate_jwt
+from app.core.executor import run_blocking
 from fastapi import HTTPException
 from app.utils.status_codes import StatusCode
 from app.users.models import User
-from app.interview_attempts.models import InterviewRecord
+from app.interview_attempts.models import CandidateLatestAttempt
 from app.user_details.models import UserDetail
 from app.paper_assignments.repository import assign_best_paper
 from datetime import date as dt_date, datetime, time
-from sqlalchemy import func, or_
+from sqlalchemy import or_
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.orm import aliased
-from app.utils.enums import ProcessStatus, RoleType, InterviewStatus
-from app.paper_assignments.models import PaperAssignment
+from app.utils.enums import ProcessStatus, RoleType, InterviewStatus, TotalCountMode
 from app.papers.models import Paper
 from app.departments.models import Department
 from app.classifications.models import Classification as Cls
-from app.utils.pagination import create_paginated_response, PaginationParams
+from app.utils.pagination import (
+    create_paginated_response,
+    paginate_query,
+    PaginationParams,
+)
 from app.utils.expiration import run_auto_expiration
 from app.utils.department_helpers import is_software_department, exclude_software_users
 
 
-def signup_user(data):
+async def signup_user(data):
+    # Hashed before a session is opened, so no connection waits on bcrypt
+    hashed_password = await password_hasher.hash(data.mobile)
+    return await run_blocking(_create_candidate, data, hashed_password)
+
+
+def _create_candidate(data, hashed_password: str):
     db_session = SessionLocal()
     try:
         # Check if Software department
@@ -42,8 +56,6 @@ def signup_user(data):
                 detail="This mobile number is already registered.",
             )
 
-        hashed_password = hash_password(data.mobile)
-
         new_user = User(
             username=data.name,
             mobile=data.mobile,
@@ -97,7 +109,25 @@ def signup_user(data):
         db_session.close()
 
 
-def signin_user(data):
+async def signin_user(data):
+    user = await run_blocking(_get_signin_user, data)
+
+    # 4. Password Check
+    if not await password_hasher.verify(data.password, user["password"]):
+        raise HTTPException(
+            status_code=StatusCode.UNAUTHORIZED,
+            detail="The password you entered is incorrect.",
+        )
+
+    # Hashes made with another work factor are replaced while the password is known
+    new_password_hash = None
+    if password_needs_rehash(user["password"]):
+        new_password_hash = await password_hasher.hash(data.password)
+
+    return await run_blocking(_complete_signin, user["id"], new_password_hash)
+
+
+def _get_signin_user(data) -> dict:
     db_session = SessionLocal()
     try:
         if not data.mobile and not data.email:
@@ -133,7 +163,7 @@ def signin_user(data):
 
         # 3. Auto-expiration Check (Before checking if active)
         if user.role == RoleType.USER.value:
-            run_auto_expiration(db_session)
+            run_auto_expiration(db_session, user_ids=[user.id])
             db_session.refresh(user)
 
         if not user.is_active:
@@ -142,12 +172,31 @@ def signin_user(data):
                 detail="Your account is currently inactive. Please contact the administrator.",
             )
 
-        # 4. Password Check
-        if not verify_password(data.password, user.password):
+        return {"id": user.id, "password": user.password}
+
+    finally:
+        db_session.close()
+
+
+def _complete_signin(user_id: int, new_password_hash: Optional[str]):
+    db_session = SessionLocal()
+    try:
+        # Re-read under a row lock: an admin may have deactivated the account
+        # while the password was being checked, and a deactivation committed
+        # after this point records its mark after our reactivate below
+        user = (
+            db_session.query(User).filter(User.id == user_id).with_for_update().first()
+        )
+        if user is None or not user.is_active:
             raise HTTPException(
-                status_code=StatusCode.UNAUTHORIZED,
-                detail="The password you entered is incorrect.",
+                status_code=StatusCode.FORBIDDEN,
+                detail="Your account is currently inactive. Please contact the administrator.",
             )
+        if new_password_hash:
+            user.password = new_password_hash
+        # Active per the database: drop a mark a failed Redis write left behind
+        revocation.reactivate([user.id])
+        db_session.commit()
 
         # Role is now auto-detected from the database record
 
@@ -185,7 +234,12 @@ def signin_user(data):
         db_session.close()
 
 
-def _create_staff(data, role):
+async def _create_staff(data, role):
+    hashed_password = await password_hasher.hash(data.mobile)
+    return await run_blocking(_insert_staff, data, role, hashed_password)
+
+
+def _insert_staff(data, role, hashed_password: str):
     db_session = SessionLocal()
     try:
         existing_user = (
@@ -197,8 +251,6 @@ def _create_staff(data, role):
                 detail="This mobile number is already registered.",
             )
 
-        hashed_password = hash_password(data.mobile)
-
         new_user = User(
             username=data.name,
             mobile=data.mobile,
@@ -232,12 +284,12 @@ def _create_staff(data, role):
         db_session.close()
 
 
-def create_admin(data):
-    return _create_staff(data, "admin")
+async def create_admin(data):
+    return await _create_staff(data, "admin")
 
 
-def create_project_lead(data):
-    return _create_staff(data, "project_lead")
+async def create_project_lead(data):
+    return await _create_staff(data, "project_lead")
 
 
 def get_user_by_id(user_id):
@@ -327,6 +379,8 @@ def get_users_by_role(
     test_level_id: int = None,
     status: str = None,
     exclude_software: bool = False,
+    cursor: str = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
 ):
     db_session = SessionLocal()
     try:
@@ -349,79 +403,41 @@ def get_users_by_role(
             except (ValueError, TypeError, IndexError):
                 return None
 
-        # 1. AUTO-EXPIRATION LOGIC (Bulk update for expired tests)
-        run_auto_expiration(db_session)
-
-        # 2. DATA RETRIEVAL
+        # 1. DATA RETRIEVAL (auto-expiration runs on a schedule, not per request)
         range_from = safe_parse_date(date_from)
         range_to = safe_parse_date(date_to)
 
         UserDept = aliased(Department)
 
-        # Latest assignment per user via row_number()
-        assignment_subq = db_session.query(
-            PaperAssignment.user_id,
-            PaperAssignment.paper_id,
-            PaperAssignment.department_id,
-            PaperAssignment.test_level_id,
-            PaperAssignment.is_attempted,
-            PaperAssignment.assigned_date,
-            func.row_number()
-            .over(
-                partition_by=PaperAssignment.user_id,
-                order_by=PaperAssignment.id.desc(),
-            )
-            .label("rn"),
-        ).subquery()
-
-        # Latest attempt per user via row_number()
-        attempt_subq = db_session.query(
-            InterviewRecord.user_id,
-            InterviewRecord.id,
-            InterviewRecord.status,
-            InterviewRecord.started_at,
-            InterviewRecord.submitted_at,
-            func.row_number()
-            .over(
-                partition_by=InterviewRecord.user_id,
-                order_by=InterviewRecord.id.desc(),
-            )
-            .label("rn"),
-        ).subquery()
+        # Latest assignment and attempt per user, kept current by triggers
+        latest = CandidateLatestAttempt
 
         results_query = (
             db_session.query(
                 User,
-                assignment_subq.c.paper_id.label("asgn_paper_id"),
-                assignment_subq.c.department_id.label("asgn_dept_id"),
-                assignment_subq.c.test_level_id.label("asgn_level_id"),
-                assignment_subq.c.is_attempted.label("asgn_is_attempted"),
-                assignment_subq.c.assigned_date.label("asgn_date"),
+                latest.assignment_paper_id.label("asgn_paper_id"),
+                latest.assignment_department_id.label("asgn_dept_id"),
+                latest.assignment_test_level_id.label("asgn_level_id"),
+                latest.assignment_is_attempted.label("asgn_is_attempted"),
+                latest.assignment_date.label("asgn_date"),
                 Paper.paper_name,
                 Department.name.label("asgn_dept_name"),
                 Cls.name.label("level_name"),
                 UserDept.name.label("user_dept_name"),
-                attempt_subq.c.id.label("attempt_id"),
-                attempt_subq.c.status.label("attempt_status"),
-                attempt_subq.c.started_at.label("attempt_started_at"),
-                attempt_subq.c.submitted_at.label("attempt_submitted_at"),
+                latest.attempt_id,
+                latest.status.label("attempt_status"),
+                latest.started_at.label("attempt_started_at"),
+                latest.submitted_at.label("attempt_submitted_at"),
                 UserDetail.is_submitted,
                 UserDetail.is_interview_submitted,
                 UserDetail.is_reinterview,
                 UserDetail.reinterview_date,
             )
-            .outerjoin(
-                assignment_subq,
-                (User.id == assignment_subq.c.user_id) & (assignment_subq.c.rn == 1),
-            )
-            .outerjoin(Paper, assignment_subq.c.paper_id == Paper.id)
-            .outerjoin(Department, assignment_subq.c.department_id == Department.id)
+            .outerjoin(latest, User.id == latest.user_id)
+            .outerjoin(Paper, latest.assignment_paper_id == Paper.id)
+            .outerjoin(Department, latest.assignment_department_id == Department.id)
             .outerjoin(UserDept, User.department_id == UserDept.id)
-            .outerjoin(Cls, assignment_subq.c.test_level_id == Cls.id)
-            .outerjoin(
-                attempt_subq,
-                (User.id == attempt_subq.c.user_id) & (attempt_subq.c.rn == 1),
-            )
+            .outerjoin(Cls, latest.assignment_test_level_id == Cls.id)
             .outerjoin(UserDetail, User.id == UserDetail.user_id)
             .filter(User.role == role)
         )
@@ -435,12 +451,12 @@ def get_users_by_role(
             results_query = results_query.filter(
                 or_(
                     User.department_id == department_id,
-                    assignment_subq.c.department_id == department_id,
+                    latest.assignment_department_id == department_id,
                 )
             )
         if test_level_id:
             results_query = results_query.filter(
-                assignment_subq.c.test_level_id == test_level_id
+                latest.assignment_test_level_id == test_level_id
             )
         if search:
             pattern = f"%{search}%"
@@ -452,7 +468,7 @@ def get_users_by_role(
                 )
             )
 
-        # 3. DATE FILTERS (Strictly New Registrations or Re-interviews)
+        # 2. DATE FILTERS (Strictly New Registrations or Re-interviews)
         if range_from:
             start_date_obj = range_from
             end_date_obj = range_to if range_to else range_from
@@ -468,24 +484,27 @@ def get_users_by_role(
                 )
             )
 
-        # 4. STATUS FILTER
+        # 3. STATUS FILTER
         if status and status != "all":
             if status == "pending":
                 results_query = results_query.filter(
                     or_(
                         User.process_status == ProcessStatus.PENDING.value,
-                        assignment_subq.c.rn.is_(None),
+                        latest.assignment_id.is_(None),
                     )
                 )
             else:
                 results_query = results_query.filter(User.process_status == status)
 
-        total_records = results_query.count()
-        results = (
-            results_query.order_by(User.id.desc())
-            .offset((page - 1) * limit)
-            .limit(limit)
-            .all()
+        results, total_records, next_cursor = paginate_query(
+            results_query,
+            User.id,
+            User.id,
+            lambda row: (row.User.id, row.User.id),
+            limit=limit,
+            offset=(page - 1) * limit,
+            cursor=cursor,
+            total=total,
         )
 
         data = [
@@ -555,9 +574,12 @@ def get_users_by_role(
         return create_paginated_response(
             data=data,
             total_records=total_records,
-            params=PaginationParams(page=page, limit=limit),
+            params=PaginationParams(page=page, limit=limit, cursor=cursor, total=total),
+            next_cursor=next_cursor,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_users_by_role: {str(e)}")
         raise HTTPException(
@@ -589,6 +611,10 @@ def toggle_user_status(user_id: int, is_active: bool = None):
         user.updated_at = datetime.now()
 
         db_session.commit()
+        if user.is_active:
+            revocation.reactivate([user.id])
+        else:
+            revocation.deactivate([user.id])
         return {"id": user.id, "is_active": user.is_active}
     except HTTPException:
         raise
@@ -602,8 +628,17 @@ def toggle_user_status(user_id: int, is_active: bool = None):
         db_session.close()
 
 
-def update_user_basic_info(user_id: int, data):
+async def update_user_basic_info(user_id: int, data):
+    # The password follows the mobile number, so hash it off the blocking pool
+    mobile_hash = None
+    if data.mobile is not None:
+        mobile_hash = await password_hasher.hash(data.mobile)
+    return await run_blocking(_update_user_basic_info, user_id, data, mobile_hash)
+
+
+def _update_user_basic_info(user_id: int, data, mobile_hash: str | None):
     db_session = SessionLocal()
+    password_reset = False
     try:
         user = db_session.query(User).filter(User.id == user_id).first()
         if not user:
@@ -628,7 +663,8 @@ def update_user_basic_info(user_id: int, data):
                 user.mobile = data.mobile
 
                 # Also update the user's password to match the new mobile number
-                user.password = hash_password(data.mobile)
+                user.password = mobile_hash
+                password_reset = True
                 # Also update UserDetail primaryMobile if it exists
                 user_detail = (
                     db_session.query(UserDetail)
@@ -667,6 +703,9 @@ def update_user_basic_info(user_id: int, data):
             user.department_id = data.department_id
 
         db_session.commit()
+        if password_reset:
+            # The password followed the mobile number: end the old sessions
+            revocation.revoke_tokens(user.id)
         db_session.refresh(user)
         return {"message": "User basic info updated successfully", "user_id": user.id}
     except HTTPException:
@@ -681,7 +720,19 @@ def update_user_basic_info(user_id: int, data):
         db_session.close()
 
 
-def change_password(user_id: int, data):
+async def change_password(user_id: int, data):
+    current_hash = await run_blocking(_get_password_hash, user_id)
+    if not await password_hasher.verify(data.current_password, current_hash):
+        raise HTTPException(
+            status_code=StatusCode.BAD_REQUEST,
+            detail="Incorrect current password.",
+        )
+
+    new_password_hash = await password_hasher.hash(data.new_password)
+    return await run_blocking(_set_password, user_id, new_password_hash)
+
+
+def _get_password_hash(user_id: int) -> str:
     db_session = SessionLocal()
     try:
         user = db_session.query(User).filter(User.id == user_id).first()
@@ -690,14 +741,22 @@ def change_password(user_id: int, data):
                 status_code=StatusCode.NOT_FOUND,
                 detail="User not found.",
             )
+        return user.password
+    finally:
+        db_session.close()
+
 
-        if not verify_password(data.current_password, user.password):
+def _set_password(user_id: int, hashed_password: str):
+    db_session = SessionLocal()
+    try:
+        user = db_session.query(User).filter(User.id == user_id).first()
+        if not user:
             raise HTTPException(
-                status_code=StatusCode.BAD_REQUEST,
-                detail="Incorrect current password.",
+                status_code=StatusCode.NOT_FOUND,
+                detail="User not found.",
             )
 
-        user.password = hash_password(data.new_password)
+        user.password = hashed_password
         db_session.commit()
         return {"message": "Password updated successfully"}
     except HTTPException:
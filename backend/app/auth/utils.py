@@ -1,11 +1,13 @@
 import bcrypt
 import jwt
+from typing import Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    rounds = settings.BCRYPT_ROUNDS if rounds is None else rounds
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -15,10 +17,19 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with a work factor other than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
 def generate_jwt(user: dict):
     payload = {
         "user_id": user["id"],
         "role": user["role"],
+        "iat": datetime.utcnow(),
         "exp": datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRE_HOURS),
     }
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
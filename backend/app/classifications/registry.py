@@ -0,0 +1,99 @@
+"""
+In-memory registry of classifications.
+
+Classifications are a small, rarely edited table that hot paths look up by
+``(type, code)`` or id: resolving the section of every question while
+compiling answer keys, and ordering subject results by paper. ``current()``
+returns an immutable, indexed snapshot of the whole table so each of those
+lookups is a dictionary hit instead of a query.
+
+The rows are cached under the repository's ``CACHE_TAG``. Every write
+(create, update including renames cascaded by ``_cascade_code_update``, and
+reorder) already invalidates that tag, which refreshes the registry in every
+worker; the indexes are only rebuilt when the cached rows change.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from app.classifications.models import Classification
+from app.classifications.repository import CACHE_TAG
+from app.core import cache
+from app.database.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_KEY = "classifications:registry"
+
+
+@dataclass(frozen=True)
+class ClassificationEntry:
+    id: int
+    type: str
+    code: str
+    name: str
+    is_active: bool
+
+
+class ClassificationRegistry:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        entries = [ClassificationEntry(**row) for row in rows]
+        self._by_id = {entry.id: entry for entry in entries}
+        self._by_code = {(entry.type, entry.code): entry for entry in entries}
+
+    def get(self, classification_id: int) -> Optional[ClassificationEntry]:
+        return self._by_id.get(classification_id)
+
+    def find(self, type_: str, code: str) -> Optional[ClassificationEntry]:
+        return self._by_code.get((type_, code))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+_registry: Optional[ClassificationRegistry] = None
+
+
+def _load_rows() -> list[dict]:
+    db_session = SessionLocal()
+    try:
+        return [
+            {
+                "id": row.id,
+                "type": row.type,
+                "code": row.code,
+                "name": row.name,
+                "is_active": row.is_active,
+            }
+            for row in db_session.query(
+                Classification.id,
+                Classification.type,
+                Classification.code,
+                Classification.name,
+                Classification.is_active,
+            ).all()
+        ]
+    finally:
+        db_session.close()
+
+
+def current() -> ClassificationRegistry:
+    """The registry as of the latest classification write."""
+    global _registry
+    rows = cache.get_or_load(REGISTRY_KEY, _load_rows, tags=[CACHE_TAG], ttl=None)
+    registry = _registry
+    # In-process cache hits return the same list, so the indexes are reused
+    if registry is None or registry.rows is not rows:
+        registry = ClassificationRegistry(rows)
+        _registry = registry
+    return registry
+
+
+def warm() -> None:
+    """Load the registry at startup; a failure only delays it to first use."""
+    try:
+        logger.info(f"Classification registry: {len(current())} entries loaded")
+    except Exception as e:
+        logger.warning(f"Classification registry: warm-up failed: {e}")
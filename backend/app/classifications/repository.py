@@ -1,10 +1,14 @@
 # app/classifications/repository.py
 
+from app.core import cache
 from app.database.db import SessionLocal
 from app.classifications.models import Classification
 from app.questions.models import Question
 from app.papers.models import Paper
 
+# Cache tag of every classification read; bumped on any write
+CACHE_TAG = "classifications"
+
 
 def get_all(
     type_filter: str = None,
@@ -14,6 +18,24 @@ def get_all(
     order: str = "asc",
     limit: int = 10,
     offset: int = 0,
+):
+    args = (type_filter, is_active, search, sort_by, order, limit, offset)
+    data, total_records = cache.get_or_load(
+        cache.make_key("classifications:list", *args),
+        lambda: _get_all(*args),
+        tags=[CACHE_TAG],
+    )
+    return data, total_records
+
+
+def _get_all(
+    type_filter: str = None,
+    is_active: bool = None,
+    search: str = None,
+    sort_by: str = "sort_order",
+    order: str = "asc",
+    limit: int = 10,
+    offset: int = 0,
 ):
     db_session = SessionLocal()
     try:
@@ -59,6 +81,14 @@ def get_all(
 
 
 def get_by_id(classification_id: int):
+    return cache.get_or_load(
+        f"classifications:{classification_id}",
+        lambda: _get_by_id(classification_id),
+        tags=[CACHE_TAG],
+    )
+
+
+def _get_by_id(classification_id: int):
     db_session = SessionLocal()
     try:
         classification = (
@@ -84,6 +114,14 @@ def get_by_id(classification_id: int):
 
 
 def get_by_code_and_type(code: str, type_: str):
+    return cache.get_or_load(
+        f"classifications:{type_}:{code.upper()}",
+        lambda: _get_by_code_and_type(code, type_),
+        tags=[CACHE_TAG],
+    )
+
+
+def _get_by_code_and_type(code: str, type_: str):
     db_session = SessionLocal()
     try:
         classification = (
@@ -109,6 +147,14 @@ def get_by_code_and_type(code: str, type_: str):
 
 
 def get_by_code(code: str):
+    return cache.get_or_load(
+        f"classifications:code:{code.upper()}",
+        lambda: _get_by_code(code),
+        tags=[CACHE_TAG],
+    )
+
+
+def _get_by_code(code: str):
     db_session = SessionLocal()
     try:
         classification = (
@@ -161,6 +207,7 @@ def update(classification_id: int, data):
         # ----------------------------------------------------
 
         db_session.commit()
+        cache.invalidate_tags(CACHE_TAG)
         db_session.refresh(classification)
         return {
             "id": classification.id,
@@ -335,6 +382,7 @@ def create(data, code: str):
         )
         db_session.add(new_classification)
         db_session.commit()
+        cache.invalidate_tags(CACHE_TAG)
         db_session.refresh(new_classification)
         return {
             "id": new_classification.id,
@@ -362,6 +410,7 @@ def reorder(items: list):
                 Classification.id == item["id"]
             ).update({"sort_order": item["sort_order"]})
         db_session.commit()
+        cache.invalidate_tags(CACHE_TAG)
         return True
     except Exception as exception:
         db_session.rollback()
@@ -0,0 +1,94 @@
+"""
+Per-key background jobs run on the API worker's loop.
+
+A job (e.g. regrading one paper, backfilling one rule) runs its blocking body
+on the blocking pool and reports progress to admins as notification events
+of its ``event_type``. At most one job per key runs in a worker: asking again
+while it runs folds the request into it, and the body runs once more after
+the current pass, against whatever changed meanwhile.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Callable, Optional
+
+from app.core.executor import run_blocking
+from app.core.realtime import realtime_manager
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[dict], None]
+
+
+class BackgroundJobs:
+    """
+    ``run(key, job_id, on_progress)`` is the blocking job body; it returns
+    the final progress event, or None when there was nothing to do.
+    ``summarize`` turns that event into the log line of a finished pass.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        event_type: str,
+        key_field: str,
+        run: Callable[[int, str, ProgressCallback], Optional[dict]],
+        summarize: Callable[[dict], str],
+    ):
+        self.name = name
+        self.event_type = event_type
+        self.key_field = key_field
+        self.run = run
+        self.summarize = summarize
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._rerun_requested: set[int] = set()
+
+    @property
+    def _label(self) -> str:
+        return self.key_field.removesuffix("_id")
+
+    async def _run_job(self, key: int, job_id: str) -> None:
+        def publish(event: dict) -> None:
+            realtime_manager.publish_sync(event, user_id="admin")
+
+        try:
+            while True:
+                self._rerun_requested.discard(key)
+                result = await run_blocking(self.run, key, job_id, publish)
+                if result is not None:
+                    logger.info(
+                        f"{self.name} {job_id}: {self._label} {key} "
+                        f"{self.summarize(result)}"
+                    )
+                if key not in self._rerun_requested:
+                    break
+        except Exception as e:
+            logger.error(f"{self.name} {job_id}: {self._label} {key} failed: {e}")
+            await realtime_manager.publish(
+                {
+                    "type": self.event_type,
+                    "job_id": job_id,
+                    self.key_field: key,
+                    "status": "failed",
+                    "error": str(e),
+                },
+                user_id="admin",
+            )
+        finally:
+            self._tasks.pop(key, None)
+
+    def schedule(self, key: int) -> dict:
+        """Start the key's job on the running loop, or fold into the running one."""
+        task = self._tasks.get(key)
+        if task and not task.done():
+            self._rerun_requested.add(key)
+            return {self.key_field: key, "job_id": task.get_name(), "status": "queued"}
+
+        job_id = uuid.uuid4().hex
+        self._tasks[key] = asyncio.create_task(self._run_job(key, job_id), name=job_id)
+        return {self.key_field: key, "job_id": job_id, "status": "started"}
+
+    async def request(self, key: int) -> dict:
+        """``schedule`` as a coroutine, for FastAPI BackgroundTasks."""
+        return self.schedule(key)
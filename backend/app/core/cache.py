@@ -0,0 +1,356 @@
+"""
+Two-tier read-through cache: a per-worker LRU in front of Redis.
+
+``get_or_load(key, loader, tags=...)`` returns the cached value or runs
+``loader`` once to fill both tiers. Every entry depends on a version counter
+for its own key and one per tag (e.g. "classifications"). ``invalidate`` and
+``invalidate_tags`` bump those counters, which makes every worker's copy stale
+at once; an in-process hit costs one MGET of the counters instead of fetching
+and re-parsing the payload. Without Redis, in-process entries expire after
+CACHE_LOCAL_TTL_SECONDS so other workers converge after an edit.
+
+A miss is rebuilt by one caller only: threads of a worker queue on a
+per-key lock and other workers wait on a Redis lock for the value to appear
+(up to CACHE_LOCK_WAIT_MS, after which they load it themselves).
+
+Cached values are shared between callers and must be treated as read-only.
+Values read back from Redis are plain JSON (datetimes become ISO strings).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+import orjson
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KEY_PREFIX = "cache"
+# Bump when the shape of a cached payload changes
+SCHEMA_VERSION = 1
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _data_key(key: str) -> str:
+    return f"{KEY_PREFIX}:v{SCHEMA_VERSION}:{key}"
+
+
+def _version_key(dependency: str) -> str:
+    return f"{KEY_PREFIX}:version:{dependency}"
+
+
+def _lock_key(key: str) -> str:
+    return f"{KEY_PREFIX}:lock:{key}"
+
+
+def _dependencies(key: str, tags: Iterable[str]) -> list[str]:
+    return [f"key:{key}", *(f"tag:{tag}" for tag in tags)]
+
+
+def make_key(prefix: str, *parts: Any) -> str:
+    """Stable key for a call's arguments (e.g. list filters), bounded in length."""
+    digest = hashlib.sha1(orjson.dumps(parts, default=str)).hexdigest()[:16]
+    return f"{prefix}:{digest}"
+
+
+# ---------------------------------------------------------------------------
+# In-process tier
+# ---------------------------------------------------------------------------
+
+
+class _LocalLRU:
+    """key -> (expires_at, versions, tags, value), least recently used first."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: tuple) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def drop_tagged(self, tags: set[str]) -> None:
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if tags & e[2]]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_local = _LocalLRU(settings.CACHE_LOCAL_MAXSIZE)
+
+# Striped per-key locks so one thread per worker rebuilds a given key
+_key_locks = [threading.Lock() for _ in range(64)]
+
+_stats_lock = threading.Lock()
+_stats = {
+    "local_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "loads": 0,
+    "lock_waits": 0,
+    "invalidations": 0,
+    "errors": 0,
+}
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def stats() -> dict:
+    with _stats_lock:
+        result = dict(_stats)
+    lookups = result["local_hits"] + result["redis_hits"] + result["misses"]
+    result["hit_ratio"] = (
+        round((result["local_hits"] + result["redis_hits"]) / lookups, 4)
+        if lookups
+        else 0.0
+    )
+    result["local_entries"] = len(_local)
+    return result
+
+
+def clear_local() -> None:
+    _local.clear()
+
+
+# ---------------------------------------------------------------------------
+# Redis tier
+# ---------------------------------------------------------------------------
+
+
+def _current_versions(dependencies: list[str]) -> Optional[tuple]:
+    """Versions of an entry's key and tags, or None when Redis is unavailable."""
+    if redis_client is None:
+        return None
+    try:
+        values = redis_client.mget([_version_key(d) for d in dependencies])
+    except Exception as e:
+        _count("errors")
+        logger.error(f"Cache: version read failed: {e}")
+        return None
+    return tuple(value or "0" for value in values)
+
+
+def _read_redis(key: str, versions: tuple):
+    """(found, value) for the Redis copy stored under ``versions``."""
+    try:
+        raw = redis_client.get(_data_key(key))
+    except Exception as e:
+        _count("errors")
+        logger.error(f"Cache: read failed for {key}: {e}")
+        return False, None
+    if not raw:
+        return False, None
+    payload = orjson.loads(raw)
+    if tuple(payload["v"]) != versions:
+        return False, None
+    return True, payload["d"]
+
+
+def _write_redis(key: str, value: Any, versions: tuple, ttl: Optional[int]) -> None:
+    try:
+        redis_client.set(
+            _data_key(key),
+            orjson.dumps({"v": versions, "d": value}, default=str),
+            ex=ttl,
+        )
+    except Exception as e:
+        _count("errors")
+        logger.error(f"Cache: write failed for {key}: {e}")
+
+
+def _acquire_lock(key: str) -> Optional[str]:
+    """Token of the cross-worker rebuild lock, or None if another worker holds it."""
+    token = uuid.uuid4().hex
+    try:
+        if redis_client.set(
+            _lock_key(key), token, nx=True, px=settings.CACHE_LOCK_TTL_MS
+        ):
+            return token
+        return None
+    except Exception as e:
+        _count("errors")
+        logger.error(f"Cache: lock failed for {key}: {e}")
+        return token  # rebuild without the lock
+
+
+def _release_lock(key: str, token: str) -> None:
+    try:
+        redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token)
+    except Exception as e:
+        logger.error(f"Cache: unlock failed for {key}: {e}")
+
+
+def _wait_for_value(key: str, versions: tuple):
+    """Poll for the value another worker is rebuilding; (found, value)."""
+    _count("lock_waits")
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_MS / 1000
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        found, value = _read_redis(key, versions)
+        if found:
+            return True, value
+        try:
+            if not redis_client.exists(_lock_key(key)):
+                break  # the rebuild finished without caching (None) or died
+        except Exception:
+            break
+    return False, None
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def _local_hit(key: str, versions: Optional[tuple]):
+    entry = _local.get(key)
+    if entry is None:
+        return False, None
+    expires_at, entry_versions, _, value = entry
+    if expires_at <= time.monotonic() or entry_versions != versions:
+        return False, None
+    return True, value
+
+
+def _remember(key: str, versions: Optional[tuple], tags: Iterable[str], value) -> None:
+    expires_at = time.monotonic() + settings.CACHE_LOCAL_TTL_SECONDS
+    _local.put(key, (expires_at, versions, frozenset(tags), value))
+
+
+def get_or_load(
+    key: str,
+    loader: Callable[[], T],
+    tags: Iterable[str] = (),
+    ttl: Optional[int] = settings.CACHE_DEFAULT_TTL_SECONDS,
+) -> T:
+    """
+    Cached value of ``key``, loading it with ``loader`` on a miss. A ``None``
+    result is returned but not cached. ``ttl`` bounds the Redis copy (None
+    keeps it until invalidated).
+    """
+    tags = tuple(tags)
+    dependencies = _dependencies(key, tags)
+    # Read versions before loading so an invalidation mid-load is never masked
+    versions = _current_versions(dependencies)
+
+    found, value = _local_hit(key, versions)
+    if found:
+        _count("local_hits")
+        return value
+
+    if versions is not None:
+        found, value = _read_redis(key, versions)
+        if found:
+            _count("redis_hits")
+            _remember(key, versions, tags, value)
+            return value
+
+    with _key_locks[hash(key) % len(_key_locks)]:
+        # Another thread of this worker may have loaded it meanwhile
+        found, value = _local_hit(key, versions)
+        if found:
+            _count("local_hits")
+            return value
+
+        _count("misses")
+        token = None
+        if versions is not None:
+            token = _acquire_lock(key)
+            if token is None:
+                found, value = _wait_for_value(key, versions)
+                if found:
+                    _remember(key, versions, tags, value)
+                    return value
+        try:
+            _count("loads")
+            value = loader()
+            if value is not None:
+                if versions is not None:
+                    _write_redis(key, value, versions, ttl)
+                _remember(key, versions, tags, value)
+            return value
+        finally:
+            if token is not None:
+                _release_lock(key, token)
+
+
+def put(
+    key: str,
+    value: Any,
+    tags: Iterable[str] = (),
+    ttl: Optional[int] = settings.CACHE_DEFAULT_TTL_SECONDS,
+) -> None:
+    """Store a freshly built value (e.g. to warm the cache after an edit)."""
+    tags = tuple(tags)
+    versions = _current_versions(_dependencies(key, tags))
+    if versions is not None:
+        _write_redis(key, value, versions, ttl)
+    _remember(key, versions, tags, value)
+
+
+def invalidate(*keys: str) -> None:
+    """Drop the given keys in every worker."""
+    for key in keys:
+        _local.pop(key)
+    _bump([f"key:{key}" for key in keys], [_data_key(key) for key in keys])
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Drop every entry carrying one of ``tags`` in every worker."""
+    _local.drop_tagged(set(tags))
+    _bump([f"tag:{tag}" for tag in tags])
+
+
+def _bump(dependencies: list[str], data_keys: Iterable[str] = ()) -> None:
+    _count("invalidations", len(dependencies))
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        for dependency in dependencies:
+            pipe.incr(_version_key(dependency))
+        for data_key in data_keys:
+            pipe.delete(data_key)
+        pipe.execute()
+    except Exception as e:
+        _count("errors")
+        logger.error(f"Cache: invalidation failed for {dependencies}: {e}")
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,12 +14,142 @@ class Settings:
     DB_NAME = os.getenv("DB_NAME")
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 30))
+
+    # Threads used to run sync repository calls from async routes. Kept below
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW so the pool never waits on pool_timeout.
+    BLOCKING_POOL_WORKERS = int(os.getenv("BLOCKING_POOL_WORKERS", 32))
+    BLOCKING_POOL_SLOW_WAIT_MS = int(os.getenv("BLOCKING_POOL_SLOW_WAIT_MS", 250))
+
+    # Password hashing (app.auth.hasher): bcrypt work factor (hashes made with
+    # another one are replaced on the next sign-in) and the hashing threads
+    # of each worker (0 hashes in the blocking pool instead). Every uvicorn
+    # worker has its own, so the default stays small.
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_THREADS = int(
+        os.getenv("PASSWORD_HASH_THREADS", min(4, os.cpu_count() or 1))
+    )
+    PASSWORD_HASH_SLOW_WAIT_MS = int(os.getenv("PASSWORD_HASH_SLOW_WAIT_MS", 500))
+
+    # Deactivated users and revoked tokens (app.auth.revocation) are refused on
+    # every request; each worker caches a user's state for the TTL
+    AUTH_REVOCATION_ENABLED = (
+        os.getenv("AUTH_REVOCATION_ENABLED", "true").lower() == "true"
+    )
+    AUTH_REVOCATION_TTL_SECONDS = float(os.getenv("AUTH_REVOCATION_TTL_SECONDS", 5))
+    AUTH_REVOCATION_LOCAL_MAXSIZE = int(
+        os.getenv("AUTH_REVOCATION_LOCAL_MAXSIZE", 10000)
+    )
+
     HF_TOKEN = os.getenv("HF_TOKEN")
     AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", 4000))
 
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 
+    # Write-behind buffer for interview autosaves (Redis hash per attempt)
+    ANSWER_BUFFER_ENABLED = os.getenv("ANSWER_BUFFER_ENABLED", "true").lower() == "true"
+    ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS = float(
+        os.getenv("ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS", 5)
+    )
+    ANSWER_BUFFER_TTL_SECONDS = int(os.getenv("ANSWER_BUFFER_TTL_SECONDS", 86400))
+    ANSWER_BUFFER_LOCK_TTL_MS = int(os.getenv("ANSWER_BUFFER_LOCK_TTL_MS", 30000))
+    ANSWER_BUFFER_CONTEXT_TTL_SECONDS = int(
+        os.getenv("ANSWER_BUFFER_CONTEXT_TTL_SECONDS", 300)
+    )
+
+    # Compiled per-paper answer keys used for grading. The local TTL only
+    # applies when Redis is unavailable (otherwise a version check is used).
+    ANSWER_KEY_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_KEY_CACHE_TTL_SECONDS", 86400))
+    ANSWER_KEY_LOCAL_TTL_SECONDS = int(os.getenv("ANSWER_KEY_LOCAL_TTL_SECONDS", 60))
+
+    # Bulk regrade after grade-settings / answer changes (attempts per chunk,
+    # grading processes; 1 grades inline in the blocking pool thread).
+    REGRADE_CHUNK_SIZE = int(os.getenv("REGRADE_CHUNK_SIZE", 500))
+    REGRADE_PROCESSES = int(os.getenv("REGRADE_PROCESSES", 2))
+
+    # Candidate report PDFs: rendered in a per-worker process pool (0 renders
+    # in the blocking pool instead) and kept on disk per attempt. A ZIP export
+    # renders at most REPORT_PDF_PROCESSES reports at once.
+    REPORT_PDF_PROCESSES = int(os.getenv("REPORT_PDF_PROCESSES", 2))
+    REPORT_CACHE_DIR = os.getenv(
+        "REPORT_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "talent-flow-reports"),
+    )
+    REPORT_EXPORT_MAX_ITEMS = int(os.getenv("REPORT_EXPORT_MAX_ITEMS", 200))
+
+    # Auto-assignment rule backfill: candidates redistributed per transaction;
+    # rules covering more candidates than INLINE_MAX run as a background job
+    ASSIGN_BACKFILL_CHUNK_SIZE = int(os.getenv("ASSIGN_BACKFILL_CHUNK_SIZE", 1000))
+    ASSIGN_BACKFILL_INLINE_MAX = int(os.getenv("ASSIGN_BACKFILL_INLINE_MAX", 2000))
+
+    # Scheduled auto-expiration of candidates (one sweep per interval across
+    # workers, elected through a Redis lease)
+    EXPIRATION_ENABLED = os.getenv("EXPIRATION_ENABLED", "true").lower() == "true"
+    EXPIRATION_INTERVAL_SECONDS = float(os.getenv("EXPIRATION_INTERVAL_SECONDS", 300))
+
+    # Background duplicate-candidate checks queued on user details save
+    DUPLICATE_WORKER_ENABLED = (
+        os.getenv("DUPLICATE_WORKER_ENABLED", "true").lower() == "true"
+    )
+    DUPLICATE_WORKER_POLL_SECONDS = float(os.getenv("DUPLICATE_WORKER_POLL_SECONDS", 1))
+    # A worker's unacknowledged checks are requeued once its lease lapses; a
+    # check failing this many times in a row is dropped
+    DUPLICATE_WORKER_LEASE_SECONDS = int(
+        os.getenv("DUPLICATE_WORKER_LEASE_SECONDS", 60)
+    )
+    DUPLICATE_CHECK_MAX_ATTEMPTS = int(os.getenv("DUPLICATE_CHECK_MAX_ATTEMPTS", 3))
+    # Offline whole-population sweep (scripts/run_duplicate_sweep.py): scoring
+    # processes and candidate pairs scored per chunk
+    DUPLICATE_SWEEP_PROCESSES = int(os.getenv("DUPLICATE_SWEEP_PROCESSES", 2))
+    DUPLICATE_SWEEP_CHUNK_SIZE = int(os.getenv("DUPLICATE_SWEEP_CHUNK_SIZE", 5000))
+
+    # Two-tier cache (app.core.cache): per-worker LRU in front of Redis.
+    # Rebuilds are single-flight: other workers wait up to CACHE_LOCK_WAIT_MS.
+    CACHE_LOCAL_MAXSIZE = int(os.getenv("CACHE_LOCAL_MAXSIZE", 1024))
+    CACHE_LOCAL_TTL_SECONDS = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", 60))
+    CACHE_DEFAULT_TTL_SECONDS = int(os.getenv("CACHE_DEFAULT_TTL_SECONDS", 3600))
+    CACHE_LOCK_TTL_MS = int(os.getenv("CACHE_LOCK_TTL_MS", 10000))
+    CACHE_LOCK_WAIT_MS = int(os.getenv("CACHE_LOCK_WAIT_MS", 5000))
+
+    # Streaming bulk question upload: rows validated and inserted per chunk
+    BULK_UPLOAD_CHUNK_SIZE = int(os.getenv("BULK_UPLOAD_CHUNK_SIZE", 1000))
+    BULK_UPLOAD_PROGRESS_TTL_SECONDS = int(
+        os.getenv("BULK_UPLOAD_PROGRESS_TTL_SECONDS", 3600)
+    )
+    # ZIP images stored at once per upload; each also gets a WebP variant
+    # no larger than QUESTION_IMAGE_WEB_MAX_PX on its longest side
+    BULK_UPLOAD_IMAGE_CONCURRENCY = int(os.getenv("BULK_UPLOAD_IMAGE_CONCURRENCY", 4))
+    QUESTION_IMAGE_WEB_MAX_PX = int(os.getenv("QUESTION_IMAGE_WEB_MAX_PX", 1280))
+    QUESTION_IMAGE_WEB_QUALITY = int(os.getenv("QUESTION_IMAGE_WEB_QUALITY", 80))
+
+    # List endpoints asked for total=cached reuse a COUNT for this long
+    PAGINATION_COUNT_CACHE_TTL_SECONDS = int(
+        os.getenv("PAGINATION_COUNT_CACHE_TTL_SECONDS", 60)
+    )
+
+    # Realtime notifications: per-worker Redis pool, outbound queue bound
+    # (publishers wait when full) and events sent per pipelined round trip
+    REALTIME_MAX_CONNECTIONS = int(os.getenv("REALTIME_MAX_CONNECTIONS", 20))
+    REALTIME_OUTBOX_SIZE = int(os.getenv("REALTIME_OUTBOX_SIZE", 10000))
+    REALTIME_PUBLISH_BATCH_SIZE = int(os.getenv("REALTIME_PUBLISH_BATCH_SIZE", 100))
+    REALTIME_SYNC_PUBLISH_TIMEOUT_SECONDS = float(
+        os.getenv("REALTIME_SYNC_PUBLISH_TIMEOUT_SECONDS", 5)
+    )
+    # Per-connection SSE queue bound and what happens when a client falls
+    # behind: "drop_oldest" or "disconnect" (it then reconnects and replays).
+    # The last REALTIME_REPLAY_MAXLEN events per target are kept for
+    # Last-Event-ID replay.
+    REALTIME_SUBSCRIBER_QUEUE_SIZE = int(
+        os.getenv("REALTIME_SUBSCRIBER_QUEUE_SIZE", 100)
+    )
+    REALTIME_SLOW_CLIENT_POLICY = os.getenv(
+        "REALTIME_SLOW_CLIENT_POLICY", "drop_oldest"
+    ).lower()
+    REALTIME_REPLAY_MAXLEN = int(os.getenv("REALTIME_REPLAY_MAXLEN", 200))
+    REALTIME_REPLAY_TTL_SECONDS = int(os.getenv("REALTIME_REPLAY_TTL_SECONDS", 3600))
+
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     MEDIA_ROOT = os.path.join(BASE_DIR, "images")
     UPLOAD_DIR = MEDIA_ROOT
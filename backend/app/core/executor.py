@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BlockingDispatcher:
+    """
+    Runs blocking (sync SQLAlchemy / file IO) callables off the event loop.
+
+    The pool is bounded so a burst of autosaves can never open more DB
+    sessions than the engine pool can hand out; excess calls wait in the
+    executor queue instead of stalling the loop. Counters are kept per worker
+    process so saturation is visible via ``stats()``.
+    """
+
+    def __init__(self, max_workers: int, slow_wait_ms: int):
+        self.max_workers = max_workers
+        self.slow_wait_ms = slow_wait_ms
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._peak_queued = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="blocking-io",
+                    )
+        return self._executor
+
+    def _instrumented(self, enqueued_at: float, call: Callable[[], T]) -> T:
+        wait_ms = (time.perf_counter() - enqueued_at) * 1000
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+        if wait_ms > self.slow_wait_ms:
+            logger.warning(
+                f"Blocking dispatcher saturated: call waited {wait_ms:.1f}ms "
+                f"(workers={self.max_workers}, queued={self._queued})"
+            )
+
+        failed = False
+        try:
+            return call()
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``func(*args, **kwargs)`` on the bounded pool."""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        return await loop.run_in_executor(
+            self._get_executor(),
+            self._instrumented,
+            time.perf_counter(),
+            call,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": (
+                    round(self._total_wait_ms / finished, 2) if finished else 0.0
+                ),
+                "max_wait_ms": round(self._max_wait_ms, 2),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+blocking_dispatcher = BlockingDispatcher(
+    max_workers=settings.BLOCKING_POOL_WORKERS,
+    slow_wait_ms=settings.BLOCKING_POOL_SLOW_WAIT_MS,
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Shorthand for ``blocking_dispatcher.run``."""
+    return await blocking_dispatcher.run(func, *args, **kwargs)
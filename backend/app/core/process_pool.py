@@ -0,0 +1,56 @@
+"""
+Process pools started safely from an API worker.
+
+A worker runs the event loop, the blocking pool and the Redis listener
+threads, and a ``fork``-context pool copies it (on Python 3.11 at the first
+submit) with whatever locks those threads hold at that moment. Pools made
+here take their processes from a forkserver instead: a single-threaded
+process started once per worker, which imports the app afresh. Work and
+initializers must therefore be module-level functions with picklable
+arguments, and children read settings from the environment, not from the
+parent's in-memory overrides.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _context() -> multiprocessing.context.BaseContext:
+    # forkserver is POSIX only; spawn gives the same isolation, slower
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def new_process_pool(
+    max_workers: int,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: tuple = (),
+) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_context(),
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+def map_bounded(
+    pool: Executor, func: Callable[[Any], T], items: Iterable, in_flight: int
+) -> Iterator[T]:
+    """
+    ``func(item)`` of every item on the pool, yielded in order. At most
+    ``in_flight`` items are submitted ahead of the results, so memory stays
+    flat however long ``items`` is.
+    """
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
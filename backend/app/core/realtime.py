@@ -1,104 +1,470 @@
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+CHANNEL_PREFIX = "notifications"
+
+# Append the event to the target's replay stream and publish it with its
+# stream id, so live delivery and Last-Event-ID replay share one id space.
+_PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], '*', 'data', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('PUBLISH', KEYS[2], id .. ' ' .. ARGV[1])
+return id
+"""
+
+SLOW_CLIENT_DROP_OLDEST = "drop_oldest"
+SLOW_CLIENT_DISCONNECT = "disconnect"
+
+
+def _target(user_id: Any) -> str:
+    return str(user_id) if user_id is not None and str(user_id) != "None" else "admin"
+
+
+def channel_key(target: str) -> str:
+    return f"{CHANNEL_PREFIX}:{target}"
+
+
+def stream_key(target: str) -> str:
+    return f"{CHANNEL_PREFIX}:{target}:events"
+
+
+def _parse_event_id(event_id: str) -> Tuple[int, int]:
+    millis, _, seq = event_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def _publish_args(target: str, data: str) -> tuple:
+    return (
+        stream_key(target),
+        channel_key(target),
+        data,
+        settings.REALTIME_REPLAY_MAXLEN,
+        settings.REALTIME_REPLAY_TTL_SECONDS,
+    )
+
+
+class SubscriberQueue(asyncio.Queue):
+    """
+    Bounded queue of (event_id, data) for one SSE connection. ``data`` is the
+    JSON text as published, passed through untouched. A ``None`` item means
+    the client fell behind and was cut off; it should reconnect with
+    Last-Event-ID.
+    """
+
+    def __init__(self, target: str, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.target = target
+        self.dropped = 0
+        self.closed = False
+        self.last_id: Tuple[int, int] = (0, 0)
+        # Live events that arrive while the backlog is being replayed
+        self.held: Optional[list] = None
+
 
 class RealtimeManager:
+    """
+    Fans notifications out to SSE subscribers across workers via Redis.
+
+    Every target (a user id, or "admin") has its own Pub/Sub channel and a
+    short Redis Stream of recent events. A worker subscribes only to the
+    channels of targets connected to it, so it never sees other users'
+    traffic. Events are encoded once when published and handed to every
+    local subscriber as-is.
+
+    ``publish`` only puts the event on a bounded outbound queue; a publisher
+    task drains it and sends whatever has accumulated in one pipelined round
+    trip. A full queue makes publishers wait (backpressure) instead of growing
+    without bound, and the counters in ``stats()`` show how often that
+    happens.
+    """
+
     def __init__(self):
         self.redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-        self.user_queues: Dict[str, List[asyncio.Queue]] = {}
-        self.admin_queues: List[asyncio.Queue] = []
+        self.subscribers: Dict[str, List[SubscriberQueue]] = {}
+        self._pubsub = None
         self._pubsub_task = None
+        self._has_channels: Optional[asyncio.Event] = None
+        self._publisher_task = None
+        self._client: Optional[redis.Redis] = None
+        self._publish_script = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._published = 0
+        self._failed = 0
+        self._batches = 0
+        self._batched = 0
+        self._max_batch = 0
+        self._peak_depth = 0
+        self._full_waits = 0
+        self._sync_fallbacks = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._disconnected = 0
+        self._replayed = 0
+
+    def _bind(self):
+        """Attach to the running loop; the pool and queues are per event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._client = None
+            self._publish_script = None
+            self._outbox = asyncio.Queue(maxsize=settings.REALTIME_OUTBOX_SIZE)
+            self._has_channels = asyncio.Event()
+            self._pubsub = None
+            self._pubsub_task = None
+            self._publisher_task = None
+            self.subscribers = {}
+        return loop
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis(
+                connection_pool=redis.ConnectionPool.from_url(
+                    self.redis_url,
+                    decode_responses=True,
+                    max_connections=settings.REALTIME_MAX_CONNECTIONS,
+                )
+            )
+            self._publish_script = self._client.register_script(_PUBLISH_SCRIPT)
+        return self._client
+
+    @staticmethod
+    def _encode(data: Any) -> str:
+        return json.dumps(data, default=str)
+
+    # ---------------------------------------------------------------------------
+    # Inbound: per-target channels -> local subscriber queues
+    # ---------------------------------------------------------------------------
+
+    def _get_pubsub(self):
+        if self._pubsub is None:
+            self._pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
 
     async def _listen_to_redis(self):
         """
-        Listen to Redis Pub/Sub and broadcast to local queues.
+        Read messages for the channels this worker is subscribed to and hand
+        them to the local queues of that target.
         """
-        r = redis.from_url(self.redis_url, decode_responses=True)
-        pubsub = r.pubsub()
-        await pubsub.subscribe("notifications")
+        while True:
+            if self._pubsub is None or not self._pubsub.subscribed:
+                self._has_channels.clear()
+                await self._has_channels.wait()
+                continue
+            try:
+                message = await self._get_pubsub().get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Realtime: Redis error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if not message or message["type"] != "message":
+                continue
 
-        # Listening started
+            target = message["channel"][len(CHANNEL_PREFIX) + 1 :]
+            event_id, _, data = message["data"].partition(" ")
+            for queue in list(self.subscribers.get(target, [])):
+                self._deliver(queue, event_id, data)
 
-        try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    payload = json.loads(message["data"])
-                    target_id = str(payload.get("target_id", "admin"))
-                    data = payload.get("data")
-
-                    # Broadcast to local queues in THIS worker
-                    target_queues = []
-                    if target_id == "admin":
-                        target_queues = list(self.admin_queues)
-                    else:
-                        target_queues = list(self.user_queues.get(target_id, []))
-
-                    for queue in target_queues:
-                        try:
-                            queue.put_nowait(json.dumps(data, default=str))
-                        except Exception as e:
-                            logger.error(f"Realtime: Queue put failed: {e}")
-        except Exception as e:
-            logger.error(f"Realtime: Redis error: {e}")
-        finally:
-            await pubsub.unsubscribe("notifications")
+    def _deliver(self, queue: SubscriberQueue, event_id: str, data: str) -> None:
+        if queue.closed:
+            return
+        if queue.held is not None:
+            queue.held.append((event_id, data))
+            return
+        parsed_id = _parse_event_id(event_id)
+        if parsed_id <= queue.last_id:
+            return  # already sent during replay
+
+        if queue.full():
+            if settings.REALTIME_SLOW_CLIENT_POLICY == SLOW_CLIENT_DISCONNECT:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                queue.closed = True
+                with self._lock:
+                    self._disconnected += 1
+                logger.warning(
+                    f"Realtime: subscriber of {queue.target} fell behind, "
+                    "disconnecting it"
+                )
+                return
+            queue.get_nowait()
+            queue.dropped += 1
+            with self._lock:
+                self._dropped += 1
+
+        queue.put_nowait((event_id, data))
+        queue.last_id = parsed_id
+        with self._lock:
+            self._delivered += 1
 
     def ensure_listener(self):
+        self._bind()
         if self._pubsub_task is None or self._pubsub_task.done():
             self._pubsub_task = asyncio.create_task(self._listen_to_redis())
 
-    async def subscribe(self, user_id: str = None) -> asyncio.Queue:
+    async def _replay(self, queue: SubscriberQueue, last_event_id: str) -> None:
+        """Queue the events of the target's stream newer than last_event_id."""
+        try:
+            entries = await self._get_client().xrange(
+                stream_key(queue.target),
+                min=f"({last_event_id}",
+                count=settings.REALTIME_REPLAY_MAXLEN,
+            )
+        except RedisError as e:
+            logger.warning(f"Realtime: replay for {queue.target} failed: {e}")
+            entries = []
+
+        held, queue.held = queue.held, None
+        for event_id, fields in entries:
+            self._deliver(queue, event_id, fields.get("data", "null"))
+        with self._lock:
+            self._replayed += len(entries)
+        for event_id, data in held or []:
+            self._deliver(queue, event_id, data)
+
+    async def subscribe(
+        self, user_id: str = None, last_event_id: Optional[str] = None
+    ) -> SubscriberQueue:
+        """
+        Start receiving the target's events. With ``last_event_id`` (the SSE
+        Last-Event-ID of a reconnecting client) the events it missed are
+        replayed first, in order and without duplicates.
+        """
         self.ensure_listener()
-        queue = asyncio.Queue()
-        user_id_str = (
-            str(user_id) if user_id is not None and str(user_id) != "None" else "admin"
-        )
-
-        if user_id_str == "admin":
-            self.admin_queues.append(queue)
-        else:
-            if user_id_str not in self.user_queues:
-                self.user_queues[user_id_str] = []
-            self.user_queues[user_id_str].append(queue)
+        target = _target(user_id)
+        queue = SubscriberQueue(target, settings.REALTIME_SUBSCRIBER_QUEUE_SIZE)
+        if last_event_id:
+            try:
+                queue.last_id = _parse_event_id(last_event_id)
+                queue.held = []
+            except ValueError:
+                last_event_id = None
+
+        first = target not in self.subscribers
+        self.subscribers.setdefault(target, []).append(queue)
+        if first:
+            try:
+                await self._get_pubsub().subscribe(channel_key(target))
+            except RedisError as e:
+                logger.error(f"Realtime: subscribe to {target} failed: {e}")
+        self._has_channels.set()
+
+        if last_event_id:
+            await self._replay(queue, last_event_id)
         return queue
 
-    async def unsubscribe(self, queue: asyncio.Queue, user_id: str = None):
-        user_id_str = (
-            str(user_id) if user_id is not None and str(user_id) != "None" else "admin"
-        )
-        if user_id_str == "admin":
-            if queue in self.admin_queues:
-                self.admin_queues.remove(queue)
-        else:
-            if (
-                user_id_str in self.user_queues
-                and queue in self.user_queues[user_id_str]
-            ):
-                self.user_queues[user_id_str].remove(queue)
+    async def unsubscribe(self, queue: SubscriberQueue, user_id: str = None):
+        target = _target(user_id)
+        queues = self.subscribers.get(target)
+        if not queues or queue not in queues:
+            return
+        queues.remove(queue)
+        if not queues:
+            del self.subscribers[target]
+            try:
+                await self._get_pubsub().unsubscribe(channel_key(target))
+            except RedisError as e:
+                logger.warning(f"Realtime: unsubscribe from {target} failed: {e}")
+
+    # ---------------------------------------------------------------------------
+    # Outbound queue
+    # ---------------------------------------------------------------------------
+
+    def ensure_publisher(self):
+        self._bind()
+        if self._publisher_task is None or self._publisher_task.done():
+            self._publisher_task = asyncio.create_task(self._run_publisher())
+
+    async def _send_batch(self, batch: List[Tuple[str, str]]) -> None:
+        try:
+            client = self._get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for target, data in batch:
+                    stream, channel, *args = _publish_args(target, data)
+                    await self._publish_script(
+                        keys=[stream, channel], args=args, client=pipe
+                    )
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            with self._lock:
+                self._failed += len(batch)
+            logger.error(f"Realtime: publish of {len(batch)} events failed: {e}")
+            return
+        with self._lock:
+            self._published += len(batch)
+            self._batched += len(batch)
+            self._batches += 1
+            self._max_batch = max(self._max_batch, len(batch))
+
+    async def _run_publisher(self):
+        """Send everything queued since the last round trip in one pipeline."""
+        outbox = self._outbox
+        while True:
+            batch = [await outbox.get()]
+            while len(batch) < settings.REALTIME_PUBLISH_BATCH_SIZE:
+                try:
+                    batch.append(outbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    outbox.task_done()
+
+    async def _enqueue(self, event: Tuple[str, str]) -> None:
+        self.ensure_publisher()
+        if self._outbox.full():
+            with self._lock:
+                self._full_waits += 1
+                full_waits = self._full_waits
+            if full_waits % 100 == 1:
+                logger.warning(
+                    f"Realtime: outbox full ({self._outbox.maxsize} events), "
+                    f"publishers waiting ({full_waits} waits so far)"
+                )
+        await self._outbox.put(event)
+        self._record_enqueued()
+
+    def _record_enqueued(self) -> None:
+        with self._lock:
+            self._enqueued += 1
+            self._peak_depth = max(self._peak_depth, self._outbox.qsize())
 
     async def publish(self, data: Any, user_id: str = None):
         """
         Publish an event to Redis. All workers will hear this.
+        Returns once the event is queued; it goes out with the next batch.
         """
-        user_id_str = str(user_id) if user_id is not None else "admin"
-        payload = {"target_id": user_id_str, "data": data}
-
-        async with redis.from_url(self.redis_url) as r:
-            await r.publish("notifications", json.dumps(payload, default=str))
+        await self._enqueue((_target(user_id), self._encode(data)))
 
     def publish_sync(self, data: Any, user_id: str = None):
-        # Fallback for sync code
+        """
+        Publish from sync code. From a worker thread the event is handed to
+        the loop's outbound queue and this waits until it is queued. With no
+        loop (scripts, CLI), or when the queue cannot take it, the event is
+        published directly on the sync Redis client.
+        """
+        event = (_target(user_id), self._encode(data))
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                self.ensure_publisher()
+                try:
+                    self._outbox.put_nowait(event)
+                    self._record_enqueued()
+                    return
+                except asyncio.QueueFull:
+                    with self._lock:
+                        self._full_waits += 1
+            else:
+                future = asyncio.run_coroutine_threadsafe(self._enqueue(event), loop)
+                try:
+                    future.result(
+                        timeout=settings.REALTIME_SYNC_PUBLISH_TIMEOUT_SECONDS
+                    )
+                    return
+                except Exception as e:
+                    future.cancel()
+                    logger.warning(
+                        f"Realtime: loop handoff failed, publishing directly: {e}"
+                    )
+
+        from app.core.redis_client import redis_client
+
+        with self._lock:
+            self._sync_fallbacks += 1
+        if redis_client is None:
+            logger.error("Realtime: Redis unavailable, event dropped")
+            with self._lock:
+                self._failed += 1
+            return
         try:
-            loop = asyncio.get_running_loop()
-            asyncio.run_coroutine_threadsafe(self.publish(data, user_id), loop)
-        except RuntimeError:
-            pass
+            redis_client.eval(_PUBLISH_SCRIPT, 2, *_publish_args(*event))
+            with self._lock:
+                self._published += 1
+        except RedisError as e:
+            with self._lock:
+                self._failed += 1
+            logger.error(f"Realtime: direct publish failed: {e}")
+
+    # ---------------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ---------------------------------------------------------------------------
+
+    async def start(self):
+        """Bind to the app's loop so publish_sync can hand events to it."""
+        self.ensure_publisher()
+
+    async def close(self):
+        """Flush the outbound queue, then stop the tasks and the pool."""
+        if self._outbox is not None and self._publisher_task is not None:
+            try:
+                await asyncio.wait_for(
+                    self._outbox.join(),
+                    timeout=settings.REALTIME_SYNC_PUBLISH_TIMEOUT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Realtime: {self._outbox.qsize()} events unsent at shutdown"
+                )
+        for task in (self._publisher_task, self._pubsub_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._publisher_task = None
+        self._pubsub_task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "outbox_size": self._outbox.maxsize if self._outbox else 0,
+                "outbox_depth": self._outbox.qsize() if self._outbox else 0,
+                "peak_depth": self._peak_depth,
+                "full_waits": self._full_waits,
+                "enqueued": self._enqueued,
+                "published": self._published,
+                "failed": self._failed,
+                "batches": self._batches,
+                "avg_batch": (
+                    round(self._batched / self._batches, 2) if self._batches else 0.0
+                ),
+                "max_batch": self._max_batch,
+                "sync_fallbacks": self._sync_fallbacks,
+                "channels": len(self.subscribers),
+                "subscribers": sum(len(queues) for queues in self.subscribers.values()),
+                "delivered": self._delivered,
+                "dropped": self._dropped,
+                "disconnected": self._disconnected,
+                "replayed": self._replayed,
+            }
 
 
 # Global instance
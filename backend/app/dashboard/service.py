@@ -1,6 +1,7 @@
 from datetime import date
 from typing import Optional
 from sqlalchemy import func
+from app.core.executor import run_blocking
 from app.database.db import SessionLocal
 from app.users.models import User
 from app.papers.models import Paper
@@ -9,7 +10,6 @@ from app.interview_attempts.models import InterviewRecord
 from app.paper_assignments.models import PaperAssignment
 from app.user_details.models import UserDetail
 from .schemas import DashboardOverviewResponse, DashboardStats, TodayPulse, GradeCount
-from app.utils.expiration import run_auto_expiration
 from app.utils.grade_utils import GradeLabel
 from app.utils.department_helpers import exclude_software_users
 from app.utils.enums import RoleType
@@ -18,12 +18,14 @@ from app.utils.enums import RoleType
 class DashboardService:
     async def get_overview(
         self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> DashboardOverviewResponse:
+        return await run_blocking(self._build_overview, start_date, end_date)
+
+    def _build_overview(
+        self, start_date: Optional[date], end_date: Optional[date]
     ) -> DashboardOverviewResponse:
         db = SessionLocal()
         try:
-            # Trigger Auto-Expiration on dashboard load to keep stats fresh
-            run_auto_expiration(db)
-
             # Default to today if no date range provided
             today = date.today()
             filter_start = start_date or today
@@ -12,8 +12,8 @@ DATABASE_URL = (
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=20,  # Base persistent connections
-    max_overflow=30,  # Extra burst connections (total max = 50)
+    pool_size=settings.DB_POOL_SIZE,  # Base persistent connections
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Extra burst connections (default max = 50)
     pool_timeout=30,  # Wait up to 30s for a free connection
     pool_recycle=1800,  # Recycle connections every 30min (avoids stale connections)
 )
@@ -1,6 +1,10 @@
+from app.core import cache
 from app.database.db import SessionLocal
 from app.departments.models import Department
 
+# Cache tag of every department read; bumped on any write
+CACHE_TAG = "departments"
+
 
 def _to_dict(department):
     if not department:
@@ -19,6 +23,21 @@ def get_all(
     search: str = None,
     limit: int = 10,
     offset: int = 0,
+):
+    args = (is_active, search, limit, offset)
+    data, total_records = cache.get_or_load(
+        cache.make_key("departments:list", *args),
+        lambda: _get_all(*args),
+        tags=[CACHE_TAG],
+    )
+    return data, total_records
+
+
+def _get_all(
+    is_active: bool = None,
+    search: str = None,
+    limit: int = 10,
+    offset: int = 0,
 ):
     db_session = SessionLocal()
     try:
@@ -40,6 +59,14 @@ def get_all(
 
 
 def get_by_id(department_id: int):
+    return cache.get_or_load(
+        f"departments:{department_id}",
+        lambda: _get_by_id(department_id),
+        tags=[CACHE_TAG],
+    )
+
+
+def _get_by_id(department_id: int):
     db_session = SessionLocal()
     try:
         department = (
@@ -58,6 +85,7 @@ def create(data):
         )
         db_session.add(new_department)
         db_session.commit()
+        cache.invalidate_tags(CACHE_TAG)
         db_session.refresh(new_department)
         return _to_dict(new_department)
     except Exception as e:
@@ -81,6 +109,7 @@ def update(department_id: int, data):
             setattr(department, key, value)
 
         db_session.commit()
+        cache.invalidate_tags(CACHE_TAG)
         db_session.refresh(department)
         return _to_dict(department)
     except Exception as e:
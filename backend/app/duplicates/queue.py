@@ -0,0 +1,280 @@
+"""
+Background queue for duplicate-candidate checks.
+
+Saving user details only enqueues the user id; the scoring runs in
+``run_duplicate_worker`` (one per worker process) and any match is pushed to
+admins over ``realtime_manager``.
+
+Redis layout:
+    duplicates:queue                LIST of user ids waiting to be checked
+    duplicates:pending              SET of the same ids, so repeated saves of
+                                    one profile queue a single check
+    duplicates:processing:<worker>  LIST of the ids a worker took and has not
+                                    acknowledged yet
+    duplicates:alive:<worker>       set while that worker runs, expiring
+                                    DUPLICATE_WORKER_LEASE_SECONDS after its
+                                    last poll
+    duplicates:failures             HASH user id -> failed checks in a row
+
+An id moves from the queue to the worker's processing list and leaves it only
+once its check has committed. A check that raises is queued again, up to
+DUPLICATE_CHECK_MAX_ATTEMPTS times; ids left behind by a worker that died are
+queued again by the next worker to start. A check reads the profile as saved
+when it runs, so a queued id never goes stale. Without Redis the check is
+scheduled on the running loop instead. Every Redis call runs on the blocking
+pool, so a slow Redis never stalls the loop.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.realtime import realtime_manager
+from app.core.redis_client import redis_client
+from app.database.db import SessionLocal
+from app.duplicates.service import detect_duplicates
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "duplicates:queue"
+PENDING_KEY = "duplicates:pending"
+PROCESSING_PREFIX = "duplicates:processing:"
+ALIVE_PREFIX = "duplicates:alive:"
+FAILURES_KEY = "duplicates:failures"
+
+# Identifies this process's processing list and liveness key
+WORKER_ID = uuid.uuid4().hex
+
+# In-process checks scheduled while Redis is unavailable
+_fallback_checks: set[asyncio.Task] = set()
+
+# Queue an id unless it is already waiting
+_ENQUEUE_SCRIPT = """
+if redis.call('SADD', KEYS[2], ARGV[1]) == 1 then
+    redis.call('LPUSH', KEYS[1], ARGV[1])
+end
+"""
+
+# Move the oldest id to the processing list and clear its pending flag, so a
+# save made while it is checked queues another check
+_POP_SCRIPT = """
+local user_id = redis.call('LMOVE', KEYS[1], KEYS[3], 'RIGHT', 'LEFT')
+if user_id then
+    redis.call('SREM', KEYS[2], user_id)
+end
+return user_id
+"""
+
+# A committed check: drop the id from the processing list
+_ACK_SCRIPT = """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+"""
+
+# A failed check: queue it again (at the back) until it has failed
+# ARGV[2] times in a row. Returns the failures so far.
+_RETRY_SCRIPT = """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+local failures = redis.call('HINCRBY', KEYS[4], ARGV[1], 1)
+if failures >= tonumber(ARGV[2]) then
+    redis.call('HDEL', KEYS[4], ARGV[1])
+elseif redis.call('SADD', KEYS[3], ARGV[1]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+end
+return failures
+"""
+
+# Hand a dead worker's unacknowledged ids back to the front of the queue.
+# KEYS: its processing list, the queue, the pending set, its liveness key.
+_REQUEUE_SCRIPT = """
+if redis.call('EXISTS', KEYS[4]) == 1 then
+    return 0
+end
+local ids = redis.call('LRANGE', KEYS[1], 0, -1)
+for _, user_id in ipairs(ids) do
+    if redis.call('SADD', KEYS[3], user_id) == 1 then
+        redis.call('RPUSH', KEYS[2], user_id)
+    end
+end
+redis.call('DEL', KEYS[1])
+return #ids
+"""
+
+
+def _processing_key(worker_id: Optional[str] = None) -> str:
+    return f"{PROCESSING_PREFIX}{worker_id or WORKER_ID}"
+
+
+def _alive_key(worker_id: Optional[str] = None) -> str:
+    return f"{ALIVE_PREFIX}{worker_id or WORKER_ID}"
+
+
+def check_user(user_id: int) -> Optional[dict]:
+    """Run one duplicate check; returns the notification to publish, if any."""
+    db = SessionLocal()
+    try:
+        return detect_duplicates(db, user_id)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _publish(notification: Optional[dict]) -> None:
+    if notification:
+        await realtime_manager.publish(notification, user_id="admin")
+
+
+async def _check_and_publish(user_id: int) -> None:
+    try:
+        await _publish(await run_blocking(check_user, user_id))
+    except Exception as e:
+        logger.error(f"Duplicate check failed for user {user_id}: {e}")
+
+
+def _enqueue(user_id: int) -> None:
+    redis_client.eval(_ENQUEUE_SCRIPT, 2, QUEUE_KEY, PENDING_KEY, user_id)
+
+
+async def enqueue_duplicate_check(user_id: int) -> None:
+    if redis_client is not None:
+        try:
+            await run_blocking(_enqueue, user_id)
+            return
+        except RedisError as e:
+            logger.warning(f"Duplicate queue unavailable, checking in-process: {e}")
+    task = asyncio.create_task(_check_and_publish(user_id))
+    _fallback_checks.add(task)
+    task.add_done_callback(_fallback_checks.discard)
+
+
+def _pop_user_id() -> Optional[int]:
+    raw = redis_client.eval(_POP_SCRIPT, 3, QUEUE_KEY, PENDING_KEY, _processing_key())
+    return int(raw) if raw is not None else None
+
+
+def _ack(user_id: int) -> None:
+    redis_client.eval(_ACK_SCRIPT, 2, _processing_key(), FAILURES_KEY, user_id)
+
+
+def _retry(user_id: int) -> int:
+    return redis_client.eval(
+        _RETRY_SCRIPT,
+        4,
+        _processing_key(),
+        QUEUE_KEY,
+        PENDING_KEY,
+        FAILURES_KEY,
+        user_id,
+        settings.DUPLICATE_CHECK_MAX_ATTEMPTS,
+    )
+
+
+def _heartbeat() -> None:
+    redis_client.set(_alive_key(), 1, ex=settings.DUPLICATE_WORKER_LEASE_SECONDS)
+
+
+def _poll() -> Optional[int]:
+    """Renew this worker's lease and take the next id, if any."""
+    _heartbeat()
+    return _pop_user_id()
+
+
+def _release_lease() -> None:
+    redis_client.delete(_alive_key())
+
+
+def requeue_unfinished() -> int:
+    """
+    Queue again the ids taken by workers that are no longer alive; returns how
+    many were handed back.
+    """
+    requeued = 0
+    for key in redis_client.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+        if isinstance(key, bytes):
+            key = key.decode()
+        worker_id = key[len(PROCESSING_PREFIX) :]
+        requeued += redis_client.eval(
+            _REQUEUE_SCRIPT, 4, key, QUEUE_KEY, PENDING_KEY, _alive_key(worker_id)
+        )
+    return requeued
+
+
+async def _process(user_id: int) -> bool:
+    """Check one popped id, acknowledging it once committed."""
+    try:
+        notification = await run_blocking(check_user, user_id)
+    except Exception as e:
+        try:
+            failures = await run_blocking(_retry, user_id)
+        except RedisError as redis_error:
+            # Left in the processing list for the next worker start
+            logger.error(
+                f"Duplicate queue: retry of user {user_id} failed: {redis_error}"
+            )
+            failures = 0
+        if failures >= settings.DUPLICATE_CHECK_MAX_ATTEMPTS:
+            logger.error(
+                f"Duplicate check failed for user {user_id} "
+                f"{failures} times, giving up: {e}"
+            )
+        else:
+            logger.error(f"Duplicate check failed for user {user_id}: {e}")
+        return False
+
+    try:
+        await run_blocking(_ack, user_id)
+    except RedisError as e:
+        # Left in the processing list: checked again after the next worker start
+        logger.error(f"Duplicate queue: ack of user {user_id} failed: {e}")
+    try:
+        await _publish(notification)
+    except Exception as e:
+        logger.error(f"Duplicate check for user {user_id}: publish failed: {e}")
+    return True
+
+
+def is_enabled() -> bool:
+    return settings.DUPLICATE_WORKER_ENABLED and redis_client is not None
+
+
+async def run_duplicate_worker(stop_event: asyncio.Event) -> None:
+    """
+    Hand back the ids of dead workers, then drain the queue and poll every
+    DUPLICATE_WORKER_POLL_SECONDS. A failed check waits for the next poll.
+    """
+    interval = settings.DUPLICATE_WORKER_POLL_SECONDS
+    try:
+        await run_blocking(_heartbeat)
+        requeued = await run_blocking(requeue_unfinished)
+        if requeued:
+            logger.info(f"Duplicate queue: requeued {requeued} unfinished checks")
+    except RedisError as e:
+        logger.error(f"Duplicate queue: requeue failed: {e}")
+
+    while not stop_event.is_set():
+        try:
+            user_id = await run_blocking(_poll)
+        except RedisError as e:
+            logger.error(f"Duplicate queue: pop failed: {e}")
+            user_id = None
+
+        if user_id is not None and await _process(user_id):
+            continue
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+    try:
+        # Anything still unacknowledged is picked up by the next worker start
+        await run_blocking(_release_lease)
+    except RedisError as e:
+        logger.error(f"Duplicate queue: releasing the worker lease failed: {e}")
@@ -1,6 +1,10 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
 from app.duplicates.models import AdminNotification, DuplicateUserMatch
-from typing import Optional, List, Tuple
+from app.user_details.models import UserDetail
+from app.users.models import User
+from typing import Iterator, Optional, List, Tuple
+from sqlalchemy import insert
 from app.utils.pagination import PaginationParams
 
 
@@ -83,3 +87,71 @@ def update_notification_status(
 
     db.commit()
     return len(notifications)
+
+
+def get_detail_with_created_at(
+    db: Session, user_id: int
+) -> Optional[Tuple[UserDetail, Optional[datetime]]]:
+    return (
+        db.query(UserDetail, User.created_at)
+        .outerjoin(User, User.id == UserDetail.user_id)
+        .filter(UserDetail.user_id == user_id)
+        .first()
+    )
+
+
+def get_dob_candidates(
+    db: Session, dob: str, exclude_user_id: int
+) -> List[Tuple[UserDetail, Optional[datetime]]]:
+    """Other profiles with this DOB (served by ix_user_details_dob)."""
+    return (
+        db.query(UserDetail, User.created_at)
+        .outerjoin(User, User.id == UserDetail.user_id)
+        .filter(
+            UserDetail.personal_details["dob"].astext == dob,
+            UserDetail.user_id != exclude_user_id,
+        )
+        .all()
+    )
+
+
+def iter_sweep_profiles(
+    db: Session, batch_size: int = 2000
+) -> Iterator[Tuple[UserDetail, Optional[datetime], Optional[str]]]:
+    """Every saved profile with its user's creation time and mobile, streamed."""
+    return (
+        db.query(UserDetail, User.created_at, User.mobile)
+        .outerjoin(User, User.id == UserDetail.user_id)
+        .order_by(UserDetail.user_id)
+        .yield_per(batch_size)
+    )
+
+
+def get_recorded_pairs(db: Session) -> set[frozenset]:
+    """User id pairs that already have a duplicate match, in either direction."""
+    return {
+        frozenset(pair)
+        for pair in db.query(
+            DuplicateUserMatch.new_user_id, DuplicateUserMatch.matched_user_id
+        )
+    }
+
+
+def insert_matches(db: Session, matches: List[dict]) -> int:
+    """Bulk-insert match rows and an admin notification for each (no commit)."""
+    if not matches:
+        return 0
+    match_ids = db.scalars(
+        insert(DuplicateUserMatch).returning(
+            DuplicateUserMatch.id, sort_by_parameter_order=True
+        ),
+        [match["row"] for match in matches],
+    ).all()
+    db.execute(
+        insert(AdminNotification),
+        [
+            {**match["notification"], "reference_id": match_id}
+            for match_id, match in zip(match_ids, matches)
+        ],
+    )
+    return len(match_ids)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 import asyncio
+import logging
 from app.core.realtime import realtime_manager
 from sqlalchemy.orm import Session
 from app.database.db import get_db
@@ -12,6 +13,8 @@ from app.duplicates.schemas import NotificationReadRequest
 from app.utils.enums import RoleType
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/notifications", tags=["Admin Notifications"])
 
 
@@ -90,9 +93,12 @@ async def stream_notifications(
         RoleType.ADMIN.value if user_role == RoleType.ADMIN.value else str(current_user)
     )
 
+    # Sent by EventSource on reconnect; missed events are replayed first
+    last_event_id = request.headers.get("last-event-id")
+
     async def event_generator():
         print(f"SSE: User {target_id} connected")
-        queue = await realtime_manager.subscribe(target_id)
+        queue = await realtime_manager.subscribe(target_id, last_event_id)
         try:
             while True:
                 if await request.is_disconnected():
@@ -100,9 +106,14 @@ async def stream_notifications(
                     break
 
                 try:
-                    data = await asyncio.wait_for(queue.get(), timeout=20.0)
+                    event = await asyncio.wait_for(queue.get(), timeout=20.0)
+                    if event is None:
+                        # Fell too far behind; the client reconnects and replays
+                        logger.warning(f"SSE: User {target_id} dropped as too slow")
+                        break
+                    event_id, data = event
                     print(f"SSE: Sending data to {target_id}: {data}")
-                    yield f"data: {data}\n\n"
+                    yield f"id: {event_id}\ndata: {data}\n\n"
                 except asyncio.TimeoutError:
                     yield ": keep-alive\n\n"
 
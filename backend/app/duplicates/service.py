@@ -1,13 +1,10 @@
 import difflib
 from sqlalchemy.orm import Session
 from app.duplicates.models import DuplicateUserMatch, AdminNotification
-from app.user_details.schemas import UserDetailsSchema
 from app.user_details.models import UserDetail
-from app.users.models import User
 from app.duplicates import repository
 from app.utils.pagination import create_paginated_response
 from typing import Optional
-from app.core.realtime import realtime_manager
 
 
 def get_string_similarity(str1: str, str2: str) -> float:
@@ -34,251 +31,228 @@ def get_family_member_name(family_details: list, relation: str) -> str:
     return ""
 
 
-async def detect_duplicates(db: Session, new_user_id: int, new_data: UserDetailsSchema):
-    # Step 1: Blocking (Fetch users with same DOB)
-    dob = new_data.personalDetails.dob
-    if not dob:
-        return
-
-    new_user_rec = db.query(User).filter(User.id == new_user_id).first()
-    new_created_at = (
-        new_user_rec.created_at.isoformat()
-        if new_user_rec and new_user_rec.created_at
-        else None
+def get_similarity_upper_bound(str1: str, str2: str) -> float:
+    """
+    Cheap upper bound on ``get_string_similarity`` (difflib's quick_ratio,
+    a character-multiset overlap), used to discard candidates before scoring.
+    """
+    if not str1 and not str2:
+        return 100.0
+    if not str1 or not str2:
+        return 0.0
+    return (
+        difflib.SequenceMatcher(
+            None, str(str1).lower().strip(), str(str2).lower().strip()
+        ).quick_ratio()
+        * 100
     )
 
-    # Fetch users with the same DOB
-    candidates = (
-        db.query(UserDetail)
-        .filter(
-            UserDetail.personal_details["dob"].astext == dob,
-            UserDetail.user_id != new_user_id,
-        )
-        .all()
+
+def _education_string(education_details: list) -> str:
+    return " ".join(
+        [
+            f"{e.get('school', '')} {e.get('board', '')} {e.get('year', '')}"
+            for e in education_details
+        ]
     )
 
-    if not candidates:
-        return
 
-    best_match = None
-    highest_score = 0.0
+def _work_string(work_experience_details: list) -> str:
+    return " ".join(
+        [
+            f"{w.get('company', '')} {w.get('designation', '')} {w.get('joinDate', '')}"
+            for w in work_experience_details
+        ]
+    )
 
-    new_first_name = new_data.personalDetails.firstName
-    new_last_name = new_data.personalDetails.lastName
 
-    # Extract Family
-    new_father = get_family_member_name(
-        [m.model_dump() for m in new_data.familyDetails], "father"
+def _truncate(value: str) -> str:
+    return value.strip()[:100] + ("..." if len(value) > 100 else "")
+
+
+def build_profile(detail: UserDetail, created_at=None) -> dict:
+    """Flatten a saved UserDetail into the strings the matcher compares."""
+    personal = detail.personal_details or {}
+    family = detail.family_details or []
+    return {
+        "user_id": detail.user_id,
+        "personal": personal,
+        "name": f"{personal.get('firstName', '')} {personal.get('lastName', '')}".strip(),
+        "father": get_family_member_name(family, "father"),
+        "mother": get_family_member_name(family, "mother"),
+        "education": _education_string(detail.education_details or []),
+        "work": _work_string(detail.work_experience_details or []),
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+# Name: 40, DOB: 30, Father: 15, Mother: 15
+PRIMARY_WEIGHTS = {"name": 40.0, "father": 15.0, "mother": 15.0}
+DOB_SCORE = 30.0
+PRIMARY_THRESHOLD = 70
+PERSONAL_FIELDS = (
+    "presentAddressLine1",
+    "presentCity",
+    "presentState",
+    "presentPincode",
+)
+
+
+def _could_pass_primary(new: dict, cand: dict, dob_sim: float = 100.0) -> bool:
+    # Upper bounds never undershoot the real ratio, so no match is lost here.
+    best_case = (dob_sim / 100.0) * DOB_SCORE + sum(
+        get_similarity_upper_bound(new[field], cand[field]) / 100.0 * weight
+        for field, weight in PRIMARY_WEIGHTS.items()
     )
-    new_mother = get_family_member_name(
-        [m.model_dump() for m in new_data.familyDetails], "mother"
+    return best_case >= PRIMARY_THRESHOLD
+
+
+def score_candidate(
+    new: dict, cand: dict, dob: Optional[str], dob_sim: float = 100.0
+) -> Optional[dict]:
+    """
+    Full two-stage score of one candidate, or None below 70. Candidates of
+    ``detect_duplicates`` share the DOB; the duplicate sweep passes the DOB
+    similarity of the pair instead.
+    """
+    # Stage 2: Primary Identity Matching
+    name_sim = get_string_similarity(new["name"], cand["name"])
+    father_sim = get_string_similarity(new["father"], cand["father"])
+    mother_sim = get_string_similarity(new["mother"], cand["mother"])
+    primary_score = (
+        (name_sim / 100.0) * PRIMARY_WEIGHTS["name"]
+        + (dob_sim / 100.0) * DOB_SCORE
+        + (father_sim / 100.0) * PRIMARY_WEIGHTS["father"]
+        + (mother_sim / 100.0) * PRIMARY_WEIGHTS["mother"]
     )
+    if primary_score < PRIMARY_THRESHOLD:
+        return None
 
-    for candidate in candidates:
-        cand_personal = candidate.personal_details or {}
-        cand_family = candidate.family_details or []
-
-        cand_first_name = cand_personal.get("firstName", "")
-        cand_last_name = cand_personal.get("lastName", "")
-
-        cand_father = get_family_member_name(cand_family, "father")
-        cand_mother = get_family_member_name(cand_family, "mother")
-
-        cand_user_rec = db.query(User).filter(User.id == candidate.user_id).first()
-        cand_created_at = (
-            cand_user_rec.created_at.isoformat()
-            if cand_user_rec and cand_user_rec.created_at
-            else None
+    # Stage 3: Full Profile Matching
+    personal_sims = [
+        get_string_similarity(
+            str(new["personal"].get(field, "")), str(cand["personal"].get(field, ""))
         )
+        for field in PERSONAL_FIELDS
+    ]
+    personal_sim = sum(personal_sims) / len(personal_sims)
+    edu_sim = get_string_similarity(new["education"], cand["education"])
+    work_sim = get_string_similarity(new["work"], cand["work"])
+
+    full_profile_score = (sum(personal_sims) + edu_sim + work_sim) / (
+        len(personal_sims) + 2
+    )
+    final_score = (primary_score * 0.6) + (full_profile_score * 0.4)
+
+    def summary(profile: dict) -> dict:
+        return {
+            "name": profile["name"],
+            "dob": profile["personal"].get("dob") or dob,
+            "father": profile["father"],
+            "mother": profile["mother"],
+            "created_at": profile["created_at"],
+            "education": _truncate(profile["education"]),
+            "work": _truncate(profile["work"]),
+            "city": profile["personal"].get("presentCity", ""),
+        }
+
+    return {
+        "candidate_user_id": cand["user_id"],
+        "primary_score": primary_score,
+        "final_score": final_score,
+        "match_details": {
+            "new_user": summary(new),
+            "matched_user": summary(cand),
+            "scores": {
+                "name": name_sim,
+                "dob": dob_sim,
+                "father": father_sim,
+                "mother": mother_sim,
+                "personal": personal_sim,
+                "education": edu_sim,
+                "work": work_sim,
+            },
+        },
+    }
 
-        # Stage 2: Primary Identity Matching
-        # Name: 40, DOB: 30, Father: 15, Mother: 15
-
-        # We already know DOB matches perfectly from the query
-        score_dob = 30.0
-
-        new_full_name = f"{new_first_name} {new_last_name}".strip()
-        cand_full_name = f"{cand_first_name} {cand_last_name}".strip()
-        name_sim = get_string_similarity(new_full_name, cand_full_name)
-        score_name = (name_sim / 100.0) * 40.0
-
-        father_sim = get_string_similarity(new_father, cand_father)
-        score_father = (father_sim / 100.0) * 15.0
-
-        mother_sim = get_string_similarity(new_mother, cand_mother)
-        score_mother = (mother_sim / 100.0) * 15.0
-
-        primary_score = score_name + score_dob + score_father + score_mother
 
-        if primary_score < 70:
+def find_best_match(new: dict, candidates: list[dict], dob: str) -> Optional[dict]:
+    best_match = None
+    for cand in candidates:
+        if not _could_pass_primary(new, cand):
             continue
+        match = score_candidate(new, cand, dob)
+        if match and (
+            best_match is None or match["final_score"] > best_match["final_score"]
+        ):
+            best_match = match
+    return best_match
+
+
+def detect_duplicates(db: Session, new_user_id: int) -> Optional[dict]:
+    """
+    Compare a user's saved details with every other profile sharing their DOB
+    and record the best match of 70% or more. Blocking; runs in the duplicate
+    check worker (see duplicates.queue). Returns the admin notification to
+    publish, if any.
+    """
+    loaded = repository.get_detail_with_created_at(db, new_user_id)
+    if not loaded:
+        return None
+    new_detail, new_created_at = loaded
+
+    # Step 1: Blocking (users with the same DOB, via the DOB expression index)
+    dob = (new_detail.personal_details or {}).get("dob")
+    if not dob:
+        return None
 
-        # Stage 3: Full Profile Matching
-        fields_to_compare = []
-
-        # Personal
-        personal_fields = []
-        personal_fields.append(
-            (
-                new_data.personalDetails.presentAddressLine1,
-                cand_personal.get("presentAddressLine1", ""),
-            )
-        )
-        personal_fields.append(
-            (new_data.personalDetails.presentCity, cand_personal.get("presentCity", ""))
-        )
-        personal_fields.append(
-            (
-                new_data.personalDetails.presentState,
-                cand_personal.get("presentState", ""),
-            )
-        )
-        personal_fields.append(
-            (
-                new_data.personalDetails.presentPincode,
-                cand_personal.get("presentPincode", ""),
-            )
-        )
-
-        personal_sim = (
-            sum([get_string_similarity(str(v1), str(v2)) for v1, v2 in personal_fields])
-            / len(personal_fields)
-            if personal_fields
-            else 0
-        )
-        fields_to_compare.extend(personal_fields)
-
-        # Education
-        new_edu = [e.model_dump() for e in new_data.educationDetails]
-        cand_edu = candidate.education_details or []
-        new_edu_str = " ".join(
-            [
-                f"{e.get('school', '')} {e.get('board', '')} {e.get('year', '')}"
-                for e in new_edu
-            ]
-        )
-        cand_edu_str = " ".join(
-            [
-                f"{e.get('school', '')} {e.get('board', '')} {e.get('year', '')}"
-                for e in cand_edu
-            ]
-        )
-
-        edu_sim = get_string_similarity(new_edu_str, cand_edu_str)
-        fields_to_compare.append((new_edu_str, cand_edu_str))
-
-        # Work Exp
-        new_work = [w.model_dump() for w in new_data.workExperienceDetails]
-        cand_work = candidate.work_experience_details or []
-        new_work_str = " ".join(
-            [
-                f"{w.get('company', '')} {w.get('designation', '')} {w.get('joinDate', '')}"
-                for w in new_work
-            ]
-        )
-        cand_work_str = " ".join(
-            [
-                f"{w.get('company', '')} {w.get('designation', '')} {w.get('joinDate', '')}"
-                for w in cand_work
-            ]
-        )
-
-        work_sim = get_string_similarity(new_work_str, cand_work_str)
-        fields_to_compare.append((new_work_str, cand_work_str))
-
-        # Calculate full profile sim
-        total_sim = 0.0
-        for val1, val2 in fields_to_compare:
-            total_sim += get_string_similarity(str(val1), str(val2))
-
-        full_profile_score = (
-            total_sim / len(fields_to_compare) if fields_to_compare else 0
-        )
-
-        final_score = (primary_score * 0.6) + (full_profile_score * 0.4)
-
-        if final_score > highest_score:
-            highest_score = final_score
-            best_match = {
-                "candidate_user_id": candidate.user_id,
-                "primary_score": primary_score,
-                "final_score": final_score,
-                "match_details": {
-                    "new_user": {
-                        "name": new_full_name,
-                        "dob": dob,
-                        "father": new_father,
-                        "mother": new_mother,
-                        "created_at": new_created_at,
-                        "education": new_edu_str.strip()[:100]
-                        + ("..." if len(new_edu_str) > 100 else ""),
-                        "work": new_work_str.strip()[:100]
-                        + ("..." if len(new_work_str) > 100 else ""),
-                        "city": new_data.personalDetails.presentCity,
-                    },
-                    "matched_user": {
-                        "name": cand_full_name,
-                        "dob": dob,
-                        "father": cand_father,
-                        "mother": cand_mother,
-                        "created_at": cand_created_at,
-                        "education": cand_edu_str.strip()[:100]
-                        + ("..." if len(cand_edu_str) > 100 else ""),
-                        "work": cand_work_str.strip()[:100]
-                        + ("..." if len(cand_work_str) > 100 else ""),
-                        "city": cand_personal.get("presentCity", ""),
-                    },
-                    "scores": {
-                        "name": name_sim,
-                        "dob": 100.0,
-                        "father": father_sim,
-                        "mother": mother_sim,
-                        "personal": personal_sim,
-                        "education": edu_sim,
-                        "work": work_sim,
-                    },
-                },
-            }
-
-    if best_match and best_match["final_score"] >= 70:
-        final_score = best_match["final_score"]
-        status = "high" if final_score >= 85 else "possible"
-
-        # Create records
-        match_record = DuplicateUserMatch(
-            new_user_id=new_user_id,
-            matched_user_id=best_match["candidate_user_id"],
-            primary_score=best_match["primary_score"],
-            final_score=final_score,
-            status=status,
-            match_details=best_match["match_details"],
-        )
-        db.add(match_record)
-        db.flush()  # To get match_record.id
+    candidates = [
+        build_profile(detail, created_at)
+        for detail, created_at in repository.get_dob_candidates(db, dob, new_user_id)
+    ]
+    if not candidates:
+        return None
 
-        new_name = best_match["match_details"]["new_user"]["name"]
-        matched_name = best_match["match_details"]["matched_user"]["name"]
+    best_match = find_best_match(
+        build_profile(new_detail, new_created_at), candidates, dob
+    )
+    if not best_match or best_match["final_score"] < 70:
+        return None
+
+    final_score = best_match["final_score"]
+    status = "high" if final_score >= 85 else "possible"
+
+    # Create records
+    match_record = DuplicateUserMatch(
+        new_user_id=new_user_id,
+        matched_user_id=best_match["candidate_user_id"],
+        primary_score=best_match["primary_score"],
+        final_score=final_score,
+        status=status,
+        match_details=best_match["match_details"],
+    )
+    db.add(match_record)
+    db.flush()  # To get match_record.id
 
-        notification = AdminNotification(
-            type="duplicate_user",
-            reference_id=match_record.id,
-            title=f"Potential Duplicate: {new_name}",
-            message=f"A new registration for '{new_name}' matches existing profile '{matched_name}' with a {final_score:.1f}% similarity score. Review required.",
-        )
-        db.add(notification)
-        db.commit()
+    new_name = best_match["match_details"]["new_user"]["name"]
+    matched_name = best_match["match_details"]["matched_user"]["name"]
 
-        # Real-time broadcast to Admin
-        await realtime_manager.publish(
-            {
-                "id": notification.id,
-                "type": notification.type,
-                "title": notification.title,
-                "message": notification.message,
-                "created_at": notification.created_at,
-            },
-            user_id="admin",
-        )
+    notification = AdminNotification(
+        type="duplicate_user",
+        reference_id=match_record.id,
+        title=f"Potential Duplicate: {new_name}",
+        message=f"A new registration for '{new_name}' matches existing profile '{matched_name}' with a {final_score:.1f}% similarity score. Review required.",
+    )
+    db.add(notification)
+    db.commit()
+
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "created_at": notification.created_at,
+    }
 
 
 class DuplicateService:
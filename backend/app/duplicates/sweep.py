@@ -0,0 +1,273 @@
+"""
+Whole-population duplicate sweep.
+
+``detect_duplicates`` compares a saved profile only with profiles of the same
+DOB, so a typo'd DOB or a profile saved before the check existed is never
+cross-checked, and comparing every pair of profiles instead would take n²
+SequenceMatcher calls. The sweep finds candidate pairs in near-linear time:
+
+1. exact blocking keys: mobile number, and pincode + name initials,
+2. MinHash signatures of the character bigrams of the candidate's, father's
+   and mother's names, cut into LSH bands, so profiles with alike names share
+   a bucket with high probability,
+3. candidate pairs are scored in a process pool with ``score_candidate``,
+   whose DOB term becomes the DOB similarity of the pair,
+4. pairs of 70% or more that have no match yet are bulk-inserted as
+   ``DuplicateUserMatch`` rows, each with its admin notification.
+
+Run it with ``scripts/run_duplicate_sweep.py``.
+"""
+
+import itertools
+import logging
+import re
+import time
+import zlib
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.process_pool import map_bounded, new_process_pool
+from app.database.db import SessionLocal
+from app.duplicates import repository
+from app.duplicates.service import (
+    PRIMARY_THRESHOLD,
+    _could_pass_primary,
+    build_profile,
+    score_candidate,
+)
+
+logger = logging.getLogger(__name__)
+
+# 20 bands of 6 rows: pairs whose name bigrams have a Jaccard similarity of
+# 0.75 share a band ~98% of the time (0.6: ~64%), unrelated names sharing a
+# surname (~0.4) rarely do.
+LSH_BANDS = 20
+LSH_ROWS = 6
+# Buckets bigger than this (shared office numbers, placeholder values) are
+# skipped rather than expanded into all their pairs.
+MAX_BUCKET_SIZE = 200
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, _MERSENNE_PRIME, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+_HASH_B = _rng.integers(0, _MERSENNE_PRIME, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join(_NON_ALNUM.sub(" ", str(value or "").lower()).split())
+
+
+def dob_similarity(first: Optional[str], second: Optional[str]) -> float:
+    """
+    100 for the same DOB, 80 for one slip (a wrong or swapped digit, or day and
+    month swapped), 0 otherwise. String similarity would rate any two dates of
+    the same decade ~70%.
+    """
+    a, b = re.sub(r"\D", "", first or ""), re.sub(r"\D", "", second or "")
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    if a == b:
+        return 100.0
+    diffs = [i for i in range(len(a)) if a[i] != b[i]]
+    if len(diffs) == 1:
+        return 80.0
+    if len(diffs) == 2 and diffs[1] == diffs[0] + 1:
+        i = diffs[0]
+        if a[i] == b[i + 1] and a[i + 1] == b[i]:
+            return 80.0
+    # YYYY-MM-DD against YYYY-DD-MM
+    if len(a) == 8 and a[:4] == b[:4] and a[4:6] == b[6:8] and a[6:8] == b[4:6]:
+        return 80.0
+    return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Candidate pairs
+# ---------------------------------------------------------------------------
+
+
+def minhash_signature(profile: dict) -> Optional[np.ndarray]:
+    """MinHash of the name bigrams, or None for a profile without names."""
+    shingles = set()
+    for field in ("name", "father", "mother"):
+        text = _normalize(profile[field])
+        if text:
+            padded = f" {text} "
+            shingles.update(
+                f"{field}:{padded[i:i + 2]}" for i in range(len(padded) - 1)
+            )
+    if not shingles:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode()) & _MERSENNE_PRIME for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    permuted = (_HASH_A[:, None] * hashes[None, :] + _HASH_B[:, None]) % (
+        _MERSENNE_PRIME
+    )
+    return permuted.min(axis=1)
+
+
+def blocking_keys(profile: dict) -> Iterator[tuple]:
+    mobile = re.sub(r"\D", "", profile.get("mobile") or "")[-10:]
+    if len(mobile) == 10:
+        yield ("mobile", mobile)
+
+    pincode = re.sub(r"\D", "", str(profile["personal"].get("presentPincode") or ""))
+    initials = "".join(sorted(word[0] for word in _normalize(profile["name"]).split()))
+    if pincode and initials:
+        yield ("pincode", pincode, initials)
+
+    signature = minhash_signature(profile)
+    if signature is not None:
+        for band, rows in enumerate(signature.reshape(LSH_BANDS, LSH_ROWS)):
+            yield ("lsh", band, rows.tobytes())
+
+
+def candidate_pairs(profiles: list[dict]) -> set[tuple[int, int]]:
+    """Index pairs (i < j) of profiles sharing at least one blocking bucket."""
+    buckets: dict[tuple, list[int]] = defaultdict(list)
+    for index, profile in enumerate(profiles):
+        for key in blocking_keys(profile):
+            buckets[key].append(index)
+
+    pairs = set()
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET_SIZE:
+            logger.warning(f"Duplicate sweep: skipped a bucket of {len(members)}")
+            continue
+        pairs.update(itertools.combinations(members, 2))
+    return pairs
+
+
+# ---------------------------------------------------------------------------
+# Scoring (runs in pool processes)
+# ---------------------------------------------------------------------------
+
+_worker_profiles: list[dict] | None = None
+
+
+def _init_worker(profiles: list[dict]) -> None:
+    global _worker_profiles
+    _worker_profiles = profiles
+
+
+def score_pair(first: dict, second: dict) -> Optional[dict]:
+    """``score_candidate`` for any two profiles; the later user is the new one."""
+    new, cand = (
+        (first, second) if first["user_id"] > second["user_id"] else (second, first)
+    )
+    dob_sim = dob_similarity(new["personal"].get("dob"), cand["personal"].get("dob"))
+    if not _could_pass_primary(new, cand, dob_sim):
+        return None
+    match = score_candidate(new, cand, None, dob_sim)
+    if not match or match["final_score"] < PRIMARY_THRESHOLD:
+        return None
+    return {"new_user_id": new["user_id"], **match}
+
+
+def _score_chunk(
+    pairs: list[tuple[int, int]], profiles: list[dict] | None = None
+) -> list[dict]:
+    profiles = profiles if profiles is not None else _worker_profiles
+    return [
+        match
+        for i, j in pairs
+        if (match := score_pair(profiles[i], profiles[j])) is not None
+    ]
+
+
+def _chunked(pairs: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(pairs)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def score_pairs(
+    profiles: list[dict], pairs: Iterable[tuple[int, int]], processes: int
+) -> list[dict]:
+    chunks = _chunked(pairs, settings.DUPLICATE_SWEEP_CHUNK_SIZE)
+    if processes <= 1:
+        return [match for chunk in chunks for match in _score_chunk(chunk, profiles)]
+
+    matches = []
+    # Every process receives the profiles once, pickled, when it starts
+    with new_process_pool(
+        processes, initializer=_init_worker, initargs=(profiles,)
+    ) as pool:
+        for found in map_bounded(pool, _score_chunk, chunks, processes * 2):
+            matches.extend(found)
+    return matches
+
+
+# ---------------------------------------------------------------------------
+# Sweep
+# ---------------------------------------------------------------------------
+
+
+def _match_records(match: dict) -> dict:
+    final_score = match["final_score"]
+    new_name = match["match_details"]["new_user"]["name"]
+    matched_name = match["match_details"]["matched_user"]["name"]
+    return {
+        "row": {
+            "new_user_id": match["new_user_id"],
+            "matched_user_id": match["candidate_user_id"],
+            "primary_score": match["primary_score"],
+            "final_score": final_score,
+            "status": "high" if final_score >= 85 else "possible",
+            "match_details": match["match_details"],
+            "is_reviewed": False,
+        },
+        "notification": {
+            "type": "duplicate_user",
+            "title": f"Potential Duplicate: {new_name}",
+            "message": f"The duplicate sweep found that '{new_name}' matches existing profile '{matched_name}' with a {final_score:.1f}% similarity score. Review required.",
+            "is_read": False,
+        },
+    }
+
+
+def run_sweep(processes: Optional[int] = None, dry_run: bool = False) -> dict:
+    """Sweep every saved profile for duplicates and record new matches."""
+    processes = settings.DUPLICATE_SWEEP_PROCESSES if processes is None else processes
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        profiles = [
+            dict(build_profile(detail, created_at), mobile=mobile)
+            for detail, created_at, mobile in repository.iter_sweep_profiles(db)
+        ]
+        recorded = repository.get_recorded_pairs(db)
+
+        pairs = [
+            (i, j)
+            for i, j in candidate_pairs(profiles)
+            if frozenset((profiles[i]["user_id"], profiles[j]["user_id"]))
+            not in recorded
+        ]
+        matches = score_pairs(profiles, pairs, processes)
+        matches.sort(key=lambda match: -match["final_score"])
+
+        inserted = 0
+        if not dry_run:
+            inserted = repository.insert_matches(db, list(map(_match_records, matches)))
+            db.commit()
+        return {
+            "profiles": len(profiles),
+            "candidate_pairs": len(pairs),
+            "matches": len(matches),
+            "inserted": inserted,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
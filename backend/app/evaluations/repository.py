@@ -5,7 +5,9 @@ from .schemas import InterviewEvaluationCreate, InterviewEvaluationUpdate
 from app.users.models import User
 from app.classifications.models import Classification
 from app.core.realtime import realtime_manager
-from app.utils.enums import EvaluationStatus
+from app.reports import report_cache
+from app.utils.enums import EvaluationStatus, TotalCountMode
+from app.utils.pagination import paginate_query
 import logging
 
 logger = logging.getLogger(__name__)
@@ -217,6 +219,7 @@ async def update_evaluation(
 
     db.commit()
     db.refresh(db_obj)
+    report_cache.invalidate(db_obj.attempt_id)
 
     # Trigger evaluation_submitted notification for Admin (user_id = None)
     try:
@@ -302,6 +305,7 @@ async def delete_evaluation(db: Session, evaluation_id: int):
 
         db.delete(db_obj)
         db.commit()
+        report_cache.invalidate(db_obj.attempt_id)
     return db_obj
 
 
@@ -312,6 +316,8 @@ def get_all_evaluations_with_details(
     project_lead_id: str | None = None,
     limit: int = 10,
     offset: int = 0,
+    cursor: str | None = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
 ):
     Candidate = aliased(User)
     Lead = aliased(User)
@@ -349,12 +355,18 @@ def get_all_evaluations_with_details(
             | (Candidate.mobile.ilike(f"%{search}%"))
         )
 
-    total_records = query.count()
-    results = (
-        query.order_by(desc(InterviewEvaluation.id)).offset(offset).limit(limit).all()
+    results, total_records, next_cursor = paginate_query(
+        query,
+        InterviewEvaluation.id,
+        InterviewEvaluation.id,
+        lambda row: (row.id, row.id),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        total=total,
     )
 
-    return [dict(r._asdict()) for r in results], total_records
+    return [dict(r._asdict()) for r in results], total_records, next_cursor
 
 
 def get_evaluations_by_candidate_with_details(db: Session, user_id: int):
@@ -5,7 +5,8 @@ from . import repository, schemas
 from app.utils.response_handler import ResponseHandler
 from app.utils.status_codes import StatusCode
 from app.utils.dependencies import authenticate_user
-from app.utils.enums import RoleType, EvaluationStatus
+from app.utils.enums import RoleType, EvaluationStatus, TotalCountMode
+from app.utils.pagination import PaginationParams, create_paginated_response
 
 router = APIRouter()
 
@@ -153,29 +154,34 @@ def list_evaluations_for_admin(
     project_lead_id: str | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
     db: Session = Depends(get_db),
 ):
     try:
         offset = (page - 1) * limit
-        results, total = repository.get_all_evaluations_with_details(
-            db,
-            status=status,
-            search=search,
-            project_lead_id=project_lead_id,
-            limit=limit,
-            offset=offset,
+        results, total_records, next_cursor = (
+            repository.get_all_evaluations_with_details(
+                db,
+                status=status,
+                search=search,
+                project_lead_id=project_lead_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                total=total,
+            )
         )
-        total_pages = (total + limit - 1) // limit
-
-        return ResponseHandler.success(
-            data=results,
-            pagination={
-                "total_records": total,
-                "total_pages": total_pages,
-                "current_page": page,
-                "per_page": limit,
-            },
+        paginated = create_paginated_response(
+            results,
+            total_records,
+            PaginationParams(page=page, limit=limit, cursor=cursor, total=total),
+            next_cursor,
         )
+
+        return ResponseHandler.success(data=results, pagination=paginated["pagination"])
+    except HTTPException:
+        raise
     except Exception as e:
         return ResponseHandler.error(message=str(e))
 
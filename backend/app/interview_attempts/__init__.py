@@ -1 +1,5 @@
-from .models import InterviewRecord  # noqa: F401
+from .models import (  # noqa: F401
+    CandidateLatestAttempt,
+    InterviewRecord,
+    InterviewResponse,
+)
@@ -0,0 +1,250 @@
+"""
+Write-behind buffer for interview autosaves.
+
+Autosaves are written to a Redis hash per attempt (field = question_id) instead
+of rewriting the attempt row on every keystroke batch. Repeated saves for the
+same question coalesce in place, so a flush only ever applies the latest delta
+per question. Attempt ids with pending deltas are tracked in a dirty set which
+any worker can replay, so a crashed worker loses nothing that was acknowledged.
+
+This module only talks to Redis; applying deltas to Postgres lives in
+``repository.flush_buffered_answers``.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "answer_buffer"
+DIRTY_KEY = f"{KEY_PREFIX}:dirty"
+
+
+def _answers_key(attempt_id: int) -> str:
+    return f"{KEY_PREFIX}:{attempt_id}:answers"
+
+
+def _closed_key(attempt_id: int) -> str:
+    return f"{KEY_PREFIX}:{attempt_id}:closed"
+
+
+def _lock_key(attempt_id: int) -> str:
+    return f"{KEY_PREFIX}:{attempt_id}:lock"
+
+
+# Rejects the write once the attempt is closed (submitted), otherwise stores
+# every delta and marks the attempt dirty in a single atomic step.
+# KEYS: answers, closed, dirty   ARGV: ttl, attempt_id, field, value, ...
+_PUSH_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[2])
+return 1
+"""
+
+# Removes only the fields that still hold the flushed value, so a save that
+# landed while the flush was running survives for the next pass.
+# KEYS: answers, dirty   ARGV: attempt_id, field, value, ...
+_ACK_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+local remaining = redis.call('HLEN', KEYS[1])
+if remaining == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return remaining
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class AttemptClosedError(Exception):
+    """Raised when a save arrives for an attempt that is being submitted."""
+
+
+def is_enabled() -> bool:
+    return settings.ANSWER_BUFFER_ENABLED and redis_client is not None
+
+
+def push(attempt_id: int, deltas: dict[int, str]) -> None:
+    """Durably buffer serialized deltas keyed by question id."""
+    if not deltas:
+        return
+    args: list[Any] = [settings.ANSWER_BUFFER_TTL_SECONDS, attempt_id]
+    for question_id, payload in deltas.items():
+        args.extend((question_id, payload))
+
+    stored = redis_client.eval(
+        _PUSH_SCRIPT,
+        3,
+        _answers_key(attempt_id),
+        _closed_key(attempt_id),
+        DIRTY_KEY,
+        *args,
+    )
+    if not stored:
+        raise AttemptClosedError(attempt_id)
+
+
+def has_pending(attempt_id: int) -> bool:
+    if not is_enabled():
+        return False
+    try:
+        return bool(redis_client.sismember(DIRTY_KEY, attempt_id))
+    except Exception as e:
+        logger.error(f"Answer buffer: dirty check failed for {attempt_id}: {e}")
+        return False
+
+
+def pending_count(attempt_id: int) -> int:
+    """Deltas still buffered for an attempt (Redis errors propagate)."""
+    return redis_client.hlen(_answers_key(attempt_id))
+
+
+def read(attempt_id: int) -> dict[str, str]:
+    return redis_client.hgetall(_answers_key(attempt_id))
+
+
+def ack(attempt_id: int, snapshot: dict[str, str]) -> int:
+    args: list[Any] = [attempt_id]
+    for field, value in snapshot.items():
+        args.extend((field, value))
+    return redis_client.eval(_ACK_SCRIPT, 2, _answers_key(attempt_id), DIRTY_KEY, *args)
+
+
+def dirty_attempt_ids() -> list[int]:
+    if not is_enabled():
+        return []
+    return sorted(int(value) for value in redis_client.smembers(DIRTY_KEY))
+
+
+def close(attempt_id: int) -> None:
+    """Stop accepting saves for an attempt (called before submit)."""
+    if is_enabled():
+        redis_client.set(
+            _closed_key(attempt_id), 1, ex=settings.ANSWER_BUFFER_TTL_SECONDS
+        )
+
+
+def reopen(attempt_id: int) -> None:
+    if is_enabled():
+        redis_client.delete(_closed_key(attempt_id))
+
+
+def discard(attempt_id: int) -> None:
+    """Drop anything buffered for an attempt that no longer accepts answers."""
+    forget_context(attempt_id)
+    if not is_enabled():
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.delete(_answers_key(attempt_id))
+        pipe.srem(DIRTY_KEY, attempt_id)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Answer buffer: discard failed for {attempt_id}: {e}")
+
+
+@contextmanager
+def flush_lock(attempt_id: int, wait_seconds: float = 0) -> Iterator[bool]:
+    """
+    Cross-worker lock so only one process applies an attempt's deltas at a
+    time. Yields False if the lock could not be taken within ``wait_seconds``.
+    """
+    token = uuid.uuid4().hex
+    key = _lock_key(attempt_id)
+    deadline = time.monotonic() + wait_seconds
+    acquired = False
+    while True:
+        acquired = bool(
+            redis_client.set(key, token, nx=True, px=settings.ANSWER_BUFFER_LOCK_TTL_MS)
+        )
+        if acquired or time.monotonic() >= deadline:
+            break
+        time.sleep(0.05)
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            redis_client.eval(_RELEASE_SCRIPT, 1, key, token)
+
+
+# ---------------------------------------------------------------------------
+# Per-worker attempt context cache
+# ---------------------------------------------------------------------------
+# Holds what a save needs to validate and label a delta (owner, paper question
+# ids, section per question) so buffered saves never touch Postgres.
+
+_contexts: dict[int, tuple[float, dict]] = {}
+_contexts_lock = threading.Lock()
+
+
+def get_context(attempt_id: int) -> dict | None:
+    with _contexts_lock:
+        entry = _contexts.get(attempt_id)
+    if not entry:
+        return None
+    expires_at, context = entry
+    if expires_at < time.monotonic():
+        forget_context(attempt_id)
+        return None
+    return context
+
+
+def set_context(attempt_id: int, context: dict) -> None:
+    expires_at = time.monotonic() + settings.ANSWER_BUFFER_CONTEXT_TTL_SECONDS
+    with _contexts_lock:
+        _contexts[attempt_id] = (expires_at, context)
+
+
+def forget_context(attempt_id: int) -> None:
+    with _contexts_lock:
+        _contexts.pop(attempt_id, None)
+
+
+# ---------------------------------------------------------------------------
+# Background flusher (one per worker process)
+# ---------------------------------------------------------------------------
+
+
+async def run_flusher(stop_event: asyncio.Event) -> None:
+    """
+    Flush dirty attempts every ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS. The first
+    pass runs immediately on startup, which replays anything left behind by a
+    worker that died before flushing.
+    """
+    from app.core.executor import run_blocking
+    from app.interview_attempts.repository import flush_all_buffered_answers
+
+    interval = settings.ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS
+    while not stop_event.is_set():
+        try:
+            await run_blocking(flush_all_buffered_answers)
+        except Exception as e:
+            logger.error(f"Answer buffer: flush pass failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
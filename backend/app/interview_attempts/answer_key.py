@@ -0,0 +1,189 @@
+"""
+Compiled per-paper answer keys.
+
+An ``AnswerKey`` holds everything grading needs for one paper: marks and
+pre-normalized correct answers per question, the section each question belongs
+to, the grade bands and the paper's subject order. Grading a submission is then
+an in-memory pass over the attempt's responses.
+
+Keys are cached in-process and in Redis. Every paper has a version counter in
+Redis; invalidating a paper bumps it, which makes every worker's in-process copy
+stale at once. Without Redis, in-process copies expire after
+ANSWER_KEY_LOCAL_TTL_SECONDS so other workers converge after an edit.
+
+This module only stores keys; compiling them from the database lives in
+``repository._compile_answer_key``.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "answer_key"
+LOCAL_VERSION = "local"
+
+
+def _payload_key(paper_id: int) -> str:
+    return f"{KEY_PREFIX}:{paper_id}"
+
+
+def _version_key(paper_id: int) -> str:
+    return f"{KEY_PREFIX}:{paper_id}:version"
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    question_id: int
+    marks: float
+    section_code: str
+    section_name: str
+    # Normalized full answer ("" when the question has no answer) and the set
+    # of option keys / normalized parts it is made of.
+    correct_text: str
+    correct_keys: frozenset[str]
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    paper_id: int
+    version: str
+    question_ids: tuple[int, ...]
+    questions: Mapping[int, QuestionKey]
+    grade_settings: tuple[dict, ...]
+    subject_order: Mapping[str, int]
+
+    def to_dict(self) -> dict:
+        return {
+            "paper_id": self.paper_id,
+            "version": self.version,
+            "question_ids": list(self.question_ids),
+            "questions": [
+                [
+                    q.question_id,
+                    q.marks,
+                    q.section_code,
+                    q.section_name,
+                    q.correct_text,
+                    sorted(q.correct_keys),
+                ]
+                for q in self.questions.values()
+            ],
+            "grade_settings": list(self.grade_settings),
+            "subject_order": dict(self.subject_order),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AnswerKey":
+        questions = {
+            row[0]: QuestionKey(
+                question_id=row[0],
+                marks=row[1],
+                section_code=row[2],
+                section_name=row[3],
+                correct_text=row[4],
+                correct_keys=frozenset(row[5]),
+            )
+            for row in data["questions"]
+        }
+        return cls(
+            paper_id=data["paper_id"],
+            version=data["version"],
+            question_ids=tuple(data["question_ids"]),
+            questions=MappingProxyType(questions),
+            grade_settings=tuple(data["grade_settings"]),
+            subject_order=MappingProxyType(data["subject_order"]),
+        )
+
+
+# paper_id -> (expires_at, key); expires_at only matters without Redis.
+_local: dict[int, tuple[float, AnswerKey]] = {}
+_local_lock = threading.Lock()
+
+
+def _current_version(paper_id: int) -> str | None:
+    """Redis version of a paper's key, or None when Redis is unavailable."""
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.get(_version_key(paper_id)) or "0"
+    except Exception as e:
+        logger.error(f"Answer key: version read failed for paper {paper_id}: {e}")
+        return None
+
+
+def lookup(paper_id: int) -> tuple[AnswerKey | None, str]:
+    """
+    Return the cached key (or None) and the version a freshly compiled key
+    must be stored under. Read the version before compiling so an
+    invalidation that lands mid-compile is never masked.
+    """
+    version = _current_version(paper_id)
+
+    with _local_lock:
+        entry = _local.get(paper_id)
+    if entry:
+        expires_at, key = entry
+        if version is None:
+            if key.version == LOCAL_VERSION and expires_at > time.monotonic():
+                return key, LOCAL_VERSION
+        elif key.version == version:
+            return key, version
+
+    if version is None:
+        return None, LOCAL_VERSION
+
+    try:
+        raw = redis_client.get(_payload_key(paper_id))
+        if raw:
+            key = AnswerKey.from_dict(json.loads(raw))
+            if key.version == version:
+                _remember(key)
+                return key, version
+    except Exception as e:
+        logger.error(f"Answer key: read failed for paper {paper_id}: {e}")
+
+    return None, version
+
+
+def store(key: AnswerKey) -> None:
+    _remember(key)
+    if key.version == LOCAL_VERSION or redis_client is None:
+        return
+    try:
+        redis_client.set(
+            _payload_key(key.paper_id),
+            json.dumps(key.to_dict()),
+            ex=settings.ANSWER_KEY_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.error(f"Answer key: write failed for paper {key.paper_id}: {e}")
+
+
+def invalidate(paper_id: int) -> None:
+    """Drop a paper's key everywhere (call after its questions/answers change)."""
+    with _local_lock:
+        _local.pop(paper_id, None)
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.incr(_version_key(paper_id))
+        pipe.delete(_payload_key(paper_id))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Answer key: invalidation failed for paper {paper_id}: {e}")
+
+
+def _remember(key: AnswerKey) -> None:
+    expires_at = time.monotonic() + settings.ANSWER_KEY_LOCAL_TTL_SECONDS
+    with _local_lock:
+        _local[key.paper_id] = (expires_at, key)
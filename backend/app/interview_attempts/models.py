@@ -2,14 +2,18 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Date,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
+    Text,
     TIMESTAMP,
+    UniqueConstraint,
     func,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
 from app.database.db import Base
 
@@ -50,13 +54,13 @@ class InterviewRecord(Base):
     overall_grade = Column(String(20), nullable=False, server_default="N/A")
     subject_grades = Column(JSONB, nullable=False, server_default="[]")
 
+    # Typing-test stats — taken from the typing answer at submit time
+    typing_stats = Column(JSONB, nullable=True)
+
     # Flags
     is_auto_submitted = Column(Boolean, nullable=False, server_default="false")
 
-    # Consolidated responses for all saved answers.
-    # Flat JSON array: [{question_id, section_code, section_name, answer_text,
-    #                    is_attempted, is_auto_saved, is_skipped, manual_marks, saved_at}]
-    responses = Column(JSONB, nullable=False, server_default="[]")
+    # Saved answers live in interview_responses (one row per question).
 
     created_at = Column(
         TIMESTAMP,
@@ -80,3 +84,93 @@ class InterviewRecord(Base):
             name="chk_interview_records_completion_reason",
         ),
     )
+
+
+class InterviewResponse(Base):
+    """One saved answer per (attempt, question); upserted in place on save."""
+
+    __tablename__ = "interview_responses"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    attempt_id = Column(
+        Integer,
+        ForeignKey("interview_records.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+
+    section_code = Column(String(100), nullable=False)
+    section_name = Column(String(255), nullable=False)
+
+    answer_text = Column(Text, nullable=True)
+    is_attempted = Column(Boolean, nullable=False, server_default="false")
+    is_auto_saved = Column(Boolean, nullable=False, server_default="false")
+    is_skipped = Column(Boolean, nullable=False, server_default="false")
+    manual_marks = Column(Numeric(10, 2), nullable=True)
+
+    saved_at = Column(
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        nullable=False,
+    )
+
+    # Also serves every per-attempt lookup (attempt_id is the leading column).
+    __table_args__ = (
+        UniqueConstraint(
+            "attempt_id",
+            "question_id",
+            name="uq_interview_responses_attempt_question",
+        ),
+    )
+
+
+class CandidateLatestAttempt(Base):
+    """
+    Read model: one row per candidate with their latest attempt and latest
+    paper assignment. Maintained by database triggers on interview_records,
+    interview_evaluations and paper_assignments (see migration 3c1d7a9e52f0);
+    the application never writes to it.
+    """
+
+    __tablename__ = "candidate_latest_attempts"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Latest attempt (NULL when the candidate only has an assignment)
+    attempt_id = Column(Integer, nullable=True)
+    paper_id = Column(Integer, nullable=True)
+    status = Column(String(30), nullable=True)
+    completion_reason = Column(String(30), nullable=True)
+    started_at = Column(TIMESTAMP, nullable=True)
+    submitted_at = Column(TIMESTAMP, nullable=True)
+    overall_grade = Column(String(20), nullable=True)
+    typing_stats = Column(JSONB, nullable=True)
+    attempts_count = Column(Integer, nullable=False, server_default="0")
+
+    # Interviewers of the latest attempt: [{"name", "status"}] (completed
+    # first) and their ids for the project-lead filter.
+    interviewers = Column(JSONB, nullable=False, server_default="[]")
+    interviewer_ids = Column(ARRAY(Integer), nullable=False, server_default="{}")
+
+    # Latest paper assignment
+    assignment_id = Column(Integer, nullable=True)
+    assignment_paper_id = Column(Integer, nullable=True)
+    assignment_department_id = Column(Integer, nullable=True)
+    assignment_test_level_id = Column(Integer, nullable=True)
+    assignment_is_attempted = Column(Boolean, nullable=True)
+    assignment_date = Column(Date, nullable=True)
+
+    refreshed_at = Column(
+        TIMESTAMP, server_default=func.current_timestamp(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_candidate_latest_attempts_attempt_id", "attempt_id"),
+        Index(
+            "ix_candidate_latest_attempts_interviewer_ids",
+            "interviewer_ids",
+            postgresql_using="gin",
+        ),
+    )
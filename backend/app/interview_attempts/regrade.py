@@ -0,0 +1,341 @@
+"""
+Bulk regrade of submitted attempts for one paper.
+
+Used after a paper's grade settings change or a question's answer / marks are
+corrected, which leaves stored obtained_marks, overall_grade and
+subject_grades stale. The job:
+
+1. compiles the paper's answer key once,
+2. streams every submitted attempt's responses through a server-side cursor,
+   grouped into chunks of REGRADE_CHUNK_SIZE attempts,
+3. grades chunks in a forkserver process pool (pure CPU work, see
+   ``repository._grade_responses``),
+4. writes each chunk back with one ``UPDATE ... FROM (VALUES ...)``.
+
+Progress events are published to admins over ``realtime_manager``. A row
+changed while the job ran (e.g. manual marks) is skipped, since that change
+already regraded it against the current key.
+"""
+
+import json
+import logging
+from typing import Iterator, Mapping
+
+from sqlalchemy import (
+    TIMESTAMP,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    cast,
+    column,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.background_jobs import BackgroundJobs, ProgressCallback
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.process_pool import map_bounded, new_process_pool
+from app.database.db import SessionLocal, engine
+from app.papers import question_index
+from app.papers.models import Paper
+from app.utils.enums import InterviewStatus
+from .answer_key import QuestionKey
+from .models import InterviewRecord, InterviewResponse
+from . import repository
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_worker_key: tuple[Mapping[int, QuestionKey], tuple, Mapping[str, int]] | None = None
+
+
+def _set_worker_key(
+    question_keys: dict[int, QuestionKey],
+    grade_settings: tuple,
+    subject_order: dict[str, int],
+) -> None:
+    global _worker_key
+    _worker_key = (question_keys, grade_settings, subject_order)
+
+
+def _grade_chunk(chunk: list[tuple[int, object, list[dict]]]) -> list[dict]:
+    question_keys, grade_settings, subject_order = _worker_key
+    rows: list[dict] = []
+    for attempt_id, updated_at, responses in chunk:
+        if responses:
+            graded = repository._grade_responses(
+                responses, question_keys, grade_settings
+            )
+            subject_grades = repository._sort_subject_results(
+                graded["subject_grades"], subject_order
+            )
+        else:
+            graded = {"obtained_marks": 0, "total_marks": 0, "overall_grade": "N/A"}
+            subject_grades = []
+        rows.append(
+            {
+                "id": attempt_id,
+                "updated_at": updated_at,
+                "obtained_marks": graded["obtained_marks"],
+                "total_marks": graded["total_marks"],
+                "overall_grade": graded["overall_grade"],
+                "subject_grades": subject_grades,
+            }
+        )
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Reading / writing
+# ---------------------------------------------------------------------------
+
+
+def _finalized_records_filter(paper_id: int):
+    return (
+        InterviewRecord.paper_id == paper_id,
+        InterviewRecord.status != InterviewStatus.STARTED.value,
+    )
+
+
+def _load_question_keys(paper_id: int) -> tuple[dict, tuple, dict]:
+    db = SessionLocal()
+    try:
+        key = repository._get_answer_key(db, paper_id)
+        question_keys = dict(key.questions)
+
+        # Graded like _recompute_grades: answers to questions since removed
+        # from the paper still count.
+        answered_ids = {
+            qid
+            for (qid,) in db.query(InterviewResponse.question_id)
+            .join(InterviewRecord, InterviewRecord.id == InterviewResponse.attempt_id)
+            .filter(*_finalized_records_filter(paper_id))
+            .distinct()
+        }
+        missing_ids = sorted(answered_ids - question_keys.keys())
+        question_keys.update(repository._compile_question_keys(db, missing_ids))
+
+        return question_keys, key.grade_settings, dict(key.subject_order)
+    finally:
+        db.close()
+
+
+def _count_records(paper_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(func.count(InterviewRecord.id))
+            .filter(*_finalized_records_filter(paper_id))
+            .scalar()
+        )
+    finally:
+        db.close()
+
+
+def _stream_chunks(
+    paper_id: int, chunk_size: int
+) -> Iterator[list[tuple[int, object, list[dict]]]]:
+    """Yield lists of (attempt_id, updated_at, responses) from a server-side cursor."""
+    stmt = (
+        select(
+            InterviewRecord.id,
+            InterviewRecord.updated_at,
+            InterviewResponse.question_id,
+            InterviewResponse.section_code,
+            InterviewResponse.section_name,
+            InterviewResponse.answer_text,
+            InterviewResponse.is_attempted,
+            InterviewResponse.manual_marks,
+        )
+        .outerjoin(
+            InterviewResponse, InterviewResponse.attempt_id == InterviewRecord.id
+        )
+        .where(*_finalized_records_filter(paper_id))
+        .order_by(InterviewRecord.id, InterviewResponse.id)
+    )
+
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size * 20).execute(stmt)
+
+        chunk: list[tuple[int, object, list[dict]]] = []
+        current: tuple[int, object, list[dict]] | None = None
+        for row in result:
+            if current is None or current[0] != row.id:
+                if current is not None:
+                    chunk.append(current)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+                current = (row.id, row.updated_at, [])
+            if row.question_id is not None:
+                current[2].append(
+                    {
+                        "question_id": row.question_id,
+                        "section_code": row.section_code,
+                        "section_name": row.section_name,
+                        "answer_text": row.answer_text,
+                        "is_attempted": row.is_attempted,
+                        "manual_marks": (
+                            float(row.manual_marks)
+                            if row.manual_marks is not None
+                            else None
+                        ),
+                    }
+                )
+        if current is not None:
+            chunk.append(current)
+        if chunk:
+            yield chunk
+
+
+def _write_grades(rows: list[dict]) -> int:
+    """Bulk UPDATE ... FROM (VALUES ...); returns the number of rows written."""
+    if not rows:
+        return 0
+    graded = values(
+        column("id", Integer),
+        column("updated_at", TIMESTAMP),
+        column("obtained_marks", Numeric),
+        column("total_marks", Numeric),
+        column("overall_grade", String),
+        column("subject_grades", Text),
+        name="graded",
+    ).data(
+        [
+            (
+                row["id"],
+                row["updated_at"],
+                row["obtained_marks"],
+                row["total_marks"],
+                row["overall_grade"],
+                json.dumps(row["subject_grades"]),
+            )
+            for row in rows
+        ]
+    )
+    stmt = (
+        update(InterviewRecord)
+        .where(
+            InterviewRecord.id == graded.c.id,
+            InterviewRecord.updated_at == graded.c.updated_at,
+        )
+        .values(
+            obtained_marks=graded.c.obtained_marks,
+            total_marks=graded.c.total_marks,
+            overall_grade=graded.c.overall_grade,
+            subject_grades=cast(graded.c.subject_grades, JSONB),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    db = SessionLocal()
+    try:
+        written = db.execute(stmt).rowcount
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+
+
+def regrade_paper(
+    paper_id: int, job_id: str, on_progress: ProgressCallback | None = None
+) -> dict:
+    """Regrade every submitted attempt of a paper. Blocking; run off the loop."""
+    question_keys, grade_settings, subject_order = _load_question_keys(paper_id)
+    total = _count_records(paper_id)
+    progress = {
+        "type": "regrade_progress",
+        "job_id": job_id,
+        "paper_id": paper_id,
+        "status": "running",
+        "total": total,
+        "processed": 0,
+        "updated": 0,
+    }
+
+    def report(rows: list[dict]) -> None:
+        progress["processed"] += len(rows)
+        progress["updated"] += _write_grades(rows)
+        if on_progress:
+            on_progress(dict(progress))
+
+    if on_progress:
+        on_progress(dict(progress))
+
+    chunks = _stream_chunks(paper_id, settings.REGRADE_CHUNK_SIZE)
+    initargs = (question_keys, grade_settings, subject_order)
+
+    if settings.REGRADE_PROCESSES <= 1 or total <= settings.REGRADE_CHUNK_SIZE:
+        _set_worker_key(*initargs)
+        for chunk in chunks:
+            report(_grade_chunk(chunk))
+    else:
+        with new_process_pool(
+            settings.REGRADE_PROCESSES,
+            initializer=_set_worker_key,
+            initargs=initargs,
+        ) as pool:
+            in_flight = settings.REGRADE_PROCESSES * 2
+            for rows in map_bounded(pool, _grade_chunk, chunks, in_flight):
+                report(rows)
+
+    progress["status"] = "completed"
+    if on_progress:
+        on_progress(dict(progress))
+    return progress
+
+
+_jobs = BackgroundJobs(
+    "Regrade",
+    "regrade_progress",
+    "paper_id",
+    regrade_paper,
+    lambda result: f"{result['updated']}/{result['total']} attempts updated",
+)
+
+
+def schedule_regrade(paper_id: int) -> dict:
+    """Start (or fold into) the background regrade of a paper."""
+    return _jobs.schedule(paper_id)
+
+
+def paper_exists(paper_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Paper.id).filter(Paper.id == paper_id).first() is not None
+    finally:
+        db.close()
+
+
+def _paper_ids_containing_question(question_id: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        return question_index.papers_containing(db, question_id)
+    finally:
+        db.close()
+
+
+async def request_regrade(paper_id: int) -> dict:
+    return await _jobs.request(paper_id)
+
+
+async def request_regrade_for_question(question_id: int) -> list[dict]:
+    paper_ids = await run_blocking(_paper_ids_containing_question, question_id)
+    return [schedule_regrade(paper_id) for paper_id in paper_ids]
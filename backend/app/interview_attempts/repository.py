@@ -1,31 +1,54 @@
 from __future__ import annotations
 
 import json
+import logging
 import math
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from fastapi import HTTPException
-from app.utils.enums import ProcessStatus, RoleType, InterviewStatus, EvaluationStatus
-from sqlalchemy import case, desc, func
-from sqlalchemy.orm import Session
+from app.utils.enums import (
+    ProcessStatus,
+    RoleType,
+    InterviewStatus,
+    EvaluationStatus,
+    TotalCountMode,
+)
+from redis.exceptions import RedisError
+from sqlalchemy import desc, func, select, text, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.orm.attributes import flag_modified
 
-from app.classifications.models import Classification
+from app.classifications import registry as classification_registry
+from app.classifications.registry import ClassificationRegistry
 from app.database.db import SessionLocal
 from app.papers.models import Paper
+from app.reports import report_cache
+from app.auth import revocation
 from app.paper_assignments.models import PaperAssignment
 from app.questions.models import Question
 from app.answer.models import QuestionAnswer
 from app.users.models import User
 from app.utils.status_codes import StatusCode
 from app.user_details.models import UserDetail
-from .models import InterviewRecord
+from .models import CandidateLatestAttempt, InterviewRecord, InterviewResponse
+from . import answer_buffer, answer_key
+from .answer_key import AnswerKey, QuestionKey
 from app.evaluations.models import InterviewEvaluation
 from app.utils.grade_utils import GradeLabel
+from app.utils.pagination import (
+    PaginationParams,
+    count_total,
+    create_paginated_response,
+    paginate_query,
+)
 from datetime import date as dt_date
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -53,6 +76,13 @@ def _split_answer_values(raw_value: str) -> list[str]:
     return [part.strip() for part in raw_value.split(",") if part.strip()]
 
 
+def _answer_value_keys(raw_value: str) -> frozenset[str]:
+    return frozenset(
+        _extract_option_key(p) or _normalize_text(p)
+        for p in _split_answer_values(raw_value)
+    )
+
+
 def _is_answer_correct(user_answer: str, correct_answer: str) -> bool:
     normalized_user = _normalize_text(user_answer)
     normalized_correct = _normalize_text(correct_answer)
@@ -60,11 +90,17 @@ def _is_answer_correct(user_answer: str, correct_answer: str) -> bool:
         return False
     if normalized_user == normalized_correct:
         return True
-    user_parts = _split_answer_values(user_answer)
-    correct_parts = _split_answer_values(correct_answer)
-    user_keys = {_extract_option_key(p) or _normalize_text(p) for p in user_parts}
-    correct_keys = {_extract_option_key(p) or _normalize_text(p) for p in correct_parts}
-    return user_keys == correct_keys
+    return _answer_value_keys(user_answer) == _answer_value_keys(correct_answer)
+
+
+def _matches_answer_key(user_answer: str, key: QuestionKey) -> bool:
+    """``_is_answer_correct`` against a precompiled correct answer."""
+    normalized_user = _normalize_text(user_answer)
+    if not normalized_user or not key.correct_text:
+        return False
+    if normalized_user == key.correct_text:
+        return True
+    return _answer_value_keys(user_answer) == key.correct_keys
 
 
 # ---------------------------------------------------------------------------
@@ -113,16 +149,19 @@ def _get_paper_or_404(db: Session, paper_id: int) -> Paper:
     return paper
 
 
-def _resolve_question_section(db: Session, question: Question) -> tuple[str, str]:
-    default_code = (question.subject_type or "").strip() or "GENERAL"
-    classification = (
-        db.query(Classification)
-        .filter(Classification.code == default_code, Classification.type == "subject")
-        .first()
-    )
-    if classification:
-        return classification.code, classification.name
-    return default_code, default_code.replace("_", " ").title()
+def _resolve_question_section(
+    registry: ClassificationRegistry, question: Question
+) -> tuple[str, str]:
+    code = (question.subject_type or "").strip() or "GENERAL"
+    subject = registry.find("subject", code)
+    if subject:
+        return subject.code, subject.name
+    return code, code.replace("_", " ").title()
+
+
+def _resolve_question_sections(questions: list[Question]) -> dict[int, tuple[str, str]]:
+    registry = classification_registry.current()
+    return {q.id: _resolve_question_section(registry, q) for q in questions}
 
 
 def _get_total_duration_minutes(paper: Paper) -> int:
@@ -137,14 +176,17 @@ def _get_total_duration_minutes(paper: Paper) -> int:
 
 
 def _sort_subject_results_by_paper_order(
-    db: Session,
     paper: Paper | None,
     subject_results: list[dict] | None,
 ) -> list[dict]:
     results = list(subject_results or [])
     if not paper or not results:
         return results
+    return _sort_subject_results(results, _build_subject_order_map(paper))
 
+
+def _build_subject_order_map(paper: Paper) -> dict[str, int]:
+    """Normalized subject name/code -> position of the subject in the paper."""
     subject_data = (
         paper.subject_ids_data if isinstance(paper.subject_ids_data, list) else []
     )
@@ -154,28 +196,16 @@ def _sort_subject_results_by_paper_order(
         if isinstance(item, dict) and item.get("is_selected")
     ]
     if not selected_subjects:
-        return results
+        return {}
 
-    subject_ids = [
-        int(item["subject_id"])
-        for item in selected_subjects
-        if str(item.get("subject_id") or "").isdigit()
-    ]
-    classifications = (
-        db.query(Classification).filter(Classification.id.in_(subject_ids)).all()
-        if subject_ids
-        else []
-    )
-    classification_by_id = {
-        classification.id: classification for classification in classifications
-    }
+    registry = classification_registry.current()
 
     order_map: dict[str, int] = {}
     for fallback_index, item in enumerate(
         sorted(selected_subjects, key=lambda value: int(value.get("order") or 0))
     ):
         subject_id = int(item.get("subject_id") or 0)
-        classification = classification_by_id.get(subject_id)
+        classification = registry.get(subject_id)
         sort_index = int(item.get("order") or fallback_index)
 
         for value in (
@@ -186,6 +216,12 @@ def _sort_subject_results_by_paper_order(
             if value:
                 order_map[_normalize_text(str(value))] = sort_index
 
+    return order_map
+
+
+def _sort_subject_results(
+    results: list[dict], order_map: Mapping[str, int]
+) -> list[dict]:
     if not order_map:
         return results
 
@@ -210,6 +246,62 @@ def _sort_subject_results_by_paper_order(
     ]
 
 
+# ---------------------------------------------------------------------------
+# Answer keys (see answer_key.py)
+# ---------------------------------------------------------------------------
+
+
+def _compile_question_keys(
+    db: Session, question_ids: list[int]
+) -> dict[int, QuestionKey]:
+    if not question_ids:
+        return {}
+    questions = db.query(Question).filter(Question.id.in_(question_ids)).all()
+    correct_answers = dict(
+        db.query(QuestionAnswer.question_id, QuestionAnswer.answer_text)
+        .filter(QuestionAnswer.question_id.in_(question_ids))
+        .all()
+    )
+    sections = _resolve_question_sections(questions)
+
+    question_keys: dict[int, QuestionKey] = {}
+    for q in questions:
+        correct_text = correct_answers.get(q.id) or ""
+        s_code, s_name = sections[q.id]
+        question_keys[q.id] = QuestionKey(
+            question_id=q.id,
+            marks=float(q.marks or 0),
+            section_code=s_code,
+            section_name=s_name,
+            correct_text=_normalize_text(correct_text),
+            correct_keys=_answer_value_keys(correct_text),
+        )
+    return question_keys
+
+
+def _compile_answer_key(db: Session, paper: Paper, version: str) -> AnswerKey:
+    question_ids = _extract_question_ids(paper.question_id)
+    question_keys = _compile_question_keys(db, question_ids)
+    return AnswerKey(
+        paper_id=paper.id,
+        version=version,
+        question_ids=tuple(question_ids),
+        questions=MappingProxyType(
+            {qid: question_keys[qid] for qid in question_ids if qid in question_keys}
+        ),
+        grade_settings=tuple(paper.grade_settings or []),
+        subject_order=MappingProxyType(_build_subject_order_map(paper)),
+    )
+
+
+def _get_answer_key(db: Session, paper_id: int) -> AnswerKey:
+    key, version = answer_key.lookup(paper_id)
+    if key is None:
+        key = _compile_answer_key(db, _get_paper_or_404(db, paper_id), version)
+        answer_key.store(key)
+    return key
+
+
 # ---------------------------------------------------------------------------
 # Grade computation helpers
 # ---------------------------------------------------------------------------
@@ -224,48 +316,23 @@ def _get_grade_label(percentage: float, grade_settings: list) -> str:
     return "N/A"
 
 
-def _recompute_grades(
-    record: InterviewRecord, db: Session, paper_obj: Paper | None = None
-) -> None:
+def _grade_responses(
+    responses: list[dict],
+    question_keys: Mapping[int, QuestionKey],
+    grade_settings: tuple[dict, ...] | list,
+) -> dict:
     """
-    Recompute obtained_marks, total_marks, overall_grade, subject_grades
-    from record.responses JSON array. Modifies record in-place (caller must commit).
+    Pure grading pass over saved responses. Returns obtained_marks,
+    total_marks, overall_grade and subject_grades (in first-seen order).
     """
-    if paper_obj is None:
-        paper_obj = db.query(Paper).filter(Paper.id == record.paper_id).first()
-
-    grade_settings: list = (paper_obj.grade_settings or []) if paper_obj else []
-    responses: list[dict] = list(record.responses or [])
-
-    if not responses:
-        record.total_marks = 0
-        record.obtained_marks = 0
-        record.overall_grade = "N/A"
-        record.subject_grades = []
-        return
-
-    question_ids = [r["question_id"] for r in responses]
-
-    questions = db.query(Question).filter(Question.id.in_(question_ids)).all()
-    questions_map: dict[int, Question] = {q.id: q for q in questions}
-
-    correct_answers = (
-        db.query(QuestionAnswer)
-        .filter(QuestionAnswer.question_id.in_(question_ids))
-        .all()
-    )
-    correct_answers_map: dict[int, QuestionAnswer] = {
-        ca.question_id: ca for ca in correct_answers
-    }
-
     # Maintain insertion order for sections
     section_order: list[str] = []
     section_stats: dict[str, dict] = {}
 
     for resp in responses:
         qid = resp.get("question_id")
-        question = questions_map.get(qid)
-        if not question:
+        key = question_keys.get(qid)
+        if not key:
             continue
 
         s_name = resp.get("section_name", "General")
@@ -286,7 +353,7 @@ def _recompute_grades(
             }
 
         stats = section_stats[s_name]
-        q_marks = float(question.marks or 0)
+        q_marks = key.marks
         stats["total_marks"] += q_marks
         stats["total_questions"] += 1
 
@@ -306,19 +373,8 @@ def _recompute_grades(
                 else:
                     stats["incorrect_count"] += 1
             else:
-                correct_answer = correct_answers_map.get(qid)
-                correct_text = (
-                    correct_answer.answer_text if correct_answer else ""
-                ) or ""
                 user_text = (resp.get("answer_text") or "").strip()
-
-                is_correct = (
-                    _is_answer_correct(user_text, correct_text)
-                    if correct_text.strip()
-                    else False
-                )
-
-                if is_correct:
+                if _matches_answer_key(user_text, key):
                     stats["correct_count"] += 1
                     stats["obtained_marks"] += q_marks
                 else:
@@ -355,15 +411,184 @@ def _recompute_grades(
 
     overall_pct = (total_obtained / total_max * 100) if total_max > 0 else 0
 
-    record.obtained_marks = round(total_obtained, 2)
-    record.total_marks = round(total_max, 2)
-    record.overall_grade = _get_grade_label(overall_pct, grade_settings)
-    record.subject_grades = _sort_subject_results_by_paper_order(
-        db, paper_obj, subject_grades
+    return {
+        "obtained_marks": round(total_obtained, 2),
+        "total_marks": round(total_max, 2),
+        "overall_grade": _get_grade_label(overall_pct, grade_settings),
+        "subject_grades": subject_grades,
+    }
+
+
+def _recompute_grades(record: InterviewRecord, db: Session) -> None:
+    """
+    Recompute obtained_marks, total_marks, overall_grade, subject_grades
+    from the attempt's saved responses and the paper's compiled answer key.
+    Modifies record in-place (caller must commit).
+    """
+    responses: list[dict] = _load_responses(db, record.id)
+
+    if not responses:
+        record.total_marks = 0
+        record.obtained_marks = 0
+        record.overall_grade = "N/A"
+        record.subject_grades = []
+        return
+
+    key = _get_answer_key(db, record.paper_id)
+    question_keys: Mapping[int, QuestionKey] = key.questions
+
+    # Answers to questions that were removed from the paper after they were
+    # saved are still graded, as before the answer key existed.
+    missing_ids = [
+        r["question_id"] for r in responses if r["question_id"] not in question_keys
+    ]
+    if missing_ids:
+        question_keys = {
+            **question_keys,
+            **_compile_question_keys(db, missing_ids),
+        }
+
+    graded = _grade_responses(responses, question_keys, key.grade_settings)
+
+    record.obtained_marks = graded["obtained_marks"]
+    record.total_marks = graded["total_marks"]
+    record.overall_grade = graded["overall_grade"]
+    record.subject_grades = _sort_subject_results(
+        graded["subject_grades"], key.subject_order
     )
     flag_modified(record, "subject_grades")
 
 
+# ---------------------------------------------------------------------------
+# Response store helpers (interview_responses)
+# ---------------------------------------------------------------------------
+
+# Columns a save overwrites; manual_marks / is_skipped survive re-saves.
+_ANSWER_COLUMNS = (
+    "section_code",
+    "section_name",
+    "answer_text",
+    "is_attempted",
+    "is_auto_saved",
+    "saved_at",
+)
+
+
+def _response_to_dict(response: InterviewResponse) -> dict:
+    return {
+        "question_id": response.question_id,
+        "section_code": response.section_code,
+        "section_name": response.section_name,
+        "answer_text": response.answer_text,
+        "is_attempted": response.is_attempted,
+        "is_auto_saved": response.is_auto_saved,
+        "is_skipped": response.is_skipped,
+        "manual_marks": (
+            float(response.manual_marks) if response.manual_marks is not None else None
+        ),
+        "saved_at": response.saved_at.isoformat() if response.saved_at else None,
+    }
+
+
+def _load_responses(db: Session, record_id: int) -> list[dict]:
+    """Saved responses for an attempt, in the order they were first saved."""
+    rows = (
+        db.query(InterviewResponse)
+        .filter(InterviewResponse.attempt_id == record_id)
+        .order_by(InterviewResponse.id)
+        .all()
+    )
+    return [_response_to_dict(row) for row in rows]
+
+
+def _load_answered_question_ids(db: Session, record_id: int) -> set[int]:
+    return {
+        question_id
+        for (question_id,) in db.query(InterviewResponse.question_id).filter(
+            InterviewResponse.attempt_id == record_id
+        )
+    }
+
+
+def _upsert_responses(
+    db: Session, record_id: int, entries: list[dict], only_newer: bool = False
+) -> int:
+    """
+    Single-statement INSERT ... ON CONFLICT upsert of answer entries. With
+    ``only_newer`` an existing row is only overwritten by a later saved_at.
+    Returns the number of rows written.
+    """
+    if not entries:
+        return 0
+    stmt = pg_insert(InterviewResponse).values(
+        [{"attempt_id": record_id, **entry} for entry in entries]
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_interview_responses_attempt_question",
+        set_={column: stmt.excluded[column] for column in _ANSWER_COLUMNS},
+        where=(
+            InterviewResponse.saved_at <= stmt.excluded.saved_at if only_newer else None
+        ),
+    )
+    return db.execute(stmt).rowcount
+
+
+def _insert_missing_responses(db: Session, record_id: int, entries: list[dict]) -> int:
+    if not entries:
+        return 0
+    stmt = (
+        pg_insert(InterviewResponse)
+        .values([{"attempt_id": record_id, **entry} for entry in entries])
+        .on_conflict_do_nothing(constraint="uq_interview_responses_attempt_question")
+    )
+    return db.execute(stmt).rowcount
+
+
+def _refresh_attempt_counts(db: Session, record: InterviewRecord) -> None:
+    attempted_count = (
+        db.query(func.count(InterviewResponse.id))
+        .filter(
+            InterviewResponse.attempt_id == record.id,
+            InterviewResponse.is_attempted.is_(True),
+        )
+        .scalar()
+        or 0
+    )
+    record.attempted_count = attempted_count
+    record.unattempted_count = max(record.total_questions - attempted_count, 0)
+
+
+def _load_json_answers(db: Session, record_ids: list[int]) -> dict[int, list[str]]:
+    """JSON-encoded answers (typing tests) per attempt, in save order."""
+    if not record_ids:
+        return {}
+    rows = (
+        db.query(InterviewResponse.attempt_id, InterviewResponse.answer_text)
+        .filter(
+            InterviewResponse.attempt_id.in_(record_ids),
+            InterviewResponse.answer_text.like("{%"),
+        )
+        .order_by(InterviewResponse.id)
+        .all()
+    )
+    answers: dict[int, list[str]] = {}
+    for attempt_id, answer_text in rows:
+        answers.setdefault(attempt_id, []).append(answer_text)
+    return answers
+
+
+def _compute_typing_stats(db: Session, record_id: int) -> dict | None:
+    """Stats of the first JSON (typing test) answer that carries them."""
+    for answer_text in _load_json_answers(db, [record_id]).get(record_id, []):
+        try:
+            parsed = json.loads(answer_text)
+            if "stats" in parsed:
+                return parsed["stats"]
+        except Exception:
+            pass
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Materialization helper
 # ---------------------------------------------------------------------------
@@ -372,33 +597,28 @@ def _recompute_grades(
 def _materialize_unanswered_entries(
     db: Session, record: InterviewRecord, is_auto_saved: bool
 ) -> None:
-    """Append blank response entries for questions not yet in responses JSON."""
-    paper = _get_paper_or_404(db, record.paper_id)
-    question_ids = _extract_question_ids(paper.question_id)
-    record.total_questions = len(question_ids)
+    """Insert blank response rows for paper questions not answered yet."""
+    key = _get_answer_key(db, record.paper_id)
+    record.total_questions = len(key.question_ids)
 
-    existing = list(record.responses or [])
-    answered_ids = {r["question_id"] for r in existing}
-    missing_ids = [qid for qid in question_ids if qid not in answered_ids]
+    answered_ids = _load_answered_question_ids(db, record.id)
+    missing_ids = [qid for qid in key.question_ids if qid not in answered_ids]
 
     if not missing_ids:
         return
 
-    questions = db.query(Question).filter(Question.id.in_(missing_ids)).all()
-    questions_map = {q.id: q for q in questions}
-    now = datetime.utcnow().isoformat()
+    now = datetime.utcnow()
 
     new_entries: list[dict] = []
     for qid in missing_ids:
-        q = questions_map.get(qid)
+        q = key.questions.get(qid)
         if not q:
             continue
-        s_code, s_name = _resolve_question_section(db, q)
         new_entries.append(
             {
                 "question_id": qid,
-                "section_code": s_code,
-                "section_name": s_name,
+                "section_code": q.section_code,
+                "section_name": q.section_name,
                 "answer_text": None,
                 "is_attempted": False,
                 "is_auto_saved": is_auto_saved,
@@ -408,8 +628,7 @@ def _materialize_unanswered_entries(
             }
         )
 
-    record.responses = existing + new_entries
-    flag_modified(record, "responses")
+    _insert_missing_responses(db, record.id, new_entries)
 
 
 # ---------------------------------------------------------------------------
@@ -417,21 +636,212 @@ def _materialize_unanswered_entries(
 # ---------------------------------------------------------------------------
 
 
-def _serialize_saved_responses(record: InterviewRecord) -> list[dict]:
+def _serialize_saved_responses(db: Session, record_id: int) -> list[dict]:
     return [
         {
             "question_id": r["question_id"],
-            "section_code": r.get("section_code", ""),
-            "section_name": r.get("section_name", ""),
-            "answer_text": r.get("answer_text"),
-            "is_attempted": r.get("is_attempted", False),
-            "is_auto_saved": r.get("is_auto_saved", False),
-            "saved_at": r.get("saved_at"),
+            "section_code": r["section_code"],
+            "section_name": r["section_name"],
+            "answer_text": r["answer_text"],
+            "is_attempted": r["is_attempted"],
+            "is_auto_saved": r["is_auto_saved"],
+            "saved_at": r["saved_at"],
         }
-        for r in (record.responses or [])
+        for r in _load_responses(db, record_id)
     ]
 
 
+# ---------------------------------------------------------------------------
+# Write-behind autosave helpers (see answer_buffer.py)
+# ---------------------------------------------------------------------------
+
+
+def _get_buffer_context(record_id: int, user_id: int) -> dict:
+    """Owner + question -> section map for an active attempt, cached per worker."""
+    context = answer_buffer.get_context(record_id)
+    if context is not None:
+        if context["user_id"] != user_id:
+            raise HTTPException(
+                status_code=StatusCode.NOT_FOUND, detail="Attempt not found"
+            )
+        return context
+
+    db = SessionLocal()
+    try:
+        record = _get_record_or_404(db, record_id, user_id)
+        if record.status != InterviewStatus.STARTED.value:
+            raise HTTPException(
+                status_code=StatusCode.BAD_REQUEST,
+                detail="Cannot save answer. Attempt is already submitted.",
+            )
+
+        key = _get_answer_key(db, record.paper_id)
+        context = {
+            "user_id": user_id,
+            "paper_question_ids": set(key.question_ids),
+            "sections": {
+                qid: (q.section_code, q.section_name)
+                for qid, q in key.questions.items()
+            },
+        }
+        answer_buffer.set_context(record_id, context)
+        return context
+    finally:
+        db.close()
+
+
+def _buffer_answers(
+    record_id: int, user_id: int, answers: list[dict], strict: bool
+) -> tuple[str, dict]:
+    """
+    Validate and push deltas to the answer buffer. With ``strict`` a question
+    outside the paper is an error (single save); otherwise it is skipped, which
+    matches the batch endpoint's behaviour.
+    """
+    context = _get_buffer_context(record_id, user_id)
+    now = datetime.utcnow().isoformat()
+
+    deltas: dict[int, str] = {}
+    for entry in answers:
+        qid = entry["question_id"]
+        if qid not in context["paper_question_ids"]:
+            if strict:
+                raise HTTPException(
+                    status_code=StatusCode.BAD_REQUEST,
+                    detail="Question does not belong to the paper for this attempt.",
+                )
+            continue
+
+        section = context["sections"].get(qid)
+        if not section:
+            if strict:
+                raise HTTPException(
+                    status_code=StatusCode.NOT_FOUND,
+                    detail=f"Question {qid} not found",
+                )
+            continue
+
+        normalized = (entry.get("answer_text") or "").strip()
+        deltas[qid] = json.dumps(
+            {
+                "section_code": section[0],
+                "section_name": section[1],
+                "answer_text": normalized or None,
+                "is_attempted": bool(normalized),
+                "is_auto_saved": entry.get("is_auto_saved", False),
+                "saved_at": now,
+            }
+        )
+
+    try:
+        answer_buffer.push(record_id, deltas)
+    except answer_buffer.AttemptClosedError:
+        answer_buffer.forget_context(record_id)
+        raise HTTPException(
+            status_code=StatusCode.BAD_REQUEST,
+            detail="Cannot save answer. Attempt is already submitted.",
+        )
+    return now, context
+
+
+def _apply_buffered_answers(
+    db: Session, record: InterviewRecord, snapshot: dict[str, str]
+) -> int:
+    """Upsert buffered deltas; a row already holding a later save is kept."""
+    entries: list[dict] = []
+    for field, raw in snapshot.items():
+        delta = json.loads(raw)
+        delta["saved_at"] = datetime.fromisoformat(delta["saved_at"])
+        entries.append({"question_id": int(field), **delta})
+
+    applied = _upsert_responses(db, record.id, entries, only_newer=True)
+    if applied:
+        _refresh_attempt_counts(db, record)
+    return applied
+
+
+def _flush_locked(record_id: int, wait_seconds: float) -> int | None:
+    """Flush under the attempt's flush lock; None when it could not be taken."""
+    with answer_buffer.flush_lock(record_id, wait_seconds) as acquired:
+        if not acquired:
+            if wait_seconds:
+                logger.warning(
+                    f"Answer buffer: timed out waiting to flush attempt {record_id}"
+                )
+            return None
+
+        snapshot = answer_buffer.read(record_id)
+        applied = 0
+        if snapshot:
+            db = SessionLocal()
+            try:
+                record = (
+                    db.query(InterviewRecord)
+                    .filter(InterviewRecord.id == record_id)
+                    .with_for_update()
+                    .first()
+                )
+                if record and record.status == InterviewStatus.STARTED.value:
+                    applied = _apply_buffered_answers(db, record, snapshot)
+                    db.commit()
+                else:
+                    logger.info(
+                        f"Answer buffer: dropping {len(snapshot)} deltas for "
+                        f"inactive attempt {record_id}"
+                    )
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        answer_buffer.ack(record_id, snapshot)
+        return applied
+
+
+def flush_buffered_answers(record_id: int, wait_seconds: float = 0) -> int:
+    """
+    Apply an attempt's buffered autosaves to Postgres. Returns the number of
+    responses written. Deltas for an attempt that is no longer active are
+    dropped, exactly like a late direct save would have been rejected.
+    """
+    if not answer_buffer.has_pending(record_id):
+        return 0
+    return _flush_locked(record_id, wait_seconds) or 0
+
+
+def drain_buffered_answers(record_id: int, wait_seconds: float = 5) -> int:
+    """
+    Flush a closed attempt until nothing is buffered. Raises (503 when the
+    flush lock stays taken) instead of returning with deltas left behind, so
+    a submit never grades or discards answers that were not written.
+    """
+    applied = 0
+    # A save that raced the close lands after the first snapshot: re-check
+    for _ in range(3):
+        if not answer_buffer.pending_count(record_id):
+            return applied
+        flushed = _flush_locked(record_id, wait_seconds)
+        if flushed is None:
+            break
+        applied += flushed
+    raise HTTPException(
+        status_code=StatusCode.SERVICE_UNAVAILABLE,
+        detail="Saved answers are still being written. Please submit again.",
+    )
+
+
+def flush_all_buffered_answers() -> int:
+    """Flush every dirty attempt; used by the interval flusher and shutdown."""
+    flushed = 0
+    for record_id in answer_buffer.dirty_attempt_ids():
+        try:
+            flushed += flush_buffered_answers(record_id)
+        except Exception as exc:
+            logger.error(f"Answer buffer: flush failed for attempt {record_id}: {exc}")
+    return flushed
+
+
 # ===========================================================================
 # Public repository functions
 # ===========================================================================
@@ -456,6 +866,9 @@ def start_attempt(paper_id: int, user_id: int) -> dict:
         )
 
         if existing:
+            if flush_buffered_answers(existing.id, wait_seconds=5):
+                db.refresh(existing)
+
             # Server-side timer enforcement
             if total_dur > 0 and existing.status == InterviewStatus.STARTED.value:
                 started_utc = existing.started_at
@@ -490,7 +903,7 @@ def start_attempt(paper_id: int, user_id: int) -> dict:
                 "is_resumed": True,
                 "paper_question_ids": question_ids,
                 "total_duration_minutes": total_dur,
-                "saved_responses": _serialize_saved_responses(existing),
+                "saved_responses": _serialize_saved_responses(db, existing.id),
             }
 
         record = InterviewRecord(
@@ -542,6 +955,33 @@ def save_answer(
     answer_text: str | None,
     is_auto_saved: bool,
 ) -> dict:
+    if answer_buffer.is_enabled():
+        try:
+            now, context = _buffer_answers(
+                record_id,
+                user_id,
+                [
+                    {
+                        "question_id": question_id,
+                        "answer_text": answer_text,
+                        "is_auto_saved": is_auto_saved,
+                    }
+                ],
+                strict=True,
+            )
+            s_code, s_name = context["sections"][question_id]
+            return {
+                "attempt_id": record_id,
+                "question_id": question_id,
+                "section_code": s_code,
+                "section_name": s_name,
+                "is_attempted": bool((answer_text or "").strip()),
+                "is_auto_saved": is_auto_saved,
+                "saved_at": now,
+            }
+        except RedisError as exc:
+            logger.warning(f"Answer buffer unavailable, writing through: {exc}")
+
     db = SessionLocal()
     try:
         record = _get_record_or_404(db, record_id, user_id)
@@ -552,16 +992,15 @@ def save_answer(
                 detail="Cannot save answer. Attempt is already submitted.",
             )
 
-        paper_question_ids = set(
-            _extract_question_ids(_get_paper_or_404(db, record.paper_id).question_id)
-        )
-        if question_id not in paper_question_ids:
+        # Sections come from the paper's answer key, where they are frozen
+        key = _get_answer_key(db, record.paper_id)
+        if question_id not in key.question_ids:
             raise HTTPException(
                 status_code=StatusCode.BAD_REQUEST,
                 detail="Question does not belong to the paper for this attempt.",
             )
 
-        question = db.query(Question).filter(Question.id == question_id).first()
+        question = key.questions.get(question_id)
         if not question:
             raise HTTPException(
                 status_code=StatusCode.NOT_FOUND,
@@ -570,24 +1009,13 @@ def save_answer(
 
         normalized = (answer_text or "").strip()
         is_attempted = bool(normalized)
-        s_code, s_name = _resolve_question_section(db, question)
-        now = datetime.utcnow().isoformat()
+        s_code, s_name = question.section_code, question.section_name
+        saved_at = datetime.utcnow()
 
-        responses: list[dict] = list(record.responses or [])
-        found = False
-        for resp in responses:
-            if resp.get("question_id") == question_id:
-                resp["answer_text"] = normalized or None
-                resp["is_attempted"] = is_attempted
-                resp["is_auto_saved"] = is_auto_saved
-                resp["section_code"] = s_code
-                resp["section_name"] = s_name
-                resp["saved_at"] = now
-                found = True
-                break
-
-        if not found:
-            responses.append(
+        _upsert_responses(
+            db,
+            record_id,
+            [
                 {
                     "question_id": question_id,
                     "section_code": s_code,
@@ -595,18 +1023,11 @@ def save_answer(
                     "answer_text": normalized or None,
                     "is_attempted": is_attempted,
                     "is_auto_saved": is_auto_saved,
-                    "is_skipped": False,
-                    "manual_marks": None,
-                    "saved_at": now,
+                    "saved_at": saved_at,
                 }
-            )
-
-        record.responses = responses
-        flag_modified(record, "responses")
-
-        attempted_count = sum(1 for r in responses if r.get("is_attempted"))
-        record.attempted_count = attempted_count
-        record.unattempted_count = max(record.total_questions - attempted_count, 0)
+            ],
+        )
+        _refresh_attempt_counts(db, record)
 
         db.commit()
 
@@ -617,7 +1038,7 @@ def save_answer(
             "section_name": s_name,
             "is_attempted": is_attempted,
             "is_auto_saved": is_auto_saved,
-            "saved_at": now,
+            "saved_at": saved_at.isoformat(),
         }
 
     except HTTPException:
@@ -634,6 +1055,17 @@ def save_answers_batch(
     user_id: int,
     answers: list[dict],
 ) -> dict:
+    if answer_buffer.is_enabled():
+        try:
+            now, _ = _buffer_answers(record_id, user_id, answers, strict=False)
+            return {
+                "attempt_id": record_id,
+                "count": len(answers),
+                "saved_at": now,
+            }
+        except RedisError as exc:
+            logger.warning(f"Answer buffer unavailable, writing through: {exc}")
+
     db = SessionLocal()
     try:
         record = _get_record_or_404(db, record_id, user_id)
@@ -644,71 +1076,40 @@ def save_answers_batch(
                 detail="Cannot save answers. Attempt is already submitted.",
             )
 
-        # Get all valid question IDs for this paper
-        paper_question_ids = set(
-            _extract_question_ids(_get_paper_or_404(db, record.paper_id).question_id)
-        )
+        # Paper questions with their frozen sections
+        key = _get_answer_key(db, record.paper_id)
 
-        # Get all questions info in one query for section resolution
-        q_ids_to_fetch = [
-            a["question_id"] for a in answers if a["question_id"] in paper_question_ids
-        ]
-        questions = db.query(Question).filter(Question.id.in_(q_ids_to_fetch)).all()
-        questions_map = {q.id: q for q in questions}
-
-        now = datetime.utcnow().isoformat()
-        responses: list[dict] = list(record.responses or [])
-        resp_map = {r["question_id"]: r for r in responses}
+        saved_at = datetime.utcnow()
+        # Keyed by question so a repeated id in one batch keeps its last value
+        # (ON CONFLICT cannot touch the same row twice in one statement).
+        entries: dict[int, dict] = {}
 
         for entry in answers:
             qid = entry["question_id"]
-            if qid not in paper_question_ids:
-                continue
-
-            question = questions_map.get(qid)
+            question = key.questions.get(qid)
             if not question:
                 continue
 
             normalized = (entry.get("answer_text") or "").strip()
-            is_attempted = bool(normalized)
-            s_code, s_name = _resolve_question_section(db, question)
-
-            if qid in resp_map:
-                resp = resp_map[qid]
-                resp["answer_text"] = normalized or None
-                resp["is_attempted"] = is_attempted
-                resp["is_auto_saved"] = entry.get("is_auto_saved", False)
-                resp["section_code"] = s_code
-                resp["section_name"] = s_name
-                resp["saved_at"] = now
-            else:
-                new_resp = {
-                    "question_id": qid,
-                    "section_code": s_code,
-                    "section_name": s_name,
-                    "answer_text": normalized or None,
-                    "is_attempted": is_attempted,
-                    "is_auto_saved": entry.get("is_auto_saved", False),
-                    "is_skipped": False,
-                    "manual_marks": None,
-                    "saved_at": now,
-                }
-                responses.append(new_resp)
-                resp_map[qid] = new_resp
-
-        record.responses = responses
-        flag_modified(record, "responses")
+            entries[qid] = {
+                "question_id": qid,
+                "section_code": question.section_code,
+                "section_name": question.section_name,
+                "answer_text": normalized or None,
+                "is_attempted": bool(normalized),
+                "is_auto_saved": entry.get("is_auto_saved", False),
+                "saved_at": saved_at,
+            }
 
-        attempted_count = sum(1 for r in responses if r.get("is_attempted"))
-        record.attempted_count = attempted_count
-        record.unattempted_count = max(record.total_questions - attempted_count, 0)
+        _upsert_responses(db, record_id, list(entries.values()))
+        _refresh_attempt_counts(db, record)
 
         db.commit()
 
         return {
             "attempt_id": record_id,
             "count": len(answers),
-            "saved_at": now,
+            "saved_at": saved_at.isoformat(),
         }
 
     except HTTPException:
@@ -731,21 +1132,26 @@ def finalize_attempt(
     own_session = db is None
     if own_session:
         db = SessionLocal()
+    buffered = False
     try:
         record = _get_record_or_404(db, record_id, user_id)
 
         if record.status != InterviewStatus.STARTED.value:
             return get_attempt_summary(record_id, user_id)
 
+        # Refuse further buffered saves, then drain what is already buffered
+        # so grading sees every acknowledged answer.
+        if answer_buffer.is_enabled():
+            buffered = True
+            answer_buffer.close(record_id)
+            if drain_buffered_answers(record_id, wait_seconds=5):
+                db.refresh(record)
+
         # 1. Materialize unanswered questions
         _materialize_unanswered_entries(db, record, is_auto_saved=is_auto_submitted)
 
         # 2. Recount
-        attempted_count = sum(
-            1 for r in (record.responses or []) if r.get("is_attempted")
-        )
-        record.attempted_count = attempted_count
-        record.unattempted_count = max(record.total_questions - attempted_count, 0)
+        _refresh_attempt_counts(db, record)
 
         # 3. Status + timestamps
         record.status = status
@@ -760,8 +1166,8 @@ def finalize_attempt(
             record.active_duration_seconds = current_accumulated + max(int(diff), 0)
 
         # 4. Compute and store grades permanently
-        paper_obj = _get_paper_or_404(db, record.paper_id)
-        _recompute_grades(record, db, paper_obj)
+        _recompute_grades(record, db)
+        record.typing_stats = _compute_typing_stats(db, record.id)
 
         # 5. Update UserDetail
         user_detail = db.query(UserDetail).filter(UserDetail.user_id == user_id).first()
@@ -790,6 +1196,8 @@ def finalize_attempt(
 
         db.commit()
         db.refresh(record)
+        if buffered:
+            answer_buffer.discard(record_id)
 
         return {
             "attempt_id": record.id,
@@ -810,9 +1218,13 @@ def finalize_attempt(
         }
 
     except HTTPException:
+        if buffered:
+            answer_buffer.reopen(record_id)
         raise
     except Exception as exc:
         db.rollback()
+        if buffered:
+            answer_buffer.reopen(record_id)
         raise exc
     finally:
         if own_session:
@@ -844,6 +1256,37 @@ def get_attempt_summary(record_id: int, user_id: int) -> dict:
         db.close()
 
 
+def _attempt_interviewers():
+    """
+    Lateral interviewers of the enclosing query's InterviewRecord, built like
+    candidate_latest_attempts.interviewers.
+    """
+    lead = aliased(User)
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            "name", lead.username, "status", InterviewEvaluation.status
+                        ),
+                        (
+                            InterviewEvaluation.status
+                            == EvaluationStatus.COMPLETED.value
+                        ).desc(),
+                        InterviewEvaluation.updated_at,
+                    )
+                ),
+                text("'[]'::jsonb"),
+            ).label("interviewers")
+        )
+        .select_from(InterviewEvaluation)
+        .join(lead, lead.id == InterviewEvaluation.project_lead_id)
+        .where(InterviewEvaluation.attempt_id == InterviewRecord.id)
+        .lateral("interviewers")
+    )
+
+
 def get_admin_user_results(
     search: str | None = None,
     start_date: str | None = None,
@@ -854,67 +1297,68 @@ def get_admin_user_results(
     project_lead_id: int | None = None,
     page: int = 1,
     limit: int = 10,
+    cursor: str | None = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
 ) -> dict:
     db = SessionLocal()
     try:
         from app.utils.department_helpers import exclude_software_users
 
-        latest_record_ids_query = (
-            db.query(func.max(InterviewRecord.id).label("latest_record_id"))
-            .join(User, User.id == InterviewRecord.user_id)
-            .filter(User.role == RoleType.USER.value)
-        )
-        latest_record_ids_query = exclude_software_users(db, latest_record_ids_query)
-
-        if search:
-            pattern = f"%{search.strip()}%"
-            latest_record_ids_query = latest_record_ids_query.filter(
-                (User.username.ilike(pattern))
-                | (User.mobile.ilike(pattern))
-                | (User.email.ilike(pattern))
-            )
-
-        if start_date or end_date:
+        latest = CandidateLatestAttempt
+        ranged = bool(start_date or end_date)
+        if ranged:
+            # A date range lists each candidate's latest attempt *within the
+            # range*, which need not be the read model's latest attempt, so it
+            # is picked per attempt as before.
             date_col = InterviewRecord.started_at
             if status in ["submitted", "auto_submitted"]:
                 date_col = InterviewRecord.submitted_at
 
+            in_range = db.query(
+                InterviewRecord.user_id,
+                func.max(InterviewRecord.id).label("attempt_id"),
+            )
             if start_date:
-                latest_record_ids_query = latest_record_ids_query.filter(
-                    date_col >= f"{start_date} 00:00:00"
-                )
+                in_range = in_range.filter(date_col >= f"{start_date} 00:00:00")
             if end_date:
-                latest_record_ids_query = latest_record_ids_query.filter(
-                    date_col <= f"{end_date} 23:59:59"
-                )
-
-        latest_record_ids = latest_record_ids_query.group_by(
-            InterviewRecord.user_id
-        ).subquery()
-
-        records_query = (
-            db.query(InterviewRecord, User, Paper.paper_name)
-            .join(
-                latest_record_ids,
-                latest_record_ids.c.latest_record_id == InterviewRecord.id,
+                in_range = in_range.filter(date_col <= f"{end_date} 23:59:59")
+            in_range = in_range.group_by(InterviewRecord.user_id).subquery()
+
+            selected = InterviewRecord
+            base_query = (
+                db.query(latest)
+                .join(in_range, in_range.c.user_id == latest.user_id)
+                .join(InterviewRecord, InterviewRecord.id == in_range.c.attempt_id)
             )
-            .join(User, User.id == InterviewRecord.user_id)
-            .join(Paper, Paper.id == InterviewRecord.paper_id)
+        else:
+            # One row per candidate from the trigger-maintained read model, so
+            # the listing is a single scan of candidate_latest_attempts joined
+            # to the latest record, instead of grouping every attempt to find it.
+            selected = latest
+            base_query = db.query(latest).filter(latest.attempt_id.isnot(None))
+
+        base_query = base_query.join(User, User.id == latest.user_id).filter(
+            User.role == RoleType.USER.value
         )
+        base_query = exclude_software_users(db, base_query)
+
+        if search:
+            pattern = f"%{search.strip()}%"
+            base_query = base_query.filter(
+                (User.username.ilike(pattern))
+                | (User.mobile.ilike(pattern))
+                | (User.email.ilike(pattern))
+            )
 
         # 1. Calculate global breakdown stats based on current search/date filters
         # but BEFORE status/grade filters so cards stay stable
         stats_data = (
-            db.query(
-                InterviewRecord.status,
-                InterviewRecord.overall_grade,
-                func.count(InterviewRecord.id),
+            base_query.with_entities(
+                selected.status,
+                selected.overall_grade,
+                func.count(latest.user_id),
             )
-            .join(
-                latest_record_ids,
-                latest_record_ids.c.latest_record_id == InterviewRecord.id,
-            )
-            .group_by(InterviewRecord.status, InterviewRecord.overall_grade)
+            .group_by(selected.status, selected.overall_grade)
             .all()
         )
         summary_stats = {
@@ -943,67 +1387,89 @@ def get_admin_user_results(
             "poor": sum(s[2] for s in stats_data if s[1] == GradeLabel.POOR),
         }
 
-        # 2. Apply post-subquery filters on the actual record columns for LISTING ONLY
+        # 2. Apply status/grade filters for LISTING ONLY
         if status and status != "all":
-            records_query = records_query.filter(InterviewRecord.status == status)
+            base_query = base_query.filter(selected.status == status)
         if completion_reason and completion_reason != "all":
-            records_query = records_query.filter(
-                InterviewRecord.completion_reason == completion_reason
+            base_query = base_query.filter(
+                selected.completion_reason == completion_reason
             )
         if overall_grade and overall_grade != "all":
-            records_query = records_query.filter(
-                InterviewRecord.overall_grade == overall_grade
-            )
+            base_query = base_query.filter(selected.overall_grade == overall_grade)
 
         if project_lead_id and project_lead_id != "all":
-            records_query = records_query.filter(
-                InterviewRecord.id.in_(
-                    db.query(InterviewEvaluation.attempt_id)
-                    .filter(InterviewEvaluation.project_lead_id == project_lead_id)
-                    .subquery()
+            if ranged:
+                base_query = base_query.filter(
+                    InterviewRecord.id.in_(
+                        select(InterviewEvaluation.attempt_id).where(
+                            InterviewEvaluation.project_lead_id == int(project_lead_id)
+                        )
+                    )
+                )
+            else:
+                base_query = base_query.filter(
+                    latest.interviewer_ids.contains([int(project_lead_id)])
                 )
+
+        if ranged:
+            interviewers = _attempt_interviewers()
+            records_query = base_query.outerjoin(interviewers, true())
+            interviewers_col = interviewers.c.interviewers
+        else:
+            records_query = base_query.join(
+                InterviewRecord, InterviewRecord.id == latest.attempt_id
             )
+            interviewers_col = latest.interviewers
+
+        columns = [
+            InterviewRecord,
+            User,
+            Paper.paper_name,
+            UserDetail.is_interview_submitted,
+            latest.attempts_count,
+            interviewers_col,
+        ]
+        # An exact total for an offset page rides along as a window count; a
+        # cursor page would have the window count only the rows after it.
+        window_total = total == TotalCountMode.EXACT and not cursor
+        if window_total:
+            columns.append(func.count().over().label("total_count"))
 
-        total_items = records_query.count()
-        total_pages = math.ceil(total_items / limit) if limit > 0 else 0
-        records = (
-            records_query.order_by(desc(InterviewRecord.id))
-            .limit(limit)
-            .offset((page - 1) * limit)
-            .all()
+        records_query = (
+            records_query.join(Paper, Paper.id == InterviewRecord.paper_id)
+            .outerjoin(UserDetail, UserDetail.user_id == User.id)
+            .with_entities(*columns)
         )
 
-        results: list[dict] = []
-
-        for record, user, paper_name in records:
-            attempts_count = (
-                db.query(InterviewRecord)
-                .filter(InterviewRecord.user_id == user.id)
-                .count()
-            )
+        selected_id = InterviewRecord.id if ranged else latest.attempt_id
+        records, _, next_cursor = paginate_query(
+            records_query,
+            selected_id,
+            selected_id,
+            lambda row: (row.InterviewRecord.id, row.InterviewRecord.id),
+            limit=limit,
+            offset=(page - 1) * limit,
+            cursor=cursor,
+            total=TotalCountMode.NONE,
+        )
+        if not window_total:
+            total_items = count_total(base_query, total)
+        elif records:
+            total_items = records[0].total_count
+        else:
+            # Past the last page the window has no row to report on
+            total_items = base_query.count() if page > 1 else 0
 
-            # Typing stats — parsed from responses JSON if present
-            typing_stats = None
-            for resp in record.responses or []:
-                answer_text = resp.get("answer_text")
-                if (
-                    answer_text
-                    and isinstance(answer_text, str)
-                    and answer_text.startswith("{")
-                ):
-                    try:
-                        parsed = json.loads(answer_text)
-                        if "stats" in parsed:
-                            typing_stats = parsed["stats"]
-                            break
-                    except Exception:
-                        pass
-
-            # Fetch user details for the submitted flag
-            user_detail = (
-                db.query(UserDetail).filter(UserDetail.user_id == user.id).first()
-            )
+        results: list[dict] = []
 
+        for (
+            record,
+            user,
+            paper_name,
+            is_interview_submitted,
+            attempts_count,
+            interviewer_rows,
+        ) in (row[:6] for row in records):
             results.append(
                 {
                     "user_id": user.id,
@@ -1012,9 +1478,7 @@ def get_admin_user_results(
                     "email": user.email,
                     "is_active": user.is_active,
                     "process_status": user.process_status,
-                    "is_interview_submitted": user_detail.is_interview_submitted
-                    if user_detail
-                    else False,
+                    "is_interview_submitted": bool(is_interview_submitted),
                     "attempts_count": attempts_count,
                     "is_reattempt": attempts_count > 1,
                     "latest_attempt": {
@@ -1032,47 +1496,21 @@ def get_admin_user_results(
                         "obtained_marks": float(record.obtained_marks),
                         "overall_grade": record.overall_grade,
                         "active_duration_seconds": record.active_duration_seconds,
-                        "typing_stats": typing_stats,
+                        "typing_stats": record.typing_stats,
                         "subject_results": record.subject_grades,
-                        "interviewers": [
-                            {"name": row[0], "status": row[1]}
-                            for row in (
-                                db.query(User.username, InterviewEvaluation.status)
-                                .join(
-                                    InterviewEvaluation,
-                                    InterviewEvaluation.project_lead_id == User.id,
-                                )
-                                .filter(InterviewEvaluation.attempt_id == record.id)
-                                .order_by(
-                                    case(
-                                        (
-                                            InterviewEvaluation.status
-                                            == EvaluationStatus.COMPLETED.value,
-                                            0,
-                                        ),
-                                        else_=1,
-                                    ),
-                                    InterviewEvaluation.updated_at.asc(),
-                                )
-                                .all()
-                            )
-                        ],
+                        "interviewers": interviewer_rows,
                     },
                 }
             )
 
-        return {
-            "data": results,
-            "pagination": {
-                "total_records": total_items,
-                "total_pages": total_pages,
-                "current_page": page,
-                "per_page": limit,
-                "has_next": page < total_pages,
-                "has_previous": page > 1,
-            },
-            "summary_stats": summary_stats,
-        }
+        response = create_paginated_response(
+            results,
+            total_items,
+            PaginationParams(page=page, limit=limit, cursor=cursor, total=total),
+            next_cursor,
+        )
+        response["summary_stats"] = summary_stats
+        return response
     finally:
         db.close()
 
@@ -1103,19 +1541,10 @@ def get_admin_user_attempts(user_id: int) -> dict:
 
         attempts: list[dict] = []
         for record, paper_name in records_with_papers:
-            typing_stats = None
-            for resp in record.responses or []:
-                user_answer = resp.get("answer_text")
-                if (
-                    user_answer
-                    and isinstance(user_answer, str)
-                    and user_answer.startswith("{")
-                ):
-                    try:
-                        parsed = json.loads(user_answer)
-                        typing_stats = parsed.get("stats")
-                    except Exception:
-                        pass
+            typing_stats = record.typing_stats
+            if typing_stats is None and record.status == InterviewStatus.STARTED.value:
+                # Not submitted yet, so nothing was stored
+                typing_stats = _compute_typing_stats(db, record.id)
 
             attempts.append(
                 {
@@ -1181,6 +1610,8 @@ def get_admin_user_result_detail(user_id: int, attempt_id: int | None = None) ->
                 status_code=StatusCode.NOT_FOUND,
                 detail="No interview attempt found for this user",
             )
+        if flush_buffered_answers(record.id, wait_seconds=2):
+            db.refresh(record)
 
         paper_obj = db.query(Paper).filter(Paper.id == record.paper_id).first()
 
@@ -1191,7 +1622,7 @@ def get_admin_user_result_detail(user_id: int, attempt_id: int | None = None) ->
         )
 
         # Build detailed answers using stored responses + live question/answer data
-        responses: list[dict] = list(record.responses or [])
+        responses: list[dict] = _load_responses(db, record.id)
         question_ids = [r["question_id"] for r in responses]
 
         questions = (
@@ -1299,7 +1730,6 @@ def get_admin_user_result_detail(user_id: int, attempt_id: int | None = None) ->
         # Grade settings for scale display (not for computation — grades already stored)
         grade_settings = (paper_obj.grade_settings or []) if paper_obj else []
         ordered_subject_results = _sort_subject_results_by_paper_order(
-            db,
             paper_obj,
             record.subject_grades,
         )
@@ -1370,6 +1800,7 @@ def reset_user_today_attempt(user_id: int) -> dict:
         )
 
         if record:
+            answer_buffer.discard(record.id)
             db.delete(record)
 
         user_detail = db.query(UserDetail).filter(UserDetail.user_id == user_id).first()
@@ -1448,6 +1879,7 @@ def reset_user_for_reinterview(user_id: int) -> dict:
                 )
 
         db.commit()
+        revocation.reactivate([user_id])
         return {
             "message": "Re-interview enabled. User will appear in Today's Papers as RETURNING.",
             "reinterview_date": str(dt_date.today()),
@@ -1464,6 +1896,7 @@ def reset_user_for_reinterview(user_id: int) -> dict:
 def assign_manual_marks(
     user_id: int, record_id: int, question_id: int, marks: float
 ) -> dict:
+    flush_buffered_answers(record_id, wait_seconds=2)
     db = SessionLocal()
     try:
         record = _get_record_or_404(db, record_id, user_id)
@@ -1488,28 +1921,27 @@ def assign_manual_marks(
                 detail=f"Marks must be between 0 and {max_marks}",
             )
 
-        # Update manual_marks in responses JSON
-        responses: list[dict] = list(record.responses or [])
-        found = False
-        for resp in responses:
-            if resp.get("question_id") == question_id:
-                resp["manual_marks"] = marks
-                found = True
-                break
+        # Update manual_marks on the saved response
+        updated = (
+            db.query(InterviewResponse)
+            .filter(
+                InterviewResponse.attempt_id == record.id,
+                InterviewResponse.question_id == question_id,
+            )
+            .update({InterviewResponse.manual_marks: marks}, synchronize_session=False)
+        )
 
-        if not found:
+        if not updated:
             raise HTTPException(
                 status_code=StatusCode.NOT_FOUND,
                 detail="Response not found for this question",
             )
 
-        record.responses = responses
-        flag_modified(record, "responses")
-
         # Recompute all grades in one shot
         _recompute_grades(record, db)
 
         db.commit()
+        report_cache.invalidate(record.id)
 
         return {
             "message": "Manual marks applied successfully",
@@ -1529,6 +1961,7 @@ def assign_manual_marks(
 def reset_subject_responses(
     user_id: int, record_id: int, section_names: list[str]
 ) -> dict:
+    flush_buffered_answers(record_id, wait_seconds=2)
     db = SessionLocal()
     try:
         record = (
@@ -1551,23 +1984,32 @@ def reset_subject_responses(
                 detail="Please select at least one subject to reset",
             )
 
-        existing = list(record.responses or [])
-        filtered = [
-            r
+        existing = (
+            db.query(
+                InterviewResponse.id,
+                InterviewResponse.section_name,
+                InterviewResponse.section_code,
+            )
+            .filter(InterviewResponse.attempt_id == record.id)
+            .all()
+        )
+        removed_ids = [
+            r.id
             for r in existing
-            if _normalize_text(str(r.get("section_name") or "")) not in reset_sections
-            and _normalize_text(str(r.get("section_code") or "")) not in reset_sections
+            if _normalize_text(str(r.section_name or "")) in reset_sections
+            or _normalize_text(str(r.section_code or "")) in reset_sections
         ]
 
-        removed_count = len(existing) - len(filtered)
+        removed_count = len(removed_ids)
         if removed_count == 0:
             raise HTTPException(
                 status_code=StatusCode.BAD_REQUEST,
                 detail="No saved responses were found for the selected subjects. Please refresh and try again.",
             )
 
-        record.responses = filtered
-        flag_modified(record, "responses")
+        db.query(InterviewResponse).filter(
+            InterviewResponse.id.in_(removed_ids)
+        ).delete(synchronize_session=False)
 
         # Reset attempt status
         record.started_at = datetime.now(timezone.utc)
@@ -1578,13 +2020,12 @@ def reset_subject_responses(
         record.overall_grade = "N/A"
         record.subject_grades = []
         flag_modified(record, "subject_grades")
+        record.typing_stats = None
 
         # Recount
         paper = _get_paper_or_404(db, record.paper_id)
         record.total_questions = len(_extract_question_ids(paper.question_id))
-        attempted_count = sum(1 for r in filtered if r.get("is_attempted"))
-        record.attempted_count = attempted_count
-        record.unattempted_count = max(record.total_questions - attempted_count, 0)
+        _refresh_attempt_counts(db, record)
 
         # Reset UserDetail + PaperAssignment
         user_detail = db.query(UserDetail).filter(UserDetail.user_id == user_id).first()
@@ -1604,6 +2045,11 @@ def reset_subject_responses(
             assignment.is_attempted = False
 
         db.commit()
+        report_cache.invalidate(record_id)
+        # The attempt is active again; let buffered saves through once more.
+        answer_buffer.forget_context(record_id)
+        if answer_buffer.is_enabled():
+            answer_buffer.reopen(record_id)
         return {
             "message": f"Successfully reset {len(reset_sections)} subjects",
             "removed_responses": removed_count,
@@ -1620,43 +2066,31 @@ def reset_subject_responses(
 def mark_subject_section_as_skipped(
     user_id: int, record_id: int, section_name: str
 ) -> dict:
+    flush_buffered_answers(record_id, wait_seconds=2)
     db = SessionLocal()
     try:
         record = _get_record_or_404(db, record_id, user_id)
-        paper = _get_paper_or_404(db, record.paper_id)
-        question_ids = _extract_question_ids(paper.question_id)
+        key = _get_answer_key(db, record.paper_id)
 
         # Get all questions in this section
-        all_questions = (
-            db.query(Question).filter(Question.id.in_(question_ids)).all()
-            if question_ids
-            else []
-        )
-        section_question_ids: list[int] = []
-        for q in all_questions:
-            _, s_name = _resolve_question_section(db, q)
-            if s_name == section_name:
-                section_question_ids.append(q.id)
+        section_questions = [
+            q for q in key.questions.values() if q.section_name == section_name
+        ]
 
-        if not section_question_ids:
+        if not section_questions:
             return {"message": "No questions found for this section"}
 
-        existing = list(record.responses or [])
-        responded_ids = {r["question_id"] for r in existing}
-        now = datetime.utcnow().isoformat()
+        responded_ids = _load_answered_question_ids(db, record.id)
+        now = datetime.utcnow()
 
         new_entries: list[dict] = []
-        for qid in section_question_ids:
-            if qid not in responded_ids:
-                q = next((x for x in all_questions if x.id == qid), None)
-                if not q:
-                    continue
-                s_code, s_nm = _resolve_question_section(db, q)
+        for q in section_questions:
+            if q.question_id not in responded_ids:
                 new_entries.append(
                     {
-                        "question_id": qid,
-                        "section_code": s_code,
-                        "section_name": s_nm,
+                        "question_id": q.question_id,
+                        "section_code": q.section_code,
+                        "section_name": q.section_name,
                         "answer_text": None,
                         "is_attempted": False,
                         "is_auto_saved": True,
@@ -1667,8 +2101,7 @@ def mark_subject_section_as_skipped(
                 )
 
         if new_entries:
-            record.responses = existing + new_entries
-            flag_modified(record, "responses")
+            _insert_missing_responses(db, record.id, new_entries)
             db.commit()
 
         return {
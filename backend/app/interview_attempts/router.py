@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query
 
 from app.utils.dependencies import authenticate_user, require_roles
+from app.utils.enums import TotalCountMode
 from app.utils.status_codes import ResponseMessage, StatusCode, api_response
 from .schemas import (
     SaveAttemptAnswerRequest,
@@ -101,6 +102,8 @@ async def get_admin_user_results(
     project_lead_id: int | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    total: TotalCountMode = Query(default=TotalCountMode.EXACT),
 ):
     data = await service.get_admin_user_results(
         search=search,
@@ -112,6 +115,8 @@ async def get_admin_user_results(
         project_lead_id=project_lead_id,
         page=page,
         limit=limit,
+        cursor=cursor,
+        total=total,
     )
     return api_response(StatusCode.OK, ResponseMessage.FETCHED, data=data)
 
@@ -194,6 +199,21 @@ async def assign_manual_marks(
     return api_response(StatusCode.OK, ResponseMessage.SUCCESS, data=data)
 
 
+@router.post(
+    "/admin/results/regrade-paper/{paper_id}",
+    dependencies=[Depends(require_roles(["admin"]))],
+)
+async def regrade_paper(
+    paper_id: int,
+):
+    """
+    Regrade every submitted attempt of a paper in the background. Progress is
+    streamed to admins as ``regrade_progress`` notification events.
+    """
+    data = await service.regrade_paper(paper_id=paper_id)
+    return api_response(StatusCode.ACCEPTED, ResponseMessage.SUCCESS, data=data)
+
+
 @router.post(
     "/admin/results/reset-user-subjects/{user_id}",
     dependencies=[Depends(require_roles(["admin"]))],
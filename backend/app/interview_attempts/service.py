@@ -1,13 +1,17 @@
 from fastapi import HTTPException
 
+from app.core.executor import run_blocking
+from app.utils.enums import TotalCountMode
 from app.utils.status_codes import StatusCode
-from . import repository
+from . import regrade, repository
 
 
 class InterviewAttemptService:
     async def start_attempt(self, paper_id: int, user_id: int):
         try:
-            return repository.start_attempt(paper_id=paper_id, user_id=user_id)
+            return await run_blocking(
+                repository.start_attempt, paper_id=paper_id, user_id=user_id
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -24,7 +28,8 @@ class InterviewAttemptService:
         is_auto_saved: bool,
     ):
         try:
-            return repository.save_answer(
+            return await run_blocking(
+                repository.save_answer,
                 record_id=attempt_id,
                 question_id=question_id,
                 user_id=user_id,
@@ -42,7 +47,8 @@ class InterviewAttemptService:
         self, attempt_id: int, user_id: int, answers: list[dict]
     ):
         try:
-            return repository.save_answers_batch(
+            return await run_blocking(
+                repository.save_answers_batch,
                 record_id=attempt_id,
                 user_id=user_id,
                 answers=answers,
@@ -56,7 +62,8 @@ class InterviewAttemptService:
 
     async def submit_attempt(self, attempt_id: int, user_id: int):
         try:
-            return repository.finalize_attempt(
+            return await run_blocking(
+                repository.finalize_attempt,
                 record_id=attempt_id,
                 user_id=user_id,
                 status="submitted",
@@ -72,7 +79,8 @@ class InterviewAttemptService:
 
     async def auto_submit_attempt(self, attempt_id: int, user_id: int):
         try:
-            return repository.finalize_attempt(
+            return await run_blocking(
+                repository.finalize_attempt,
                 record_id=attempt_id,
                 user_id=user_id,
                 status="auto_submitted",
@@ -88,7 +96,9 @@ class InterviewAttemptService:
 
     async def get_summary(self, attempt_id: int, user_id: int):
         try:
-            return repository.get_attempt_summary(record_id=attempt_id, user_id=user_id)
+            return await run_blocking(
+                repository.get_attempt_summary, record_id=attempt_id, user_id=user_id
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -107,9 +117,12 @@ class InterviewAttemptService:
         project_lead_id: int | None = None,
         page: int = 1,
         limit: int = 10,
+        cursor: str | None = None,
+        total: TotalCountMode = TotalCountMode.EXACT,
     ):
         try:
-            return repository.get_admin_user_results(
+            return await run_blocking(
+                repository.get_admin_user_results,
                 search=search,
                 start_date=start_date,
                 end_date=end_date,
@@ -119,6 +132,8 @@ class InterviewAttemptService:
                 project_lead_id=project_lead_id,
                 page=page,
                 limit=limit,
+                cursor=cursor,
+                total=total,
             )
         except HTTPException:
             raise
@@ -131,8 +146,10 @@ class InterviewAttemptService:
         self, user_id: int, attempt_id: int | None = None
     ):
         try:
-            return repository.get_admin_user_result_detail(
-                user_id=user_id, attempt_id=attempt_id
+            return await run_blocking(
+                repository.get_admin_user_result_detail,
+                user_id=user_id,
+                attempt_id=attempt_id,
             )
         except HTTPException:
             raise
@@ -143,7 +160,9 @@ class InterviewAttemptService:
 
     async def get_admin_user_attempts(self, user_id: int):
         try:
-            return repository.get_admin_user_attempts(user_id=user_id)
+            return await run_blocking(
+                repository.get_admin_user_attempts, user_id=user_id
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -153,7 +172,9 @@ class InterviewAttemptService:
 
     async def reset_user_today_attempt(self, user_id: int):
         try:
-            return repository.reset_user_today_attempt(user_id=user_id)
+            return await run_blocking(
+                repository.reset_user_today_attempt, user_id=user_id
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -163,7 +184,7 @@ class InterviewAttemptService:
 
     async def reset_user_details(self, user_id: int):
         try:
-            return repository.reset_user_details(user_id=user_id)
+            return await run_blocking(repository.reset_user_details, user_id=user_id)
         except HTTPException:
             raise
         except Exception as exception:
@@ -173,7 +194,9 @@ class InterviewAttemptService:
 
     async def reset_user_for_reinterview(self, user_id: int):
         try:
-            return repository.reset_user_for_reinterview(user_id=user_id)
+            return await run_blocking(
+                repository.reset_user_for_reinterview, user_id=user_id
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -185,7 +208,8 @@ class InterviewAttemptService:
         self, user_id: int, attempt_id: int, question_id: int, marks: float
     ):
         try:
-            return repository.assign_manual_marks(
+            return await run_blocking(
+                repository.assign_manual_marks,
                 user_id=user_id,
                 record_id=attempt_id,
                 question_id=question_id,
@@ -198,11 +222,27 @@ class InterviewAttemptService:
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
             )
 
+    async def regrade_paper(self, paper_id: int):
+        try:
+            if not await run_blocking(regrade.paper_exists, paper_id):
+                raise HTTPException(
+                    status_code=StatusCode.NOT_FOUND,
+                    detail=f"Paper {paper_id} not found",
+                )
+            return regrade.schedule_regrade(paper_id)
+        except HTTPException:
+            raise
+        except Exception as exception:
+            raise HTTPException(
+                status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
+            )
+
     async def reset_user_subjects(
         self, user_id: int, attempt_id: int, section_names: list[str]
     ):
         try:
-            return repository.reset_subject_responses(
+            return await run_blocking(
+                repository.reset_subject_responses,
                 user_id=user_id,
                 record_id=attempt_id,
                 section_names=section_names,
@@ -216,7 +256,8 @@ class InterviewAttemptService:
 
     async def skip_section(self, attempt_id: int, user_id: int, section_name: str):
         try:
-            return repository.mark_subject_section_as_skipped(
+            return await run_blocking(
+                repository.mark_subject_section_as_skipped,
                 user_id=user_id,
                 record_id=attempt_id,
                 section_name=section_name,
@@ -228,7 +269,9 @@ class InterviewAttemptService:
 
     async def get_active_attempt_status(self, user_id: int):
         try:
-            return repository.get_active_attempt_status(user_id=user_id)
+            return await run_blocking(
+                repository.get_active_attempt_status, user_id=user_id
+            )
         except Exception as exception:
             raise HTTPException(
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
@@ -1,6 +1,8 @@
+import asyncio
 import os
 import uvicorn
 import traceback
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,9 +24,53 @@ from app.locations.routers import router as locations_router
 from app.evaluations.router import router as evaluations_router
 from app.reports.router import router as reports_router
 from app.core.config import settings
+from app.core.executor import blocking_dispatcher, run_blocking
+from app.core.realtime import realtime_manager
+from app.classifications import registry as classification_registry
+from app.interview_attempts import answer_buffer
+from app.interview_attempts.repository import flush_all_buffered_answers
+from app.utils.expiration import run_expiration_scheduler
+from app.duplicates import queue as duplicate_queue
+from app.reports import renderer as report_renderer
+from app.auth.hasher import password_hasher
 from app.utils.status_codes import StatusCode, ResponseMessage, api_response
 
-app = FastAPI(title="Talent Flow ATS")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop_event = asyncio.Event()
+    await realtime_manager.start()
+    await run_blocking(classification_registry.warm)
+    flusher_task = None
+    if answer_buffer.is_enabled():
+        flusher_task = asyncio.create_task(answer_buffer.run_flusher(stop_event))
+    expiration_task = None
+    if settings.EXPIRATION_ENABLED:
+        expiration_task = asyncio.create_task(run_expiration_scheduler(stop_event))
+    duplicate_task = None
+    if duplicate_queue.is_enabled():
+        duplicate_task = asyncio.create_task(
+            duplicate_queue.run_duplicate_worker(stop_event)
+        )
+
+    yield
+
+    stop_event.set()
+    if expiration_task:
+        await expiration_task
+    if duplicate_task:
+        await duplicate_task
+    if flusher_task:
+        await flusher_task
+        # Final drain so nothing acknowledged waits for another worker
+        await run_blocking(flush_all_buffered_answers)
+    await realtime_manager.close()
+    report_renderer.shutdown()
+    password_hasher.shutdown()
+    blocking_dispatcher.shutdown(wait=True)
+
+
+app = FastAPI(title="Talent Flow ATS", lifespan=lifespan)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 1. CORS CONFIGURATION (Should be added early)
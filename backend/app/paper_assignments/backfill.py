@@ -0,0 +1,270 @@
+"""
+Backfill of an auto-assignment rule over the candidates it already covers.
+
+Creating or updating a rule assigns its papers to the matching candidates
+registered (or re-interviewing) on its date, redistributing their AUTO
+assignments that were not attempted yet. Candidates are walked in id order in
+chunks of ASSIGN_BACKFILL_CHUNK_SIZE, one transaction per chunk:
+
+1. the chunk's unattempted AUTO assignments on the date are deleted,
+2. one ``INSERT ... SELECT`` assigns ``paper_ids[(offset + row_number()) % n]``
+   to every candidate of the chunk left without an assignment (round-robin in
+   rule order, continued across chunks by ``offset``),
+3. the newly assigned candidates are marked READY.
+
+Rules covering up to ASSIGN_BACKFILL_INLINE_MAX candidates are backfilled in
+the request; larger ones run as a background job reporting progress to admins
+as ``assignment_backfill_progress`` notification events.
+"""
+
+import logging
+
+from sqlalchemy import Integer, delete, exists, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import array, insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.background_jobs import BackgroundJobs, ProgressCallback
+from app.core.config import settings
+from app.database.db import SessionLocal
+from app.papers.models import Paper
+from app.user_details.models import UserDetail
+from app.users.models import User
+from app.utils.enums import ProcessStatus, RoleType
+from . import balancer
+from .models import AutoAssignmentRule, PaperAssignment
+
+logger = logging.getLogger(__name__)
+
+
+def _candidate_filter(rule: AutoAssignmentRule) -> list:
+    """Users matching Dept/Level AND (Registration Date OR Re-interview Date)."""
+    return [
+        User.department_id == rule.department_id,
+        User.test_level_id == rule.test_level_id,
+        User.role == RoleType.USER.value,
+        User.is_active.is_(True),
+        or_(
+            func.date(User.created_at) == rule.assigned_date,
+            exists().where(
+                UserDetail.user_id == User.id,
+                UserDetail.reinterview_date == rule.assigned_date,
+            ),
+        ),
+    ]
+
+
+def count_candidates(db: Session, rule: AutoAssignmentRule) -> int:
+    return db.scalar(select(func.count(User.id)).where(*_candidate_filter(rule)))
+
+
+def _active_paper_ids(db: Session, rule: AutoAssignmentRule) -> list[int]:
+    """The rule's ACTIVE papers, in rule order."""
+    raw_paper_ids = rule.paper_ids if isinstance(rule.paper_ids, list) else []
+    if not raw_paper_ids:
+        return []
+    active_paper_ids = set(
+        db.scalars(
+            select(Paper.id).where(
+                Paper.id.in_(raw_paper_ids), Paper.is_active.is_(True)
+            )
+        )
+    )
+    return list(
+        dict.fromkeys(int(pid) for pid in raw_paper_ids if int(pid) in active_paper_ids)
+    )
+
+
+def _resolve_assigner(db: Session, rule: AutoAssignmentRule) -> int:
+    # Fallback for assigned_by
+    if db.scalar(select(User.id).where(User.id == rule.created_by)) is not None:
+        return rule.created_by
+    fallback_admin = db.scalar(
+        select(User.id).where(User.role == RoleType.ADMIN.value).limit(1)
+    )
+    return fallback_admin or rule.created_by
+
+
+def _backfill_chunk(
+    db: Session,
+    candidates: list,
+    values: dict,
+    paper_ids: list[int],
+    after: int,
+    offset: int,
+) -> tuple[int | None, int, int]:
+    """
+    Redistribute the next chunk of ``candidates`` with ids above ``after``;
+    ``values`` are the columns shared by every new assignment. Returns (last
+    id of the chunk or None when done, candidates in the chunk, assignments
+    inserted).
+    """
+    chunk = (
+        select(User.id)
+        .where(*candidates, User.id > after)
+        .order_by(User.id)
+        .limit(settings.ASSIGN_BACKFILL_CHUNK_SIZE)
+        .subquery()
+    )
+    upto, size = db.execute(select(func.max(chunk.c.id), func.count())).one()
+    if upto is None:
+        return None, 0, 0
+    in_chunk = [*candidates, User.id > after, User.id <= upto]
+    assigned_date = values["assigned_date"]
+
+    # Unattempted AUTO assignments are redistributed across the current pool
+    db.execute(
+        delete(PaperAssignment).where(
+            PaperAssignment.user_id.in_(select(User.id).where(*in_chunk)),
+            PaperAssignment.assigned_date == assigned_date,
+            PaperAssignment.is_attempted.is_(False),
+            PaperAssignment.assignment_source == "AUTO",
+        )
+    )
+
+    inserted: list[int] = []
+    if paper_ids:
+        # Respect the assignments that remain (started or MANUAL ones)
+        pending = (
+            select(User.id.label("user_id"))
+            .where(
+                *in_chunk,
+                ~exists().where(
+                    PaperAssignment.user_id == User.id,
+                    PaperAssignment.assigned_date == assigned_date,
+                ),
+            )
+            .subquery()
+        )
+        position = func.row_number().over(order_by=pending.c.user_id)
+        # Strict round-robin based on rule sequence (Postgres arrays are 1-based)
+        paper_id = array(paper_ids, type_=Integer)[
+            (offset + position - 1) % len(paper_ids) + 1
+        ]
+        rows = select(
+            pending.c.user_id, paper_id, *(literal(v) for v in values.values())
+        )
+        stmt = (
+            pg_insert(PaperAssignment)
+            .from_select(["user_id", "paper_id", *values], rows)
+            # A candidate auto-assigned on login meanwhile keeps that paper
+            .on_conflict_do_nothing(index_elements=["user_id", "assigned_date"])
+            .returning(PaperAssignment.user_id)
+        )
+        inserted = list(db.scalars(stmt))
+
+    if inserted:
+        db.execute(
+            update(User)
+            .where(User.id.in_(inserted))
+            .values(process_status=ProcessStatus.READY.value)
+        )
+    db.commit()
+    return upto, size, len(inserted)
+
+
+def backfill_rule(
+    db: Session,
+    rule: AutoAssignmentRule,
+    job_id: str | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> dict:
+    """Backfill the rule chunk by chunk. Blocking; run off the loop."""
+    progress = {
+        "type": "assignment_backfill_progress",
+        "job_id": job_id,
+        "rule_id": rule.id,
+        "status": "running",
+        "total": 0,
+        "processed": 0,
+        "assigned": 0,
+    }
+    if not rule.is_active or not rule.paper_ids:
+        progress["status"] = "completed"
+        return progress
+
+    # Read the rule once: chunk commits expire it
+    candidates = _candidate_filter(rule)
+    values = {
+        "department_id": rule.department_id,
+        "test_level_id": rule.test_level_id,
+        "assigned_date": rule.assigned_date,
+        "assigned_by": _resolve_assigner(db, rule),
+        "assignment_source": "AUTO",
+        "auto_rule_id": rule.id,
+    }
+    paper_ids = _active_paper_ids(db, rule)
+    if not paper_ids:
+        logger.warning(
+            f"No active papers found for Auto-Rule {rule.id}. "
+            "Unattempted auto assignments are only cleared."
+        )
+    progress["total"] = db.scalar(select(func.count(User.id)).where(*candidates))
+    if on_progress:
+        on_progress(dict(progress))
+
+    after = 0
+    while True:
+        after, size, inserted = _backfill_chunk(
+            db, candidates, values, paper_ids, after, progress["assigned"]
+        )
+        if after is None:
+            break
+        progress["processed"] += size
+        progress["assigned"] += inserted
+        if on_progress:
+            on_progress(dict(progress))
+
+    progress["status"] = "completed"
+    if on_progress:
+        on_progress(dict(progress))
+    return progress
+
+
+def should_run_inline(db: Session, rule: AutoAssignmentRule) -> bool:
+    if not rule.is_active or not rule.paper_ids:
+        return True
+    return count_candidates(db, rule) <= settings.ASSIGN_BACKFILL_INLINE_MAX
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+
+def _backfill_rule_id(
+    rule_id: int, job_id: str, on_progress: ProgressCallback
+) -> dict | None:
+    db = SessionLocal()
+    try:
+        rule = (
+            db.query(AutoAssignmentRule)
+            .filter(AutoAssignmentRule.id == rule_id)
+            .first()
+        )
+        if rule is None:
+            return None
+        assigned_date = rule.assigned_date
+        result = backfill_rule(db, rule, job_id, on_progress)
+        # The day's assignments moved under the counters: recount on next pick
+        balancer.reset(rule_id, assigned_date)
+        return result
+    finally:
+        db.close()
+
+
+_jobs = BackgroundJobs(
+    "Backfill",
+    "assignment_backfill_progress",
+    "rule_id",
+    _backfill_rule_id,
+    lambda result: f"{result['assigned']}/{result['total']} candidates assigned",
+)
+
+
+def schedule_backfill(rule_id: int) -> dict:
+    """Start (or fold into) the background backfill of a rule."""
+    return _jobs.schedule(rule_id)
+
+
+async def request_backfill(rule_id: int) -> dict:
+    return await _jobs.request(rule_id)
@@ -0,0 +1,120 @@
+"""
+Balanced paper picks for auto-assignment.
+
+A candidate gets the paper of their rule's pool with the fewest assignments
+that day. Counting them on every login raced: concurrent logins read the same
+counts and took the same paper. The counts are kept in Redis instead, seeded
+once from paper_assignments, and ``pick`` takes the least-assigned paper and
+counts it in one Lua call, so concurrent logins spread evenly.
+
+Redis layout:
+    assign:counts:<rule_id>:<date>   HASH paper id -> assignments that day
+                                     (plus a "_seeded" marker), expiring a
+                                     day after the date
+
+Rule edits redistribute the day's assignments, so they ``reset`` the
+counters. Without Redis ``pick`` returns None and the caller counts in
+Postgres instead.
+"""
+
+import logging
+from datetime import date
+from typing import Callable, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TTL_SECONDS = 2 * 86400
+
+# Least-assigned paper of ARGV (first on ties) counted once, or nil unseeded
+_PICK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local best, best_count
+for _, paper_id in ipairs(ARGV) do
+    local count = tonumber(redis.call('HGET', KEYS[1], paper_id) or '0')
+    if best_count == nil or count < best_count then
+        best, best_count = paper_id, count
+    end
+end
+redis.call('HINCRBY', KEYS[1], best, 1)
+return best
+"""
+
+# ARGV: ttl, then paper id / count pairs; a no-op when already seeded
+_SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], '_seeded', 1)
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Uncount ARGV[1], unless the counters were reset or expired meanwhile (the
+# reseed already left the unsaved pick out)
+_RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+return 1
+"""
+
+
+def _counter_key(rule_id: int, assigned_date: date) -> str:
+    return f"assign:counts:{rule_id}:{assigned_date.isoformat()}"
+
+
+def pick(
+    rule_id: int,
+    assigned_date: date,
+    paper_ids: list[int],
+    load_counts: Callable[[], dict[int, int]],
+) -> Optional[int]:
+    """
+    Least-assigned of ``paper_ids`` (first on ties), already counted, or None
+    when Redis is unavailable. ``load_counts`` seeds the day's counters.
+    """
+    if redis_client is None or not paper_ids:
+        return None
+    key = _counter_key(rule_id, assigned_date)
+    try:
+        for _ in range(2):
+            picked = redis_client.eval(_PICK_SCRIPT, 1, key, *paper_ids)
+            if picked is not None:
+                return int(picked)
+            seed = [item for pair in load_counts().items() for item in pair]
+            redis_client.eval(_SEED_SCRIPT, 1, key, COUNTER_TTL_SECONDS, *seed)
+    except RedisError as e:
+        logger.warning(f"Assignment counters unavailable for rule {rule_id}: {e}")
+    return None
+
+
+def release(rule_id: int, assigned_date: date, paper_id: int) -> None:
+    """Uncount a pick whose assignment was not saved."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.eval(
+            _RELEASE_SCRIPT, 1, _counter_key(rule_id, assigned_date), paper_id
+        )
+    except RedisError as e:
+        logger.warning(f"Could not release paper {paper_id} of rule {rule_id}: {e}")
+
+
+def reset(rule_id: int, assigned_date: date) -> None:
+    """Drop the counters; the next pick reseeds them from the database."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.delete(_counter_key(rule_id, assigned_date))
+    except RedisError as e:
+        logger.error(f"Could not reset assignment counters of rule {rule_id}: {e}")
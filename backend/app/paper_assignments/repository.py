@@ -11,10 +11,13 @@ from app.questions import repository as question_repository
 from app.users.models import User
 from app.utils.status_codes import StatusCode
 from app.utils.enums import ProcessStatus, RoleType
-from app.core.redis_client import get_cached_data, set_cached_data
+from app.core import cache
+from app.classifications.repository import CACHE_TAG as CLASSIFICATIONS_TAG
+from app.departments.repository import CACHE_TAG as DEPARTMENTS_TAG
 
 from sqlalchemy import func, or_
 from app.user_details.models import UserDetail
+from . import backfill, balancer, snapshot
 from .models import PaperAssignment, AutoAssignmentRule
 from .schemas import (
     PaperAssignmentCreate,
@@ -59,9 +62,12 @@ def create_auto_assignment_rule(
     db.refresh(existing)
 
     # Backfill for existing users if rule is created for Today
-    backfill_assignments_for_rule(db, existing)
+    backfilled = backfill_assignments_for_rule(db, existing)
+    _auto_rule_changed(existing.id, existing.assigned_date)
 
-    return get_auto_assignment_rule(db, existing.id)
+    rule = get_auto_assignment_rule(db, existing.id)
+    rule.backfill_scheduled = not backfilled
+    return rule
 
 
 def get_auto_assignment_rule(db: Session, rule_id: int) -> AutoAssignmentRule | None:
@@ -191,6 +197,7 @@ def update_auto_assignment_rule(
             detail="Cannot set auto-assignment rule date to a past date.",
         )
 
+    previous_date = rule.assigned_date
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(rule, key, value)
 
@@ -198,9 +205,12 @@ def update_auto_assignment_rule(
     db.refresh(rule)
 
     # Backfill for existing users if rule is updated
-    backfill_assignments_for_rule(db, rule)
+    backfilled = backfill_assignments_for_rule(db, rule)
+    _auto_rule_changed(rule.id, previous_date, rule.assigned_date)
 
-    return get_auto_assignment_rule(db, rule.id)
+    rule = get_auto_assignment_rule(db, rule.id)
+    rule.backfill_scheduled = not backfilled
+    return rule
 
 
 def delete_auto_assignment_rule(db: Session, rule_id: int) -> dict:
@@ -215,110 +225,79 @@ def delete_auto_assignment_rule(db: Session, rule_id: int) -> dict:
         {PaperAssignment.auto_rule_id: None}, synchronize_session=False
     )
 
+    assigned_date = rule.assigned_date
     db.delete(rule)
     db.commit()
+    _auto_rule_changed(rule_id, assigned_date)
     return {"message": "Rule deleted successfully"}
 
 
-def backfill_assignments_for_rule(db: Session, rule: AutoAssignmentRule):
+def backfill_assignments_for_rule(db: Session, rule: AutoAssignmentRule) -> bool:
     """
-    Optimized Bulk Backfill:
-    Finds all unassigned users matching the rule and assigns them papers
-    in a single transaction using in-memory distribution logic.
+    Assign the rule's papers to the matching candidates it already covers
+    (see ``backfill``). Large candidate pools are left to a background job:
+    returns False when the caller must schedule ``backfill.request_backfill``.
     """
-    if not rule.is_active or not rule.paper_ids:
-        return
+    if not backfill.should_run_inline(db, rule):
+        return False
+    backfill.backfill_rule(db, rule)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Auto-assignment on login
+# ---------------------------------------------------------------------------
+
+# Plans (the active rule of a department, level and date with its active
+# papers) are cached until a rule or a paper changes
+AUTO_RULES_TAG = "auto_assignment_rules"
 
-    # 1. Find all users matching Dept/Level AND (Registration Date OR Re-interview Date)
-    matching_users = (
-        db.query(User.id)
-        .outerjoin(UserDetail, User.id == UserDetail.user_id)
-        .filter(
-            User.department_id == rule.department_id,
-            User.test_level_id == rule.test_level_id,
-            User.role == RoleType.USER.value,
-            User.is_active.is_(True),
-            or_(
-                func.date(User.created_at) == rule.assigned_date,
-                UserDetail.reinterview_date == rule.assigned_date,
-            ),
-        )
-        .all()
-    )
-    user_ids = [u.id for u in matching_users]
-    if not user_ids:
-        return
 
-    # 2. Identify users who ALREADY started the interview (Don't touch them)
-    started_assignments = (
-        db.query(PaperAssignment.user_id)
+def _auto_rule_plan_key(
+    department_id: int, test_level_id: int, assigned_date: date
+) -> str:
+    return f"auto_rule_plan:{department_id}:{test_level_id}:{assigned_date.isoformat()}"
+
+
+def _auto_rule_changed(rule_id: int, *assigned_dates: date) -> None:
+    cache.invalidate_tags(AUTO_RULES_TAG)
+    # The backfill redistributed the day's assignments: recount on next pick
+    for assigned_date in set(assigned_dates):
+        balancer.reset(rule_id, assigned_date)
+
+
+def _load_auto_rule_plan(
+    db: Session, department_id: int, test_level_id: int, assigned_date: date
+) -> dict:
+    """Plan of the active rule, or {} (cached as well) when nothing applies."""
+    rule = (
+        db.query(AutoAssignmentRule)
         .filter(
-            PaperAssignment.assigned_date == rule.assigned_date,
-            PaperAssignment.user_id.in_(user_ids),
-            PaperAssignment.is_attempted.is_(True),
+            AutoAssignmentRule.department_id == department_id,
+            AutoAssignmentRule.test_level_id == test_level_id,
+            AutoAssignmentRule.assigned_date == assigned_date,
+            AutoAssignmentRule.is_active.is_(True),
         )
-        .all()
+        .first()
     )
-    started_user_ids = {a.user_id for a in started_assignments}
-
-    # Potential users to assign or re-assign
-    assignable_user_ids = [uid for uid in user_ids if uid not in started_user_ids]
-    if not assignable_user_ids:
-        return
-
-    # 3. Delete existing AUTO assignments that HAVEN'T started yet
-    # This allows us to redistribute them across the updated paper pool
-    db.query(PaperAssignment).filter(
-        PaperAssignment.user_id.in_(assignable_user_ids),
-        PaperAssignment.assigned_date == rule.assigned_date,
-        PaperAssignment.is_attempted.is_(False),
-        PaperAssignment.assignment_source == "AUTO",
-    ).delete(synchronize_session=False)
-
-    # CRITICAL: Flush deletions so the next count query doesn't include them
-    db.flush()
-
-    # Re-check for remaining assignments (e.g. MANUAL ones that we should respect)
-    remaining_assignments = (
-        db.query(PaperAssignment.user_id)
-        .filter(
-            PaperAssignment.assigned_date == rule.assigned_date,
-            PaperAssignment.user_id.in_(assignable_user_ids),
-        )
-        .all()
+    raw_paper_ids = (
+        rule.paper_ids if rule is not None and isinstance(rule.paper_ids, list) else []
     )
-    remaining_user_ids = {a.user_id for a in remaining_assignments}
-
-    pending_user_ids = [
-        uid for uid in assignable_user_ids if uid not in remaining_user_ids
-    ]
-
-    if not pending_user_ids:
-        return
-
-    # 4. Bulk Distribution Logic
-    raw_paper_ids = rule.paper_ids if isinstance(rule.paper_ids, list) else []
     if not raw_paper_ids:
-        db.commit()  # Commit deletions if any
-        return
+        return {}
 
-    # Filter only ACTIVE papers while PRESERVING rule order and ensuring INT type
-    active_ids_query = (
-        db.query(Paper.id)
+    # Only ACTIVE papers, in rule order
+    active_paper_ids = {
+        p.id
+        for p in db.query(Paper.id)
         .filter(Paper.id.in_(raw_paper_ids), Paper.is_active.is_(True))
         .all()
+    }
+    paper_ids = list(
+        dict.fromkeys(int(pid) for pid in raw_paper_ids if int(pid) in active_paper_ids)
     )
-    active_paper_ids = {p.id for p in active_ids_query}
-
-    # Ensure all IDs are treated as integers for robust matching
-    paper_ids = [int(pid) for pid in raw_paper_ids if int(pid) in active_paper_ids]
-
     if not paper_ids:
-        print(
-            f"WARNING: No active papers found for Auto-Rule {rule.id}. Deletions committed."
-        )
-        db.commit()
-        return
+        return {}
 
     # Fallback for assigned_by
     assigner_id = rule.created_by
@@ -329,34 +308,32 @@ def backfill_assignments_for_rule(db: Session, rule: AutoAssignmentRule):
         )
         assigner_id = fallback_admin.id if fallback_admin else rule.created_by
 
-    # Sort pending users by ID for deterministic order
-    pending_user_ids.sort()
-
-    new_assignments = []
-    for i, uid in enumerate(pending_user_ids):
-        # Strict Round-robin based on rule sequence
-        best_paper_id = paper_ids[i % len(paper_ids)]
-
-        assignment = PaperAssignment(
-            user_id=uid,
-            paper_id=best_paper_id,
-            department_id=rule.department_id,
-            test_level_id=rule.test_level_id,
-            assigned_date=rule.assigned_date,
-            assigned_by=assigner_id,
-            assignment_source="AUTO",
-            auto_rule_id=rule.id,
-        )
-        new_assignments.append(assignment)
+    return {"rule_id": rule.id, "paper_ids": paper_ids, "assigned_by": assigner_id}
 
-    if new_assignments:
-        db.add_all(new_assignments)
-        # Update status to ready
-        db.query(User).filter(User.id.in_(pending_user_ids)).update(
-            {User.process_status: ProcessStatus.READY.value}, synchronize_session=False
-        )
 
-    db.commit()
+def get_auto_rule_plan(
+    db: Session, department_id: int, test_level_id: int, assigned_date: date
+) -> dict:
+    return cache.get_or_load(
+        _auto_rule_plan_key(department_id, test_level_id, assigned_date),
+        lambda: _load_auto_rule_plan(db, department_id, test_level_id, assigned_date),
+        tags=(AUTO_RULES_TAG,),
+    )
+
+
+def _count_assignments(
+    db: Session, paper_ids: list[int], assigned_date: date
+) -> dict[int, int]:
+    counts = (
+        db.query(PaperAssignment.paper_id, func.count(PaperAssignment.id))
+        .filter(
+            PaperAssignment.assigned_date == assigned_date,
+            PaperAssignment.paper_id.in_(paper_ids),
+        )
+        .group_by(PaperAssignment.paper_id)
+        .all()
+    )
+    return dict(counts)
 
 
 def assign_best_paper(
@@ -366,19 +343,9 @@ def assign_best_paper(
     test_level_id: int,
     assigned_date: date,
 ) -> PaperAssignment | None:
-    # 1. Find the active rule for this Dept/Level on this Date
-    rule = (
-        db.query(AutoAssignmentRule)
-        .filter(
-            AutoAssignmentRule.department_id == department_id,
-            AutoAssignmentRule.test_level_id == test_level_id,
-            AutoAssignmentRule.assigned_date == assigned_date,
-            AutoAssignmentRule.is_active.is_(True),
-        )
-        .first()
-    )
-
-    if not rule or not rule.paper_ids:
+    # 1. The active rule for this Dept/Level on this Date, with its papers
+    plan = get_auto_rule_plan(db, department_id, test_level_id, assigned_date)
+    if not plan:
         return None
 
     # 1.5 Verify if this specific user matches the Date criteria (Registration or Re-interview)
@@ -398,53 +365,7 @@ def assign_best_paper(
     if not user_match:
         return None
 
-    # 2. Sequential/Round-robin: Check assignment counts for papers in the pool
-    # We want the paper with the MINIMUM number of assignments today
-    raw_paper_ids = rule.paper_ids if isinstance(rule.paper_ids, list) else []
-    if not raw_paper_ids:
-        return None
-
-    # Filter only ACTIVE papers from the pool (Point 1)
-    active_papers = (
-        db.query(Paper.id)
-        .filter(Paper.id.in_(raw_paper_ids), Paper.is_active.is_(True))
-        .all()
-    )
-    paper_ids = [p.id for p in active_papers]
-
-    if not paper_ids:
-        return None
-
-    # Fallback for assigned_by (Point 4)
-    assigner_id = rule.created_by
-    creator_exists = db.query(User.id).filter(User.id == assigner_id).first()
-    if not creator_exists:
-        fallback_admin = (
-            db.query(User.id).filter(User.role == RoleType.ADMIN.value).first()
-        )
-        assigner_id = fallback_admin.id if fallback_admin else rule.created_by
-
-    # Subquery to get counts for these specific papers today
-    counts = (
-        db.query(
-            PaperAssignment.paper_id, func.count(PaperAssignment.id).label("total")
-        )
-        .filter(
-            PaperAssignment.assigned_date == assigned_date,
-            PaperAssignment.paper_id.in_(paper_ids),
-        )
-        .group_by(PaperAssignment.paper_id)
-        .all()
-    )
-
-    count_map = {p_id: 0 for p_id in paper_ids}
-    for p_id, total in counts:
-        count_map[p_id] = total
-
-    # Sort paper_ids by their current count (ascending) to pick the one with the least assignments
-    best_paper_id = sorted(paper_ids, key=lambda p: count_map.get(p, 0))[0]
-
-    # 3. Check if user already has an assignment for today
+    # 2. Check if user already has an assignment for today (before counting one)
     existing = (
         db.query(PaperAssignment)
         .filter(
@@ -457,6 +378,28 @@ def assign_best_paper(
     if existing:
         return existing
 
+    # 3. The paper of the pool with the fewest assignments today
+    rule_id, paper_ids = plan["rule_id"], plan["paper_ids"]
+    best_paper_id = balancer.pick(
+        rule_id,
+        assigned_date,
+        paper_ids,
+        lambda: _count_assignments(db, paper_ids, assigned_date),
+    )
+    counted = best_paper_id is not None
+    if not counted:
+        # Without Redis, concurrent logins take turns on the rule row
+        locked = (
+            db.query(AutoAssignmentRule.id)
+            .filter(AutoAssignmentRule.id == rule_id)
+            .with_for_update()
+            .first()
+        )
+        if not locked:
+            return None
+        count_map = _count_assignments(db, paper_ids, assigned_date)
+        best_paper_id = min(paper_ids, key=lambda p: count_map.get(p, 0))
+
     # 4. Create the assignment
     assignment = PaperAssignment(
         user_id=user_id,
@@ -464,20 +407,25 @@ def assign_best_paper(
         department_id=department_id,
         test_level_id=test_level_id,
         assigned_date=assigned_date,
-        assigned_by=assigner_id,  # Validated or fallback admin
+        assigned_by=plan["assigned_by"],  # Validated or fallback admin
         assignment_source="AUTO",
-        auto_rule_id=rule.id,
+        auto_rule_id=rule_id,
     )
 
     db.add(assignment)
 
     # Update user status to ready
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        user.process_status = ProcessStatus.READY.value
+    db.query(User).filter(User.id == user_id).update(
+        {User.process_status: ProcessStatus.READY.value}, synchronize_session=False
+    )
 
-    db.commit()
-    db.refresh(assignment)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        if counted:
+            balancer.release(rule_id, assigned_date, best_paper_id)
+        raise
 
     return get_assignment_by_user_and_date(db, user_id, assigned_date)
 
@@ -668,9 +616,22 @@ def get_assignment_by_user_and_date(
     return _hydrate_assignment_result(result)
 
 
-def get_my_interview_paper(
+# Paper details embed subject, test level and department names
+PAPER_DETAILS_TAGS = (CLASSIFICATIONS_TAG, DEPARTMENTS_TAG)
+
+
+def _paper_snapshot_key(paper_id: int) -> str:
+    return f"paper:{paper_id}:snapshot"
+
+
+def _publish_paper_snapshot(db: Session, paper_id: int) -> dict | None:
+    paper_details = build_paper_details(db, paper_id)
+    return snapshot.encode(paper_details) if paper_details else None
+
+
+def get_my_paper_snapshot(
     db: Session, user_id: int, assigned_date: date | None = None
-) -> dict | None:
+) -> tuple[PaperAssignment, date, snapshot.PaperSnapshot] | None:
     effective_date = assigned_date or date.today()
     assignment = get_assignment_by_user_and_date(
         db=db,
@@ -680,31 +641,20 @@ def get_my_interview_paper(
     if not assignment:
         return None
 
-    # Check Redis cache first
-    cache_key = f"paper:{assignment.paper_id}:details"
-    cached_paper = get_cached_data(cache_key)
-    if cached_paper:
-        return {
-            "assignment_id": assignment.id,
-            "assigned_date": effective_date,
-            **cached_paper,
-        }
-
-    paper_details = build_paper_details(db, assignment.paper_id)
-    if not paper_details:
+    # Published until the paper is edited; concurrent misses build it once
+    encoded = cache.get_or_load(
+        _paper_snapshot_key(assignment.paper_id),
+        lambda: _publish_paper_snapshot(db, assignment.paper_id),
+        tags=PAPER_DETAILS_TAGS,
+        ttl=None,
+    )
+    if not encoded:
         raise HTTPException(
             status_code=StatusCode.NOT_FOUND,
             detail=f"Active paper {assignment.paper_id} not found or missing questions",
         )
 
-    # Store in Redis (Permanent cache)
-    set_cached_data(cache_key, paper_details, expire_seconds=None)
-
-    return {
-        "assignment_id": assignment.id,
-        "assigned_date": effective_date,
-        **paper_details,
-    }
+    return assignment, effective_date, snapshot.load(assignment.paper_id, encoded)
 
 
 def build_paper_details(db: Session, paper_id: int) -> dict | None:
@@ -836,14 +786,18 @@ def build_paper_details(db: Session, paper_id: int) -> dict | None:
 
 
 def rebuild_paper_cache(db: Session, paper_id: int) -> None:
-    """Helper to manually rebuild paper cache from DB and store it in Redis."""
-    paper_details = build_paper_details(db, paper_id)
-    cache_key = f"paper:{paper_id}:details"
+    """Helper to manually rebuild paper cache from DB and store it in the cache."""
+    from app.interview_attempts import answer_key
 
-    if paper_details:
-        set_cached_data(cache_key, paper_details, expire_seconds=None)
-    else:
-        # If paper became inactive or lost all questions, we should just delete its cache
-        from app.core.redis_client import delete_cached_data
+    # Grading keys are compiled lazily on the next submission.
+    answer_key.invalidate(paper_id)
+
+    cache_key = _paper_snapshot_key(paper_id)
+    cache.invalidate(cache_key)
+    # The paper may have been (de)activated in a rule's pool
+    cache.invalidate_tags(AUTO_RULES_TAG)
 
-        delete_cached_data(cache_key)
+    # An inactive paper, or one without questions, simply stays unpublished
+    encoded = _publish_paper_snapshot(db, paper_id)
+    if encoded:
+        cache.put(cache_key, encoded, tags=PAPER_DETAILS_TAGS, ttl=None)
@@ -1,13 +1,13 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from app.database.db import SessionLocal
 from app.utils.dependencies import authenticate_user, require_roles
 from app.utils.status_codes import ResponseMessage, StatusCode, api_response
 
-from . import repository, schemas
+from . import backfill, repository, schemas, snapshot
 from app.utils.pagination import (
     PaginationParams,
     get_pagination_params,
@@ -59,24 +59,28 @@ def assign_paper(
 
 @router.get("/get-my-assigned-paper")
 def get_my_interview_paper(
+    request: Request,
     assigned_date: date | None = Query(
         default=None, description="Optional assignment date in YYYY-MM-DD"
     ),
     db: Session = Depends(get_db),
     current_user: int = Depends(authenticate_user),
 ):
-    data = repository.get_my_interview_paper(
+    result = repository.get_my_paper_snapshot(
         db=db,
         user_id=current_user,
         assigned_date=assigned_date,
     )
-    if not data:
+    if not result:
         return api_response(StatusCode.NOT_FOUND, ResponseMessage.NOT_FOUND)
 
-    return api_response(
-        StatusCode.OK,
-        ResponseMessage.FETCHED,
-        data=schemas.AssignedInterviewPaperResponse.model_validate(data).model_dump(),
+    assignment, effective_date, paper_snapshot = result
+    return snapshot.respond(
+        request,
+        paper_snapshot,
+        assignment_id=assignment.id,
+        assigned_date=effective_date,
+        message=ResponseMessage.FETCHED,
     )
 
 
@@ -89,12 +93,15 @@ def get_my_interview_paper(
 )
 def create_auto_rule(
     payload: schemas.AutoAssignmentRuleCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: int = Depends(authenticate_user),
 ):
     rule = repository.create_auto_assignment_rule(
         db=db, payload=payload, created_by=current_user
     )
+    if rule.backfill_scheduled:
+        background_tasks.add_task(backfill.request_backfill, rule.id)
     return api_response(
         StatusCode.CREATED,
         "Auto-assignment rule configured successfully",
@@ -142,11 +149,14 @@ def list_auto_rules(
 def update_auto_rule(
     rule_id: int,
     payload: schemas.AutoAssignmentRuleUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     rule = repository.update_auto_assignment_rule(
         db=db, rule_id=rule_id, payload=payload
     )
+    if rule.backfill_scheduled:
+        background_tasks.add_task(backfill.request_backfill, rule.id)
     return api_response(
         StatusCode.OK,
         "Auto-assignment rule updated successfully",
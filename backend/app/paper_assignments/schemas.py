@@ -68,9 +68,8 @@ class InterviewPaperMetaResponse(BaseModel):
     test_level_name: str | None = None
 
 
-class AssignedInterviewPaperResponse(BaseModel):
-    assignment_id: int
-    assigned_date: date
+# Published paper content; assignment_id/assigned_date are added per request
+class InterviewPaperSnapshotResponse(BaseModel):
     paper: InterviewPaperMetaResponse
     total_questions: int
     overall_duration_minutes: int
@@ -124,5 +123,7 @@ class AutoAssignmentRuleResponse(AutoAssignmentRuleBase):
     department_name: str | None = None
     test_level_name: str | None = None
     paper_names: list[str] = []
+    # The backfill of a large candidate pool runs in the background
+    backfill_scheduled: bool = False
 
     model_config = ConfigDict(from_attributes=True)
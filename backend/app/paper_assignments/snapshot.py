@@ -0,0 +1,155 @@
+"""
+Published paper snapshots.
+
+A snapshot is the candidate-facing content of a paper (``build_paper_details``
+validated against ``InterviewPaperSnapshotResponse``) encoded to JSON once and
+deflated once, when the paper is published. Its version is a hash of that
+content, so republishing an unchanged paper keeps the version and candidates
+that already hold it get a 304.
+
+Snapshots are cached through ``app.core.cache``; each worker additionally keeps
+the encoded and compressed form of the version it last served per paper.
+
+Every candidate's response wraps the same snapshot in the ``api_response``
+envelope with their own assignment fields. The envelope is spliced around the
+pre-encoded bytes and, for gzip clients, two tiny deflate segments are spliced
+around the pre-deflated snapshot, so a request neither encodes nor compresses
+the paper itself.
+"""
+
+import hashlib
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import date
+
+import orjson
+from fastapi import Request, Response
+
+from app.utils.status_codes import StatusCode
+
+from .schemas import InterviewPaperSnapshotResponse
+
+COMPRESS_LEVEL = 6
+# Fixed header: no name, mtime 0 (the content is versioned, not timestamped)
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+@dataclass(frozen=True)
+class PaperSnapshot:
+    paper_id: int
+    version: str
+    # JSON members of the snapshot object, without the enclosing braces
+    body: bytes
+    # Raw deflate of ``body`` ending on a full flush, so it can be spliced
+    deflated: bytes
+
+
+def encode(paper_details: dict) -> dict:
+    """Validate and encode built paper details into a cacheable snapshot."""
+    content = InterviewPaperSnapshotResponse.model_validate(paper_details)
+    body = orjson.dumps(content.model_dump(mode="json"))
+    return {
+        "version": hashlib.sha256(body).hexdigest()[:16],
+        "body": body[1:-1].decode(),
+    }
+
+
+# paper_id -> snapshot last served by this worker
+_compiled: dict[int, PaperSnapshot] = {}
+_compiled_lock = threading.Lock()
+
+
+def load(paper_id: int, encoded: dict) -> PaperSnapshot:
+    """The worker's compiled form of an encoded snapshot."""
+    snapshot = _compiled.get(paper_id)
+    if snapshot is not None and snapshot.version == encoded["version"]:
+        return snapshot
+
+    body = encoded["body"].encode()
+    snapshot = PaperSnapshot(
+        paper_id=paper_id,
+        version=encoded["version"],
+        body=body,
+        deflated=_deflate(body, final=False),
+    )
+    with _compiled_lock:
+        _compiled[paper_id] = snapshot
+    return snapshot
+
+
+def _deflate(data: bytes, final: bool) -> bytes:
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH
+    )
+
+
+# ---------------------------------------------------------------------------
+# Responses
+# ---------------------------------------------------------------------------
+
+
+def _etag(snapshot: PaperSnapshot, assignment_id: int) -> str:
+    # Weak: the gzip and identity encodings carry the same tag
+    return f'W/"{assignment_id}-{snapshot.version}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("Accept-Encoding", "")
+
+
+def respond(
+    request: Request,
+    snapshot: PaperSnapshot,
+    assignment_id: int,
+    assigned_date: date,
+    message: str,
+) -> Response:
+    """The ``api_response`` for one candidate's assignment, or a 304."""
+    etag = _etag(snapshot, assignment_id)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=StatusCode.NOT_MODIFIED, headers=headers)
+
+    envelope = orjson.dumps(
+        {
+            "status": StatusCode.OK,
+            "message": message,
+            "data": {"assignment_id": assignment_id, "assigned_date": assigned_date},
+        }
+    )
+    prefix, suffix = envelope[:-2] + b",", b"}}"
+
+    if not _accepts_gzip(request):
+        return Response(
+            content=prefix + snapshot.body + suffix,
+            media_type="application/json",
+            headers=headers,
+        )
+
+    crc = zlib.crc32(suffix, zlib.crc32(snapshot.body, zlib.crc32(prefix)))
+    size = len(prefix) + len(snapshot.body) + len(suffix)
+    content = b"".join(
+        (
+            _GZIP_HEADER,
+            _deflate(prefix, final=False),
+            snapshot.deflated,
+            _deflate(suffix, final=True),
+            struct.pack("<II", crc, size & 0xFFFFFFFF),
+        )
+    )
+    headers["Content-Encoding"] = "gzip"
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -36,3 +36,18 @@ class Paper(Base):
         onupdate=func.current_timestamp(),
         nullable=False,
     )
+
+
+class PaperQuestion(Base):
+    """
+    Question ids of each paper, mirroring ``papers.question_id`` so "which
+    papers contain question X" is one indexed lookup. Written through
+    ``question_index.sync`` in the same transaction as the paper.
+    """
+
+    __tablename__ = "paper_questions"
+
+    paper_id = Column(
+        Integer, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True
+    )
+    question_id = Column(Integer, primary_key=True, index=True)
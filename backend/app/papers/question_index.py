@@ -0,0 +1,47 @@
+"""
+Reverse index of question id -> ids of the papers that contain it.
+
+Editing a question has to refresh the published snapshot, answer key and
+results of every paper using it. Papers store their questions in a JSON
+column, so finding them used to mean loading and walking the whole paper
+catalogue. The ``paper_questions`` table mirrors that column. Every writer
+of papers (create_paper, update_paper, seeds/seed_papers.py) calls ``sync``
+inside the transaction that writes the paper, so a committed paper and its
+index entries always agree; a new writer must do the same.
+"""
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.papers.models import PaperQuestion
+
+
+def _question_ids(question_payload: Any) -> list[int]:
+    from app.paper_assignments.repository import _extract_question_ids
+
+    return _extract_question_ids(question_payload)
+
+
+def sync(db: Session, paper_id: int, question_payload: Any) -> None:
+    """Replace a paper's indexed questions (call before committing it)."""
+    db.query(PaperQuestion).filter(PaperQuestion.paper_id == paper_id).delete(
+        synchronize_session=False
+    )
+    question_ids = _question_ids(question_payload)
+    if question_ids:
+        db.execute(
+            insert(PaperQuestion),
+            [{"paper_id": paper_id, "question_id": qid} for qid in question_ids],
+        )
+
+
+def papers_containing(db: Session, question_id: int) -> list[int]:
+    """Ids of the papers whose question list includes ``question_id``."""
+    return [
+        paper_id
+        for (paper_id,) in db.query(PaperQuestion.paper_id)
+        .filter(PaperQuestion.question_id == question_id)
+        .order_by(PaperQuestion.paper_id)
+    ]
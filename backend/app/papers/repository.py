@@ -1,3 +1,4 @@
+from app.papers import question_index
 from app.papers.models import Paper
 from app.papers.schemas import PaperCreate, PaperUpdate
 from sqlalchemy.orm import Session
@@ -5,6 +6,8 @@ from typing import List, Optional
 
 from app.departments.models import Department
 from app.classifications.models import Classification
+from app.utils.enums import TotalCountMode
+from app.utils.pagination import paginate_query
 
 
 def get_papers(
@@ -15,7 +18,9 @@ def get_papers(
     test_level_id: Optional[int] = None,
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
-) -> tuple[List[Paper], int]:
+    cursor: Optional[str] = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
+) -> tuple[List[Paper], Optional[int], Optional[str]]:
     query = (
         db.query(
             Paper,
@@ -36,8 +41,16 @@ def get_papers(
     if search:
         query = query.filter(Paper.paper_name.ilike(f"%{search}%"))
 
-    total_records = query.count()
-    results = query.order_by(Paper.id.desc()).offset(skip).limit(limit).all()
+    results, total_records, next_cursor = paginate_query(
+        query,
+        Paper.id,
+        Paper.id,
+        lambda row: (row.Paper.id, row.Paper.id),
+        limit=limit,
+        offset=skip,
+        cursor=cursor,
+        total=total,
+    )
 
     papers = []
     for paper, dept_name, level_name, level_code in results:
@@ -46,7 +59,7 @@ def get_papers(
         paper.test_level_id = level_code if level_code else str(paper.test_level_id)
         papers.append(paper)
 
-    return papers, total_records
+    return papers, total_records, next_cursor
 
 
 def get_paper(db: Session, paper_id: int) -> Optional[Paper]:
@@ -85,6 +98,8 @@ def create_paper(db: Session, paper: PaperCreate, user_id: int) -> Paper:
 
     db_paper = Paper(**paper_data, test_level_id=test_level_id, created_by=user_id)
     db.add(db_paper)
+    db.flush()
+    question_index.sync(db, db_paper.id, db_paper.question_id)
     db.commit()
     db.refresh(db_paper)
     return get_paper(db, db_paper.id)
@@ -113,6 +128,9 @@ def update_paper(
     for key, value in update_data.items():
         setattr(db_paper, key, value)
 
+    if "question_id" in update_data:
+        question_index.sync(db, paper_id, db_paper.question_id)
+
     db.commit()
     db.refresh(db_paper)
 
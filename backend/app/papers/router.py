@@ -1,8 +1,9 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 from app.database.db import SessionLocal
 from app.papers import repository, schemas
+from app.interview_attempts import regrade
 from app.utils.status_codes import StatusCode, ResponseMessage, api_response
 from app.utils.dependencies import authenticate_user
 from app.utils.pagination import (
@@ -33,7 +34,7 @@ def read_papers(
     db: Session = Depends(get_db),
 ):
     offset = (pagination.page - 1) * pagination.limit
-    papers, total_records = repository.get_papers(
+    papers, total_records, next_cursor = repository.get_papers(
         db,
         skip=offset,
         limit=pagination.limit,
@@ -41,6 +42,8 @@ def read_papers(
         test_level_id=test_level_id,
         search=pagination.search,
         is_active=is_active,
+        cursor=pagination.cursor,
+        total=pagination.total,
     )
 
     # Convert SQLAlchemy objects to Pydantic models and then to dicts for proper serialization
@@ -48,7 +51,9 @@ def read_papers(
         schemas.PaperResponse.model_validate(paper).model_dump() for paper in papers
     ]
 
-    paginated_data = create_paginated_response(paper_list, total_records, pagination)
+    paginated_data = create_paginated_response(
+        paper_list, total_records, pagination, next_cursor
+    )
     return api_response(StatusCode.OK, ResponseMessage.FETCHED, data=paginated_data)
 
 
@@ -96,6 +101,7 @@ def update_paper(
 def update_grade_settings(
     paper_id: int,
     grade_settings: List[schemas.GradeSettingItem],
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     grade_data = [item.model_dump() for item in grade_settings]
@@ -104,6 +110,8 @@ def update_grade_settings(
     )
     if db_paper is None:
         return api_response(StatusCode.NOT_FOUND, ResponseMessage.NOT_FOUND)
+    # Stored grades of submitted attempts were computed with the old bands
+    background_tasks.add_task(regrade.request_regrade, paper_id)
     return api_response(
         StatusCode.OK,
         ResponseMessage.UPDATED,
@@ -1,22 +1,33 @@
 # app/questions/bulk_upload_service.py
 
 import os
-import io
 import pandas as pd
 import asyncio
 import zipfile
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, Dict, Optional, Tuple
 from uuid import uuid4
 from fastapi import UploadFile, HTTPException
+from openpyxl import load_workbook
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field, field_validator, ValidationError, ConfigDict
+from pydantic import (
+    BaseModel,
+    Field,
+    field_validator,
+    ValidationError,
+    ConfigDict,
+    TypeAdapter,
+)
 
 from app.core.config import settings
+from app.core.executor import run_blocking
 from app.utils.status_codes import StatusCode
 from app.questions.models import Question
 from app.answer.models import QuestionAnswer
 from app.classifications.models import Classification
 from app.database.db import SessionLocal
+from . import image_store, upload_progress
 from .constants import QuestionType
 
 # --- Pydantic Models for Strict Validation ---
@@ -70,6 +81,12 @@ class ContactRowSchema(BaseRowSchema):
     website_url: str = Field(alias="Website URL")
 
 
+@lru_cache(maxsize=None)
+def _rows_adapter(schema: type[BaseRowSchema]) -> TypeAdapter:
+    """Validator for a whole chunk of rows of one schema"""
+    return TypeAdapter(list[schema])
+
+
 # --- Optimized Service ---
 
 
@@ -108,10 +125,6 @@ class BulkUploadService:
         },
     }
 
-    def __init__(self):
-        self.upload_dir = os.path.join(settings.MEDIA_ROOT, "questions")
-        os.makedirs(self.upload_dir, exist_ok=True)
-
     async def process_bulk_upload(
         self,
         file: UploadFile,
@@ -121,18 +134,21 @@ class BulkUploadService:
         default_subject: Optional[str] = None,
         default_level: Optional[str] = None,
         default_marks: Optional[int] = None,
+        upload_id: Optional[str] = None,
     ):
-        # 1. Load Data with Pandas
-        try:
-            contents = await file.read()
-            df = pd.read_excel(io.BytesIO(contents))
-            # Convert NaN to None for clean processing
-            df = df.where(pd.notnull(df), None)
-            rows = df.to_dict("records")
-        except Exception as e:
+        # 1. Resolve Official Question Type
+        official_type = self._resolve_type(question_type)
+        if not official_type:
+            available = [q.value for q in self.QUESTION_CONFIG.keys()]
             raise HTTPException(
                 status_code=StatusCode.BAD_REQUEST,
-                detail=f"Invalid Excel format: {str(e)}",
+                detail=f"Invalid question type: {question_type}. Available official types: {available}",
+            )
+
+        upload_id = upload_id or uuid4().hex
+        if not upload_progress.is_valid_id(upload_id):
+            raise HTTPException(
+                status_code=StatusCode.BAD_REQUEST, detail="Invalid upload id"
             )
 
         # 2. Parallel Image Processing if ZIP provided
@@ -140,61 +156,81 @@ class BulkUploadService:
         if zip_file:
             images_map = await self._process_zip_images(zip_file)
 
-        # 3. Setup Metadata for Validation
+        # 3. Stream, validate and insert the workbook off the event loop
+        result = await run_blocking(
+            self._import_workbook,
+            file.file,
+            official_type,
+            user_id,
+            images_map,
+            (default_subject, default_level, default_marks),
+            upload_id,
+        )
+        return {**result, "upload_id": upload_id}
+
+    def _import_workbook(
+        self,
+        source: BinaryIO,
+        q_type: QuestionType,
+        user_id: int,
+        images_map: Dict,
+        defaults: Tuple[Optional[str], Optional[str], Optional[int]],
+        upload_id: str,
+    ) -> Dict:
+        """
+        Stream the first sheet in chunks. Every row is validated so all errors
+        are reported, but rows are only inserted while none failed, and the
+        transaction is committed only if the whole sheet is valid.
+        """
+        upload_progress.update(
+            upload_id, status="running", processed=0, inserted=0, error_count=0
+        )
+        try:
+            workbook = load_workbook(source, read_only=True, data_only=True)
+        except Exception as e:
+            upload_progress.update(upload_id, status="failed")
+            raise HTTPException(
+                status_code=StatusCode.BAD_REQUEST,
+                detail=f"Invalid Excel format: {str(e)}",
+            )
+
         db = SessionLocal()
         try:
+            sheet = workbook.worksheets[0]
+            if sheet.max_row:
+                upload_progress.update(upload_id, total_rows=sheet.max_row - 1)
             subjects_map, levels_map = self._get_metadata_cache(db)
 
-            # 3. Resolve Official Question Type
-            official_type = self._resolve_type(question_type)
-
-            if not official_type:
-                available = [q.value for q in self.QUESTION_CONFIG.keys()]
-                raise HTTPException(
-                    status_code=StatusCode.BAD_REQUEST,
-                    detail=f"Invalid question type: {question_type}. Available official types: {available}",
-                )
-
-            prepared_data = []
             errors = []
-
-            # 4. Modular Parsing & Validation
-            for idx, row in enumerate(rows):
-                row_num = idx + 2
-
-                # Apply defaults if missing in row
-                if not row.get("Subject Code") and default_subject:
-                    row["Subject Code"] = default_subject
-                if not row.get("Exam Level Code") and default_level:
-                    row["Exam Level Code"] = default_level
-                if (
-                    not row.get("Marks") or pd.isna(row.get("Marks"))
-                ) and default_marks is not None:
-                    row["Marks"] = default_marks
-
-                try:
-                    parsed_item = self._parse_and_validate(
-                        row, official_type, subjects_map, levels_map, images_map
-                    )
-                    prepared_data.append(parsed_item)
-                except (ValidationError, ValueError) as e:
-                    error_msgs = []
-                    if isinstance(e, ValidationError):
-                        error_msgs = [
-                            f"{err['loc'][-1]}: {err['msg']}" for err in e.errors()
-                        ]
-                    else:
-                        error_msgs = [str(e)]
-                    errors.append({"row": row_num, "errors": error_msgs})
+            processed = inserted = 0
+            for chunk in self._iter_row_chunks(sheet, settings.BULK_UPLOAD_CHUNK_SIZE):
+                self._apply_defaults(chunk, *defaults)
+                prepared, chunk_errors = self._validate_chunk(
+                    chunk, q_type, subjects_map, levels_map, images_map
+                )
+                errors.extend(chunk_errors)
+                processed += len(chunk)
+                if not errors:
+                    inserted += self._insert_chunk(db, prepared, user_id)
+                upload_progress.update(
+                    upload_id,
+                    processed=processed,
+                    inserted=inserted,
+                    error_count=len(errors),
+                )
 
             if errors:
+                db.rollback()
+                upload_progress.update(upload_id, status="invalid", inserted=0)
                 return {"success": False, "errors": errors}
 
-            # 5. Optimized Bulk DB Insert
-            return await self._execute_bulk_insert(db, prepared_data, user_id)
+            db.commit()
+            upload_progress.update(upload_id, status="completed")
+            return {"success": True, "count": inserted}
 
         except Exception as e:
             db.rollback()
+            upload_progress.update(upload_id, status="failed")
             if isinstance(e, HTTPException):
                 raise e
             raise HTTPException(
@@ -202,6 +238,98 @@ class BulkUploadService:
             )
         finally:
             db.close()
+            workbook.close()
+
+    @staticmethod
+    def _iter_row_chunks(sheet, size: int) -> Iterator[List[Tuple[int, Dict]]]:
+        """(Excel row number, row dict) chunks of a sheet; blank rows are skipped."""
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            name if name is not None else f"Unnamed: {index}"
+            for index, name in enumerate(header)
+        ]
+
+        chunk = []
+        for row_num, values in enumerate(rows, start=2):
+            # Empty cells (and empty strings, as pandas read them) become None
+            values = [None if value == "" else value for value in values]
+            if all(value is None for value in values):
+                continue
+            chunk.append((row_num, dict(zip(columns, values))))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _apply_defaults(
+        chunk: List[Tuple[int, Dict]],
+        default_subject: Optional[str],
+        default_level: Optional[str],
+        default_marks: Optional[int],
+    ) -> None:
+        """Fill missing subject / level / marks cells with the form defaults."""
+        for _, row in chunk:
+            if default_subject and not row.get("Subject Code"):
+                row["Subject Code"] = default_subject
+            if default_level and not row.get("Exam Level Code"):
+                row["Exam Level Code"] = default_level
+            if default_marks is not None and not row.get("Marks"):
+                row["Marks"] = default_marks
+
+    def _validate_chunk(
+        self,
+        chunk: List[Tuple[int, Dict]],
+        q_type: QuestionType,
+        subjects_map: Dict,
+        levels_map: Dict,
+        images_map: Dict,
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Validate a chunk with one pydantic call over all its rows; only a chunk
+        with errors falls back to row-by-row validation to report them.
+        """
+        schema = self.QUESTION_CONFIG[q_type].get("schema", BaseRowSchema)
+        rows = [row for _, row in chunk]
+
+        failed: Dict[int, List[str]] = {}
+        try:
+            validated_rows = _rows_adapter(schema).validate_python(rows)
+        except ValidationError as e:
+            validated_rows = None
+            for err in e.errors():
+                failed.setdefault(err["loc"][0], []).append(
+                    f"{err['loc'][-1]}: {err['msg']}"
+                )
+
+        prepared, errors = [], []
+        for index, (row_num, row) in enumerate(chunk):
+            if index in failed:
+                errors.append({"row": row_num, "errors": failed[index]})
+                continue
+            try:
+                validated_row = (
+                    validated_rows[index]
+                    if validated_rows is not None
+                    else schema.model_validate(row)
+                )
+                prepared.append(
+                    self._build_item(
+                        validated_row,
+                        row,
+                        q_type,
+                        subjects_map,
+                        levels_map,
+                        images_map,
+                    )
+                )
+            except ValueError as e:
+                errors.append({"row": row_num, "errors": [str(e)]})
+        return prepared, errors
 
     def _resolve_type(self, q_type_str: str) -> Optional[QuestionType]:
         """Resolves an incoming string (alias or official code) to a QuestionType Enum"""
@@ -220,30 +348,18 @@ class BulkUploadService:
 
         return None
 
-    def _parse_and_validate(
+    def _build_item(
         self,
+        validated_row: BaseRowSchema,
         row: Dict,
         q_type: QuestionType,
         subjects_map: Dict,
         levels_map: Dict,
         images_map: Dict,
     ) -> Dict:
-        """Modular parser using Pydantic for validation and business logic for mapping"""
+        """Business checks and mapping of a validated row to insert payloads"""
 
-        # Determine Schema from Registry
-        config = self.QUESTION_CONFIG.get(q_type)
-        if not config:
-            raise ValueError(f"No configuration found for question type: {q_type}")
-
-        Schema = config.get("schema", BaseRowSchema)
-
-        # 1. Pydantic Basic Validation
-        try:
-            validated_row = Schema(**row)
-        except ValidationError as e:
-            raise e
-
-        # 2. Metadata Check
+        # 1. Metadata Check
         sub_code = str(validated_row.subject_code).strip().upper()
         lvl_code = str(validated_row.exam_level_code).strip().upper()
 
@@ -255,14 +371,14 @@ class BulkUploadService:
         if not lvl:
             raise ValueError(f"Invalid Level Code: {lvl_code}")
 
-        # 3. Image URL mapping
+        # 2. Image URL mapping
         q_image_url = None
         if validated_row.question_image:
             if validated_row.question_image not in images_map:
                 raise ValueError(f"Image {validated_row.question_image} missing in ZIP")
             q_image_url = images_map[validated_row.question_image]
 
-        # 4. Type Specific Logic
+        # 3. Type Specific Logic
         options = []
         ans_text = ""
         ans_explanation = row.get(
@@ -344,7 +460,7 @@ class BulkUploadService:
                 }.items()
             }
 
-        # 5. Final Package
+        # 4. Final Package
         q_text = validated_row.question_text
         if not q_text:
             # Fallback for special types
@@ -372,58 +488,48 @@ class BulkUploadService:
             },
         }
 
-    async def _execute_bulk_insert(
-        self, db: Session, data_list: List[Dict], user_id: int
-    ):
-        """High-performance bulk insert using return_defaults for IDs"""
-        questions = [
-            Question(**item["question"], created_by=user_id) for item in data_list
-        ]
-
-        # Step 1: Bulk Save Questions (returns IDs in objects)
-        db.bulk_save_objects(questions, return_defaults=True)
-        db.flush()
-
-        # Step 2: Bulk Save Answers linked to Question IDs
-        answers = []
-        for i, q in enumerate(questions):
-            ans_data = data_list[i]["answer"]
-            answers.append(
-                QuestionAnswer(
-                    question_id=q.id,
-                    answer_text=ans_data["answer_text"],
-                    explanation=ans_data["explanation"],
-                    created_by=user_id,
-                )
-            )
-
-        db.bulk_save_objects(answers)
-        db.commit()
-
-        return {"success": True, "count": len(questions)}
+    @staticmethod
+    def _insert_chunk(db: Session, prepared: List[Dict], user_id: int) -> int:
+        """Multi-row INSERT ... RETURNING id for the questions, then their answers"""
+        if not prepared:
+            return 0
+
+        question_ids = db.scalars(
+            insert(Question).returning(Question.id, sort_by_parameter_order=True),
+            [{**item["question"], "created_by": user_id} for item in prepared],
+        ).all()
+
+        db.execute(
+            insert(QuestionAnswer),
+            [
+                {"question_id": question_id, **item["answer"], "created_by": user_id}
+                for question_id, item in zip(question_ids, prepared)
+            ],
+        )
+        return len(question_ids)
 
     async def _process_zip_images(self, image_zip: UploadFile) -> Dict[str, str]:
-        """Parallelized image saving from ZIP"""
+        """Stream ZIP members into the image store, a bounded number at a time"""
         images_map = {}
         try:
-            zip_contents = await image_zip.read()
-            with zipfile.ZipFile(io.BytesIO(zip_contents)) as z:
+            with zipfile.ZipFile(image_zip.file) as z:
                 # Filter out directories and metadata
-                image_files = [
-                    f
-                    for f in z.namelist()
-                    if not f.startswith("__MACOSX/") and not f.endswith("/")
+                members = [
+                    info
+                    for info in z.infolist()
+                    if not info.filename.startswith("__MACOSX/")
+                    and not info.is_dir()
+                    and os.path.basename(info.filename)
                 ]
 
-                # Create saving tasks for parallel execution
-                tasks = []
-                for img_path in image_files:
-                    filename = os.path.basename(img_path)
-                    if filename:
-                        tasks.append(self._async_save_image(filename, z.read(img_path)))
+                semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_IMAGE_CONCURRENCY)
+
+                async def store_member(info: zipfile.ZipInfo) -> Tuple[str, str]:
+                    async with semaphore:
+                        url = await run_blocking(self._store_zip_member, z, info)
+                    return os.path.basename(info.filename), url
 
-                # Execute all tasks in parallel
-                results = await asyncio.gather(*tasks)
+                results = await asyncio.gather(*map(store_member, members))
                 for orig_name, saved_url in results:
                     images_map[orig_name] = saved_url
 
@@ -431,19 +537,10 @@ class BulkUploadService:
             print(f"ZIP Error: {e}")
         return images_map
 
-    async def _async_save_image(
-        self, original_name: str, data: bytes
-    ) -> Tuple[str, str]:
-        """Wrapper to run blocking I/O in a thread pool"""
-        return await asyncio.to_thread(self._save_bytes_image, original_name, data)
-
-    def _save_bytes_image(self, original_name: str, data: bytes) -> Tuple[str, str]:
-        clean_name = original_name.replace(" ", "_").replace("-", "_")
-        filename = f"{uuid4().hex}_{clean_name}"
-        file_path = os.path.join(self.upload_dir, filename)
-        with open(file_path, "wb") as f:
-            f.write(data)
-        return original_name, f"/images/questions/{filename}"
+    @staticmethod
+    def _store_zip_member(z: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+        with z.open(info) as member:
+            return image_store.store(member, info.filename)
 
     def _get_metadata_cache(self, db: Session) -> Tuple[Dict, Dict]:
         """Optimized metadata fetching"""
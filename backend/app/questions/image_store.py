@@ -0,0 +1,127 @@
+"""
+Content-addressed storage for question images.
+
+Images are stored under ``UPLOAD_DIR/questions/<aa>/<sha256><ext>``, named by
+the hash of their content, so the same picture uploaded again (in another ZIP,
+or for another question) reuses the stored file instead of adding a copy.
+
+Raster images also get a web variant, scaled down to QUESTION_IMAGE_WEB_MAX_PX
+and re-encoded as WebP, next to the original. It is only kept when it is
+smaller than the original, and the returned URL points to it, since that is
+the file candidates download through the ``/images`` mount.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUBDIR = "questions"
+URL_PREFIX = "/images"
+READ_CHUNK_BYTES = 1024 * 1024
+
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,8}$")
+
+
+def _extension(original_name: str) -> str:
+    extension = os.path.splitext(original_name)[1].lower()
+    return extension if _EXTENSION.match(extension) else ""
+
+
+def _relative_path(digest: str, suffix: str) -> str:
+    return f"{SUBDIR}/{digest[:2]}/{digest}{suffix}"
+
+
+def _absolute_path(relative: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, *relative.split("/"))
+
+
+def _variant_suffix() -> str:
+    return f".w{settings.QUESTION_IMAGE_WEB_MAX_PX}.webp"
+
+
+def _write_atomic(target: str, data: bytes) -> None:
+    """Write through a temp file next to ``target`` and move it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _web_variant(source_path: str) -> Optional[bytes]:
+    """A scaled-down WebP encoding of the image, if smaller than the original."""
+    try:
+        with Image.open(source_path) as image:
+            if getattr(image, "is_animated", False):
+                return None
+            image = ImageOps.exif_transpose(image)
+            limit = settings.QUESTION_IMAGE_WEB_MAX_PX
+            image.thumbnail((limit, limit))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            buffer = io.BytesIO()
+            image.save(
+                buffer,
+                format="WEBP",
+                quality=settings.QUESTION_IMAGE_WEB_QUALITY,
+                method=4,
+            )
+    except Exception as e:
+        # Not a raster image Pillow can read (svg, corrupt file, ...)
+        logger.info(f"Image store: no web variant for {source_path}: {e}")
+        return None
+
+    encoded = buffer.getvalue()
+    return encoded if len(encoded) < os.path.getsize(source_path) else None
+
+
+def store(stream: BinaryIO, original_name: str) -> str:
+    """
+    Store an image read from ``stream`` and return its ``/images`` URL.
+
+    The stream is copied to disk in chunks while it is hashed, so an image is
+    never held in memory whole (apart from its web variant).
+    """
+    directory = os.path.join(settings.UPLOAD_DIR, SUBDIR)
+    os.makedirs(directory, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while chunk := stream.read(READ_CHUNK_BYTES):
+                digest.update(chunk)
+                handle.write(chunk)
+
+        hexdigest = digest.hexdigest()
+        original = _relative_path(hexdigest, _extension(original_name))
+        variant = _relative_path(hexdigest, _variant_suffix())
+        original_path = _absolute_path(original)
+        variant_path = _absolute_path(variant)
+        # The variant is written before the original is moved into place, so
+        # a stored original always has its variant (when it has one)
+        if not os.path.exists(original_path):
+            os.makedirs(os.path.dirname(original_path), exist_ok=True)
+            encoded = _web_variant(temp_path)
+            if encoded is not None:
+                _write_atomic(variant_path, encoded)
+            os.replace(temp_path, original_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+    url = variant if os.path.exists(variant_path) else original
+    return f"{URL_PREFIX}/{url}"
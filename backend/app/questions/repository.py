@@ -5,21 +5,29 @@ from app.database.db import SessionLocal
 from app.questions.models import Question
 from app.answer.models import QuestionAnswer
 from app.classifications.models import Classification
+from app.utils.enums import TotalCountMode
+from app.utils.pagination import paginate_query
 
 
 def _rebuild_papers_containing_question(db, question_id: int):
+    from app.papers import question_index
     from app.papers.models import Paper
-    from app.paper_assignments.repository import (
-        rebuild_paper_cache,
-        _extract_question_ids,
-    )
+    from app.paper_assignments.repository import rebuild_paper_cache
 
-    # Only check active papers
-    active_papers = db.query(Paper).filter(Paper.is_active).all()
-    for paper in active_papers:
-        q_ids = _extract_question_ids(paper.question_id)
-        if question_id in q_ids:
-            rebuild_paper_cache(db, paper.id)
+    from app.interview_attempts import answer_key
+
+    paper_ids = question_index.papers_containing(db, question_id)
+    if not paper_ids:
+        return
+
+    # Only active papers have a published snapshot, but attempts on inactive
+    # papers can still be graded, so their answer keys are dropped too.
+    papers = db.query(Paper.id, Paper.is_active).filter(Paper.id.in_(paper_ids))
+    for paper_id, is_active in papers:
+        if is_active:
+            rebuild_paper_cache(db, paper_id)
+        else:
+            answer_key.invalidate(paper_id)
 
 
 def create_question(
@@ -84,6 +92,8 @@ def get_questions(
     order: str = "desc",
     limit: int = 10,
     offset: int = 0,
+    cursor: str = None,
+    total: TotalCountMode = TotalCountMode.EXACT,
 ):
     db_session = SessionLocal()
     try:
@@ -152,18 +162,24 @@ def get_questions(
         if search:
             query = query.filter(Question.question_text.ilike(f"%{search}%"))
 
-        total_records = query.count()
-
-        sort_column = getattr(Question, sort_by, Question.created_at)
-        if order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        results = query.offset(offset).limit(limit).all()
+        if not hasattr(Question, sort_by or ""):
+            sort_by = "created_at"
+        sort_column = getattr(Question, sort_by)
+
+        results, total_records, next_cursor = paginate_query(
+            query,
+            sort_column,
+            Question.id,
+            lambda row: (getattr(row.Question, sort_by), row.Question.id),
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order=order,
+            total=total,
+        )
         data = [_format_question_orm(row) for row in results]
 
-        return data, total_records
+        return data, total_records, next_cursor
     finally:
         db_session.close()
 
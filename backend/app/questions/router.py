@@ -5,6 +5,8 @@ from typing import Optional
 from . import schemas
 from app.questions.service import QuestionService
 from app.questions.bulk_upload_service import BulkUploadService
+from app.questions import upload_progress
+from app.core.executor import run_blocking
 from app.utils.status_codes import StatusCode, ResponseMessage, api_response
 from app.utils.dependencies import authenticate_user
 from app.utils.pagination import (
@@ -29,7 +31,7 @@ async def get_questions(
     pagination: PaginationParams = Depends(get_pagination_params),
 ):
     offset = (pagination.page - 1) * pagination.limit
-    data, total_records = await question_service.get_questions(
+    data, total_records, next_cursor = await question_service.get_questions(
         question_type=question_type,
         subject=subject,
         exam_level=exam_level,
@@ -40,9 +42,13 @@ async def get_questions(
         order=pagination.order,
         limit=pagination.limit,
         offset=offset,
+        cursor=pagination.cursor,
+        total=pagination.total,
     )
 
-    paginated_data = create_paginated_response(data, total_records, pagination)
+    paginated_data = create_paginated_response(
+        data, total_records, pagination, next_cursor
+    )
     return api_response(StatusCode.OK, ResponseMessage.FETCHED, data=paginated_data)
 
 
@@ -132,6 +138,7 @@ async def bulk_upload_questions(
     exam_level: Optional[str] = Form(None),
     marks: int = Form(0),
     question_type: str = Form("mcq"),
+    upload_id: Optional[str] = Form(None),
     current_user: int = Depends(authenticate_user),
 ):
     bulk_service = BulkUploadService()
@@ -143,6 +150,7 @@ async def bulk_upload_questions(
         default_marks=marks,
         question_type=question_type,
         user_id=current_user,
+        upload_id=upload_id,
     )
     if not result["success"]:
         return api_response(
@@ -154,3 +162,12 @@ async def bulk_upload_questions(
         f"Successfully uploaded {result['count']} questions",
         data=result,
     )
+
+
+@router.get("/bulk-upload/{upload_id}/progress")
+async def bulk_upload_progress(upload_id: str):
+    """Poll a running upload; pass the same ``upload_id`` to ``/bulk-upload``."""
+    data = await run_blocking(upload_progress.get, upload_id)
+    if not data:
+        return api_response(StatusCode.NOT_FOUND, ResponseMessage.NOT_FOUND)
+    return api_response(StatusCode.OK, ResponseMessage.FETCHED, data=data)
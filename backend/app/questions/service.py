@@ -1,11 +1,11 @@
 # app/questions/service.py
 
-from app.questions import repository
+from app.questions import image_store, repository
 from app.classifications import repository as classification_repo
 from fastapi import UploadFile, HTTPException
-import os
-from uuid import uuid4
-from app.core.config import settings
+from app.core.executor import run_blocking
+from app.interview_attempts import regrade
+from app.utils.enums import TotalCountMode
 from app.utils.status_codes import StatusCode
 
 
@@ -24,11 +24,20 @@ class QuestionService:
     async def create_question(self, payload, user_id: int):
         try:
             # Validate Codes
-            self._validate_classification_code(payload.question_type, "question_type")
-            self._validate_classification_code(payload.subject, "subject")
-            self._validate_classification_code(payload.exam_level, "exam_level")
+            await run_blocking(
+                self._validate_classification_code,
+                payload.question_type,
+                "question_type",
+            )
+            await run_blocking(
+                self._validate_classification_code, payload.subject, "subject"
+            )
+            await run_blocking(
+                self._validate_classification_code, payload.exam_level, "exam_level"
+            )
 
-            return repository.create_question(
+            return await run_blocking(
+                repository.create_question,
                 payload,
                 payload.question_type,
                 payload.subject,
@@ -54,9 +63,12 @@ class QuestionService:
         order: str = "desc",
         limit: int = 10,
         offset: int = 0,
+        cursor: str = None,
+        total: TotalCountMode = TotalCountMode.EXACT,
     ):
         try:
-            return repository.get_questions(
+            return await run_blocking(
+                repository.get_questions,
                 question_type=question_type,
                 subject=subject,
                 exam_level=exam_level,
@@ -67,7 +79,11 @@ class QuestionService:
                 order=order,
                 limit=limit,
                 offset=offset,
+                cursor=cursor,
+                total=total,
             )
+        except HTTPException:
+            raise
         except Exception as exception:
             raise HTTPException(
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
@@ -75,7 +91,7 @@ class QuestionService:
 
     async def get_question_by_id(self, question_id: int):
         try:
-            result = repository.get_question_by_id(question_id)
+            result = await run_blocking(repository.get_question_by_id, question_id)
             if not result:
                 raise HTTPException(
                     status_code=StatusCode.NOT_FOUND, detail="Question not found"
@@ -90,7 +106,7 @@ class QuestionService:
 
     async def get_questions_by_ids(self, question_ids: list[int]):
         try:
-            return repository.get_questions_by_ids(question_ids)
+            return await run_blocking(repository.get_questions_by_ids, question_ids)
         except Exception as e:
             raise HTTPException(
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(e)
@@ -100,21 +116,34 @@ class QuestionService:
         try:
             # Validate Codes (only if provided)
             if payload.question_type:
-                self._validate_classification_code(
-                    payload.question_type, "question_type"
+                await run_blocking(
+                    self._validate_classification_code,
+                    payload.question_type,
+                    "question_type",
                 )
             if payload.subject:
-                self._validate_classification_code(payload.subject, "subject")
+                await run_blocking(
+                    self._validate_classification_code, payload.subject, "subject"
+                )
             if payload.exam_level:
-                self._validate_classification_code(payload.exam_level, "exam_level")
+                await run_blocking(
+                    self._validate_classification_code, payload.exam_level, "exam_level"
+                )
 
-            return repository.update_question(
+            result = await run_blocking(
+                repository.update_question,
                 question_id,
                 payload,
                 payload.question_type,
                 payload.subject,
                 payload.exam_level,
             )
+
+            # A corrected answer or new marks changes stored grades
+            if {"answer", "marks"} & payload.model_fields_set:
+                await regrade.request_regrade_for_question(question_id)
+
+            return result
         except HTTPException:
             raise
         except Exception as exception:
@@ -124,7 +153,7 @@ class QuestionService:
 
     async def update_question_status(self, question_id: int):
         try:
-            return repository.toggle_question_status(question_id)
+            return await run_blocking(repository.toggle_question_status, question_id)
         except Exception as exception:
             raise HTTPException(
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
@@ -138,8 +167,12 @@ class QuestionService:
         than requested (never blocks the workflow).
         """
         try:
-            self._validate_classification_code(payload.subject_code, "subject")
-            self._validate_classification_code(payload.exam_level, "exam_level")
+            await run_blocking(
+                self._validate_classification_code, payload.subject_code, "subject"
+            )
+            await run_blocking(
+                self._validate_classification_code, payload.exam_level, "exam_level"
+            )
 
             requirements = [
                 {
@@ -150,7 +183,8 @@ class QuestionService:
                 for r in payload.requirements
             ]
 
-            return repository.auto_generate_questions(
+            return await run_blocking(
+                repository.auto_generate_questions,
                 subject_code=payload.subject_code,
                 exam_level=payload.exam_level,
                 requirements=requirements,
@@ -164,9 +198,15 @@ class QuestionService:
 
     async def get_available_question_counts(self, subject_code: str, exam_level: str):
         try:
-            self._validate_classification_code(subject_code, "subject")
-            self._validate_classification_code(exam_level, "exam_level")
-            return repository.get_available_question_counts(subject_code, exam_level)
+            await run_blocking(
+                self._validate_classification_code, subject_code, "subject"
+            )
+            await run_blocking(
+                self._validate_classification_code, exam_level, "exam_level"
+            )
+            return await run_blocking(
+                repository.get_available_question_counts, subject_code, exam_level
+            )
         except HTTPException:
             raise
         except Exception as exception:
@@ -176,13 +216,7 @@ class QuestionService:
 
     async def save_image(self, file: UploadFile) -> str:
         try:
-            os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-            clean_name = file.filename.replace(" ", "_").replace("-", "_")
-            filename = f"{uuid4().hex}_{clean_name}"
-            file_path = os.path.join(settings.UPLOAD_DIR, filename)
-            with open(file_path, "wb") as file_handle:
-                file_handle.write(await file.read())
-            return f"/images/{filename}"
+            return await run_blocking(image_store.store, file.file, file.filename)
         except Exception as exception:
             raise HTTPException(
                 status_code=StatusCode.INTERNAL_SERVER_ERROR, detail=str(exception)
@@ -0,0 +1,65 @@
+"""
+Progress of bulk question uploads.
+
+An upload runs inside its request on one worker, while the client polls
+``GET /questions/bulk-upload/{upload_id}/progress``, which may land on any
+worker. Progress is therefore kept in a Redis hash per upload (expiring after
+BULK_UPLOAD_PROGRESS_TTL_SECONDS), or in process memory without Redis.
+"""
+
+import logging
+import re
+import threading
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bulk_upload"
+# Client-chosen ids, so they are kept to a safe key alphabet
+UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_INT_FIELDS = ("total_rows", "processed", "inserted", "error_count")
+
+_local: dict[str, dict] = {}
+_local_lock = threading.Lock()
+
+
+def _key(upload_id: str) -> str:
+    return f"{KEY_PREFIX}:{upload_id}:progress"
+
+
+def is_valid_id(upload_id: str) -> bool:
+    return bool(UPLOAD_ID_PATTERN.match(upload_id))
+
+
+def update(upload_id: str, **fields) -> None:
+    """Merge ``fields`` (status, total_rows, processed, ...) into the progress."""
+    values = {k: v for k, v in fields.items() if v is not None}
+    if redis_client is None:
+        with _local_lock:
+            _local.setdefault(upload_id, {}).update(values)
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(_key(upload_id), mapping=values)
+        pipe.expire(_key(upload_id), settings.BULK_UPLOAD_PROGRESS_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Bulk upload progress: write failed for {upload_id}: {e}")
+
+
+def get(upload_id: str) -> Optional[dict]:
+    if redis_client is None:
+        with _local_lock:
+            progress = dict(_local.get(upload_id) or {})
+    else:
+        progress = redis_client.hgetall(_key(upload_id))
+    if not progress:
+        return None
+    for field in _INT_FIELDS:
+        if field in progress:
+            progress[field] = int(progress[field])
+    return {"upload_id": upload_id, **progress}
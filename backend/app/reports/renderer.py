@@ -0,0 +1,68 @@
+"""
+Report PDF rendering in a process pool.
+
+xhtml2pdf is pure Python: a render takes seconds of CPU and, run in a thread,
+holds the GIL for all of it, stalling every other request of the worker. Each
+worker therefore renders in its own small pool of REPORT_PDF_PROCESSES
+processes (from ``app.core.process_pool``, never forked from the threaded
+worker), started on first use and shut down with the app.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.process_pool import new_process_pool
+from app.reports.pdf_service import generate_report_pdf
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = new_process_pool(settings.REPORT_PDF_PROCESSES)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def render(html: str) -> bytes:
+    """PDF bytes of a report's HTML."""
+    if settings.REPORT_PDF_PROCESSES <= 0:
+        return await run_blocking(generate_report_pdf, html)
+
+    loop = asyncio.get_running_loop()
+    for retry in (False, True):
+        pool = _get_pool()
+        try:
+            return await loop.run_in_executor(pool, generate_report_pdf, html)
+        except BrokenProcessPool:
+            # A render process died (e.g. OOM-killed); start a fresh pool once
+            logger.error("Report renderer: process pool broken, restarting it")
+            _discard_pool(pool)
+            if retry:
+                raise
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
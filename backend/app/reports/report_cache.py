@@ -0,0 +1,61 @@
+"""
+Rendered report PDFs, cached on disk per attempt.
+
+A report is keyed by its attempt and the hash of the HTML it is rendered from.
+The HTML carries every input of the PDF (attempt results, evaluations, user
+details, template, date), so a changed input simply misses. Each attempt keeps
+only its latest PDF, and ``invalidate`` drops it as soon as evaluations or
+manual marks change rather than on the next download.
+
+Files live under REPORT_CACHE_DIR, shared by all workers on the host.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode()).hexdigest()[:32]
+
+
+def _attempt_dir(attempt_id: int) -> str:
+    return os.path.join(settings.REPORT_CACHE_DIR, str(attempt_id))
+
+
+def get(attempt_id: int, digest: str) -> Optional[bytes]:
+    try:
+        with open(os.path.join(_attempt_dir(attempt_id), f"{digest}.pdf"), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def put(attempt_id: int, digest: str, pdf_bytes: bytes) -> None:
+    """Store ``pdf_bytes`` as the attempt's report, replacing older ones."""
+    directory = _attempt_dir(attempt_id)
+    filename = f"{digest}.pdf"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".render-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(temp_path, os.path.join(directory, filename))
+        for name in os.listdir(directory):
+            if name != filename and not name.startswith("."):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(os.path.join(directory, name))
+    except OSError as e:
+        logger.error(f"Report cache: write failed for attempt {attempt_id}: {e}")
+
+
+def invalidate(attempt_id: int) -> None:
+    shutil.rmtree(_attempt_dir(attempt_id), ignore_errors=True)
@@ -1,12 +1,15 @@
-import io
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.utils.dependencies import authenticate_user, require_roles
 from app.utils.status_codes import StatusCode
 from app.database.db import get_db
-from app.reports.service import generate_report_pdf_file
+from app.reports.schemas import ReportExportRequest
+from app.reports.service import generate_report_pdf_file, stream_reports_zip
 
 router = APIRouter(
     dependencies=[Depends(authenticate_user)],
@@ -25,12 +28,12 @@ async def download_report_pdf(
 ):
     """Generate and stream a PDF report sheet for a candidate's attempt."""
     try:
-        pdf_bytes, filename = generate_report_pdf_file(
+        pdf_bytes, filename = await generate_report_pdf_file(
             db, user_id=user_id, attempt_id=attempt_id
         )
 
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -39,3 +42,25 @@ async def download_report_pdf(
             status_code=StatusCode.INTERNAL_SERVER_ERROR,
             detail=f"PDF generation failed: {str(exc)}",
         )
+
+
+@router.post(
+    "/admin/results/report/export",
+    dependencies=[Depends(require_roles(["admin", "project_lead"]))],
+    tags=["Reports"],
+)
+async def export_reports_zip(payload: ReportExportRequest):
+    """Stream a ZIP of the PDF report sheets of several attempts."""
+    targets = list(dict.fromkeys((r.user_id, r.attempt_id) for r in payload.reports))
+    if len(targets) > settings.REPORT_EXPORT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=StatusCode.BAD_REQUEST,
+            detail=f"At most {settings.REPORT_EXPORT_MAX_ITEMS} reports can be exported at once",
+        )
+
+    filename = f"Reports_{datetime.now().strftime('%d-%b-%Y')}.zip"
+    return StreamingResponse(
+        stream_reports_zip(targets),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
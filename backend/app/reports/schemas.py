@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class ReportExportItem(BaseModel):
+    user_id: int
+    attempt_id: int
+
+
+class ReportExportRequest(BaseModel):
+    reports: list[ReportExportItem] = Field(..., min_length=1)
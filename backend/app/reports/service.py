@@ -1,23 +1,126 @@
+import asyncio
+import zipfile
 from datetime import datetime
+from typing import AsyncIterator
+
 from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.database.db import SessionLocal
+from app.reports import renderer, report_cache
 from app.reports.report_builder import build_report_data
-from app.reports.pdf_service import build_report_html, generate_report_pdf
+from app.reports.pdf_service import build_report_html
 
 
-def generate_report_pdf_file(
-    db: Session, user_id: int, attempt_id: int
-) -> tuple[bytes, str]:
+def prepare_report(db: Session, user_id: int, attempt_id: int) -> tuple[str, str]:
     """
-    Fetch data, construct HTML report, convert to PDF, and generate output filename.
+    Fetch data and construct the report HTML and its output filename.
     Returns:
-        tuple[bytes, str]: (pdf_bytes, filename)
+        tuple[str, str]: (html, filename)
     """
     data = build_report_data(db, user_id=user_id, attempt_id=attempt_id)
     html = build_report_html(data)
-    pdf_bytes = generate_report_pdf(html)
 
     safe_name = data["username"].replace(" ", "_")
     formatted_date = datetime.now().strftime("%d-%b-%Y")
     filename = f"Report_{safe_name}_{formatted_date}.pdf"
 
-    return pdf_bytes, filename
+    return html, filename
+
+
+def _prepare_report_in_session(user_id: int, attempt_id: int) -> tuple[str, str]:
+    db = SessionLocal()
+    try:
+        return prepare_report(db, user_id, attempt_id)
+    finally:
+        db.close()
+
+
+async def render_report(attempt_id: int, html: str) -> bytes:
+    """The report PDF for ``html``, from the cache or rendered in the pool."""
+    digest = report_cache.content_hash(html)
+    pdf_bytes = await run_blocking(report_cache.get, attempt_id, digest)
+    if pdf_bytes is None:
+        pdf_bytes = await renderer.render(html)
+        await run_blocking(report_cache.put, attempt_id, digest, pdf_bytes)
+    return pdf_bytes
+
+
+async def generate_report_pdf_file(
+    db: Session, user_id: int, attempt_id: int
+) -> tuple[bytes, str]:
+    """
+    Report PDF of an attempt and its output filename.
+    Returns:
+        tuple[bytes, str]: (pdf_bytes, filename)
+    """
+    html, filename = await run_blocking(prepare_report, db, user_id, attempt_id)
+    return await render_report(attempt_id, html), filename
+
+
+# ---------------------------------------------------------------------------
+# ZIP export
+# ---------------------------------------------------------------------------
+
+
+class _ZipChunks:
+    """Write-only sink for ``zipfile``; written bytes are drained per entry."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_reports_zip(targets: list[tuple[int, int]]) -> AsyncIterator[bytes]:
+    """
+    Render the reports of (user_id, attempt_id) pairs, a few at a time, and
+    yield a ZIP archive of them entry by entry as they finish. Reports that
+    fail are listed in ``errors.txt`` at the end of the archive.
+    """
+    semaphore = asyncio.Semaphore(max(settings.REPORT_PDF_PROCESSES, 1))
+
+    async def build(user_id: int, attempt_id: int):
+        try:
+            async with semaphore:
+                html, filename = await run_blocking(
+                    _prepare_report_in_session, user_id, attempt_id
+                )
+                pdf_bytes = await render_report(attempt_id, html)
+            return f"{attempt_id}_{filename}", pdf_bytes, None
+        except Exception as e:
+            return None, None, f"Attempt {attempt_id} (user {user_id}): {e}"
+
+    tasks = [
+        asyncio.ensure_future(build(user_id, attempt_id))
+        for user_id, attempt_id in targets
+    ]
+    sink = _ZipChunks()
+    errors = []
+    try:
+        # PDFs are already compressed, so entries are stored as they are
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+            for next_report in asyncio.as_completed(tasks):
+                name, pdf_bytes, error = await next_report
+                if error:
+                    errors.append(error)
+                    continue
+                archive.writestr(name, pdf_bytes)
+                yield sink.drain()
+            if errors:
+                archive.writestr("errors.txt", "\n".join(errors) + "\n")
+        yield sink.drain()
+    finally:
+        for task in tasks:
+            task.cancel()
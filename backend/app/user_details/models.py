@@ -5,8 +5,10 @@ from sqlalchemy import (
     Boolean,
     Date,
     ForeignKey,
+    Index,
     TIMESTAMP,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -40,3 +42,8 @@ class UserDetail(Base):
         onupdate=func.current_timestamp(),
         nullable=False,
     )
+
+    __table_args__ = (
+        # Duplicate detection blocks candidates on DOB
+        Index("ix_user_details_dob", text("(personal_details ->> 'dob')")),
+    )
@@ -6,7 +6,7 @@ from app.utils.status_codes import StatusCode
 from app.user_details.schemas import UserDetailsSchema
 from app.user_details.models import UserDetail
 from app.users.models import User
-from app.duplicates.service import detect_duplicates
+from app.duplicates.queue import enqueue_duplicate_check
 from app.classifications.models import Classification
 
 
@@ -104,9 +104,9 @@ async def save_user_details(
 
         if run_duplicate_check:
             try:
-                await detect_duplicates(db_session, int(user_id), data)
+                await enqueue_duplicate_check(int(user_id))
             except Exception as dup_err:
-                print(f"Error detecting duplicates: {str(dup_err)}")
+                print(f"Error queueing duplicate check: {str(dup_err)}")
 
         return {
             "id": row["id"],
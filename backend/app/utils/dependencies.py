@@ -1,13 +1,24 @@
-from typing import List
-from fastapi import Request, HTTPException, status
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+from fastapi import Depends, Request, HTTPException, status
 import jwt
+from app.auth import revocation
 from app.core.config import settings
+from app.core.executor import run_blocking
 
 ALGORITHM = "HS256"
 
+logger = logging.getLogger(__name__)
 
-def authenticate_user(request: Request) -> int:
-    """Helper to verify JWT token from request headers or query params."""
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    role: Optional[str]
+
+
+def _get_token(request: Request) -> Optional[str]:
     auth_header = request.headers.get("Authorization")
     token = None
 
@@ -23,63 +34,105 @@ def authenticate_user(request: Request) -> int:
     if not token:
         token = request.query_params.get("auth_token")
 
-    if not token or token == "undefined" or token == "null":
-        print(
-            f"AUTH DEBUG: No token found. Headers: {dict(request.headers)}, Params: {dict(request.query_params)}"
-        )
+    if token in ("undefined", "null"):
+        return None
+    return token
+
+
+def _decode_token(request: Request) -> dict:
+    token = _get_token(request)
+    if not token:
+        logger.debug(f"Auth: no token on {request.method} {request.url.path}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("id") or payload.get("user_id")
-
-        if user_id is None:
-            print(f"AUTH DEBUG: Token valid but no user_id in payload: {payload}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
-            )
-        # Store user info in request state
-        request.state.user_id = user_id
-        request.state.user_role = payload.get("role")
-        return user_id
     except jwt.ExpiredSignatureError:
-        print("AUTH DEBUG: Token has expired")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
         )
     except jwt.PyJWTError as e:
-        print(f"AUTH DEBUG: JWT Decode Error: {str(e)}. Token prefix: {token[:10]}...")
+        logger.info(f"Auth: JWT decode error: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}",
         )
 
+    if (payload.get("id") or payload.get("user_id")) is None:
+        logger.info("Auth: token valid but no user_id in payload")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+    return payload
 
-# --- Dependencies (FastAPI Native Approach) ---
 
+async def _check_revocation(user_id: int, payload: dict) -> None:
+    state = revocation.cached_state(user_id)
+    if state is None:
+        state = await run_blocking(revocation.get_state, user_id)
 
-def require_roles(allowed_roles: List[str]):
-    """Dependency factory to ensure a user has specific roles."""
+    if state.inactive:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Your account is currently inactive.",
+        )
+    if state.revoked_before:
+        # Tokens issued before "iat" was added: derive it from the expiry
+        issued_at = payload.get("iat") or (
+            payload.get("exp", 0) - settings.JWT_EXPIRE_HOURS * 3600
+        )
+        if issued_at < state.revoked_before:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+            )
 
-    def dependency(request: Request):
-        authenticate_user(request)
-        _check_role(request, allowed_roles)
 
-    return dependency
+async def get_principal(request: Request) -> Principal:
+    """
+    The request's user, resolved once per request and kept on ``request.state``
+    (with ``user_id`` and ``user_role`` for handlers that read them directly).
+    Deactivated users and revoked tokens are refused when revocation is on.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
 
+    payload = _decode_token(request)
+    principal = Principal(
+        user_id=payload.get("id") or payload.get("user_id"),
+        role=payload.get("role"),
+    )
+    if revocation.is_enabled():
+        await _check_revocation(principal.user_id, payload)
 
-# --- Internal Helpers ---
+    request.state.principal = principal
+    request.state.user_id = principal.user_id
+    request.state.user_role = principal.role
+    return principal
 
 
-def _check_role(request: Request, allowed_roles: List[str]):
-    """Check if the user has one of the allowed roles."""
-    user_role = getattr(request.state, "user_role", None)
-    if user_role not in allowed_roles:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Role '{user_role}' not authorized. Required: {allowed_roles}",
-        )
+async def authenticate_user(request: Request) -> int:
+    """Id of the authenticated user (token from the headers or query params)."""
+    return (await get_principal(request)).user_id
+
+
+# --- Dependencies (FastAPI Native Approach) ---
+
+
+def require_roles(allowed_roles: List[str]):
+    """Dependency factory to ensure a user has specific roles."""
+    allowed = frozenset(allowed_roles)
+
+    async def dependency(principal: Principal = Depends(get_principal)):
+        if principal.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Role '{principal.role}' not authorized. Required: {allowed_roles}",
+            )
+
+    return dependency
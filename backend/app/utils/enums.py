@@ -26,3 +26,10 @@ class InterviewStatus(str, Enum):
 class EvaluationStatus(str, Enum):
     PENDING = "pending"
     COMPLETED = "completed"
+
+
+class TotalCountMode(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
@@ -1,82 +1,209 @@
-from datetime import date
-from sqlalchemy import or_, func, select
+"""
+Auto-expiration of candidates whose interview date has passed.
+
+A candidate who was assigned a paper (or registered) on an earlier day and
+never finished is marked 'expired' and deactivated. ``run_auto_expiration``
+does this with one set-based ``UPDATE ... RETURNING``.
+
+The sweep runs off the request path: ``run_expiration_scheduler`` runs it
+every EXPIRATION_INTERVAL_SECONDS in each worker. A Redis lease on
+EXPIRATION_LOCK_KEY makes sure only one worker sweeps per interval. The
+outcome of the last sweep is kept under EXPIRATION_WATERMARK_KEY. Sign-in
+still sweeps the one candidate signing in, so nobody gets in during the gap
+between sweeps.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, case, exists, func, not_, or_, select, update
+
+from app.auth import revocation
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.redis_client import redis_client
+from app.database.db import SessionLocal
 from app.users.models import User
 from app.paper_assignments.models import PaperAssignment
 from app.user_details.models import UserDetail
 from app.departments.models import Department
 from app.utils.enums import ProcessStatus, RoleType
 
+logger = logging.getLogger(__name__)
 
-def run_auto_expiration(db_session):
+EXPIRATION_LOCK_KEY = "expiration:lock"
+EXPIRATION_WATERMARK_KEY = "expiration:last_run"
+
+_FINISHED_STATUSES = [
+    ProcessStatus.SUBMITTED.value,
+    ProcessStatus.AUTO_SUBMITTED.value,
+]
+
+
+def _expirable_users(today: date):
+    """WHERE clause for candidates to expire as of ``today``."""
+    return and_(
+        User.role == RoleType.USER.value,
+        User.is_active.is_(True),
+        User.process_status.in_(
+            [
+                ProcessStatus.PENDING.value,
+                ProcessStatus.READY.value,
+                ProcessStatus.INPROGRESS.value,
+                *_FINISHED_STATUSES,
+            ]
+        ),
+        # Exclude Software department users from auto-expiration
+        ~exists().where(
+            Department.id == User.department_id,
+            Department.name.ilike("%software%"),
+        ),
+        # Identify candidates from past dates (by assignment or registration)
+        or_(
+            exists().where(
+                PaperAssignment.user_id == User.id,
+                PaperAssignment.assigned_date < today,
+            ),
+            func.date(User.created_at) < today,
+        ),
+        # MUST NOT have been updated/touched today (Manual Override)
+        func.date(User.updated_at) < today,
+        # MUST NOT have an assignment for today
+        ~User.id.in_(
+            select(PaperAssignment.user_id).where(
+                PaperAssignment.assigned_date == today
+            )
+        ),
+        # Must have details, and not be reset for re-interview today
+        exists().where(
+            UserDetail.user_id == User.id,
+            not_(UserDetail.is_reinterview & (UserDetail.reinterview_date == today)),
+        ),
+    )
+
+
+def run_auto_expiration(db_session, user_ids: Optional[Iterable[int]] = None):
     """
-    Identifies users who were assigned a paper in the past but never finished it,
-    marking them as 'expired' and deactivating their accounts.
-    Runs a bulk update for all eligible users.
+    Marks users who were assigned a paper in the past but never finished it as
+    'expired' and deactivates their accounts, in one UPDATE. Users who already
+    submitted keep their status and are only deactivated.
+
+    ``user_ids`` limits the sweep to those users (e.g. the one signing in).
+    Returns the number of users expired.
     """
     today = date.today()
 
-    # Subquery: Users who have an assignment for TODAY (don't expire them yet)
-    has_today_assignment = select(PaperAssignment.user_id).where(
-        PaperAssignment.assigned_date == today
+    stmt = update(User).where(_expirable_users(today))
+    if user_ids is not None:
+        stmt = stmt.where(User.id.in_(list(user_ids)))
+    stmt = (
+        stmt.values(
+            process_status=case(
+                (User.process_status.in_(_FINISHED_STATUSES), User.process_status),
+                else_=ProcessStatus.EXPIRED.value,
+            ),
+            is_active=False,
+        )
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
     )
 
-    # We care about users who are 'ready', 'inprogress', or 'pending' (if they already have an assignment).
-
-    to_expire_query = (
-        db_session.query(User)
-        .outerjoin(PaperAssignment, User.id == PaperAssignment.user_id)
-        .outerjoin(UserDetail, User.id == UserDetail.user_id)
-        .outerjoin(Department, User.department_id == Department.id)
-        .filter(
-            User.role == RoleType.USER.value,
-            User.is_active.is_(True),
-            User.process_status.in_(
-                [
-                    ProcessStatus.PENDING.value,
-                    ProcessStatus.READY.value,
-                    ProcessStatus.INPROGRESS.value,
-                    ProcessStatus.SUBMITTED.value,
-                    ProcessStatus.AUTO_SUBMITTED.value,
-                ]
-            ),
-            # Exclude Software department users from auto-expiration
-            or_(Department.id.is_(None), ~Department.name.ilike("%software%")),
-            # Identify candidates from past dates (by assignment or registration)
-            or_(
-                PaperAssignment.assigned_date < today,
-                func.date(User.created_at) < today,
+    try:
+        expired_ids = db_session.execute(stmt).scalars().all()
+        db_session.commit()
+    except Exception as e:
+        db_session.rollback()
+        logger.error(f"Error during auto-expiration: {e}")
+        return 0
+
+    if expired_ids:
+        revocation.deactivate(expired_ids)
+        logger.info(f"Auto-expired {len(expired_ids)} users.")
+    return len(expired_ids)
+
+
+# ---------------------------------------------------------------------------
+# Scheduled sweep (one per worker process, one run per interval across them)
+# ---------------------------------------------------------------------------
+
+
+def _acquire_lease(interval: float) -> bool:
+    """
+    Take this interval's sweep. The lease is not released: it expires with the
+    interval, so the other workers waking in the same window skip the sweep.
+    Without Redis every worker sweeps; the UPDATE is idempotent.
+    """
+    if redis_client is None:
+        return True
+    try:
+        return bool(
+            redis_client.set(
+                EXPIRATION_LOCK_KEY,
+                str(os.getpid()),
+                nx=True,
+                px=max(int(interval * 1000) - 500, 1000),
+            )
+        )
+    except RedisError as e:
+        logger.warning(f"Expiration: lease unavailable, sweeping anyway: {e}")
+        return True
+
+
+def _record_watermark(expired: int) -> None:
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(
+            EXPIRATION_WATERMARK_KEY,
+            json.dumps(
+                {
+                    "ran_at": datetime.now(timezone.utc).isoformat(),
+                    "expired": expired,
+                }
             ),
-            # MUST NOT have been updated/touched today (Manual Override)
-            func.date(User.updated_at) < today,
-            # MUST NOT have an assignment for today
-            ~User.id.in_(has_today_assignment),
-            # Exclude users who are reset for re-interview today
-            ~(UserDetail.is_reinterview & (UserDetail.reinterview_date == today)),
         )
-        .distinct()
-    )
+    except RedisError as e:
+        logger.warning(f"Expiration: could not record watermark: {e}")
 
-    expired_count = 0
-    # Use .all() to fetch all matching users first to avoid cursor issues during iteration
-    users_to_expire = to_expire_query.all()
 
-    for user in users_to_expire:
-        # Only set process_status to 'expired' if they haven't submitted
-        if user.process_status not in [
-            ProcessStatus.SUBMITTED.value,
-            ProcessStatus.AUTO_SUBMITTED.value,
-        ]:
-            user.process_status = ProcessStatus.EXPIRED.value
+def get_last_run() -> Optional[dict]:
+    """Watermark of the last sweep ({"ran_at", "expired"}), if known."""
+    if redis_client is None:
+        return None
+    try:
+        raw = redis_client.get(EXPIRATION_WATERMARK_KEY)
+    except RedisError:
+        return None
+    return json.loads(raw) if raw else None
 
-        user.is_active = False
-        expired_count += 1
 
-    if expired_count > 0:
+def sweep_expired_users() -> Optional[int]:
+    """One scheduled sweep; returns None when another worker holds the lease."""
+    if not _acquire_lease(settings.EXPIRATION_INTERVAL_SECONDS):
+        return None
+    db = SessionLocal()
+    try:
+        expired = run_auto_expiration(db)
+    finally:
+        db.close()
+    _record_watermark(expired)
+    return expired
+
+
+async def run_expiration_scheduler(stop_event: asyncio.Event) -> None:
+    """Sweep every EXPIRATION_INTERVAL_SECONDS, starting right away."""
+    interval = settings.EXPIRATION_INTERVAL_SECONDS
+    while not stop_event.is_set():
         try:
-            db_session.commit()
-            print(f"Auto-expired {expired_count} users.")
+            await run_blocking(sweep_expired_users)
         except Exception as e:
-            db_session.rollback()
-            print(f"Error during auto-expiration: {str(e)}")
-
-    return expired_count
+            logger.error(f"Expiration: sweep failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
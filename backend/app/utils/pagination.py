@@ -1,7 +1,25 @@
-from typing import Generic, TypeVar, List, Optional
+from typing import Any, Callable, Generic, TypeVar, List, Optional
 from pydantic import BaseModel, ConfigDict
-from fastapi import Query
+from fastapi import HTTPException, Query
+import base64
+import binascii
+import hashlib
+import json
+import logging
 import math
+from datetime import date, datetime
+from decimal import Decimal
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query as ORMQuery
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.utils.enums import TotalCountMode
+from app.utils.status_codes import StatusCode
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
@@ -12,6 +30,8 @@ class PaginationParams(BaseModel):
     search: Optional[str] = None
     sort_by: Optional[str] = "created_at"
     order: Optional[str] = "desc"
+    cursor: Optional[str] = None
+    total: TotalCountMode = TotalCountMode.EXACT
 
 
 def get_pagination_params(
@@ -20,19 +40,33 @@ def get_pagination_params(
     search: Optional[str] = Query(None, description="Search query"),
     sort_by: Optional[str] = Query("created_at", description="Field to sort by"),
     order: Optional[str] = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
+    total: TotalCountMode = Query(
+        TotalCountMode.EXACT,
+        description="How total_records is computed (exact/cached/estimated/none)",
+    ),
 ) -> PaginationParams:
     return PaginationParams(
-        page=page, limit=limit, search=search, sort_by=sort_by, order=order
+        page=page,
+        limit=limit,
+        search=search,
+        sort_by=sort_by,
+        order=order,
+        cursor=cursor,
+        total=total,
     )
 
 
 class PaginationInfo(BaseModel):
-    total_records: int
-    total_pages: int
+    total_records: Optional[int]
+    total_pages: Optional[int]
     current_page: int
     per_page: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -43,9 +77,23 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
 
 def create_paginated_response(
-    data: List[T], total_records: int, params: PaginationParams
+    data: List[T],
+    total_records: Optional[int],
+    params: PaginationParams,
+    next_cursor: Optional[str] = None,
 ) -> dict:
-    total_pages = math.ceil(total_records / params.limit) if params.limit > 0 else 0
+    """
+    total_records may be None (total=none); has_next then comes from
+    next_cursor, which keyset-aware lists set whenever another row exists.
+    """
+    if total_records is None:
+        total_pages = None
+        has_next = next_cursor is not None
+    else:
+        total_pages = math.ceil(total_records / params.limit) if params.limit > 0 else 0
+        has_next = (
+            next_cursor is not None if params.cursor else params.page < total_pages
+        )
     return {
         "data": data,
         "pagination": {
@@ -53,7 +101,185 @@ def create_paginated_response(
             "total_pages": total_pages,
             "current_page": params.page,
             "per_page": params.limit,
-            "has_next": params.page < total_pages,
-            "has_previous": params.page > 1,
+            "has_next": has_next,
+            "has_previous": params.page > 1 or bool(params.cursor),
+            "next_cursor": next_cursor,
         },
     }
+
+
+# ---------------------------------------------------------------------------
+# Keyset (cursor) pagination
+# ---------------------------------------------------------------------------
+
+
+def _encode_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    return ["v", value]
+
+
+def _decode_value(tagged: list) -> Any:
+    kind, value = tagged
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "d":
+        return date.fromisoformat(value)
+    if kind == "dec":
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: int, sort_key: Optional[str] = None) -> str:
+    """Opaque cursor for the row at (sort_value, row_id) of a list by sort_key."""
+    raw = json.dumps(
+        [sort_key, _encode_value(sort_value), row_id], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: Optional[str] = None) -> tuple[Any, int]:
+    """(sort_value, row_id) of a cursor; 400 unless it was made for sort_key."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_key, sort_value, row_id = json.loads(raw)
+        decoded = _decode_value(sort_value), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=StatusCode.BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+    if cursor_key != sort_key:
+        raise HTTPException(
+            status_code=StatusCode.BAD_REQUEST,
+            detail="Pagination cursor does not match the sort order",
+        )
+    return decoded
+
+
+def count_total(query: ORMQuery, mode: TotalCountMode) -> Optional[int]:
+    """
+    Total for an (unordered, unpaginated) query:
+    exact runs COUNT(*); cached reuses a COUNT from Redis for
+    PAGINATION_COUNT_CACHE_TTL_SECONDS; estimated reads the planner's row
+    estimate (pg_class statistics) from EXPLAIN; none skips it.
+    """
+    if mode == TotalCountMode.NONE:
+        return None
+    if mode == TotalCountMode.ESTIMATED:
+        return _estimate_count(query)
+    if mode == TotalCountMode.CACHED and redis_client is not None:
+        return _cached_count(query)
+    return query.count()
+
+
+def _compile(query: ORMQuery):
+    bind = query.session.get_bind()
+    return query.statement.compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def _estimate_count(query: ORMQuery) -> int:
+    compiled = _compile(query)
+    plan = (
+        query.session.connection()
+        .exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params or {}
+        )
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(query: ORMQuery) -> int:
+    compiled = _compile(query)
+    fingerprint = hashlib.sha1(
+        f"{compiled.string}|{sorted(compiled.params.items(), key=str)}".encode()
+    ).hexdigest()
+    key = f"pagination:count:{fingerprint}"
+    try:
+        cached = redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except RedisError as e:
+        logger.warning(f"Count cache read failed: {e}")
+        return query.count()
+
+    total = query.count()
+    try:
+        redis_client.set(key, total, ex=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning(f"Count cache write failed: {e}")
+    return total
+
+
+def paginate_query(
+    query: ORMQuery,
+    sort_column,
+    id_column,
+    row_key: Callable[[Any], tuple[Any, int]],
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    order: Optional[str] = "desc",
+    total: TotalCountMode = TotalCountMode.EXACT,
+) -> tuple[list, Optional[int], Optional[str]]:
+    """
+    Page through ``query`` ordered by (sort_column, id_column).
+
+    With a cursor the query seeks past that row instead of using OFFSET.
+    row_key(row) returns the (sort value, id) of a fetched row, used to build
+    next_cursor. One extra row is read to know whether another page exists,
+    so next_cursor is returned in page mode too and clients can switch over.
+    Cursors carry the sort column's name and are refused for another sort.
+    NULLs of a nullable sort column come last in either order.
+    Returns (rows, total_records, next_cursor).
+    """
+    total_records = count_total(query, total)
+
+    descending = order != "asc"
+    sort_key = sort_column.key
+    nullable = sort_column is not id_column and _is_nullable(sort_column)
+
+    def after(column, value):
+        return column < value if descending else column > value
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_key)
+        if sort_column is id_column:
+            seek = after(id_column, row_id)
+        elif sort_value is None:
+            # Among the trailing NULLs, ordered by id alone
+            seek = and_(sort_column.is_(None), after(id_column, row_id))
+        else:
+            seek = after(tuple_(sort_column, id_column), tuple_(sort_value, row_id))
+            if nullable:
+                seek = or_(seek, sort_column.is_(None))
+        query = query.filter(seek)
+        offset = 0
+
+    if sort_column is id_column:
+        ordering = [id_column.desc() if descending else id_column.asc()]
+    else:
+        sort_order = sort_column.desc() if descending else sort_column.asc()
+        if nullable:
+            sort_order = sort_order.nulls_last()
+        ordering = [sort_order, id_column.desc() if descending else id_column.asc()]
+
+    rows = query.order_by(*ordering).offset(offset).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*row_key(rows[-1]), sort_key)
+    return rows, total_records, next_cursor
+
+
+def _is_nullable(column) -> bool:
+    # Mapped attributes expose their Column as .expression; unknown: assume so
+    return getattr(getattr(column, "expression", column), "nullable", True)
@@ -1,8 +1,7 @@
 from enum import IntEnum
 from fastapi.responses import JSONResponse
 from typing import Any, Optional
-from datetime import datetime, date
-import json
+import orjson
 
 
 # ─────────────────────────────────────────────
@@ -68,31 +67,28 @@ class ResponseMessage:
 
 
 # ─────────────────────────────────────────────
-#  Custom JSON Encoder (handles datetime, date)
+#  JSON Response (single-pass orjson encoding)
 # ─────────────────────────────────────────────
 
 
-class CustomJSONEncoder(json.JSONEncoder):
-    """Handles datetime, date, and other non-serializable types."""
+def _json_default(obj: Any) -> Any:
+    """Types orjson does not encode natively: Pydantic models, Decimal, etc."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
 
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)
 
+class APIJSONResponse(JSONResponse):
+    """
+    Encodes the body once with orjson. datetime/date come out as isoformat,
+    Pydantic models at any depth as their dump, and anything else orjson
+    cannot encode (Decimal, sets, ...) as str().
+    """
 
-def serialize(data: Any) -> Any:
-    """Recursively convert non-serializable objects (Pydantic models, datetime, etc.) to JSON-safe types."""
-    # If the data is a Pydantic model, convert to dict first
-    if hasattr(data, "dict"):
-        data = data.dict()
-    elif hasattr(data, "model_dump"):
-        data = data.model_dump()
-
-    return json.loads(json.dumps(data, cls=CustomJSONEncoder))
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+        )
 
 
 # ─────────────────────────────────────────────
@@ -112,10 +108,10 @@ def api_response(
         "message": message,
     }
     if data is not None:
-        body["data"] = serialize(data)
+        body["data"] = data
     if errors is not None:
-        body["errors"] = serialize(errors)
+        body["errors"] = errors
     if pagination is not None:
-        body["pagination"] = serialize(pagination)
+        body["pagination"] = pagination
 
-    return JSONResponse(status_code=status_code, content=body)
+    return APIJSONResponse(status_code=status_code, content=body)
@@ -0,0 +1,116 @@
+"""
+Benchmark: per-request authentication overhead.
+
+Serves one empty route guarded the way interview_attempts/router.py guards
+its routes (router-level ``authenticate_user``, the same again as a parameter,
+plus ``require_roles``) through the ASGI stack in-process, with the previous
+dependencies ("legacy": sync, re-decoding the JWT in ``require_roles``) and
+with app.utils.dependencies (decoded once per request, async, revocation
+state from the per-worker cache). Reports time per request and jwt.decode
+calls per request; an unguarded route gives the baseline.
+
+Usage (from backend/):
+    python scripts/bench_auth_overhead.py
+    python scripts/bench_auth_overhead.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request  # noqa: E402
+
+from app.auth.utils import generate_jwt  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.utils import dependencies  # noqa: E402
+
+decode_calls = 0
+_decode = jwt.decode
+
+
+def counting_decode(*args, **kwargs):
+    global decode_calls
+    decode_calls += 1
+    return _decode(*args, **kwargs)
+
+
+jwt.decode = counting_decode
+
+
+def legacy_authenticate_user(request: Request) -> int:
+    auth_header = request.headers.get("Authorization")
+    token = auth_header.split(" ")[1] if auth_header else None
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    request.state.user_id = payload.get("id") or payload.get("user_id")
+    request.state.user_role = payload.get("role")
+    return request.state.user_id
+
+
+def legacy_require_roles(allowed_roles):
+    def dependency(request: Request):
+        legacy_authenticate_user(request)
+        if request.state.user_role not in allowed_roles:
+            raise HTTPException(status_code=403, detail="Forbidden")
+
+    return dependency
+
+
+def build_app(authenticate, require_roles) -> FastAPI:
+    router = APIRouter(dependencies=[Depends(authenticate)])
+
+    @router.get("/guarded", dependencies=[Depends(require_roles(["admin"]))])
+    async def guarded(current_user: int = Depends(authenticate)):
+        return {"user_id": current_user}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.get("/open")
+    async def open_route():
+        return {"user_id": None}
+
+    return app
+
+
+async def measure(label: str, app: FastAPI, path: str, headers: dict, count: int):
+    global decode_calls
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(50):
+            assert (await c.get(path, headers=headers)).status_code == 200
+        decode_calls = 0
+        started = time.perf_counter()
+        for _ in range(count):
+            await c.get(path, headers=headers)
+        elapsed = time.perf_counter() - started
+    print(
+        f"{label:<10} {elapsed / count * 1e6:8.1f}us/request  "
+        f"{decode_calls / count:.1f} jwt.decode/request"
+    )
+
+
+async def main(args):
+    settings.SECRET_KEY = settings.SECRET_KEY or "bench-secret"
+    token = generate_jwt({"id": 1, "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    legacy = build_app(legacy_authenticate_user, legacy_require_roles)
+    current = build_app(dependencies.authenticate_user, dependencies.require_roles)
+    print(f"{args.requests} sequential requests per variant\n")
+    await measure("no auth", current, "/open", headers, args.requests)
+    await measure("legacy", legacy, "/guarded", headers, args.requests)
+    await measure("current", current, "/guarded", headers, args.requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,168 @@
+"""
+Benchmark: parsing, validating and inserting a bulk question upload.
+
+Compares the old path (pandas read_excel of the whole sheet, then one pydantic
+model per row) with the streaming importer (openpyxl read-only rows, one
+TypeAdapter call per chunk) over a synthetic MCQ workbook. With --insert it
+also compares bulk_save_objects(return_defaults=True) with the chunked
+INSERT ... RETURNING; inserts run in a transaction that is rolled back.
+
+Usage (from backend/):
+    python scripts/bench_bulk_upload.py                  # 50k rows, parse only
+    python scripts/bench_bulk_upload.py --rows 10000 --insert
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+from app.questions.bulk_upload_service import BulkUploadService  # noqa: E402
+from app.questions.constants import QuestionType  # noqa: E402
+
+HEADER = [
+    "Subject Code",
+    "Exam Level Code",
+    "Marks",
+    "Question Text",
+    "Option 1",
+    "Option 2",
+    "Option 3",
+    "Option 4",
+    "Correct Option",
+    "Answer Explanation",
+]
+SUBJECTS = {"APTITUDE": {"id": 1, "code": "APTITUDE"}}
+LEVELS = {"FRESHER": {"id": 2, "code": "FRESHER"}}
+
+
+def synthetic_workbook(rows: int) -> bytes:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for index in range(rows):
+        sheet.append(
+            [
+                "aptitude",
+                "fresher",
+                1 + index % 3,
+                f"Question {index}: " + "lorem ipsum " * 8,
+                "Option A",
+                "Option B",
+                "Option C",
+                "Option D",
+                1 + index % 4,
+                "Because",
+            ]
+        )
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_prepare(service: BulkUploadService, data: bytes) -> list[dict]:
+    df = pd.read_excel(io.BytesIO(data))
+    df = df.where(pd.notnull(df), None)
+    schema = service.QUESTION_CONFIG[QuestionType.MULTIPLE_CHOICE]["schema"]
+    return [
+        service._build_item(
+            schema(**row), row, QuestionType.MULTIPLE_CHOICE, SUBJECTS, LEVELS, {}
+        )
+        for row in df.to_dict("records")
+    ]
+
+
+def streaming_prepare(service: BulkUploadService, data: bytes, chunk_size: int):
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        for chunk in service._iter_row_chunks(workbook.worksheets[0], chunk_size):
+            prepared, errors = service._validate_chunk(
+                chunk, QuestionType.MULTIPLE_CHOICE, SUBJECTS, LEVELS, {}
+            )
+            assert not errors, errors[:3]
+            yield prepared
+    finally:
+        workbook.close()
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"  {label:<10} {time.perf_counter() - started:8.2f}s")
+    return result
+
+
+def legacy_insert(db, prepared: list[dict]) -> None:
+    from app.answer.models import QuestionAnswer
+    from app.questions.models import Question
+
+    questions = [Question(**item["question"], created_by=1) for item in prepared]
+    db.bulk_save_objects(questions, return_defaults=True)
+    db.flush()
+    db.bulk_save_objects(
+        [
+            QuestionAnswer(question_id=question.id, **item["answer"], created_by=1)
+            for question, item in zip(questions, prepared)
+        ]
+    )
+    db.flush()
+
+
+def compare_inserts(prepared: list[dict], chunk_size: int) -> None:
+    from app.database.db import SessionLocal
+
+    import app.main  # noqa: F401  (registers every mapper)
+
+    chunks = [
+        prepared[start : start + chunk_size]
+        for start in range(0, len(prepared), chunk_size)
+    ]
+    print(f"insert ({len(prepared)} questions, rolled back)")
+    for label, insert in (
+        ("legacy", lambda db: legacy_insert(db, prepared)),
+        (
+            "chunked",
+            lambda db: [
+                BulkUploadService._insert_chunk(db, chunk, 1) for chunk in chunks
+            ],
+        ),
+    ):
+        db = SessionLocal()
+        try:
+            timed(label, lambda: insert(db))
+        finally:
+            db.rollback()
+            db.close()
+
+
+def main(args):
+    service = BulkUploadService()
+    data = synthetic_workbook(args.rows)
+    print(f"parse + validate ({args.rows} rows, {len(data) / 1024:.0f} KiB)")
+    legacy = timed("legacy", lambda: legacy_prepare(service, data))
+    streamed = timed(
+        "streaming",
+        lambda: [
+            item
+            for chunk in streaming_prepare(service, data, args.chunk_size)
+            for item in chunk
+        ],
+    )
+    if legacy != streamed:
+        print("  WARNING prepared rows differ")
+    if args.insert:
+        compare_inserts(streamed, args.chunk_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--insert", action="store_true")
+    main(parser.parse_args())
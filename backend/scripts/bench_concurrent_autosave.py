@@ -0,0 +1,123 @@
+"""
+Benchmark: 100 concurrent autosaves on one event loop.
+
+Compares calling the sync repository inline from an async handler (the old
+behaviour) with dispatching it through app.core.executor. A heartbeat task
+measures event-loop lag, which is what other requests on the same worker feel.
+
+Usage (from backend/):
+    python scripts/bench_concurrent_autosave.py                # simulated DB latency
+    python scripts/bench_concurrent_autosave.py --latency-ms 25 --concurrency 200
+    python scripts/bench_concurrent_autosave.py --attempt-id 12 --user-id 34 \\
+        --question-ids 101,102,103                             # real DB round trips
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.executor import BlockingDispatcher  # noqa: E402
+
+
+def build_save_call(args):
+    if args.attempt_id is None:
+
+        def simulated_save(index: int):
+            time.sleep(args.latency_ms / 1000)
+            return {"question_id": index}
+
+        return simulated_save
+
+    from app.interview_attempts import repository
+
+    question_ids = [int(item) for item in args.question_ids.split(",") if item]
+
+    def real_save(index: int):
+        return repository.save_answer(
+            record_id=args.attempt_id,
+            question_id=question_ids[index % len(question_ids)],
+            user_id=args.user_id,
+            answer_text=f"bench-{index}",
+            is_auto_saved=True,
+        )
+
+    return real_save
+
+
+async def heartbeat(samples: list[float], stop: asyncio.Event, interval: float):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def run_inline(save, concurrency: int):
+    async def handler(index: int):
+        started = time.perf_counter()
+        save(index)
+        return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(handler(i) for i in range(concurrency)))
+
+
+async def run_dispatched(save, concurrency: int, dispatcher: BlockingDispatcher):
+    async def handler(index: int):
+        started = time.perf_counter()
+        await dispatcher.run(save, index)
+        return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(handler(i) for i in range(concurrency)))
+
+
+async def measure(label: str, runner) -> None:
+    lag_samples: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lag_samples, stop, 0.005))
+
+    started = time.perf_counter()
+    latencies = await runner()
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    stop.set()
+    await beat
+
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<12} wall={wall_ms:8.1f}ms  "
+        f"p50={statistics.median(latencies):8.1f}ms  p95={p95:8.1f}ms  "
+        f"max_loop_lag={max(lag_samples or [0.0]):8.1f}ms"
+    )
+
+
+async def main(args):
+    save = build_save_call(args)
+    dispatcher = BlockingDispatcher(max_workers=args.workers, slow_wait_ms=10_000)
+
+    print(
+        f"{args.concurrency} concurrent autosaves, "
+        f"{'real DB' if args.attempt_id else f'{args.latency_ms}ms simulated'} "
+        f"per call, {args.workers} dispatcher workers\n"
+    )
+    await measure("inline", lambda: run_inline(save, args.concurrency))
+    await measure(
+        "dispatched", lambda: run_dispatched(save, args.concurrency, dispatcher)
+    )
+    print(f"\ndispatcher stats: {dispatcher.stats()}")
+    dispatcher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--attempt-id", type=int)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--question-ids", default="")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""
+Benchmark: whole-population duplicate sweep.
+
+Generates synthetic profiles (shaped like duplicates.service.build_profile)
+with a share of planted duplicates carrying typos in names, DOB, mobile or
+pincode, then times candidate generation (blocking keys + MinHash/LSH) and
+scoring, and reports the recall of the planted pairs. The all-pairs cost is
+extrapolated from scoring a random sample of pairs.
+
+Usage (from backend/):
+    python scripts/bench_duplicate_sweep.py                   # 100k profiles
+    python scripts/bench_duplicate_sweep.py --profiles 20000 --processes 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.duplicates import sweep  # noqa: E402
+
+SYLLABLES = "ra hul pri ya a mit su ni ta vi kas ne ha ar jun poo ja ka vi re sh an ma no de pa ro sne me na ke la".split()
+LAST = "Sharma Verma Gupta Singh Kumar Yadav Jain Patel Mehta Agarwal Mishra Chauhan Joshi Pandey Saxena Tiwari Rathore Shekhawat Meena Choudhary".split()
+CITIES = "Jaipur Delhi Udaipur Kota Ajmer Bikaner Alwar Jodhpur".split()
+
+
+def _first_name(rng: random.Random) -> str:
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 3))).capitalize()
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    if len(text) < 3:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return rng.choice(
+        [
+            text[:i] + text[i + 1 :],
+            text[:i] + text[i] + text[i:],
+            text[:i] + text[i + 1] + text[i] + text[i + 2 :],
+        ]
+    )
+
+
+def _profile(user_id: int, name, father, mother, dob, mobile, pincode, city):
+    return {
+        "user_id": user_id,
+        "personal": {
+            "dob": dob,
+            "presentCity": city,
+            "presentPincode": pincode,
+            "presentState": "Rajasthan",
+            "presentAddressLine1": f"{user_id % 500} Main Road",
+        },
+        "name": name,
+        "father": father,
+        "mother": mother,
+        "education": "RBSE 2015 RBSE 2017",
+        "work": "",
+        "created_at": None,
+        "mobile": mobile,
+    }
+
+
+def synthetic_profiles(count: int, duplicate_share: float, seed: int = 7):
+    rng = random.Random(seed)
+    profiles, planted = [], set()
+    for user_id in range(1, count + 1):
+        if profiles and rng.random() < duplicate_share:
+            source = rng.choice(profiles)
+            personal = source["personal"]
+            dob = personal["dob"]
+            if rng.random() < 0.5:
+                dob = dob[:-1] + str((int(dob[-1]) + 1) % 10)
+            profile = _profile(
+                user_id,
+                _typo(rng, source["name"]),
+                source["father"],
+                _typo(rng, source["mother"]),
+                dob,
+                (
+                    source["mobile"]
+                    if rng.random() < 0.5
+                    else f"9{rng.randrange(10**9):09d}"
+                ),
+                personal["presentPincode"],
+                personal["presentCity"],
+            )
+            planted.add((source["user_id"], user_id))
+        else:
+            last = rng.choice(LAST)
+            profile = _profile(
+                user_id,
+                f"{_first_name(rng)} {last}",
+                f"{_first_name(rng)} {last}",
+                f"{_first_name(rng)} {rng.choice(LAST)}",
+                f"{rng.randint(1985, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                f"9{rng.randrange(10**9):09d}",
+                f"30{rng.randrange(10000):04d}",
+                rng.choice(CITIES),
+            )
+        profiles.append(profile)
+    return profiles, planted
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<18} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main(args):
+    profiles, planted = synthetic_profiles(args.profiles, args.duplicate_share)
+    print(f"{len(profiles)} profiles, {len(planted)} planted duplicates")
+
+    pairs, _ = timed("candidate pairs", lambda: sweep.candidate_pairs(profiles))
+    matches, scoring = timed(
+        "scoring",
+        lambda: sweep.score_pairs(profiles, pairs, args.processes),
+    )
+
+    found = {(m["candidate_user_id"], m["new_user_id"]) for m in matches}
+    caught = {pair for pair in planted if pair in found}
+    total_pairs = len(profiles) * (len(profiles) - 1) // 2
+    print(
+        f"  candidate pairs    {len(pairs)} of {total_pairs} ({len(pairs) / total_pairs:.5%})"
+    )
+    print(f"  matches            {len(matches)}")
+    print(f"  planted recall     {len(caught) / max(len(planted), 1):.1%}")
+
+    rng = random.Random(1)
+    sample = [
+        tuple(sorted(rng.sample(range(len(profiles)), 2)))
+        for _ in range(args.sample_pairs)
+    ]
+    _, sample_seconds = timed(
+        "sample all-pairs", lambda: sweep.score_pairs(profiles, sample, 1)
+    )
+    estimate = sample_seconds / len(sample) * total_pairs / max(args.processes, 1)
+    print(f"  all-pairs estimate {estimate / 3600:8.1f}h (vs {scoring:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--duplicate-share", type=float, default=0.02)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--sample-pairs", type=int, default=20000)
+    main(parser.parse_args())
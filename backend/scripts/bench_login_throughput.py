@@ -0,0 +1,122 @@
+"""
+Benchmark: a burst of concurrent sign-ins on one worker.
+
+Each sign-in is a user lookup, a bcrypt check and a commit (DB round trips are
+simulated). "blocking pool" runs the whole sign-in on the blocking pool, as
+the service used to; "hasher" does the DB steps there and the bcrypt check in
+app.auth.hasher's thread pool. While the burst runs, light requests (one DB
+round trip each) arrive every few milliseconds; their latency is what other
+users of the worker feel.
+
+Usage (from backend/):
+    python scripts/bench_login_throughput.py
+    python scripts/bench_login_throughput.py --logins 400 --threads 4 --rounds 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.auth.hasher import PasswordHasher  # noqa: E402
+from app.auth.utils import hash_password, verify_password  # noqa: E402
+from app.core.executor import BlockingDispatcher  # noqa: E402
+
+
+def percentiles(samples: list[float]) -> str:
+    samples = sorted(samples) or [0.0]
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    return f"p50={statistics.median(samples):8.1f}ms p95={p95:8.1f}ms"
+
+
+async def light_requests(
+    dispatcher: BlockingDispatcher,
+    latency: float,
+    interval: float,
+    stop: asyncio.Event,
+    samples: list[float],
+):
+    async def request():
+        started = time.perf_counter()
+        await dispatcher.run(time.sleep, latency)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    tasks = []
+    while not stop.is_set():
+        tasks.append(asyncio.create_task(request()))
+        await asyncio.sleep(interval)
+    await asyncio.gather(*tasks)
+
+
+async def measure(label: str, sign_in, args, dispatcher: BlockingDispatcher):
+    stop = asyncio.Event()
+    light: list[float] = []
+    background = asyncio.create_task(
+        light_requests(
+            dispatcher, args.latency_ms / 1000, args.light_every_ms / 1000, stop, light
+        )
+    )
+
+    async def timed_sign_in():
+        started = time.perf_counter()
+        assert await sign_in()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    logins = await asyncio.gather(*(timed_sign_in() for _ in range(args.logins)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await background
+
+    print(
+        f"{label:<14} {args.logins / wall:7.1f} logins/s  "
+        f"login {percentiles(logins)}  light {percentiles(light)}"
+    )
+
+
+async def main(args):
+    password = "9876543210"
+    hashed = hash_password(password, args.rounds)
+    latency = args.latency_ms / 1000
+    dispatcher = BlockingDispatcher(max_workers=args.workers, slow_wait_ms=10_000)
+    hasher = PasswordHasher(threads=args.threads, slow_wait_ms=10_000)
+
+    def sign_in_blocking():
+        time.sleep(latency)
+        ok = verify_password(password, hashed)
+        time.sleep(latency)
+        return ok
+
+    async def sign_in_hasher():
+        await dispatcher.run(time.sleep, latency)
+        ok = await hasher.verify(password, hashed)
+        await dispatcher.run(time.sleep, latency)
+        return ok
+
+    print(
+        f"{args.logins} concurrent sign-ins, bcrypt rounds={args.rounds}, "
+        f"{args.workers} blocking workers, {args.threads} hashing threads, "
+        f"{args.latency_ms}ms per DB round trip\n"
+    )
+    await measure(
+        "blocking pool", lambda: dispatcher.run(sign_in_blocking), args, dispatcher
+    )
+    await measure("hasher", sign_in_hasher, args, dispatcher)
+    print(f"\nhasher stats: {hasher.stats()}")
+    hasher.shutdown()
+    dispatcher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--light-every-ms", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
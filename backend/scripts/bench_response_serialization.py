@@ -0,0 +1,237 @@
+"""
+Benchmark: encoding api_response bodies.
+
+Compares the old path (serialize() = json dumps/loads, then JSONResponse dumps
+again) with the single orjson pass of APIJSONResponse, over payloads shaped
+like build_paper_details (a 100-question paper) and
+get_admin_user_result_detail (a graded attempt).
+
+Usage (from backend/):
+    python scripts/bench_response_serialization.py              # synthetic payloads
+    python scripts/bench_response_serialization.py --questions 250 --rounds 500
+    python scripts/bench_response_serialization.py --paper-id 3 \\
+        --user-id 34 --attempt-id 12                            # real DB payloads
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.utils.status_codes import APIJSONResponse, StatusCode  # noqa: E402
+
+
+class LegacyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def legacy_response(body: dict) -> bytes:
+    body = dict(body, data=json.loads(json.dumps(body["data"], cls=LegacyEncoder)))
+    return JSONResponse(status_code=StatusCode.OK, content=body).body
+
+
+def orjson_response(body: dict) -> bytes:
+    return APIJSONResponse(status_code=StatusCode.OK, content=body).body
+
+
+def _options(index: int) -> list[dict]:
+    return [
+        {"option_label": label, "option_text": f"Option {label} for question {index}"}
+        for label in "ABCD"
+    ]
+
+
+def synthetic_paper(questions: int) -> dict:
+    sections = [
+        {
+            "id": code.lower(),
+            "code": code,
+            "title": title,
+            "duration_minutes": 20,
+            "total_marks": questions // 4,
+            "question_count": questions // 4,
+            "questions": [
+                {
+                    "id": index,
+                    "type": "multiple_choice",
+                    "question_text": f"Question {index}: " + "lorem ipsum " * 12,
+                    "subject_name": title,
+                    "type_name": "Multiple Choice",
+                    "image_url": None,
+                    "passage": "Passage text " * 20 if index % 10 == 0 else None,
+                    "marks": 1,
+                    "options": _options(index),
+                }
+                for index in range(offset, questions, 4)
+            ],
+        }
+        for offset, (code, title) in enumerate(
+            [("ENG", "English"), ("MATH", "Maths"), ("LR", "Reasoning"), ("GK", "GK")]
+        )
+    ]
+    return {
+        "paper": {
+            "id": 1,
+            "paper_name": "Synthetic paper",
+            "description": "Benchmark payload",
+            "total_time": 80,
+            "total_marks": questions,
+            "grade": "B",
+            "department_name": "Operations",
+            "test_level_name": "Fresher",
+        },
+        "total_questions": questions,
+        "sections": sections,
+    }
+
+
+def synthetic_result(questions: int) -> dict:
+    started = datetime(2026, 10, 18, 9, 30, 5, 123456)
+    return {
+        "user": {
+            "id": 34,
+            "username": "candidate",
+            "mobile": "9000000000",
+            "email": "candidate@example.com",
+            "is_active": False,
+            "department": "Operations",
+            "test_level": "Fresher",
+            "process_status": "submitted",
+        },
+        "attempt": {
+            "attempt_id": 12,
+            "paper_id": 1,
+            "paper_name": "Synthetic paper",
+            "attempt_number": 1,
+            "status": "submitted",
+            "completion_reason": "manual",
+            "started_at": started,
+            "submitted_at": started + timedelta(minutes=74),
+            "total_questions": questions,
+            "attempted_count": questions - 3,
+            "unattempted_count": 3,
+            "total_marks": float(questions),
+            "obtained_marks": float(questions * 0.7),
+            "overall_grade": "B",
+            "is_auto_submitted": False,
+        },
+        "summary": {
+            "correct_count": int(questions * 0.7),
+            "incorrect_count": questions - int(questions * 0.7) - 3,
+            "not_attempted_count": 3,
+            "total_marks_obtained": float(questions * 0.7),
+            "overall_percentage": 70.0,
+            "overall_grade": "B",
+        },
+        "subject_results": [
+            {"subject": code, "obtained": Decimal("17.50"), "total": Decimal("25")}
+            for code in ("ENG", "MATH", "LR", "GK")
+        ],
+        "grade_settings": [{"grade": "A", "min_percentage": 80}],
+        "answers": [
+            {
+                "question_id": index,
+                "section_code": "ENG",
+                "section_name": "English",
+                "question_type": "multiple_choice",
+                "subject_type": "english",
+                "exam_level": "easy",
+                "question_text": f"Question {index}: " + "lorem ipsum " * 12,
+                "passage": None,
+                "image_url": None,
+                "options": _options(index),
+                "max_marks": 1.0,
+                "user_answer": "A",
+                "typing_stats": None,
+                "correct_answer": "Option A",
+                "status": "correct",
+                "marks_obtained": 1.0,
+                "manual_marks": None,
+                "is_attempted": True,
+                "is_auto_saved": True,
+                "saved_at": (started + timedelta(seconds=index * 30)).isoformat(),
+            }
+            for index in range(questions)
+        ],
+    }
+
+
+def load_payloads(args) -> dict[str, dict]:
+    if args.paper_id is None and args.user_id is None:
+        return {
+            "paper_details": synthetic_paper(args.questions),
+            "result_detail": synthetic_result(args.questions),
+        }
+
+    from app.database.db import SessionLocal
+    from app.interview_attempts import repository as attempt_repository
+    from app.paper_assignments import repository as assignment_repository
+
+    import app.main  # noqa: F401  (registers every mapper)
+
+    payloads = {}
+    if args.paper_id is not None:
+        db = SessionLocal()
+        try:
+            payloads["paper_details"] = assignment_repository.build_paper_details(
+                db, args.paper_id
+            )
+        finally:
+            db.close()
+    if args.user_id is not None:
+        payloads["result_detail"] = attempt_repository.get_admin_user_result_detail(
+            args.user_id, args.attempt_id
+        )
+    return payloads
+
+
+def measure(label: str, encode, body: dict, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encode(body)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    median = statistics.median(timings)
+    print(f"  {label:<8} p50={median:7.3f}ms  p95={p95:7.3f}ms")
+    return median
+
+
+def main(args):
+    for name, data in load_payloads(args).items():
+        if data is None:
+            print(f"{name}: not found, skipped")
+            continue
+        body = {"status": StatusCode.OK, "message": "ok", "data": data}
+        if json.loads(legacy_response(body)) != json.loads(orjson_response(body)):
+            print(f"{name}: WARNING encodings differ")
+        size_kb = len(orjson_response(body)) / 1024
+        print(f"{name} ({size_kb:.1f} KiB, {args.rounds} rounds)")
+        legacy = measure("legacy", legacy_response, body, args.rounds)
+        fast = measure("orjson", orjson_response, body, args.rounds)
+        print(f"  speedup  {legacy / fast:.1f}x\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--paper-id", type=int)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--attempt-id", type=int)
+    main(parser.parse_args())
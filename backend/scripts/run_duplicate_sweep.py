@@ -0,0 +1,27 @@
+"""
+Sweep every saved candidate profile for duplicates (see app/duplicates/sweep.py)
+and record the new matches with their admin notifications.
+
+Usage (from backend/):
+    python scripts/run_duplicate_sweep.py --dry-run     # count only
+    python scripts/run_duplicate_sweep.py --processes 4
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.main  # noqa: F401,E402  (registers every mapper)
+from app.duplicates.sweep import run_sweep  # noqa: E402
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    stats = run_sweep(processes=args.processes, dry_run=args.dry_run)
+    for key, value in stats.items():
+        print(f"{key:<16} {value}")
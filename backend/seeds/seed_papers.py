@@ -6,6 +6,7 @@ import random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database.db import SessionLocal
+from app.papers import question_index
 from app.papers.models import Paper
 from app.questions.models import Question
 from app.departments.models import Department
@@ -120,6 +121,8 @@ def seed_papers():
                 ]
             )
             db.add(new_paper)
+            db.flush()
+            question_index.sync(db, new_paper.id, new_paper.question_id)
             print(f"✅ Created {name}: {len(subject_config)} subjects | {len(selected_question_ids)} questions | Marks: {len(selected_question_ids) * 5}")
 
         # 7. Create 3 custom uniquely-named papers with exactly 2 questions of 5 marks per subject
@@ -193,6 +196,8 @@ def seed_papers():
                 ]
             )
             db.add(custom_paper)
+            db.flush()
+            question_index.sync(db, custom_paper.id, custom_paper.question_id)
             print(f"✅ Created {name}: {len(subject_config)} subjects | {len(selected_question_ids)} questions | Marks: {len(selected_question_ids) * 5}")
 
         db.commit()
@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+from app.database.db import engine
+from app.interview_attempts import repository
+
+# Software department lookup, summary stats, and the page itself.
+MAX_STATEMENTS_PER_PAGE = 3
+
+
+@contextmanager
+def count_statements():
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+# ---------------------------
+# Admin results listing must not fan out per row
+# ---------------------------
+
+
+@pytest.mark.parametrize("limit", [1, 10, 100])
+def test_admin_results_statement_count_is_constant(limit):
+    with count_statements() as statements:
+        result = repository.get_admin_user_results(page=1, limit=limit)
+
+    assert len(statements) <= MAX_STATEMENTS_PER_PAGE, statements
+    for row in result["data"]:
+        assert isinstance(row["attempts_count"], int)
+        assert isinstance(row["latest_attempt"]["interviewers"], list)
+
+
+def test_admin_results_statement_count_past_last_page():
+    with count_statements() as statements:
+        result = repository.get_admin_user_results(page=10_000, limit=10)
+
+    assert result["data"] == []
+    # One extra COUNT, since there is no row to read the window total from
+    assert len(statements) <= MAX_STATEMENTS_PER_PAGE + 1, statements
+
+
+# ---------------------------
+# candidate_latest_attempts stays in step with interview_records
+# ---------------------------
+
+
+def test_latest_attempt_read_model_matches_records():
+    # Rows whose latest attempt / attempt count disagree with interview_records
+    with engine.connect() as conn:
+        drift = conn.execute(
+            text(
+                """
+                SELECT c.user_id
+                FROM candidate_latest_attempts AS c
+                FULL JOIN (
+                    SELECT user_id, max(id) AS attempt_id, count(*) AS n
+                    FROM interview_records
+                    GROUP BY user_id
+                ) AS r USING (user_id)
+                WHERE c.attempt_id IS DISTINCT FROM r.attempt_id
+                   OR c.attempts_count IS DISTINCT FROM coalesce(r.n, 0)
+                """
+            )
+        ).all()
+
+    assert drift == []
+
+
+# ---------------------------
+# A date range lists the latest attempt within the range
+# ---------------------------
+
+
+@pytest.fixture
+def candidate_with_older_attempt():
+    with engine.begin() as conn:
+        paper_id = conn.execute(text("SELECT min(id) FROM papers")).scalar()
+        if paper_id is None:
+            pytest.skip("needs a paper")
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (username, mobile, password, role, is_active) "
+                "VALUES ('Range Test', '5000000043', 'x', 'user', true) RETURNING id"
+            )
+        ).scalar()
+        record_ids = [
+            conn.execute(
+                text(
+                    "INSERT INTO interview_records "
+                    "(paper_id, user_id, status, started_at) "
+                    "VALUES (:p, :u, 'started', :t) RETURNING id"
+                ),
+                {"p": paper_id, "u": user_id, "t": started_at},
+            ).scalar()
+            for started_at in ("2001-02-03 10:00:00", "2001-03-04 10:00:00")
+        ]
+    yield user_id, record_ids
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM interview_records WHERE user_id = :u"), {"u": user_id}
+        )
+        conn.execute(
+            text("DELETE FROM candidate_latest_attempts WHERE user_id = :u"),
+            {"u": user_id},
+        )
+        conn.execute(text("DELETE FROM users WHERE id = :u"), {"u": user_id})
+
+
+def test_date_range_lists_latest_attempt_in_range(candidate_with_older_attempt):
+    user_id, (older_id, latest_id) = candidate_with_older_attempt
+
+    def listed(**dates):
+        result = repository.get_admin_user_results(search="Range Test", **dates)
+        return [
+            (row["user_id"], row["latest_attempt"]["attempt_id"], row["attempts_count"])
+            for row in result["data"]
+        ]
+
+    assert listed() == [(user_id, latest_id, 2)]
+    assert listed(start_date="2001-02-01", end_date="2001-02-28") == [
+        (user_id, older_id, 2)
+    ]
+    assert listed(start_date="2001-02-01") == [(user_id, latest_id, 2)]
+    assert listed(start_date="2002-01-01") == []
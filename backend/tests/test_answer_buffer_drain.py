@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+
+from app.interview_attempts import answer_buffer, repository
+
+
+def test_drain_flushes_until_nothing_is_buffered(monkeypatch):
+    pending = [2, 1, 0]
+    monkeypatch.setattr(answer_buffer, "pending_count", lambda _: pending.pop(0))
+    monkeypatch.setattr(repository, "_flush_locked", lambda *_: 1)
+
+    assert repository.drain_buffered_answers(7) == 2
+
+
+@pytest.mark.parametrize("flushed", [None, 0])
+def test_drain_refuses_to_leave_deltas_behind(monkeypatch, flushed):
+    # None: the flush lock stayed taken; 0: deltas keep reappearing
+    monkeypatch.setattr(answer_buffer, "pending_count", lambda _: 1)
+    monkeypatch.setattr(repository, "_flush_locked", lambda *_: flushed)
+
+    with pytest.raises(HTTPException) as exc_info:
+        repository.drain_buffered_answers(7, wait_seconds=0)
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,102 @@
+from types import MappingProxyType
+
+import pytest
+
+from app.interview_attempts.answer_key import AnswerKey, QuestionKey
+from app.interview_attempts.repository import (
+    _answer_value_keys,
+    _grade_responses,
+    _is_answer_correct,
+    _matches_answer_key,
+    _normalize_text,
+)
+
+
+def make_question_key(question_id, correct_text, marks=2.0, section="Aptitude"):
+    return QuestionKey(
+        question_id=question_id,
+        marks=marks,
+        section_code=section.upper(),
+        section_name=section,
+        correct_text=_normalize_text(correct_text),
+        correct_keys=_answer_value_keys(correct_text),
+    )
+
+
+GRADE_SETTINGS = (
+    {"min": 0, "max": 49.99, "grade_label": "Poor"},
+    {"min": 50, "max": 100, "grade_label": "Good"},
+)
+
+
+# ---------------------------
+# Correctness parity with _is_answer_correct
+# ---------------------------
+
+
+@pytest.mark.parametrize(
+    "user_answer, correct_answer",
+    [
+        ("B", "B"),
+        ("b) four", "B. 4"),
+        ("A, C", "C, A"),
+        ("A", "A, C"),
+        ("  Paris ", "paris"),
+        ("", "A"),
+        ("A", ""),
+        ("london", "Paris"),
+    ],
+)
+def test_compiled_key_matches_is_answer_correct(user_answer, correct_answer):
+    key = make_question_key(1, correct_answer)
+    assert _matches_answer_key(user_answer, key) == _is_answer_correct(
+        user_answer, correct_answer
+    )
+
+
+# ---------------------------
+# Grading pass
+# ---------------------------
+
+
+def test_grade_responses_uses_key_and_manual_marks():
+    question_keys = {
+        1: make_question_key(1, "B"),
+        2: make_question_key(2, "A"),
+        3: make_question_key(3, "", marks=5.0, section="Grammar"),
+    }
+    responses = [
+        {"question_id": 1, "section_name": "Aptitude", "section_code": "APTITUDE",
+         "answer_text": "b", "is_attempted": True, "manual_marks": None},
+        {"question_id": 2, "section_name": "Aptitude", "section_code": "APTITUDE",
+         "answer_text": "C", "is_attempted": True, "manual_marks": None},
+        {"question_id": 3, "section_name": "Grammar", "section_code": "GRAMMAR",
+         "answer_text": "essay", "is_attempted": True, "manual_marks": 4.0},
+        {"question_id": 99, "section_name": "Aptitude", "section_code": "APTITUDE",
+         "answer_text": "A", "is_attempted": True, "manual_marks": None},
+    ]  # fmt: skip
+
+    graded = _grade_responses(responses, question_keys, GRADE_SETTINGS)
+
+    assert graded["obtained_marks"] == 6.0
+    assert graded["total_marks"] == 9.0
+    assert graded["overall_grade"] == "Good"
+    aptitude, grammar = graded["subject_grades"]
+    assert (aptitude["correct_count"], aptitude["incorrect_count"]) == (1, 1)
+    assert aptitude["grade"] == "Good"
+    assert grammar["obtained_marks"] == 4.0
+
+
+def test_answer_key_round_trips_through_redis_payload():
+    key = AnswerKey(
+        paper_id=7,
+        version="3",
+        question_ids=(1, 2, 404),
+        questions=MappingProxyType(
+            {1: make_question_key(1, "A, C"), 2: make_question_key(2, "Paris")}
+        ),
+        grade_settings=GRADE_SETTINGS,
+        subject_order=MappingProxyType({"aptitude": 0}),
+    )
+
+    assert AnswerKey.from_dict(key.to_dict()) == key
@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from app.paper_assignments import balancer
+
+pytestmark = pytest.mark.skipif(
+    balancer.redis_client is None, reason="assignment counters need Redis"
+)
+
+
+@pytest.fixture
+def rule_id():
+    rule_id = random.randrange(10**6, 10**7)
+    yield rule_id
+    balancer.reset(rule_id, date.today())
+
+
+def test_concurrent_picks_are_balanced_from_seeded_counts(rule_id):
+    seeds = []
+
+    def load_counts():
+        seeds.append(1)
+        return {11: 3, 12: 1}
+
+    def pick(_):
+        return balancer.pick(rule_id, date.today(), [11, 12, 13], load_counts)
+
+    with ThreadPoolExecutor(8) as pool:
+        picks = Counter(pool.map(pick, range(60)))
+
+    # 4 seeded + 60 picked: 22, 21, 21 (ties go to the first paper)
+    assert picks == {11: 19, 12: 20, 13: 21}
+    assert len(seeds) >= 1
+
+
+def test_release_and_reset(rule_id):
+    today = date.today()
+    assert balancer.pick(rule_id, today, [1, 2], dict) == 1
+    balancer.release(rule_id, today, 1)
+    assert balancer.pick(rule_id, today, [1, 2], dict) == 1
+    assert balancer.pick(rule_id, today, [1, 2], dict) == 2
+
+    balancer.reset(rule_id, today)
+    assert balancer.pick(rule_id, today, [1, 2], lambda: {1: 5}) == 2
+
+
+def test_release_after_reset_does_not_recreate_the_counters(rule_id):
+    today = date.today()
+    assert balancer.pick(rule_id, today, [1, 2], dict) == 1
+    balancer.reset(rule_id, today)
+    balancer.release(rule_id, today, 1)
+
+    key = balancer._counter_key(rule_id, today)
+    assert not balancer.redis_client.exists(key)
+    # Reseeded from the database rather than from a -1 left by the release
+    assert balancer.pick(rule_id, today, [1, 2], lambda: {1: 1}) == 2
+    assert balancer.redis_client.ttl(key) > 0
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth import revocation
+from app.auth.utils import generate_jwt
+from app.core.config import settings
+from app.utils import dependencies
+from app.utils.dependencies import authenticate_user, require_roles
+
+
+def make_client() -> TestClient:
+    router = APIRouter(dependencies=[Depends(authenticate_user)])
+
+    @router.get("/admin-only", dependencies=[Depends(require_roles(["admin"]))])
+    async def admin_only(current_user: int = Depends(authenticate_user)):
+        return {"user_id": current_user}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def auth_header(user_id: int, role: str) -> dict:
+    return {"Authorization": f"Bearer {generate_jwt({'id': user_id, 'role': role})}"}
+
+
+def test_token_is_decoded_once_and_roles_are_checked(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(revocation, "is_enabled", lambda: False)
+    decodes = []
+    decode = dependencies.jwt.decode
+    monkeypatch.setattr(
+        dependencies.jwt,
+        "decode",
+        lambda *args, **kwargs: decodes.append(1) or decode(*args, **kwargs),
+    )
+    client = make_client()
+
+    response = client.get("/admin-only", headers=auth_header(7, "admin"))
+    assert response.json() == {"user_id": 7}
+    assert len(decodes) == 1
+
+    assert client.get("/admin-only", headers=auth_header(8, "user")).status_code == 403
+    assert client.get("/admin-only").status_code == 401
+
+
+def test_inactive_users_and_revoked_tokens_are_refused(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(revocation, "is_enabled", lambda: True)
+    states = {
+        1: revocation.AuthState(),
+        2: revocation.AuthState(inactive=True),
+        3: revocation.AuthState(revoked_before=2**31),
+    }
+    monkeypatch.setattr(revocation, "cached_state", states.get)
+    client = make_client()
+
+    assert client.get("/admin-only", headers=auth_header(1, "admin")).status_code == 200
+    for user_id, detail in ((2, "inactive"), (3, "revoked")):
+        response = client.get("/admin-only", headers=auth_header(user_id, "admin"))
+        assert response.status_code == 401
+        assert detail in response.json()["detail"]
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+from app.core import background_jobs
+from app.core.background_jobs import BackgroundJobs
+
+
+class Admins:
+    def __init__(self):
+        self.events = []
+
+    def publish_sync(self, event, user_id):
+        self.events.append(event)
+
+    async def publish(self, event, user_id):
+        self.events.append(event)
+
+
+def test_request_during_a_run_is_folded_into_one_more_pass(monkeypatch):
+    admins = Admins()
+    monkeypatch.setattr(background_jobs, "realtime_manager", admins)
+    release = threading.Event()
+    passes = []
+
+    def run(key, job_id, on_progress):
+        passes.append(job_id)
+        release.wait(5)
+        on_progress({"type": "test_progress", "status": "completed"})
+        return {"done": len(passes)}
+
+    jobs = BackgroundJobs("Test", "test_progress", "paper_id", run, str)
+
+    async def scenario():
+        started = jobs.schedule(7)
+        await asyncio.sleep(0.05)
+        queued = [jobs.schedule(7), await jobs.request(7)]
+        release.set()
+        await jobs._tasks[7]
+        return started, queued
+
+    started, queued = asyncio.run(scenario())
+
+    assert started["status"] == "started" and started["paper_id"] == 7
+    assert [q["status"] for q in queued] == ["queued", "queued"]
+    assert {q["job_id"] for q in queued} == {started["job_id"]}
+    # The two requests made mid-run add a single pass, under the same job id
+    assert passes == [started["job_id"]] * 2
+    assert len(admins.events) == 2
+    assert jobs._tasks == {}
+
+
+def test_failed_job_reports_to_admins(monkeypatch):
+    admins = Admins()
+    monkeypatch.setattr(background_jobs, "realtime_manager", admins)
+
+    def run(key, job_id, on_progress):
+        raise RuntimeError("boom")
+
+    jobs = BackgroundJobs("Test", "test_progress", "rule_id", run, str)
+
+    async def scenario():
+        started = jobs.schedule(3)
+        await jobs._tasks[3]
+        return started
+
+    started = asyncio.run(scenario())
+
+    assert admins.events == [
+        {
+            "type": "test_progress",
+            "job_id": started["job_id"],
+            "rule_id": 3,
+            "status": "failed",
+            "error": "boom",
+        }
+    ]
@@ -0,0 +1,60 @@
+from openpyxl import Workbook
+
+from app.questions.bulk_upload_service import BulkUploadService
+from app.questions.constants import QuestionType
+
+HEADER = ["Subject Code", "Exam Level Code", "Marks", "Question Text", "Option 1"]
+HEADER += ["Option 2", "Correct Option"]
+SUBJECTS = {"APTITUDE": {"code": "APTITUDE"}}
+LEVELS = {"FRESHER": {"code": "FRESHER"}}
+
+
+def make_sheet(rows):
+    sheet = Workbook().active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    return sheet
+
+
+def validate(chunk):
+    service = BulkUploadService()
+    return service._validate_chunk(
+        chunk, QuestionType.MULTIPLE_CHOICE, SUBJECTS, LEVELS, {}
+    )
+
+
+def test_chunks_keep_excel_row_numbers_and_skip_blank_rows():
+    sheet = make_sheet(
+        [
+            ["aptitude", "fresher", 1, "Q1", "yes", "no", 1],
+            [None] * 7,
+            ["aptitude", "fresher", 1, "Q2", "", "no", 2],
+            ["aptitude", "fresher", 1, "Q3", "yes", "no", 1],
+        ]
+    )
+
+    chunks = list(BulkUploadService._iter_row_chunks(sheet, size=2))
+
+    assert [[row_num for row_num, _ in chunk] for chunk in chunks] == [[2, 4], [5]]
+    assert chunks[0][1][1]["Option 1"] is None
+
+
+def test_validate_chunk_reports_schema_and_business_errors_per_row():
+    sheet = make_sheet(
+        [
+            ["aptitude", "fresher", 2, "Q1", "yes", "no", 2],
+            ["aptitude", "fresher", 1, "Q2", "yes", "no", "x"],
+            ["nope", "fresher", 1, "Q3", "yes", "no", 1],
+            ["aptitude", "fresher", 1, "Q4", "yes", "no", 1],
+        ]
+    )
+    (chunk,) = BulkUploadService._iter_row_chunks(sheet, size=10)
+
+    prepared, errors = validate(chunk)
+
+    assert [item["question"]["question_text"] for item in prepared] == ["Q1", "Q4"]
+    assert prepared[0]["answer"]["answer_text"] == "B"
+    assert [error["row"] for error in errors] == [3, 4]
+    assert errors[0]["errors"][0].startswith("Correct Option:")
+    assert errors[1]["errors"] == ["Invalid Subject Code: NOPE"]
@@ -0,0 +1,106 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.core import cache
+
+
+@pytest.fixture
+def key():
+    return f"test:{uuid.uuid4().hex}"
+
+
+def counting_loader(value):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return value
+
+    return loader, calls
+
+
+# ---------------------------
+# Read-through and invalidation
+# ---------------------------
+
+
+def test_second_read_is_a_hit(key):
+    loader, calls = counting_loader({"name": "Aptitude"})
+
+    assert cache.get_or_load(key, loader) == {"name": "Aptitude"}
+    assert cache.get_or_load(key, loader) == {"name": "Aptitude"}
+    assert len(calls) == 1
+
+
+def test_invalidate_reloads(key):
+    loader, calls = counting_loader([1, 2])
+    cache.get_or_load(key, loader)
+
+    cache.invalidate(key)
+    cache.get_or_load(key, loader)
+
+    assert len(calls) == 2
+
+
+def test_invalidate_tags_reloads_only_tagged_entries(key):
+    tag = f"tag-{uuid.uuid4().hex}"
+    tagged, tagged_calls = counting_loader("tagged")
+    other, other_calls = counting_loader("other")
+    cache.get_or_load(key, tagged, tags=[tag])
+    cache.get_or_load(f"{key}:other", other)
+
+    cache.invalidate_tags(tag)
+    cache.get_or_load(key, tagged, tags=[tag])
+    cache.get_or_load(f"{key}:other", other)
+
+    assert len(tagged_calls) == 2
+    assert len(other_calls) == 1
+
+
+def test_none_is_not_cached(key):
+    loader, calls = counting_loader(None)
+
+    assert cache.get_or_load(key, loader) is None
+    assert cache.get_or_load(key, loader) is None
+    assert len(calls) == 2
+
+
+def test_make_key_is_stable_and_bounded():
+    first = cache.make_key("classifications:list", "subject", None, "x" * 500)
+    again = cache.make_key("classifications:list", "subject", None, "x" * 500)
+
+    assert first == again
+    assert len(first) < 64
+    assert first != cache.make_key("classifications:list", "subject", None, "y")
+
+
+# ---------------------------
+# Stampede protection
+# ---------------------------
+
+
+def test_concurrent_misses_load_once(key):
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"sections": []}
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_load(key, slow_loader))
+        )
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"sections": []}] * 10
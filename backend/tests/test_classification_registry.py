@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from app.classifications.registry import ClassificationRegistry
+from app.interview_attempts.repository import _resolve_question_section
+
+ROWS = [
+    {"id": 1, "type": "subject", "code": "LOGICAL_REASONING", "name": "Reasoning"},
+    {"id": 2, "type": "exam_level", "code": "LOGICAL_REASONING", "name": "Level"},
+    {"id": 3, "type": "subject", "code": "ENGLISH", "name": "English"},
+]
+
+
+def make_registry():
+    return ClassificationRegistry([dict(row, is_active=True) for row in ROWS])
+
+
+def test_lookups_by_id_and_type_code():
+    registry = make_registry()
+
+    assert registry.get(3).code == "ENGLISH"
+    assert registry.get(99) is None
+    assert registry.find("exam_level", "LOGICAL_REASONING").id == 2
+    assert registry.find("subject", "MATHS") is None
+    assert len(registry) == 3
+
+
+def test_resolve_question_section_uses_subject_name():
+    question = SimpleNamespace(subject_type=" LOGICAL_REASONING ")
+
+    assert _resolve_question_section(make_registry(), question) == (
+        "LOGICAL_REASONING",
+        "Reasoning",
+    )
+
+
+def test_resolve_question_section_falls_back_to_code():
+    registry = make_registry()
+
+    assert _resolve_question_section(
+        registry, SimpleNamespace(subject_type="GENERAL_APTITUDE")
+    ) == ("GENERAL_APTITUDE", "General Aptitude")
+    assert _resolve_question_section(registry, SimpleNamespace(subject_type=None)) == (
+        "GENERAL",
+        "General",
+    )
@@ -0,0 +1,55 @@
+import pytest
+
+from app.duplicates.service import (
+    find_best_match,
+    get_similarity_upper_bound,
+    get_string_similarity,
+)
+
+
+def make_profile(user_id, name, father="", mother="", city="Delhi"):
+    return {
+        "user_id": user_id,
+        "personal": {"presentCity": city},
+        "name": name,
+        "father": father,
+        "mother": mother,
+        "education": "",
+        "work": "",
+        "created_at": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Rahul Sharma", "Rahool Sarma"),
+        ("Priya", "Ayirp"),
+        ("Ramesh", ""),
+        ("", ""),
+        ("Sita Devi", "sita devi "),
+    ],
+)
+def test_prefilter_bound_never_undershoots_similarity(a, b):
+    assert get_similarity_upper_bound(a, b) >= get_string_similarity(a, b)
+
+
+def test_best_match_skips_unrelated_and_keeps_highest_score():
+    new = make_profile(1, "Rahul Sharma", "Ramesh Sharma", "Sita Devi")
+    candidates = [
+        make_profile(2, "Zoya Khan", "Imran", "Nazia"),
+        make_profile(3, "Rahool Sharma", "Ramesh Sarma", "Sita Devi"),
+        make_profile(4, "Rahul Sharma", "Ramesh Sharma", "Sita Devi"),
+    ]
+
+    match = find_best_match(new, candidates, "1999-01-01")
+
+    assert match["candidate_user_id"] == 4
+    assert match["match_details"]["scores"]["dob"] == 100.0
+
+
+def test_no_match_below_primary_threshold():
+    new = make_profile(1, "Rahul Sharma", "Ramesh", "Sita")
+    candidates = [make_profile(2, "Zoya Khan", "Imran", "Nazia")]
+
+    assert find_best_match(new, candidates, "1999-01-01") is None
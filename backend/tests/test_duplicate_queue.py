@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.duplicates import queue
+
+pytestmark = pytest.mark.skipif(
+    queue.redis_client is None, reason="the duplicate queue needs Redis"
+)
+
+
+@pytest.fixture(autouse=True)
+def keys(monkeypatch):
+    """Run against throwaway keys, checking users with a stub."""
+    prefix = f"test:{uuid.uuid4().hex}:"
+    for name in ("QUEUE_KEY", "PENDING_KEY", "FAILURES_KEY"):
+        monkeypatch.setattr(queue, name, prefix + getattr(queue, name))
+    monkeypatch.setattr(queue, "PROCESSING_PREFIX", prefix + "processing:")
+    monkeypatch.setattr(queue, "ALIVE_PREFIX", prefix + "alive:")
+    monkeypatch.setattr(queue, "_publish", lambda _: asyncio.sleep(0))
+    monkeypatch.setattr(settings, "DUPLICATE_CHECK_MAX_ATTEMPTS", 2)
+    yield
+    queue.redis_client.delete(*queue.redis_client.keys(prefix + "*") or [prefix])
+
+
+def queued() -> list[int]:
+    return [int(i) for i in queue.redis_client.lrange(queue.QUEUE_KEY, 0, -1)]
+
+
+def processing(worker_id: str | None = None) -> list[int]:
+    key = queue._processing_key(worker_id)
+    return [int(i) for i in queue.redis_client.lrange(key, 0, -1)]
+
+
+def test_repeated_enqueues_queue_one_check():
+    for user_id in (7, 8, 7):
+        asyncio.run(queue.enqueue_duplicate_check(user_id))
+    assert queued() == [8, 7]
+
+
+def test_popped_id_stays_in_processing_until_acknowledged(monkeypatch):
+    asyncio.run(queue.enqueue_duplicate_check(7))
+    assert queue._pop_user_id() == 7
+    assert (queued(), processing()) == ([], [7])
+
+    # A save during the check queues another one
+    asyncio.run(queue.enqueue_duplicate_check(7))
+    assert queued() == [7]
+
+    monkeypatch.setattr(queue, "check_user", lambda user_id: None)
+    assert asyncio.run(queue._process(7)) is True
+    assert processing() == []
+
+
+def test_failed_check_is_retried_then_dropped(monkeypatch):
+    def check_user(user_id):
+        raise RuntimeError("database gone")
+
+    monkeypatch.setattr(queue, "check_user", check_user)
+    asyncio.run(queue.enqueue_duplicate_check(7))
+
+    assert queue._pop_user_id() == 7
+    assert asyncio.run(queue._process(7)) is False
+    assert (queued(), processing()) == ([7], [])
+
+    assert queue._pop_user_id() == 7
+    assert asyncio.run(queue._process(7)) is False
+    assert (queued(), processing()) == ([], [])
+    assert not queue.redis_client.hexists(queue.FAILURES_KEY, 7)
+
+
+def test_unacknowledged_ids_of_dead_workers_are_requeued(monkeypatch):
+    for user_id in (7, 8, 9):
+        asyncio.run(queue.enqueue_duplicate_check(user_id))
+    # This worker takes 7 and 8, then dies (no heartbeat)
+    assert queue._pop_user_id() == 7
+    assert queue._pop_user_id() == 8
+    dead = queue.WORKER_ID
+    # A live worker holds 9
+    monkeypatch.setattr(queue, "WORKER_ID", "live")
+    queue._heartbeat()
+    assert queue._pop_user_id() == 9
+
+    assert queue.requeue_unfinished() == 2
+    assert (queued(), processing(dead), processing("live")) == ([8, 7], [], [9])
+    # Handed back first, in the order they were queued
+    assert [queue._pop_user_id(), queue._pop_user_id()] == [7, 8]
+
+
+def test_worker_checks_queued_ids_with_redis_off_the_loop(monkeypatch):
+    redis_client = queue.redis_client
+    redis_threads = set()
+
+    class ThreadRecordingClient:
+        def __getattr__(self, name):
+            def call(*args, **kwargs):
+                redis_threads.add(threading.current_thread())
+                return getattr(redis_client, name)(*args, **kwargs)
+
+            return call
+
+    monkeypatch.setattr(queue, "redis_client", ThreadRecordingClient())
+    monkeypatch.setattr(settings, "DUPLICATE_WORKER_POLL_SECONDS", 0.01)
+    checked = []
+
+    async def scenario():
+        stop_event = asyncio.Event()
+        monkeypatch.setattr(
+            queue,
+            "check_user",
+            lambda user_id: checked.append(user_id) or stop_event.set(),
+        )
+        await queue.enqueue_duplicate_check(7)
+        await asyncio.wait_for(queue.run_duplicate_worker(stop_event), timeout=5)
+
+    asyncio.run(scenario())
+
+    assert redis_threads and threading.current_thread() not in redis_threads
+    assert checked == [7]
+    assert (queued(), processing()) == ([], [])
+    assert not redis_client.exists(queue._alive_key())
@@ -0,0 +1,84 @@
+import pytest
+
+from app.core.config import settings
+from app.duplicates.sweep import (
+    candidate_pairs,
+    dob_similarity,
+    score_pair,
+    score_pairs,
+)
+
+
+def make_profile(user_id, name, father, mother, dob, mobile="", pincode=""):
+    return {
+        "user_id": user_id,
+        "personal": {"dob": dob, "presentCity": "Jaipur", "presentPincode": pincode},
+        "name": name,
+        "father": father,
+        "mother": mother,
+        "education": "",
+        "work": "",
+        "created_at": None,
+        "mobile": mobile,
+    }
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("1998-04-12", "1998-04-12", 100.0),
+        ("1998-04-12", "1998-04-13", 80.0),
+        ("1998-04-12", "1989-04-12", 80.0),
+        ("1998-04-12", "1998-12-04", 80.0),
+        ("1998-04-12", "1997-08-21", 0.0),
+        ("1998-04-12", None, 0.0),
+    ],
+)
+def test_dob_similarity(a, b, expected):
+    assert dob_similarity(a, b) == expected
+
+
+def test_sweep_pairs_and_scores_a_duplicate_with_a_dob_typo():
+    profiles = [
+        make_profile(1, "Rahul Sharma", "Mahesh Sharma", "Sunita Devi", "1998-04-12"),
+        make_profile(2, "Priya Verma", "Anil Verma", "Kavita Verma", "1997-08-21"),
+        make_profile(3, "Rahul Sharmaa", "Mahesh Sharma", "Sunita Devi", "1998-04-13"),
+    ]
+
+    assert candidate_pairs(profiles) == {(0, 2)}
+
+    match = score_pair(profiles[0], profiles[2])
+    assert match["new_user_id"] == 3
+    assert match["candidate_user_id"] == 1
+    assert match["final_score"] >= 85
+    assert score_pair(profiles[0], profiles[1]) is None
+
+
+def test_sweep_pairs_profiles_sharing_a_mobile_number():
+    profiles = [
+        make_profile(1, "Amit Jain", "", "", "1995-01-01", mobile="+91 98290 12345"),
+        make_profile(2, "Sneha Rao", "", "", "1990-06-30", mobile="9829012345"),
+    ]
+
+    assert candidate_pairs(profiles) == {(0, 1)}
+
+
+def test_pool_scoring_matches_in_process_scoring(monkeypatch):
+    profiles = [
+        make_profile(1, "Rahul Sharma", "Mahesh Sharma", "Sunita Devi", "1998-04-12"),
+        make_profile(2, "Priya Verma", "Anil Verma", "Kavita Verma", "1997-08-21"),
+        make_profile(3, "Rahul Sharmaa", "Mahesh Sharma", "Sunita Devi", "1998-04-13"),
+        make_profile(4, "Priya Varma", "Anil Verma", "Kavita Verma", "1997-08-21"),
+    ]
+    pairs = [(i, j) for i in range(4) for j in range(i + 1, 4)]
+    # One pair per chunk, so the pool gets more chunks than it keeps in flight
+    monkeypatch.setattr(settings, "DUPLICATE_SWEEP_CHUNK_SIZE", 1)
+
+    in_process = score_pairs(profiles, pairs, processes=1)
+    pooled = score_pairs(profiles, pairs, processes=2)
+
+    assert pooled == in_process
+    assert {(m["new_user_id"], m["candidate_user_id"]) for m in pooled} == {
+        (3, 1),
+        (4, 2),
+    }
@@ -0,0 +1,47 @@
+import io
+
+from PIL import Image
+
+from app.core.config import settings
+from app.questions import image_store
+
+
+def png_bytes(size):
+    buffer = io.BytesIO()
+    Image.linear_gradient("L").resize(size).convert("RGB").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def stored_files(root):
+    return sorted(
+        path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file()
+    )
+
+
+def test_identical_content_is_stored_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+    first = image_store.store(io.BytesIO(b"not an image"), "a.svg")
+    second = image_store.store(io.BytesIO(b"not an image"), "copy of a.SVG")
+
+    assert first == second
+    assert first.startswith("/images/questions/") and first.endswith(".svg")
+    assert len(stored_files(tmp_path)) == 1
+
+
+def test_large_raster_is_served_as_smaller_web_variant(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "QUESTION_IMAGE_WEB_MAX_PX", 200)
+
+    url = image_store.store(io.BytesIO(png_bytes((1600, 800))), "chart.png")
+
+    assert url.endswith(".w200.webp")
+    variant = tmp_path / url.removeprefix("/images/")
+    with Image.open(variant) as image:
+        assert image.size == (200, 100)
+    assert [name.rsplit(".", 1)[-1] for name in stored_files(tmp_path)] == [
+        "png",
+        "webp",
+    ]
+    # A re-upload resolves to the same variant without re-encoding it
+    assert image_store.store(io.BytesIO(png_bytes((1600, 800))), "x.png") == url
@@ -0,0 +1,121 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, Integer, MetaData, Table
+from sqlalchemy.orm import Session, registry
+
+from app.database.db import engine
+from app.utils.enums import TotalCountMode
+from app.utils.pagination import (
+    PaginationParams,
+    create_paginated_response,
+    decode_cursor,
+    encode_cursor,
+    paginate_query,
+)
+
+
+@pytest.mark.parametrize(
+    "sort_value",
+    [42, "Aptitude", datetime(2026, 1, 2, 3, 4, 5, 6), date(2026, 1, 2), Decimal("2.50"), None],
+)  # fmt: skip
+def test_cursor_round_trips_sort_value_and_id(sort_value):
+    cursor = encode_cursor(sort_value, 17, "created_at")
+    assert decode_cursor(cursor, "created_at") == (sort_value, 17)
+
+
+def test_cursor_for_another_sort_is_a_bad_request():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor(datetime(2026, 1, 2), 17, "created_at"), "marks")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(1, 2)[:-3]])
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_page_mode_response_is_unchanged_for_exact_totals():
+    pagination = create_paginated_response([], 25, PaginationParams(page=2, limit=10))[
+        "pagination"
+    ]
+
+    assert pagination["total_pages"] == 3
+    assert pagination["has_next"] is True
+    assert pagination["has_previous"] is True
+
+
+def test_cursor_mode_without_total_pages_by_next_cursor():
+    params = PaginationParams(
+        limit=10, cursor=encode_cursor(5, 5), total=TotalCountMode.NONE
+    )
+    last = create_paginated_response([], None, params)["pagination"]
+
+    assert last["total_records"] is None
+    assert last["total_pages"] is None
+    assert last["has_next"] is False
+    assert last["has_previous"] is True
+
+
+class ScoredRow:
+    pass
+
+
+scored_metadata = MetaData()
+scored_table = Table(
+    "pagination_test_rows",
+    scored_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("score", Integer, nullable=True),
+)
+registry(metadata=scored_metadata).map_imperatively(ScoredRow, scored_table)
+
+# id -> score; ties and NULLs interleaved with the ids
+SCORES = {1: 5, 2: None, 3: 7, 4: 5, 5: None, 6: 7, 7: None, 8: 1}
+
+
+@pytest.fixture
+def scored_rows():
+    scored_metadata.create_all(engine)
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                scored_table.insert(),
+                [{"id": i, "score": s} for i, s in SCORES.items()],
+            )
+        with Session(engine) as db:
+            yield db
+    finally:
+        scored_metadata.drop_all(engine)
+
+
+@pytest.mark.parametrize(
+    "order, expected",
+    [
+        ("asc", [8, 1, 4, 3, 6, 2, 5, 7]),
+        ("desc", [6, 3, 4, 1, 8, 7, 5, 2]),
+    ],
+)
+def test_cursor_pages_walk_null_sort_values_last(scored_rows, order, expected):
+    def page(cursor):
+        return paginate_query(
+            scored_rows.query(ScoredRow),
+            ScoredRow.score,
+            ScoredRow.id,
+            lambda row: (row.score, row.id),
+            limit=3,
+            cursor=cursor,
+            order=order,
+            total=TotalCountMode.NONE,
+        )
+
+    rows, _, cursor = page(None)
+    seen = [row.id for row in rows]
+    while cursor:
+        rows, _, cursor = page(cursor)
+        seen += [row.id for row in rows]
+    assert seen == expected
@@ -0,0 +1,88 @@
+import gzip
+import json
+from datetime import date
+
+from starlette.requests import Request
+
+from app.paper_assignments import snapshot
+
+PAPER_DETAILS = {
+    "paper": {"id": 4, "paper_name": "Aptitude", "total_marks": 2},
+    "total_questions": 1,
+    "overall_duration_minutes": 20,
+    "sections": [
+        {
+            "id": "eng",
+            "code": "ENG",
+            "title": "English – Ünïcode",
+            "duration_minutes": 20,
+            "total_marks": 2,
+            "question_count": 1,
+            "questions": [
+                {
+                    "id": 9,
+                    "type": "multiple_choice",
+                    "question_text": "Pick one",
+                    "marks": 2,
+                    "options": [{"option_label": "A", "option_text": "Yes"}],
+                }
+            ],
+        }
+    ],
+}
+
+
+def make_request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def render(**headers):
+    paper_snapshot = snapshot.load(4, snapshot.encode(PAPER_DETAILS))
+    return snapshot.respond(
+        make_request(**headers),
+        paper_snapshot,
+        assignment_id=12,
+        assigned_date=date(2026, 10, 18),
+        message="ok",
+    )
+
+
+def test_identity_response_wraps_snapshot_in_envelope():
+    body = json.loads(render(**{"Accept-Encoding": "identity"}).body)
+
+    assert body["status"] == 200
+    assert body["message"] == "ok"
+    assert body["data"]["assignment_id"] == 12
+    assert body["data"]["assigned_date"] == "2026-10-18"
+    assert body["data"]["sections"][0]["title"] == "English – Ünïcode"
+    assert body["data"]["paper"]["description"] is None
+
+
+def test_gzip_response_is_a_valid_stream_of_the_same_body():
+    plain = render(**{"Accept-Encoding": "identity"})
+    compressed = render(**{"Accept-Encoding": "gzip, deflate"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.body) == plain.body
+    assert compressed.headers["ETag"] == plain.headers["ETag"]
+
+
+def test_version_is_a_content_hash():
+    first = snapshot.encode(PAPER_DETAILS)
+    changed = snapshot.encode({**PAPER_DETAILS, "overall_duration_minutes": 25})
+
+    assert snapshot.encode(PAPER_DETAILS)["version"] == first["version"]
+    assert changed["version"] != first["version"]
+
+
+def test_matching_if_none_match_returns_304():
+    etag = render().headers["ETag"]
+
+    assert render(**{"If-None-Match": etag}).status_code == 304
+    assert render(**{"If-None-Match": f'"other", {etag[2:]}'}).status_code == 304
+    assert render(**{"If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+import app.main  # noqa: F401  (registers every mapper)
+from app.auth import service
+from app.auth.hasher import PasswordHasher
+from app.auth.schemas import SignUpSchema
+from app.auth.utils import password_needs_rehash
+from app.core.config import settings
+from app.database.db import engine
+
+
+def test_hasher_hashes_and_verifies_on_its_threads(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hasher = PasswordHasher(threads=2, slow_wait_ms=10_000)
+
+    async def run():
+        hashed = await hasher.hash("9876543210")
+        return hashed, await asyncio.gather(
+            hasher.verify("9876543210", hashed),
+            hasher.verify("0123456789", hashed),
+            hasher.verify("9876543210", "not-a-bcrypt-hash"),
+        )
+
+    try:
+        hashed, results = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+
+    assert hashed.startswith("$2b$04$")
+    assert results == [True, False, False]
+    stats = hasher.stats()
+    assert stats["completed"] == 4
+    assert stats["queued"] == 0
+
+
+def test_password_needs_rehash_follows_the_work_factor(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 12)
+
+    assert not password_needs_rehash("$2b$12$" + "a" * 53)
+    assert password_needs_rehash("$2b$10$" + "a" * 53)
+    assert password_needs_rehash("plain")
+
+
+@pytest.fixture
+def candidate():
+    with engine.begin() as conn:
+        department_id = conn.execute(
+            text("SELECT id FROM departments ORDER BY id LIMIT 1")
+        ).scalar()
+        if department_id is None:
+            pytest.skip("needs a department")
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (username, mobile, password, role, is_active, "
+                "department_id) VALUES ('Hasher Test', '5000000051', 'old', 'user', "
+                "true, :d) RETURNING id"
+            ),
+            {"d": department_id},
+        ).scalar()
+    yield user_id, department_id
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE id = :u"), {"u": user_id})
+
+
+def test_profile_mobile_change_hashes_on_the_password_hasher(monkeypatch, candidate):
+    user_id, department_id = candidate
+    hashed = []
+
+    class Hasher:
+        async def hash(self, password):
+            hashed.append(password)
+            return f"hashed:{password}"
+
+    monkeypatch.setattr(service, "password_hasher", Hasher())
+    data = SignUpSchema(
+        name="Hasher Test", mobile="5000000052", department_id=department_id
+    )
+
+    asyncio.run(service.update_user_basic_info(user_id, data))
+
+    assert hashed == ["5000000052"]
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT mobile, password FROM users WHERE id = :u"), {"u": user_id}
+        ).one()
+    assert tuple(row) == ("5000000052", "hashed:5000000052")
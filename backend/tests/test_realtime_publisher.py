@@ -0,0 +1,121 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core import redis_client as redis_client_module
+from app.core.config import settings
+from app.core.realtime import RealtimeManager, stream_key
+
+
+@pytest.fixture
+def target():
+    target = f"test-{uuid.uuid4().hex}"
+    yield target
+    if redis_client_module.redis_client is not None:
+        redis_client_module.redis_client.delete(stream_key(target))
+
+
+def gated_sends(manager: RealtimeManager):
+    """Replace the Redis round trip with one that records batches once opened."""
+    gate = asyncio.Event()
+    batches = []
+
+    async def send_batch(batch):
+        await gate.wait()
+        batches.append([json.loads(data)["n"] for _, data in batch])
+
+    manager._send_batch = send_batch
+    return gate, batches
+
+
+def test_full_outbox_makes_publishers_wait(monkeypatch, target):
+    monkeypatch.setattr(settings, "REALTIME_OUTBOX_SIZE", 2)
+    monkeypatch.setattr(settings, "REALTIME_PUBLISH_BATCH_SIZE", 10)
+
+    async def scenario():
+        manager = RealtimeManager()
+        manager.ensure_publisher()
+        gate, batches = gated_sends(manager)
+
+        await manager.publish({"n": 0}, user_id=target)
+        await asyncio.sleep(0)  # the publisher takes it and waits on Redis
+        await manager.publish({"n": 1}, user_id=target)
+        await manager.publish({"n": 2}, user_id=target)
+        blocked = asyncio.create_task(manager.publish({"n": 3}, user_id=target))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert manager.stats()["full_waits"] == 1
+        assert manager.stats()["outbox_depth"] == 2
+
+        gate.set()
+        await blocked
+        await manager.close()
+        return batches, manager.stats()
+
+    batches, stats = asyncio.run(scenario())
+
+    # 3 waited for room, so it missed the batch that made it
+    assert batches == [[0], [1, 2], [3]]
+    assert (stats["enqueued"], stats["peak_depth"]) == (4, 2)
+
+
+def test_publish_sync_on_the_loop_falls_back_when_the_outbox_is_full(monkeypatch):
+    monkeypatch.setattr(settings, "REALTIME_OUTBOX_SIZE", 1)
+    published = []
+
+    class DirectClient:
+        def eval(self, script, numkeys, *args):
+            published.append(json.loads(args[2])["n"])
+
+    monkeypatch.setattr(redis_client_module, "redis_client", DirectClient())
+
+    async def scenario():
+        manager = RealtimeManager()
+        manager.ensure_publisher()
+        gate, batches = gated_sends(manager)
+        manager.publish_sync({"n": 0}, user_id="admin")
+        manager.publish_sync({"n": 1}, user_id="admin")  # no room: sent directly
+        gate.set()
+        await manager.close()
+        return batches, manager.stats()
+
+    batches, stats = asyncio.run(scenario())
+
+    assert (batches, published) == ([[0]], [1])
+    assert (stats["full_waits"], stats["sync_fallbacks"]) == (1, 1)
+
+
+@pytest.mark.skipif(
+    redis_client_module.redis_client is None, reason="publishing needs Redis"
+)
+def test_pipelined_events_keep_publish_order(monkeypatch, target):
+    monkeypatch.setattr(settings, "REALTIME_PUBLISH_BATCH_SIZE", 16)
+
+    async def scenario():
+        manager = RealtimeManager()
+        await manager.start()
+        subscriber = await manager.subscribe(target)
+        loop = asyncio.get_running_loop()
+        for n in range(50):
+            if n % 10 == 5:
+                # From a worker thread, through the loop's outbox
+                await loop.run_in_executor(None, manager.publish_sync, {"n": n}, target)
+            else:
+                await manager.publish({"n": n}, user_id=target)
+        received = []
+        while len(received) < 50:
+            event_id, data = await asyncio.wait_for(subscriber.get(), timeout=5)
+            received.append((event_id, json.loads(data)["n"]))
+        await manager.close()
+        return received, manager.stats()
+
+    received, stats = asyncio.run(scenario())
+
+    assert [n for _, n in received] == list(range(50))
+    stream = redis_client_module.redis_client.xrange(stream_key(target))
+    assert [event_id for event_id, _ in stream] == [e for e, _ in received]
+    assert stats["published"] == 50
+    assert stats["batches"] > 1 and stats["max_batch"] <= 16
+    assert stats["sync_fallbacks"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core import redis_client as redis_client_module
+from app.core.config import settings
+from app.core.realtime import (
+    SLOW_CLIENT_DISCONNECT,
+    SLOW_CLIENT_DROP_OLDEST,
+    _PUBLISH_SCRIPT,
+    RealtimeManager,
+    SubscriberQueue,
+    _publish_args,
+    stream_key,
+)
+
+
+def drain(queue: SubscriberQueue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_slow_subscriber_loses_its_oldest_events(monkeypatch):
+    monkeypatch.setattr(
+        settings, "REALTIME_SLOW_CLIENT_POLICY", SLOW_CLIENT_DROP_OLDEST
+    )
+    manager = RealtimeManager()
+    queue = SubscriberQueue("admin", maxsize=2)
+
+    for n in range(1, 5):
+        manager._deliver(queue, f"{n}-0", str(n))
+
+    assert drain(queue) == [("3-0", "3"), ("4-0", "4")]
+    assert (queue.dropped, queue.closed) == (2, False)
+    assert (manager.stats()["delivered"], manager.stats()["dropped"]) == (4, 2)
+
+
+def test_slow_subscriber_is_disconnected(monkeypatch):
+    monkeypatch.setattr(settings, "REALTIME_SLOW_CLIENT_POLICY", SLOW_CLIENT_DISCONNECT)
+    manager = RealtimeManager()
+    queue = SubscriberQueue("admin", maxsize=2)
+
+    for n in range(1, 5):
+        manager._deliver(queue, f"{n}-0", str(n))
+
+    # Only the cut-off marker is left; later events are not queued
+    assert drain(queue) == [None]
+    assert queue.closed
+    assert (manager.stats()["delivered"], manager.stats()["disconnected"]) == (2, 1)
+
+
+def test_replay_skips_events_already_sent_and_held_live_duplicates():
+    manager = RealtimeManager()
+    stream = [(f"{n}-0", {"data": str(n)}) for n in (3, 4, 5)]
+
+    class Client:
+        async def xrange(self, key, min, count):
+            assert min == "(2-0"
+            # Live events arriving meanwhile: one already in the stream
+            manager._deliver(queue, "4-0", "4")
+            manager._deliver(queue, "6-0", "6")
+            return stream
+
+    manager._get_client = Client
+    queue = SubscriberQueue("admin", maxsize=10)
+    queue.last_id, queue.held = (2, 0), []
+
+    asyncio.run(manager._replay(queue, "2-0"))
+    manager._deliver(queue, "5-0", "5")  # a late live copy
+
+    assert drain(queue) == [("3-0", "3"), ("4-0", "4"), ("5-0", "5"), ("6-0", "6")]
+    assert manager.stats()["replayed"] == 3
+
+
+@pytest.mark.skipif(
+    redis_client_module.redis_client is None, reason="replay needs Redis"
+)
+def test_reconnecting_subscriber_gets_missed_events_once():
+    target = f"test-{uuid.uuid4().hex}"
+    redis_client = redis_client_module.redis_client
+    ids = [
+        redis_client.eval(_PUBLISH_SCRIPT, 2, *_publish_args(target, json.dumps(n)))
+        for n in range(5)
+    ]
+
+    async def scenario():
+        manager = RealtimeManager()
+        await manager.start()
+        # Last-Event-ID of a client that saw events 0 and 1
+        queue = await manager.subscribe(target, ids[1])
+        await manager.publish(5, user_id=target)
+        received = []
+        while len(received) < 4:
+            event_id, data = await asyncio.wait_for(queue.get(), timeout=5)
+            received.append(json.loads(data))
+        await asyncio.sleep(0.1)
+        extra = drain(queue)
+        await manager.unsubscribe(queue, target)
+        await manager.close()
+        return received, extra
+
+    try:
+        received, extra = asyncio.run(scenario())
+    finally:
+        redis_client.delete(stream_key(target))
+
+    assert (received, extra) == ([2, 3, 4, 5], [])
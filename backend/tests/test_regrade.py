@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+import app.main  # noqa: F401  (registers every mapper)
+from app.core.config import settings
+from app.database.db import engine
+from app.interview_attempts import regrade
+from app.interview_attempts.answer_key import QuestionKey
+
+# Three attempts with 2, 1 and 0 correct answers to two 5-mark "Paris" questions
+ANSWERS = [("Paris", "Paris"), ("Paris", "Oslo"), ("Lyon", "")]
+GRADE_SETTINGS = (
+    {"min": 75, "max": 100, "grade_label": "A"},
+    {"min": 0, "max": 74.99, "grade_label": "C"},
+)
+
+
+@pytest.fixture
+def paper(monkeypatch):
+    """A paper whose submitted attempts all store a stale 0/0 "N/A" grade."""
+    with engine.begin() as conn:
+        department_id, test_level_id, question_ids = conn.execute(
+            text(
+                "SELECT (SELECT id FROM departments ORDER BY id LIMIT 1), "
+                "(SELECT id FROM classifications ORDER BY id LIMIT 1), "
+                "ARRAY(SELECT id FROM questions ORDER BY id LIMIT 2)"
+            )
+        ).one()
+        if department_id is None or test_level_id is None or len(question_ids) < 2:
+            pytest.skip("needs a department, a classification and two questions")
+
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (username, mobile, password, role, is_active) "
+                "VALUES ('Regrade Test', '5000000042', 'x', 'user', true) "
+                "RETURNING id"
+            )
+        ).scalar()
+        paper_id = conn.execute(
+            text(
+                "INSERT INTO papers (paper_name, department_id, test_level_id, "
+                "subject_ids_data, question_id, created_by) "
+                "VALUES ('Regrade Test', :d, :l, '[]', :q, :u) RETURNING id"
+            ),
+            {
+                "d": department_id,
+                "l": test_level_id,
+                "q": json.dumps(question_ids),
+                "u": user_id,
+            },
+        ).scalar()
+        record_ids = []
+        for answers in ANSWERS:
+            record_id = conn.execute(
+                text(
+                    "INSERT INTO interview_records (paper_id, user_id, status) "
+                    "VALUES (:p, :u, 'submitted') RETURNING id"
+                ),
+                {"p": paper_id, "u": user_id},
+            ).scalar()
+            record_ids.append(record_id)
+            for question_id, answer in zip(question_ids, answers):
+                conn.execute(
+                    text(
+                        "INSERT INTO interview_responses (attempt_id, question_id, "
+                        "section_code, section_name, answer_text, is_attempted) "
+                        "VALUES (:a, :q, 'GEO', 'Geography', :t, :t <> '')"
+                    ),
+                    {"a": record_id, "q": question_id, "t": answer},
+                )
+
+    question_keys = {
+        question_id: QuestionKey(
+            question_id, 5.0, "GEO", "Geography", "paris", frozenset({"paris"})
+        )
+        for question_id in question_ids
+    }
+    monkeypatch.setattr(
+        regrade,
+        "_load_question_keys",
+        lambda _: (question_keys, GRADE_SETTINGS, {"Geography": 0}),
+    )
+    yield paper_id, record_ids
+
+    with engine.begin() as conn:
+        params = {"p": paper_id, "u": user_id}
+        conn.execute(
+            text(
+                "DELETE FROM interview_responses WHERE attempt_id IN "
+                "(SELECT id FROM interview_records WHERE paper_id = :p)"
+            ),
+            params,
+        )
+        conn.execute(text("DELETE FROM interview_records WHERE paper_id = :p"), params)
+        conn.execute(
+            text("DELETE FROM candidate_latest_attempts WHERE user_id = :u"), params
+        )
+        conn.execute(text("DELETE FROM papers WHERE id = :p"), params)
+        conn.execute(text("DELETE FROM users WHERE id = :u"), params)
+
+
+def stored_grades(record_ids: list[int]) -> list[tuple]:
+    with engine.connect() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(
+                text(
+                    "SELECT obtained_marks, total_marks, overall_grade "
+                    "FROM interview_records WHERE id = ANY(:ids) ORDER BY id"
+                ),
+                {"ids": record_ids},
+            )
+        ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_regrade_paper_rewrites_stale_grades(paper, monkeypatch, processes):
+    paper_id, record_ids = paper
+    # One attempt per chunk: with 2 processes every chunk goes through the pool
+    monkeypatch.setattr(settings, "REGRADE_CHUNK_SIZE", 1)
+    monkeypatch.setattr(settings, "REGRADE_PROCESSES", processes)
+    events = []
+
+    result = regrade.regrade_paper(paper_id, "job", events.append)
+
+    assert result["status"] == "completed"
+    assert (result["total"], result["processed"], result["updated"]) == (3, 3, 3)
+    assert [e["processed"] for e in events] == [0, 1, 2, 3, 3]
+    assert stored_grades(record_ids) == [(10, 10, "A"), (5, 10, "C"), (0, 10, "C")]
+
+
+def test_rows_changed_since_they_were_read_are_not_overwritten(paper):
+    paper_id, record_ids = paper
+    (chunk,) = regrade._stream_chunks(paper_id, chunk_size=10)
+    assert [attempt_id for attempt_id, _, _ in chunk] == record_ids
+    regrade._set_worker_key(*regrade._load_question_keys(paper_id))
+    rows = regrade._grade_chunk(chunk)
+
+    # e.g. manual marks saved on the first attempt while the job ran
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE interview_records "
+                "SET updated_at = updated_at + interval '1 second' WHERE id = :id"
+            ),
+            {"id": record_ids[0]},
+        )
+
+    assert regrade._write_grades(rows) == 2
+    assert stored_grades(record_ids) == [
+        (0, 0, "N/A"),
+        (5, 10, "C"),
+        (0, 10, "C"),
+    ]
@@ -0,0 +1,50 @@
+import asyncio
+import io
+import zipfile
+
+from app.core.config import settings
+from app.reports import report_cache, service
+
+
+def test_report_cache_keeps_latest_pdf_per_attempt(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_CACHE_DIR", str(tmp_path))
+    old, new = report_cache.content_hash("<p>a</p>"), report_cache.content_hash("b")
+
+    report_cache.put(7, old, b"%PDF-old")
+    report_cache.put(7, new, b"%PDF-new")
+
+    assert report_cache.get(7, old) is None
+    assert report_cache.get(7, new) == b"%PDF-new"
+    report_cache.invalidate(7)
+    assert report_cache.get(7, new) is None
+
+
+def test_zip_export_streams_reports_and_lists_failures(monkeypatch):
+    def prepare(user_id, attempt_id):
+        if attempt_id == 3:
+            raise ValueError("Attempt not found")
+        return f"<p>{attempt_id}</p>", f"Report_user{user_id}.pdf"
+
+    async def render(attempt_id, html):
+        return f"%PDF-{html}".encode()
+
+    monkeypatch.setattr(service, "_prepare_report_in_session", prepare)
+    monkeypatch.setattr(service, "render_report", render)
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in service.stream_reports_zip([(10, 1), (11, 2), (12, 3)])
+        ]
+
+    chunks = asyncio.run(collect())
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+    assert len(chunks) == 3
+    assert sorted(archive.namelist()) == [
+        "1_Report_user10.pdf",
+        "2_Report_user11.pdf",
+        "errors.txt",
+    ]
+    assert archive.read("2_Report_user11.pdf") == b"%PDF-<p>2</p>"
+    assert archive.read("errors.txt") == b"Attempt 3 (user 12): Attempt not found\n"
@@ -0,0 +1,76 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+from pydantic import BaseModel
+
+from app.utils.status_codes import StatusCode, api_response
+
+
+class Level(str, Enum):
+    EASY = "easy"
+
+
+class Section(BaseModel):
+    code: str
+    created_at: datetime
+
+
+class LegacyEncoder(json.JSONEncoder):
+    # The encoder api_response used before the orjson response
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+PAYLOAD = {
+    "user": {"id": 7, "username": "asha", "is_active": True, "email": None},
+    "attempt": {
+        "started_at": datetime(2026, 10, 18, 9, 30, 5, 123456),
+        "submitted_at": datetime(2026, 10, 18, 10, 0, tzinfo=timezone.utc),
+        "assigned_date": date(2026, 10, 18),
+        "total_marks": 40.0,
+        "obtained_marks": Decimal("12.50"),
+    },
+    "answers": [
+        {
+            "question_id": 1,
+            "exam_level": Level.EASY,
+            "options": [{"option_label": "A", "option_text": "Ünïcode ✓"}],
+            "typing_stats": {"wpm": 42, "accuracy": 97.5},
+        }
+    ],
+    "grade_settings": {1: "A", 2: "B"},
+}
+
+
+def test_api_response_matches_legacy_encoding():
+    response = api_response(StatusCode.OK, "ok", data=PAYLOAD)
+
+    expected = json.loads(
+        json.dumps({"status": 200, "message": "ok", "data": PAYLOAD}, cls=LegacyEncoder)
+    )
+    assert json.loads(response.body) == expected
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+
+
+def test_api_response_encodes_pydantic_models():
+    created_at = datetime(2026, 10, 18, 9, 30)
+    response = api_response(
+        StatusCode.OK,
+        "ok",
+        data={"sections": [Section(code="ENG", created_at=created_at)]},
+        pagination=Section(code="P", created_at=created_at),
+    )
+
+    body = json.loads(response.body)
+    assert body["data"]["sections"] == [
+        {"code": "ENG", "created_at": "2026-10-18T09:30:00"}
+    ]
+    assert body["pagination"] == {"code": "P", "created_at": "2026-10-18T09:30:00"}